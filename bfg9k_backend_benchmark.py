@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark the BFG9K RDF backends on the same load and query mix.
+
+Compares the local rdflib backend with the pooled WASM engine (when wasmtime
+and the compiled engine are available), issuing queries one at a time from
+several threads and through the batch entry points.
+
+Usage:
+    python bfg9k_backend_benchmark.py [--wasm tools/bfg9k_rdf_engine.wasm] [--triples 2000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.absolute() / "src"))
+
+from bfg9k_manager import LocalRDFBackend, WASMRDFConnector  # noqa: E402
+
+PREFIX = "PREFIX ex: <http://example.org/bench#>\nPREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>\n"
+
+QUERY_MIX = [
+    PREFIX + "SELECT ?s WHERE { ?s a ex:Item } LIMIT 50",
+    PREFIX + "SELECT ?s ?label WHERE { ?s rdfs:label ?label } LIMIT 20",
+    PREFIX + "SELECT (COUNT(?s) AS ?n) WHERE { ?s ex:group ex:g3 }",
+    PREFIX + "ASK { ex:item7 ex:next ex:item8 }",
+    PREFIX + "SELECT ?a ?c WHERE { ?a ex:next ?b . ?b ex:next ?c } LIMIT 25",
+]
+
+
+def make_batches(triples: int, batch_size: int = 250):
+    """Turtle updates describing a chain of items in groups"""
+    items = max(1, triples // 4)
+    batches = []
+    for start in range(0, items, batch_size):
+        lines = ["@prefix ex: <http://example.org/bench#> .",
+                 "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> ."]
+        for i in range(start, min(start + batch_size, items)):
+            lines.append(f'ex:item{i} a ex:Item ; rdfs:label "Item {i}" ; '
+                         f'ex:group ex:g{i % 10} ; ex:next ex:item{i + 1} .')
+        batches.append("\n".join(lines))
+    return batches
+
+
+def run_backend(name, backend, batches, rounds, threads):
+    start = time.perf_counter()
+    backend.update_batch(batches)
+    load_s = time.perf_counter() - start
+
+    queries = QUERY_MIX * rounds
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(backend.query, queries))
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backend.query_batch(queries)
+    batch_s = time.perf_counter() - start
+
+    return {
+        "backend": name,
+        "load_ms": round(load_s * 1000, 1),
+        "queries": len(queries),
+        "concurrent_qps": round(len(queries) / single_s, 1),
+        "batch_qps": round(len(queries) / batch_s, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wasm", default="tools/bfg9k_rdf_engine.wasm", help="Compiled engine module")
+    parser.add_argument("--triples", type=int, default=2000, help="Approximate triples loaded")
+    parser.add_argument("--rounds", type=int, default=40, help="Repetitions of the query mix")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent callers")
+    args = parser.parse_args()
+
+    batches = make_batches(args.triples)
+    results = [run_backend("rdflib", LocalRDFBackend(), batches, args.rounds, args.threads)]
+    if os.path.exists(args.wasm):
+        try:
+            wasm = WASMRDFConnector(args.wasm, pool_size=args.threads)
+            results.append(run_backend("wasm", wasm, batches, args.rounds, args.threads))
+        except ImportError as e:
+            print(f"Skipping WASM backend: {e}", file=sys.stderr)
+    else:
+        print(f"Skipping WASM backend: {args.wasm} not built (see tools/build_wasm.sh)", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
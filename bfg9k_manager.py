@@ -9,16 +9,25 @@ from urllib.parse import urlparse
 import io
 from dotenv import load_dotenv
 from requests.auth import HTTPBasicAuth
-from pathlib import Path
 from abc import ABC, abstractmethod
-import wasmtime
-import tempfile
+import ctypes
+import queue
+import threading
+from contextlib import contextmanager
+from ontology_framework.validation.content_validator import ContentValidator
+from ontology_framework.graphdb_batch_writer import UpdateBatchWriter
+from ontology_framework.graphdb_client import GraphDBClient, GraphDBError
 
 # Define namespaces
 GUIDANCE = Namespace("https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#")
 BFG9K = Namespace("https://raw.githubusercontent.com/louspringer/bfg9k/main/bfg9k#")
 SH = Namespace("http://www.w3.org/ns/shacl#")
 
+try:
+    import wasmtime
+except ImportError:
+    wasmtime = None
+
 logger = logging.getLogger(__name__)
 
 load_dotenv()
@@ -41,94 +50,262 @@ class RDFBackend(ABC):
         """Validate RDF data against SHACL constraints."""
         pass
 
-class WASMRDFConnector(RDFBackend):
-    """WASM-based RDF backend implementation."""
+class _WASMInstance:
+    """One instantiated engine with its own Store, cached exports and a reusable argument buffer.
+
+    Calls use the engine's ABI: allocate(len) -> ptr, deallocate(ptr),
+    execute_query/execute_validation(ptr, len) -> result ptr,
+    execute_update(ptr, len) -> bool and get_result_length(ptr) -> len.
+    Engines may also export execute_query_batch/execute_update_batch, which
+    take u32 little-endian length-prefixed UTF-8 records and return a JSON
+    array (queries) or the number of applied updates.
+    """
+    
+    def __init__(self, engine, module):
+        self.store = wasmtime.Store(engine)
+        self.instance = wasmtime.Instance(self.store, module, [])
+        exports = self.instance.exports(self.store)
+        self.memory = exports["memory"]
+        self._allocate = exports["allocate"]
+        self._deallocate = exports["deallocate"]
+        self._result_length = exports["get_result_length"]
+        self.functions = {
+            name: exports[name]
+            for name in ("execute_query", "execute_update", "execute_validation",
+                         "execute_query_batch", "execute_update_batch")
+            if exports.get(name) is not None
+        }
+        self._view = None
+        self._view_len = -1
+        self._arg_ptr = 0
+        self._arg_capacity = 0
+    
+    def _memory_view(self):
+        """memoryview over linear memory, rebuilt only when memory grows"""
+        size = self.memory.data_len(self.store)
+        if size != self._view_len:
+            base = ctypes.cast(self.memory.data_ptr(self.store), ctypes.POINTER(ctypes.c_ubyte * size))
+            self._view = memoryview(base.contents).cast("B")
+            self._view_len = size
+        return self._view
+    
+    def _write_argument(self, data: bytes) -> int:
+        """Copy data into the reusable argument buffer, growing it geometrically"""
+        if len(data) > self._arg_capacity:
+            if self._arg_capacity:
+                self._deallocate(self.store, self._arg_ptr)
+            self._arg_capacity = max(len(data), self._arg_capacity * 2, 4096)
+            self._arg_ptr = self._allocate(self.store, self._arg_capacity)
+        self._memory_view()[self._arg_ptr:self._arg_ptr + len(data)] = data
+        return self._arg_ptr
+    
+    def call(self, name: str, data: bytes) -> int:
+        return self.functions[name](self.store, self._write_argument(data), len(data))
+    
+    def call_json(self, name: str, data: bytes):
+        result_ptr = self.call(name, data)
+        try:
+            result_len = self._result_length(self.store, result_ptr)
+            return json.loads(bytes(self._memory_view()[result_ptr:result_ptr + result_len]))
+        finally:
+            self._deallocate(self.store, result_ptr)
+
+
+def _pack_records(texts) -> bytes:
+    """Length-prefix UTF-8 records for the batch entry points"""
+    out = bytearray()
+    for text in texts:
+        encoded = text.encode('utf-8')
+        out += len(encoded).to_bytes(4, "little")
+        out += encoded
+    return bytes(out)
+
+
+class WASMInstancePool:
+    """Pre-instantiated engine instances sharing one compiled module.
+
+    Each instance holds its own RDF store, so updates are applied to every
+    instance while queries are served by whichever instance is free. An
+    instance that fails an update the others applied no longer matches them
+    and is quarantined: taken out of the pool for good.
+    """
     
-    def __init__(self, wasm_path="tools/bfg9k_rdf_engine.wasm"):
+    def __init__(self, wasm_path="tools/bfg9k_rdf_engine.wasm", size=4):
+        if wasmtime is None:
+            raise ImportError("wasmtime is required for the WASM RDF backend")
         self.engine = wasmtime.Engine()
-        self.store = wasmtime.Store(self.engine)
         self.module = wasmtime.Module.from_file(self.engine, wasm_path)
-        self.instance = wasmtime.Instance(self.store, self.module, [])
-        self.memory = self.instance.exports(self.store)["memory"]
+        self.instances = [_WASMInstance(self.engine, self.module) for _ in range(size)]
+        self.quarantined = []
+        self._idle = queue.Queue()
+        for instance in self.instances:
+            self._idle.put(instance)
+        # Serializes updates so every instance applies them in the same order
+        self._update_lock = threading.Lock()
+    
+    @contextmanager
+    def checkout(self):
+        instance = self._idle.get()
+        try:
+            yield instance
+        finally:
+            self._idle.put(instance)
+    
+    def broadcast(self, fn, succeeded=bool):
+        """Apply fn to every instance and return the result they agree on.
+        
+        When fn fails, by raising or by a result succeeded() rejects, on some
+        instances but not all, those instances are quarantined and the
+        others' result is returned. When it fails everywhere the stores still
+        match; the first exception is re-raised, or the failed result returned.
+        """
+        with self._update_lock:
+            held = [self._idle.get() for _ in self.instances]
+            results, errors, diverged = [], [], []
+            try:
+                for instance in held:
+                    try:
+                        result = fn(instance)
+                    except Exception as e:
+                        errors.append(e)
+                        diverged.append(instance)
+                        continue
+                    results.append(result)
+                    if not succeeded(result):
+                        diverged.append(instance)
+                if len(diverged) < len(held):
+                    self._quarantine(diverged)
+                    results = [r for r in results if succeeded(r)]
+            finally:
+                for instance in held:
+                    if instance not in self.quarantined:
+                        self._idle.put(instance)
+        if not results:
+            raise errors[0]
+        return results[0]
+    
+    def _quarantine(self, instances):
+        """Take instances whose store diverged out of rotation"""
+        if not instances:
+            return
+        for instance in instances:
+            self.instances.remove(instance)
+            self.quarantined.append(instance)
+        logger.error(f"Quarantined {len(instances)} WASM instance(s) that failed an update; "
+                     f"{len(self.instances)} remain in the pool")
+
+
+class WASMRDFConnector(RDFBackend):
+    """WASM-based RDF backend implementation, served from a pool of engine instances."""
+    
+    def __init__(self, wasm_path="tools/bfg9k_rdf_engine.wasm", pool_size=4):
+        self.pool = WASMInstancePool(wasm_path, pool_size)
         
     def query(self, sparql: str) -> dict:
         """Execute SPARQL query using WASM engine."""
         try:
-            # Allocate memory for query string
-            query_bytes = sparql.encode('utf-8')
-            query_ptr = self.instance.exports(self.store)["allocate"](self.store, len(query_bytes))
-            
-            # Write query to WASM memory
-            memory = self.memory.data_ptr(self.store)
-            memory[query_ptr:query_ptr + len(query_bytes)] = query_bytes
-            
-            # Execute query
-            result_ptr = self.instance.exports(self.store)["execute_query"](self.store, query_ptr, len(query_bytes))
-            
-            # Read result from WASM memory
-            result_len = self.instance.exports(self.store)["get_result_length"](self.store, result_ptr)
-            result_bytes = memory[result_ptr:result_ptr + result_len]
-            result = json.loads(result_bytes.tobytes().decode('utf-8'))
-            
-            # Free allocated memory
-            self.instance.exports(self.store)["deallocate"](self.store, query_ptr)
-            self.instance.exports(self.store)["deallocate"](self.store, result_ptr)
-            
-            return result
+            with self.pool.checkout() as instance:
+                return instance.call_json("execute_query", sparql.encode('utf-8'))
         except Exception as e:
             logger.error(f"WASM query execution failed: {e}")
             return {"error": str(e)}
     
+    def query_batch(self, queries) -> list:
+        """Execute several SPARQL queries with one checkout and, when exported, one call."""
+        try:
+            with self.pool.checkout() as instance:
+                if "execute_query_batch" in instance.functions:
+                    return instance.call_json("execute_query_batch", _pack_records(queries))
+                return [instance.call_json("execute_query", q.encode('utf-8')) for q in queries]
+        except Exception as e:
+            logger.error(f"WASM batch query execution failed: {e}")
+            return [{"error": str(e)} for _ in queries]
+    
     def update(self, ttl: str) -> bool:
         """Update RDF store using WASM engine."""
         try:
-            # Allocate memory for TTL string
             ttl_bytes = ttl.encode('utf-8')
-            ttl_ptr = self.instance.exports(self.store)["allocate"](self.store, len(ttl_bytes))
-            
-            # Write TTL to WASM memory
-            memory = self.memory.data_ptr(self.store)
-            memory[ttl_ptr:ttl_ptr + len(ttl_bytes)] = ttl_bytes
-            
-            # Execute update
-            success = self.instance.exports(self.store)["execute_update"](self.store, ttl_ptr, len(ttl_bytes))
+            return bool(self.pool.broadcast(lambda instance: instance.call("execute_update", ttl_bytes)))
+        except Exception as e:
+            logger.error(f"WASM update execution failed: {e}")
+            return False
+    
+    def update_batch(self, ttls) -> bool:
+        """Apply several Turtle updates, crossing into each instance once when supported."""
+        try:
+            packed = _pack_records(ttls)
+            encoded = [ttl.encode('utf-8') for ttl in ttls]
             
-            # Free allocated memory
-            self.instance.exports(self.store)["deallocate"](self.store, ttl_ptr)
+            def apply(instance):
+                if "execute_update_batch" in instance.functions:
+                    return instance.call("execute_update_batch", packed) == len(encoded)
+                return all([bool(instance.call("execute_update", ttl)) for ttl in encoded])
             
-            return bool(success)
+            return bool(self.pool.broadcast(apply))
         except Exception as e:
-            logger.error(f"WASM update execution failed: {e}")
+            logger.error(f"WASM batch update execution failed: {e}")
             return False
     
     def validate(self, ttl: str) -> dict:
         """Validate RDF data using WASM engine."""
         try:
-            # Allocate memory for TTL string
-            ttl_bytes = ttl.encode('utf-8')
-            ttl_ptr = self.instance.exports(self.store)["allocate"](self.store, len(ttl_bytes))
-            
-            # Write TTL to WASM memory
-            memory = self.memory.data_ptr(self.store)
-            memory[ttl_ptr:ttl_ptr + len(ttl_bytes)] = ttl_bytes
-            
-            # Execute validation
-            result_ptr = self.instance.exports(self.store)["execute_validation"](self.store, ttl_ptr, len(ttl_bytes))
-            
-            # Read result from WASM memory
-            result_len = self.instance.exports(self.store)["get_result_length"](self.store, result_ptr)
-            result_bytes = memory[result_ptr:result_ptr + result_len]
-            result = json.loads(result_bytes.tobytes().decode('utf-8'))
-            
-            # Free allocated memory
-            self.instance.exports(self.store)["deallocate"](self.store, ttl_ptr)
-            self.instance.exports(self.store)["deallocate"](self.store, result_ptr)
-            
-            return result
+            with self.pool.checkout() as instance:
+                return instance.call_json("execute_validation", ttl.encode('utf-8'))
         except Exception as e:
             logger.error(f"WASM validation execution failed: {e}")
             return {"error": str(e)}
 
+class LocalRDFBackend(RDFBackend):
+    """In-process rdflib backend, used for local runs and as the benchmark baseline."""
+    
+    def __init__(self):
+        self.graph = Graph()
+        self._lock = threading.Lock()
+    
+    def query(self, sparql: str) -> dict:
+        """Execute SPARQL query against the local graph."""
+        try:
+            with self._lock:
+                results = self.graph.query(sparql)
+                if results.type == "ASK":
+                    return bool(results.askAnswer)
+                if results.type == "SELECT":
+                    return [
+                        {str(var): str(value) for var, value in row.asdict().items()}
+                        for row in results
+                    ]
+                return [f"{s} {p} {o}" for s, p, o in results]
+        except Exception as e:
+            logger.error(f"Local query execution failed: {e}")
+            return {"error": str(e)}
+    
+    def query_batch(self, queries) -> list:
+        return [self.query(q) for q in queries]
+    
+    def update(self, ttl: str) -> bool:
+        """Add Turtle content to the local graph."""
+        try:
+            with self._lock:
+                self.graph.parse(data=ttl, format="turtle")
+            return True
+        except Exception as e:
+            logger.error(f"Local update execution failed: {e}")
+            return False
+    
+    def update_batch(self, ttls) -> bool:
+        return all([self.update(ttl) for ttl in ttls])
+    
+    def validate(self, ttl: str) -> dict:
+        """Validate RDF data using pyshacl."""
+        try:
+            g = Graph()
+            g.parse(data=ttl, format="turtle")
+            conforms, results_graph, results_text = validate(g, inference='rdfs')
+            return {"conforms": conforms, "results": results_text}
+        except Exception as e:
+            logger.error(f"Local validation execution failed: {e}")
+            return {"error": str(e)}
+
 class GraphDBConnector(RDFBackend):
     """GraphDB-based RDF backend implementation."""
     
@@ -170,19 +347,11 @@ class GraphDBConnector(RDFBackend):
     def validate(self, ttl: str) -> dict:
         """Validate RDF data using GraphDB's SHACL validation."""
         try:
-            # Create temporary file for TTL content
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.ttl', delete=False) as temp:
-                temp.write(ttl)
-                temp_path = temp.name
-            
             # Use pyshacl for validation
             g = Graph()
-            g.parse(temp_path, format="turtle")
+            g.parse(data=ttl, format="turtle")
             conforms, results_graph, results_text = validate(g, inference='rdfs')
             
-            # Clean up temporary file
-            os.unlink(temp_path)
-            
             return {
                 "conforms": conforms,
                 "results": results_text
@@ -192,11 +361,14 @@ class GraphDBConnector(RDFBackend):
             return {"error": str(e)}
 
 class BFG9KManager:
-    def __init__(self, config_path="bfg9k_config.ttl", use_wasm=False):
+    def __init__(self, config_path="bfg9k_config.ttl", use_wasm=False, shapes_path=None, validation_workers=None):
         self.use_wasm = use_wasm
+        self._update_writer = None
+        # Resident shapes graph and warm process pool for in-memory validation
+        self.validator = ContentValidator(shapes_path, workers=validation_workers)
         
         if use_wasm:
-            self.backend = WASMRDFConnector()
+            self.backend = WASMRDFConnector(pool_size=int(os.environ.get("BFG9K_WASM_POOL_SIZE", "4")))
         else:
             base_url = os.environ.get("GRAPHDB_URL")
             if base_url:
@@ -223,14 +395,51 @@ class BFG9KManager:
                 os.environ.get("GRAPHDB_PASSWORD")
             )
     
+    @property
+    def update_writer(self):
+        """Batched SPARQL UPDATE writer for the GraphDB backend.
+        
+        It uses the connector's auth, which may be None, and only sends
+        when flushed: by flush_updates(), by a write that asks for it, or
+        before a query.
+        """
+        if self._update_writer is None:
+            client = GraphDBClient(self.base_url, self.repository, auth=self.backend.auth,
+                                   require_credentials=False)
+            self._update_writer = UpdateBatchWriter(client, max_latency=None)
+        return self._update_writer
+    
+    def flush_updates(self):
+        """Send updates queued on update_writer.
+        
+        Returns:
+            True if every queued update was stored; failed ones stay queued
+        """
+        if self._update_writer is None:
+            return True
+        try:
+            self._update_writer.flush()
+            return True
+        except GraphDBError as e:
+            logger.error(f"Failed to store {self._update_writer.pending} queued updates: {e}")
+            return False
+    
     def query_ontology(self, query):
         """Query the ontology using the configured backend."""
+        if self._update_writer is not None and self._update_writer.pending:
+            # Queries see the updates queued before them; a failure is left
+            # for the caller that queued them, via flush_updates()
+            self.flush_updates()
         return self.backend.query(query)
     
     def update_ontology(self, ontology_path):
         """Update ontology using the configured backend."""
         with open(ontology_path, "r") as f:
             ttl_content = f.read()
+        return self.update_ontology_content(ttl_content)
+    
+    def update_ontology_content(self, ttl_content):
+        """Update ontology from Turtle content held in memory."""
         return self.backend.update(ttl_content)
     
     def validate_ontology(self, ontology_path):
@@ -239,49 +448,23 @@ class BFG9KManager:
             ttl_content = f.read()
         return self.backend.validate(ttl_content)
     
-    def validate_ontology_locally(self, ontology_path):
-        """Validate ontology locally using pyshacl and check isomorphism. Also run OWLReady2 reasoning, with auto-correction if needed."""
-        # Load the ontology
-        g = Graph()
-        g.parse(ontology_path, format="turtle")
-
-        # SHACL validation (no shapes graph for now, just basic RDF/OWL checks)
-        conforms, results_graph, results_text = validate(g, inference='rdfs', abort_on_first=False)
-
-        # Isomorphism test: serialize and reload, then compare
-        serialized = g.serialize(format="turtle")
-        g2 = Graph()
-        g2.parse(data=serialized, format="turtle")
-        isomorphic = g.isomorphic(g2)
-
-        # --- OWLReady2 Reasoner Validation (original) ---
-        def try_owlready2(path):
-            try:
-                from owlready2 import get_ontology, sync_reasoner
-                onto = get_ontology(f"file://{str(Path(path).absolute())}").load()
-                with onto:
-                    sync_reasoner()
-                inconsistent = list(onto.inconsistent_classes())
-                return True, [str(icls) for icls in inconsistent]
-            except Exception as e:
-                return False, [str(e)]
-
-        owlready2_consistent, owlready2_inconsistencies = try_owlready2(ontology_path)
-        auto_correction_applied = False
-        correction_summary = ""
-        corrected_owlready2_consistent = None
-        corrected_owlready2_inconsistencies = None
-        corrected_path = None
+    def validate_content(self, ttl_content, check_isomorphism=False, check_owlready2=False):
+        """Validate Turtle content in memory against the resident shapes graph.
 
-        # Remove auto-correction logic: only report errors, do not attempt to fix
-
-        return {
-            "shacl_conforms": conforms,
-            "shacl_results": results_text,
-            "isomorphic": isomorphic,
-            "owlready2_consistent": owlready2_consistent,
-            "owlready2_inconsistencies": owlready2_inconsistencies
-        }
+        Results are cached by content hash; the isomorphism and OWLReady2
+        checks only run when requested.
+        """
+        return self.validator.validate(ttl_content, check_isomorphism, check_owlready2)
+    
+    async def validate_content_async(self, ttl_content, check_isomorphism=False, check_owlready2=False):
+        """Validate Turtle content in the validation process pool, keeping the event loop free."""
+        return await self.validator.validate_async(ttl_content, check_isomorphism, check_owlready2)
+    
+    def validate_ontology_locally(self, ontology_path):
+        """Validate ontology locally using pyshacl and check isomorphism. Also run OWLReady2 reasoning."""
+        with open(ontology_path, "r") as f:
+            ttl_content = f.read()
+        return self.validate_content(ttl_content, check_isomorphism=True, check_owlready2=True)
     
     def get_governance_rules(self):
         """Get governance rules from BFG9K server"""
@@ -296,14 +479,27 @@ class BFG9KManager:
         """
         return self.query_ontology(query)
     
-    def add_governance_rule(self, rule_uri, label, comment):
-        """Add a new governance rule using BFG9K server"""
+    def add_governance_rule(self, rule_uri, label, comment, flush=True):
+        """Add a new governance rule using BFG9K server
+        
+        With the GraphDB backend the rule is queued on update_writer. It is
+        sent straight away unless flush is False, in which case it goes out
+        with later queued updates and flush_updates() reports the outcome.
+        
+        Returns:
+            True if the rule was stored, or queued when flush is False
+        """
+        rule = (f"{URIRef(rule_uri).n3()} a bfg9k:GovernanceRule ;\n"
+                f"    rdfs:label {Literal(label).n3()} ;\n"
+                f"    rdfs:comment {Literal(comment).n3()} .")
+        if isinstance(self.backend, GraphDBConnector):
+            self.update_writer.insert_data(rule, {"bfg9k": str(BFG9K), "rdfs": str(RDFS)})
+            return self.flush_updates() if flush else True
         update = f"""
         PREFIX bfg9k: <https://raw.githubusercontent.com/louspringer/bfg9k/main/bfg9k#>
+        PREFIX rdfs: <{RDFS}>
         INSERT DATA {{
-            <{rule_uri}> a bfg9k:GovernanceRule ;
-                        rdfs:label "{label}" ;
-                        rdfs:comment "{comment}" .
+            {rule}
         }}
         """
         return self.query_ontology(update)
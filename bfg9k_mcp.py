@@ -24,7 +24,6 @@ from monkey_patch import PatchedServerSession
 from fix_prefixes import fix_prefixes
 from turtle_validation import validate_all
 import asyncio
-import tempfile
 import json
 import argparse
 
@@ -96,7 +95,7 @@ logger.info(f"Current working directory: {os.getcwd()}")
 logger.info(f"GRAPHDB_URL: {os.environ.get('GRAPHDB_URL')}")
 config_path = os.path.join(os.path.dirname(__file__), "bfg9k_config.ttl")
 logger.info(f"Config path: {config_path}")
-bfg9k = BFG9KManager(config_path)
+bfg9k = BFG9KManager(config_path, shapes_path=os.environ.get("BFG9K_SHAPES_PATH"))
 logger.info("BFG9KManager instance created successfully")
 
 def get_manager():
@@ -105,8 +104,12 @@ def get_manager():
     return bfg9k
 
 @mcp.tool()
-async def validate_guidance(content: str) -> dict:
-    """Validate content against guidance ontology. Accepts either a filename or raw Turtle content."""
+async def validate_guidance(content: str, check_isomorphism: bool = False, check_owlready2: bool = False) -> dict:
+    """Validate content against guidance ontology. Accepts either a filename or raw Turtle content.
+
+    Content is validated in memory by a warm worker pool; the isomorphism and
+    OWLReady2 checks are optional and cached by content hash.
+    """
     logger.info(f"[validate_guidance] ENTRY: called with content (first 60 chars): {content[:60]}...")
     try:
         # Check if 'content' is a path to an existing file
@@ -118,38 +121,17 @@ async def validate_guidance(content: str) -> dict:
         else:
             turtle_content = content
             logger.debug("[validate_guidance] Treating input as raw Turtle content")
-        temp_file = None
-        try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".ttl", mode="w") as tf:
-                temp_file = tf.name
-                logger.debug(f"[validate_guidance] Writing to temp file: {temp_file}")
-                tf.write(turtle_content)
-            logger.debug(f"[validate_guidance] Wrote content to {temp_file}")
-            result = get_manager().validate_ontology(temp_file)
-            logger.info(f"[validate_guidance] Validation result: {str(result)[:200]}")
-            if not isinstance(result, dict):
-                result = {"raw_result": str(result)}
-            logger.info(f"[validate_guidance] RETURN: {result}")
-            return {
-                "result": result,
-                "shacl_conforms": result.get("shacl_conforms"),
-                "shacl_results": result.get("shacl_results"),
-                "isomorphic": result.get("isomorphic"),
-                "owlready2_consistent": result.get("owlready2_consistent"),
-                "owlready2_inconsistencies": result.get("owlready2_inconsistencies"),
-                "timestamp": datetime.now().isoformat()
-            }
-        except Exception as e:
-            logger.error(f"[validate_guidance] Error during temp file handling: {e}")
-            logger.error(traceback.format_exc())
-            return {"error": str(e), "trace": traceback.format_exc(), "timestamp": datetime.now().isoformat()}
-        finally:
-            if temp_file:
-                try:
-                    os.remove(temp_file)
-                    logger.debug(f"[validate_guidance] Deleted temp file: {temp_file}")
-                except Exception as cleanup_err:
-                    logger.error(f"[validate_guidance] Failed to delete temp file {temp_file}: {cleanup_err}")
+        result = await get_manager().validate_content_async(turtle_content, check_isomorphism, check_owlready2)
+        logger.info(f"[validate_guidance] Validation result: {str(result)[:200]}")
+        return {
+            "result": result,
+            "shacl_conforms": result.get("shacl_conforms"),
+            "shacl_results": result.get("shacl_results"),
+            "isomorphic": result.get("isomorphic"),
+            "owlready2_consistent": result.get("owlready2_consistent"),
+            "owlready2_inconsistencies": result.get("owlready2_inconsistencies"),
+            "timestamp": datetime.now().isoformat()
+        }
     except Exception as e:
         logger.error(f"[validate_guidance] Validation failed: {e}")
         logger.error(traceback.format_exc())
@@ -175,33 +157,13 @@ async def query_guidance(sparql_query: str) -> dict:
 async def update_guidance(content: str) -> dict:
     """Update guidance ontology."""
     logger.info(f"[update_guidance] Called with content (first 60 chars): {content[:60]}...")
-    temp_file = None
     try:
-        try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".ttl", mode="w") as tf:
-                temp_file = tf.name
-                logger.debug(f"[update_guidance] Writing to temp file: {temp_file}")
-                tf.write(content)
-            logger.debug(f"[update_guidance] Wrote content to {temp_file}")
-            with open(temp_file, "r") as f:
-                debug_content = f.read()
-            logger.debug(f"[update_guidance] Content of {temp_file} (first 500 chars): {debug_content[:500]}")
-            result = get_manager().update_ontology(temp_file)
-            logger.info(f"[update_guidance] Update result: {str(result)[:200]}")
-            if not isinstance(result, dict):
-                result = {"raw_result": str(result)}
-            return {"result": result, "timestamp": datetime.now().isoformat()}
-        except Exception as e:
-            logger.error(f"[update_guidance] Error during temp file handling: {e}")
-            logger.error(traceback.format_exc())
-            return {"error": str(e), "trace": traceback.format_exc(), "timestamp": datetime.now().isoformat()}
-        finally:
-            if temp_file:
-                try:
-                    os.remove(temp_file)
-                    logger.debug(f"[update_guidance] Deleted temp file: {temp_file}")
-                except Exception as cleanup_err:
-                    logger.error(f"[update_guidance] Failed to delete temp file {temp_file}: {cleanup_err}")
+        logger.debug(f"[update_guidance] Content (first 500 chars): {content[:500]}")
+        result = await asyncio.to_thread(get_manager().update_ontology_content, content)
+        logger.info(f"[update_guidance] Update result: {str(result)[:200]}")
+        if not isinstance(result, dict):
+            result = {"raw_result": str(result)}
+        return {"result": result, "timestamp": datetime.now().isoformat()}
     except Exception as e:
         logger.error(f"[update_guidance] Update failed: {e}")
         logger.error(traceback.format_exc())
@@ -377,5 +339,8 @@ if __name__ == "__main__":
         else:
             sys.exit(1)
     
+    # Start the validation workers before accepting tool calls
+    bfg9k.validator.warm()
+    
     # Start the MCP server
     mcp.run()
@@ -15,6 +15,45 @@ from pyvis.network import Network
 from rdflib import Graph, URIRef, Namespace, Literal
 from rdflib.namespace import RDF, RDFS, OWL
 import json
+import math
+import collections
+from ontology_framework.visualization.lod_layout import (
+    CLUSTER_MODES,
+    cluster_edges,
+    cluster_node_id,
+    cluster_nodes,
+    multilevel_layout,
+    SHARD_CALLBACK,
+    write_cluster_shards,
+)
+from ontology_framework.visualization.ontology_graph import (
+    DEFAULT_RELATION_TYPES,
+    extract_graph_data,
+    extract_relationships,
+    shorten_uri,
+)
+
+# Define node colors based on type
+NODE_COLORS = {
+    "Class": "#55efc4",      # Mint green
+    "Property": "#74b9ff",   # Soft blue
+    "Ontology": "#ffeaa7",   # Light yellow
+    "Instance": "#ff7675",   # Soft red
+    "Unknown": "#dfe6e9"     # Light gray
+}
+
+# Define edge colors
+EDGE_COLORS = {
+    "subClassOf": "#3742fa",  # Bright blue
+    "imports": "#ff4757",     # Bright red
+    "domain": "#2ed573",      # Bright green
+    "range": "#9c88ff",       # Bright purple
+    "type": "#ffa502",        # Bright orange
+    "seeAlso": "#a5674f"      # Brown
+}
+
+# Canvas units per unit of precomputed layout
+POSITION_SCALE = 1000
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -27,6 +66,14 @@ def parse_arguments():
     parser.add_argument("--height", default="800px", help="Height of the visualization")
     parser.add_argument("--width", default="100%", help="Width of the visualization")
     parser.add_argument("--physics-enabled", action="store_true", default=True, help="Enable physics simulation")
+    parser.add_argument("--no-physics", dest="physics_enabled", action="store_false",
+                        help="Disable physics and use precomputed positions")
+    parser.add_argument("--lod", choices=CLUSTER_MODES,
+                        help="Collapse namespaces or class subtrees into clusters that expand on double-click")
+    parser.add_argument("--max-nodes", type=int, default=2000,
+                        help="Switch to subtree clusters when the graph has more nodes than this")
+    parser.add_argument("--max-cluster-size", type=int, default=500,
+                        help="Split class subtrees larger than this into their subtrees")
     return parser.parse_args()
 
 def load_ontology(file_path, format="turtle"):
@@ -45,208 +92,12 @@ def get_namespace_prefixes(g):
     """Get namespace prefixes from the graph."""
     return {prefix: ns for prefix, ns in g.namespaces()}
 
-def shorten_uri(uri, namespaces):
-    """Shorten URI using namespace prefixes."""
-    for prefix, namespace in namespaces.items():
-        if uri.startswith(str(namespace)):
-            return f"{prefix}:{uri[len(str(namespace)):]}"
-    return uri.split('#')[-1] if '#' in uri else uri.split('/')[-1]
-
 def extract_all_relationships(g, relation_types=None):
-    """Extract all specified relationship types using separate SPARQL queries."""
-    if relation_types is None:
-        relation_types = ["subClassOf", "imports", "domain", "range", "type", "seeAlso"]
-    
-    relationships = {}
-    
-    # Extract subClassOf relationships
-    if "subClassOf" in relation_types:
-        query = """
-        SELECT ?source ?target
-        WHERE {
-            ?source rdfs:subClassOf ?target .
-            FILTER(isURI(?target))
-            FILTER(?target != owl:Thing)
-        }
-        """
-        results = g.query(query)
-        relationships["subClassOf"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    # Extract domain relationships
-    if "domain" in relation_types:
-        query = """
-        SELECT ?property ?domain
-        WHERE {
-            ?property rdfs:domain ?domain .
-        }
-        """
-        results = g.query(query)
-        relationships["domain"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    # Extract range relationships
-    if "range" in relation_types:
-        query = """
-        SELECT ?property ?range
-        WHERE {
-            ?property rdfs:range ?range .
-        }
-        """
-        results = g.query(query)
-        relationships["range"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    # Extract imports relationships
-    if "imports" in relation_types:
-        query = """
-        SELECT ?ontology ?imported
-        WHERE {
-            ?ontology owl:imports ?imported .
-        }
-        """
-        results = g.query(query)
-        relationships["imports"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    # Extract type relationships
-    if "type" in relation_types:
-        query = """
-        SELECT ?instance ?class
-        WHERE {
-            ?instance rdf:type ?class .
-            FILTER(isURI(?class))
-        }
-        """
-        results = g.query(query)
-        relationships["type"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    # Extract seeAlso relationships
-    if "seeAlso" in relation_types:
-        query = """
-        SELECT ?source ?target
-        WHERE {
-            ?source rdfs:seeAlso ?target .
-        }
-        """
-        results = g.query(query)
-        relationships["seeAlso"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    return relationships
-
-def get_node_type(node, relationships):
-    """Determine node type based on its relationships."""
-    # Check if it's a class
-    for _, target in relationships.get("subClassOf", []):
-        if node == target:
-            return "Class"
-    
-    # Check if it's a property
-    for source, _ in relationships.get("domain", []) + relationships.get("range", []):
-        if node == source:
-            return "Property"
-    
-    # Check if it's an ontology
-    for source, _ in relationships.get("imports", []):
-        if node == source:
-            return "Ontology"
-    
-    # Default to instance if it has a type relationship
-    for source, _ in relationships.get("type", []):
-        if node == source:
-            return "Instance"
-    
-    return "Unknown"
+    """Extract all specified relationship types from the graph's predicate index."""
+    return extract_relationships(g, relation_types or DEFAULT_RELATION_TYPES)
 
-def create_interactive_graph(relationships, namespaces, height="800px", width="100%", physics_enabled=True):
-    """Create an interactive network visualization."""
-    # Create a networkx graph from relationships
-    G = nx.DiGraph()
-    
-    # Define node colors based on type
-    node_colors = {
-        "Class": "#55efc4",      # Mint green
-        "Property": "#74b9ff",   # Soft blue
-        "Ontology": "#ffeaa7",   # Light yellow
-        "Instance": "#ff7675",   # Soft red
-        "Unknown": "#dfe6e9"     # Light gray
-    }
-    
-    # Define edge colors
-    edge_colors = {
-        "subClassOf": "#3742fa",  # Bright blue
-        "imports": "#ff4757",     # Bright red
-        "domain": "#2ed573",      # Bright green
-        "range": "#9c88ff",       # Bright purple
-        "type": "#ffa502",        # Bright orange
-        "seeAlso": "#a5674f"      # Brown
-    }
-    
-    # Add edges to the graph with relationship types
-    for rel_type, edges in relationships.items():
-        for source, target in edges:
-            G.add_edge(source, target, title=rel_type)
-    
-    # Get node types
-    node_types = {node: get_node_type(node, relationships) for node in G.nodes()}
-    
-    # Calculate node connectivity for sizing
-    connectivity = {}
-    for node in G.nodes():
-        neighbors = set(G.successors(node)) | set(G.predecessors(node))
-        connectivity[node] = len(neighbors)
-    
-    # Get max connectivity for scaling
-    max_conn = max(connectivity.values()) if connectivity else 1
-    
-    # Create PyVis network
-    net = Network(height=height, width=width, directed=True, notebook=False)
-    
-    # Set physics options for interactive adjustment
-    physics_options = {
-        "enabled": physics_enabled,
-        "solver": "forceAtlas2Based",
-        "forceAtlas2Based": {
-            "gravitationalConstant": -50,
-            "centralGravity": 0.01,
-            "springLength": 100,
-            "springConstant": 0.08,
-            "damping": 0.4,
-            "avoidOverlap": 0.5
-        },
-        "minVelocity": 0.75,
-        "maxVelocity": 50,
-        "stabilization": {
-            "enabled": True,
-            "iterations": 1000,
-            "updateInterval": 100,
-            "onlyDynamicEdges": False,
-            "fit": True
-        }
-    }
-    
-    # Add nodes with properties
-    for node in G.nodes():
-        node_type = node_types.get(node, "Unknown")
-        color = node_colors.get(node_type, "#dfe6e9")
-        
-        # Scale node size based on connectivity (min 10, max 50)
-        size = 10 + (connectivity.get(node, 1) / max_conn) * 40
-        
-        # Create readable label
-        label = shorten_uri(node, namespaces)
-        
-        # Create tooltip with more information
-        title = f"{node_type}: {label}<br>{node}"
-        
-        # Add the node
-        net.add_node(node, label=label, title=title, color=color, size=size)
-    
-    # Add edges with properties
-    for source, target, data in G.edges(data=True):
-        rel_type = data.get('title', 'Unknown')
-        color = edge_colors.get(rel_type, "#7f8c8d")
-        
-        # Add the edge
-        net.add_edge(source, target, title=rel_type, color=color, arrows={'to': {'enabled': True}})
-    
-    # Configure visualization options
+def configure_network(net, physics_options):
+    """Apply the shared vis.js display options with the given physics settings."""
     net.set_options("""
     const options = {
         "nodes": {
@@ -288,8 +139,9 @@ def create_interactive_graph(relationships, namespaces, height="800px", width="1
         "physics": %s
     }
     """ % json.dumps(physics_options))
-    
-    # Add a legend
+
+def build_legend(relationships):
+    """HTML legend of node types and the relationship types present."""
     legend_html = """
     <div style="position: absolute; top: 10px; right: 10px; padding: 10px; 
                 background-color: rgba(255, 255, 255, 0.8); border-radius: 5px; 
@@ -299,7 +151,7 @@ def create_interactive_graph(relationships, namespaces, height="800px", width="1
         <ul style="padding-left: 20px; margin-bottom: 10px;">
     """
     
-    for node_type, color in node_colors.items():
+    for node_type, color in NODE_COLORS.items():
         legend_html += f'<li><span style="display:inline-block; width:12px; height:12px; background:{color}; margin-right:5px;"></span>{node_type}</li>'
     
     legend_html += """
@@ -308,7 +160,7 @@ def create_interactive_graph(relationships, namespaces, height="800px", width="1
         <ul style="padding-left: 20px; margin-bottom: 5px;">
     """
     
-    for rel_type, color in edge_colors.items():
+    for rel_type, color in EDGE_COLORS.items():
         if rel_type in relationships and relationships[rel_type]:
             legend_html += f'<li><span style="display:inline-block; width:12px; height:12px; background:{color}; margin-right:5px;"></span>{rel_type}</li>'
     
@@ -316,6 +168,88 @@ def create_interactive_graph(relationships, namespaces, height="800px", width="1
         </ul>
     </div>
     """
+    return legend_html
+
+def create_interactive_graph(data, namespaces, height="800px", width="100%", physics_enabled=True):
+    """Create an interactive network visualization."""
+    relationships = data.edges
+    
+    # Create a networkx graph from relationships
+    G = nx.DiGraph()
+    
+    # Add edges to the graph with relationship types
+    for rel_type, edges in relationships.items():
+        G.add_edges_from(edges, title=rel_type)
+    
+    # Node types and connectivity come precomputed with the edges
+    node_types = data.node_types
+    connectivity = data.degree
+    max_conn = data.max_degree
+    
+    # Without physics, place nodes up front
+    positions = {}
+    if not physics_enabled:
+        positions, _ = multilevel_layout(G.edges(), cluster_nodes(data, "namespace"))
+    
+    # Create PyVis network
+    net = Network(height=height, width=width, directed=True, notebook=False)
+    
+    # Set physics options for interactive adjustment
+    physics_options = {
+        "enabled": physics_enabled,
+        "solver": "forceAtlas2Based",
+        "forceAtlas2Based": {
+            "gravitationalConstant": -50,
+            "centralGravity": 0.01,
+            "springLength": 100,
+            "springConstant": 0.08,
+            "damping": 0.4,
+            "avoidOverlap": 0.5
+        },
+        "minVelocity": 0.75,
+        "maxVelocity": 50,
+        "stabilization": {
+            "enabled": True,
+            "iterations": 1000,
+            "updateInterval": 100,
+            "onlyDynamicEdges": False,
+            "fit": True
+        }
+    }
+    
+    # Add nodes with properties
+    for node in G.nodes():
+        node_type = node_types.get(node, "Unknown")
+        color = NODE_COLORS.get(node_type, "#dfe6e9")
+        
+        # Scale node size based on connectivity (min 10, max 50)
+        size = 10 + (connectivity.get(node, 1) / max_conn) * 40
+        
+        # Create readable label
+        label = shorten_uri(node, namespaces)
+        
+        # Create tooltip with more information
+        title = f"{node_type}: {label}<br>{node}"
+        
+        # Add the node
+        if node in positions:
+            x, y = positions[node]
+            net.add_node(node, label=label, title=title, color=color, size=size,
+                         x=x * POSITION_SCALE, y=y * POSITION_SCALE)
+        else:
+            net.add_node(node, label=label, title=title, color=color, size=size)
+    
+    # Add edges with properties
+    for source, target, data in G.edges(data=True):
+        rel_type = data.get('title', 'Unknown')
+        color = EDGE_COLORS.get(rel_type, "#7f8c8d")
+        
+        # Add the edge
+        net.add_edge(source, target, title=rel_type, color=color, arrows={'to': {'enabled': True}})
+    
+    configure_network(net, physics_options)
+    
+    legend_html = build_legend(relationships)
     
     # Add controls for adjusting physics parameters
     physics_controls = """
@@ -453,6 +387,121 @@ def create_interactive_graph(relationships, namespaces, height="800px", width="1
     # Return the configured network and HTML additions
     return net, legend_html + physics_controls
 
+def create_clustered_graph(data, namespaces, shard_dir, by="subtree", max_cluster_size=500,
+                           height="800px", width="100%"):
+    """Create a level-of-detail view: one node per cluster, expanded on double-click.
+    
+    Positions are precomputed and physics is off. Each cluster's members are
+    written to a shard script in shard_dir, which the page loads with a
+    <script> tag when the cluster is expanded, so it also works from file://.
+    """
+    shard_dir = Path(shard_dir)
+    relationships = data.edges
+    groups = cluster_nodes(data, by, max_cluster_size)
+    membership = {node: group for group, members in groups.items() for node in members}
+    all_edges = [edge for edges in relationships.values() for edge in edges]
+    positions, centres = multilevel_layout(all_edges, groups)
+    labels = {node: shorten_uri(node, namespaces) for node in data.degree}
+    shard_files = write_cluster_shards(shard_dir, data, groups, positions, labels,
+                                       NODE_COLORS, EDGE_COLORS, POSITION_SCALE)
+    
+    net = Network(height=height, width=width, directed=True, notebook=False)
+    configure_network(net, {"enabled": False})
+    
+    # One node per cluster, coloured by its most common member type
+    largest = max(len(members) for members in groups.values())
+    for group, members in groups.items():
+        node_type = collections.Counter(data.node_types[node] for node in members).most_common(1)[0][0]
+        label = f"{shorten_uri(group.rstrip('#/'), namespaces) or group} ({len(members)})"
+        x, y = centres[group]
+        net.add_node(cluster_node_id(group), label=label, shape="dot",
+                     title=f"{len(members)} nodes in {group}<br>Double-click to expand",
+                     color=NODE_COLORS.get(node_type, "#dfe6e9"),
+                     size=15 + 45 * math.sqrt(len(members) / largest),
+                     x=x * POSITION_SCALE, y=y * POSITION_SCALE, physics=False)
+    
+    # Aggregate edges between clusters, thicker for more underlying edges
+    for (source, target), counts in cluster_edges(relationships, membership).items():
+        rel_type, _ = counts.most_common(1)[0]
+        title = ", ".join(f"{rel}: {count}" for rel, count in counts.most_common())
+        net.add_edge(cluster_node_id(source), cluster_node_id(target), title=title,
+                     color=EDGE_COLORS.get(rel_type, "#7f8c8d"),
+                     width=1 + math.log(sum(counts.values())), arrows={'to': {'enabled': True}})
+    
+    shards = {cluster_node_id(group): f"{shard_dir.name}/{name}" for group, name in shard_files.items()}
+    expand_script = """
+    <script>
+        var clusterShards = %s;
+        // Cluster id -> "loading" or "expanded"
+        var clusterState = {};
+        var loadedShards = {};
+        
+        // Called by each shard script
+        function %s(shard) {
+            loadedShards[shard.cluster] = shard;
+        }
+        
+        function isExpanded(clusterId) {
+            return clusterState[clusterId] === "expanded";
+        }
+        
+        // fetch() is blocked for file:// pages, so shards are scripts
+        function loadShard(clusterId, onLoad, onError) {
+            var script = document.createElement("script");
+            script.src = clusterShards[clusterId];
+            script.onload = function() {
+                script.remove();
+                if (loadedShards[clusterId]) onLoad(loadedShards[clusterId]);
+                else onError(new Error("Shard " + script.src + " did not register " + clusterId));
+            };
+            script.onerror = function() {
+                script.remove();
+                onError(new Error("Could not load shard " + script.src));
+            };
+            document.head.appendChild(script);
+        }
+        
+        // Replace a cluster node with its members and rewire its edges both ways
+        function expandCluster(clusterId) {
+            if (!clusterShards[clusterId] || clusterState[clusterId]) return;
+            clusterState[clusterId] = "loading";
+            loadShard(clusterId, function(shard) {
+                // Aggregate edges, and member edges parked on the cluster node
+                edges.remove(network.getConnectedEdges(clusterId));
+                nodes.remove(clusterId);
+                nodes.add(shard.nodes);
+                clusterState[clusterId] = "expanded";
+                var outgoing = shard.edges.map(function(edge) {
+                    if (edge.toCluster && !isExpanded(edge.toCluster)) {
+                        return Object.assign({}, edge, {to: edge.toCluster});
+                    }
+                    return edge;
+                });
+                var incoming = shard.incoming.map(function(edge) {
+                    if (!isExpanded(edge.fromCluster)) {
+                        return Object.assign({}, edge, {from: edge.fromCluster});
+                    }
+                    return edge;
+                });
+                edges.add(outgoing.concat(incoming));
+            }, function(error) {
+                // Allow another attempt
+                delete clusterState[clusterId];
+                console.error(error);
+                alert("Could not expand cluster: " + error.message);
+            });
+        }
+        
+        setTimeout(function() {
+            network.on("doubleClick", function(params) {
+                if (params.nodes.length) expandCluster(params.nodes[0]);
+            });
+        }, 1000);
+    </script>
+    """ % (json.dumps(shards), SHARD_CALLBACK)
+    
+    return net, build_legend(relationships) + expand_script
+
 def save_interactive_graph(net, html_additions, output_file):
     """Save the interactive graph to an HTML file with custom additions."""
     # Generate the HTML
@@ -483,7 +532,8 @@ def main():
     namespaces = get_namespace_prefixes(g)
     
     # Extract relationships
-    relationships = extract_all_relationships(g, args.relation_types)
+    data = extract_graph_data(g, args.relation_types)
+    relationships = data.edges
     
     if not any(relationships.values()):
         print("No relationships found matching the specified criteria")
@@ -495,11 +545,24 @@ def main():
         if edges:
             print(f"  {rel_type}: {len(edges)} relationships")
     
+    # Large graphs get a level-of-detail view
+    lod = args.lod
+    if lod is None and len(data.degree) > args.max_nodes:
+        print(f"{len(data.degree)} nodes exceed --max-nodes {args.max_nodes}; clustering by subtree")
+        lod = "subtree"
+    
     # Create interactive network
-    net, html_additions = create_interactive_graph(relationships, namespaces, 
-                                                 height=args.height, 
-                                                 width=args.width,
-                                                 physics_enabled=args.physics_enabled)
+    if lod:
+        output = Path(args.output)
+        shard_dir = output.with_name(f"{output.stem}_clusters")
+        net, html_additions = create_clustered_graph(data, namespaces, shard_dir, by=lod,
+                                                     max_cluster_size=args.max_cluster_size,
+                                                     height=args.height, width=args.width)
+    else:
+        net, html_additions = create_interactive_graph(data, namespaces, 
+                                                     height=args.height, 
+                                                     width=args.width,
+                                                     physics_enabled=args.physics_enabled)
     
     # Save the interactive graph
     save_interactive_graph(net, html_additions, args.output)
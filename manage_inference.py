@@ -15,9 +15,8 @@ import argparse
 import logging
 import os
 import sys
-import tempfile
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Iterator, Union
 
 import requests
 from rdflib import Graph
@@ -41,6 +40,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Explicit and inferred statement counts in one query, via GraphDB's pseudo-graphs
+STATEMENT_COUNTS_QUERY = """
+PREFIX onto: <http://www.ontotext.com/>
+SELECT ?explicit ?implicit WHERE {
+    { SELECT (COUNT(*) AS ?explicit) WHERE { GRAPH onto:explicit { ?s ?p ?o } } }
+    { SELECT (COUNT(*) AS ?implicit) WHERE { GRAPH onto:implicit { ?s ?p ?o } } }
+}
+"""
+
+# Reload format: N-Quads keeps named graphs, and one request keeps blank node labels matching
+RELOAD_FORMAT = "application/n-quads"
+
+# Export media types by file suffix; anything else is exported as Turtle
+EXPORT_FORMATS = {
+    ".nt": "application/n-triples",
+    ".nq": "application/n-quads",
+    ".trig": "application/trig",
+    ".rdf": "application/rdf+xml",
+    ".owl": "application/rdf+xml",
+    ".jsonld": "application/ld+json",
+}
+
 
 class InferenceManager:
     """Manager for GraphDB inference operations."""
@@ -160,102 +181,77 @@ class InferenceManager:
             return True
     
     def clear_inferred_statements(self) -> bool:
-        """Clear only inferred statements from the repository.
+        """Clear inferred statements by reloading only the explicit ones.
         
-        This is done by:
-        1. Backing up explicit statements 
-        2. Clearing the repository
-        3. Restoring only explicit statements
+        Explicit statements are streamed as N-Quads (infer=false) straight
+        into a transaction that first clears the repository, as one chunked
+        ADD request, so named graphs are kept and nothing is buffered in
+        memory or written to disk. Readers see the old contents until the
+        commit. The ruleset is left alone; inferred statements are rebuilt
+        from it and the explicit data on commit, so stale inferences are
+        dropped. Disable inference first to be left with explicit statements
+        only.
         
         Returns:
             Success status
         """
+        logger.info(f"Clearing inferred statements from repository '{self.repository}'")
+        tx_id = None
         try:
-            logger.info(f"Clearing inferred statements from repository '{self.repository}'")
+            tx_id = self.client.start_transaction()
+            if not self.client.update_in_transaction(tx_id, "CLEAR ALL"):
+                raise GraphDBError("CLEAR ALL was rejected")
             
-            # 1. First, disable inference to avoid materialization during operations
-            previous_ruleset = self.disable_inference()
+            received = 0
             
-            # 2. Export explicit statements to a temporary file
-            with tempfile.NamedTemporaryFile(suffix=".ttl", delete=False) as temp_file:
-                temp_path = temp_file.name
-                
-            # Get explicit statements
-            response = requests.get(
-                f"{self.graphdb_url}/repositories/{self.repository}/statements",
-                headers={"Accept": "text/turtle"}
-            )
-            response.raise_for_status()
-            
-            # Save to temp file
-            with open(temp_path, "wb") as f:
-                f.write(response.content)
-                
-            logger.info(f"Exported explicit statements to {temp_path}")
-            
-            # 3. Clear the repository
-            self.client.update("CLEAR ALL")
-            logger.info("Cleared all statements from repository")
-            
-            # 4. Reload the explicit statements
-            with open(temp_path, "rb") as f:
-                response = requests.post(
-                    f"{self.graphdb_url}/repositories/{self.repository}/statements",
-                    data=f,
-                    headers={"Content-Type": "text/turtle"}
-                )
-                response.raise_for_status()
-                
-            logger.info("Restored explicit statements")
+            def statements() -> Iterator[bytes]:
+                nonlocal received
+                for chunk in self.client.iter_statements(infer=False, content_type=RELOAD_FORMAT):
+                    received += len(chunk)
+                    yield chunk
             
-            # 5. Re-enable inference if it was previously enabled
-            if previous_ruleset != "empty":
-                self.enable_inference(previous_ruleset)
-                
-            # 6. Clean up
-            try:
-                os.unlink(temp_path)
-            except OSError:
-                pass
-                
+            if not self.client.add_to_transaction(tx_id, statements(), RELOAD_FORMAT):
+                raise GraphDBError("Reload was rejected")
+            if not self.client.commit_transaction(tx_id):
+                raise GraphDBError("Commit was rejected")
+            tx_id = None
+            logger.info(f"Reloaded {received} bytes of explicit statements")
             return True
         except Exception as e:
             logger.error(f"Failed to clear inferred statements: {e}")
+            if tx_id is not None:
+                try:
+                    self.client.rollback_transaction(tx_id)
+                except GraphDBError as rollback_error:
+                    logger.error(f"Rollback failed: {rollback_error}")
             return False
     
     def separate_inferred_explicit(self) -> dict:
         """Get counts of explicit vs. inferred triples.
         
+        Both counts come from one query over GraphDB's explicit and implicit
+        pseudo-graphs, so inference stays enabled.
+        
         Returns:
             Dictionary with counts
         """
         try:
-            # Get current ruleset
             current_ruleset = self.get_current_ruleset()
             
-            # Count all statements with inference
-            all_count = self.client.count_triples()
+            result = self.client.query(STATEMENT_COUNTS_QUERY)
+            row = result["results"]["bindings"][0]
+            explicit_count = int(row["explicit"]["value"])
+            inferred_count = int(row["implicit"]["value"])
             
-            # Disable inference and count explicit statements
-            self.disable_inference()
-            explicit_count = self.client.count_triples()
-            
-            # Calculate inferred statements
-            inferred_count = all_count - explicit_count
-            
-            # Restore previous ruleset
-            if current_ruleset != "empty":
-                self.enable_inference(current_ruleset)
-                
-            result = {
-                "total": all_count,
+            counts = {
+                "total": explicit_count + inferred_count,
                 "explicit": explicit_count,
                 "inferred": inferred_count,
                 "ruleset": current_ruleset
             }
             
-            logger.info(f"Statement counts: {result}")
-            return result
+            logger.info(f"Statement counts: {counts}")
+            return counts
         except Exception as e:
             logger.error(f"Failed to separate statements: {e}")
             raise
@@ -263,6 +259,9 @@ class InferenceManager:
     def export_without_inference(self, output_file: Union[str, Path]) -> bool:
         """Export repository data without materialized inference.
         
+        Explicit statements are streamed to the file as they arrive, in the
+        format given by its suffix (Turtle unless listed in EXPORT_FORMATS).
+        
         Args:
             output_file: Path to save the exported data
             
@@ -271,28 +270,13 @@ class InferenceManager:
         """
         try:
             output_file = Path(output_file)
+            content_type = EXPORT_FORMATS.get(output_file.suffix.lower(), "text/turtle")
             
-            # Get current ruleset
-            current_ruleset = self.get_current_ruleset()
-            
-            # Temporarily disable inference
-            self.disable_inference()
-            
-            # Export data
             with open(output_file, "wb") as f:
-                response = requests.get(
-                    f"{self.graphdb_url}/repositories/{self.repository}/statements",
-                    headers={"Accept": "text/turtle"}
-                )
-                response.raise_for_status()
-                f.write(response.content)
+                for chunk in self.client.iter_statements(infer=False, content_type=content_type):
+                    f.write(chunk)
                 
             logger.info(f"Exported repository data without inference to {output_file}")
-            
-            # Restore previous ruleset
-            if current_ruleset != "empty":
-                self.enable_inference(current_ruleset)
-                
             return True
         except Exception as e:
             logger.error(f"Failed to export repository: {e}")
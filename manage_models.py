@@ -1,3 +1,4 @@
+import atexit
 import os
 import sys
 from datetime import datetime
@@ -5,6 +6,20 @@ import oracledb
 from pathlib import Path
 import uuid
 
+try:
+    from src.ontology_framework.core.session_change_log import SessionChangeLog
+except ImportError:
+    from ontology_framework.core.session_change_log import SessionChangeLog
+
+# Local change logs, one per session model
+SESSION_LOG_DIR = Path('.sessions')
+# Pending changes written to the session table per INSERT batch
+FLUSH_BATCH_SIZE = 500
+
+_change_logs = {}
+# Session table of each open change log, for flushes outside the current session
+_session_tables = {}
+
 def get_connection():
     """Get Oracle database connection."""
     return oracledb.connect(
@@ -62,6 +77,8 @@ def create_session_model():
                 PRIMARY KEY (id)
             )
         """)
+        # Session inserts check for rows already stored under a change id
+        cur.execute(f"CREATE INDEX {session_table}_CHANGE_IDX ON {session_table} (change_id)")
         
         # Grant necessary privileges
         print("Granting privileges...")
@@ -81,53 +98,21 @@ def create_session_model():
         """, [session_model, session_table])
         
         # Add session metadata with enhanced tracking
-        change_id = str(uuid.uuid4())
-        
-        # Add session type
         print("Adding session metadata...")
-        cur.execute(f"""
-            INSERT INTO {session_table} (
-                triple, change_id, change_type, guidance_ref, change_comment
-            ) VALUES (
-                SDO_RDF_TRIPLE_S('{session_model}',
-                    '<{session_model}>',
-                    '<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>',
-                    '<http://ontologies.louspringer.com/meta#Session>'
-                ),
-                :1, 'SESSION_CREATE', 'guidance.ttl#SessionCreation',
-                'Session initialization'
-            )
-        """, [change_id])
-        
-        # Add session label
-        cur.execute(f"""
-            INSERT INTO {session_table} (
-                triple, change_id, change_type, guidance_ref, change_comment
-            ) VALUES (
-                SDO_RDF_TRIPLE_S('{session_model}',
-                    '<{session_model}>',
-                    '<http://www.w3.org/2000/01/rdf-schema#label>',
-                    '"Active development session"'
-                ),
-                :1, 'SESSION_CREATE', 'guidance.ttl#SessionCreation',
-                'Session initialization'
-            )
-        """, [change_id])
-        
-        # Add session start time
-        cur.execute(f"""
-            INSERT INTO {session_table} (
-                triple, change_id, change_type, guidance_ref, change_comment
-            ) VALUES (
-                SDO_RDF_TRIPLE_S('{session_model}',
-                    '<{session_model}>',
-                    '<http://ontologies.louspringer.com/meta#startTime>',
-                    '"{timestamp}"'
-                ),
-                :1, 'SESSION_CREATE', 'guidance.ttl#SessionCreation',
-                'Session initialization'
-            )
-        """, [change_id])
+        # New table, so there are no earlier rows to load into the log
+        change_log = get_change_log(session_model, None)
+        _session_tables[session_model] = session_table
+        change_id = str(uuid.uuid4())
+        for predicate, obj in [
+            ('<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>', '<http://ontologies.louspringer.com/meta#Session>'),
+            ('<http://www.w3.org/2000/01/rdf-schema#label>', '"Active development session"'),
+            ('<http://ontologies.louspringer.com/meta#startTime>', f'"{timestamp}"'),
+        ]:
+            change_log.record(f'<{session_model}>', predicate, obj, change_type='SESSION_CREATE',
+                              guidance_ref='guidance.ttl#SessionCreation',
+                              comment='Session initialization', change_id=change_id)
+        change_log.flush(lambda batch: _insert_changes(cur, session_model, session_table, batch),
+                         FLUSH_BATCH_SIZE)
         
         conn.commit()
         print(f"\nSuccessfully created session model {session_model}")
@@ -157,9 +142,130 @@ def get_current_session():
     
     return lines[0], lines[1]
 
+def _insert_changes(cur, session_model, session_table, changes):
+    """Insert a batch of session changes with one executemany.
+    
+    Rows already in the table are skipped, so a batch that was stored just
+    before a crash, but not yet marked flushed in the log, can be sent again.
+    A change id groups several triples, so the triple is part of the key.
+    """
+    cur.executemany(f"""
+        INSERT INTO {session_table} (
+            triple, timestamp, change_id, change_type, guidance_ref, change_comment
+        )
+        SELECT SDO_RDF_TRIPLE_S(:model, :subject, :predicate, :object),
+               :ts, :change_id, :change_type, :guidance_ref, :change_comment
+        FROM dual
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {session_table} s
+            WHERE s.change_id = :change_id
+              AND s.triple.GET_SUBJECT() = :subject
+              AND s.triple.GET_PROPERTY() = :predicate
+              AND DBMS_LOB.COMPARE(s.triple.GET_OBJECT(), TO_CLOB(:object)) = 0
+        )
+    """, [{"model": session_model, "subject": c.subject, "predicate": c.predicate,
+           "object": c.object, "ts": datetime.fromisoformat(c.timestamp),
+           "change_id": c.change_id, "change_type": c.change_type,
+           "guidance_ref": c.guidance_ref, "change_comment": c.comment} for c in changes])
+    cur.connection.commit()
+
+def _load_session_rows(change_log, session_model, session_table):
+    """Seed an empty change log from a session table written before logs existed."""
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"""
+            SELECT s.triple.GET_SUBJECT(), 
+                   s.triple.GET_PROPERTY(),
+                   s.triple.GET_OBJECT(),
+                   s.timestamp,
+                   s.change_id,
+                   s.change_type,
+                   s.guidance_ref,
+                   s.change_comment
+            FROM {session_table} s
+            ORDER BY s.timestamp
+        """)
+        for row in cur:
+            change_log.record(row[0], row[1], row[2], change_type=row[5], guidance_ref=row[6],
+                              comment=row[7], change_id=row[4] or str(uuid.uuid4()),
+                              timestamp=row[3].isoformat())
+        # These rows are already in the store
+        change_log.flush(lambda batch: None, FLUSH_BATCH_SIZE)
+    finally:
+        cur.close()
+        conn.close()
+
+def get_change_log(session_model, session_table):
+    """Get the local change log for a session, opening it once per process.
+    
+    Changes are recorded in the log and indexed in memory; they reach the
+    session table in batches through flush_session().
+    """
+    change_log = _change_logs.get(session_model)
+    if change_log is None:
+        path = SESSION_LOG_DIR / f"{session_model}.jsonl"
+        is_new = not path.exists()
+        change_log = SessionChangeLog(path)
+        _change_logs[session_model] = change_log
+        _session_tables[session_model] = session_table
+        if is_new and session_table:
+            _load_session_rows(change_log, session_model, session_table)
+    return change_log
+
+def flush_session():
+    """Write the current session's pending changes to its table in batches.
+    
+    Returns:
+        Number of changes written, or None if there is no active session
+    """
+    session_model, session_table = get_current_session()
+    if not session_model:
+        print("No active session found")
+        return None
+    
+    change_log = get_change_log(session_model, session_table)
+    return _flush_change_log(change_log, session_model, session_table)
+
+def _flush_change_log(change_log, session_model, session_table):
+    """Write one change log's pending changes to its session table in batches."""
+    if not change_log.pending:
+        return 0
+    
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        flushed = change_log.flush(lambda batch: _insert_changes(cur, session_model, session_table, batch),
+                                   FLUSH_BATCH_SIZE)
+        print(f"Flushed {flushed} changes to session {session_model}")
+        return flushed
+    except Exception as e:
+        print(f"Error flushing session: {e}")
+        conn.rollback()
+        return None
+    finally:
+        cur.close()
+        conn.close()
+
+def _flush_at_exit():
+    for session_model, change_log in _change_logs.items():
+        session_table = _session_tables.get(session_model)
+        if change_log.pending and session_table:
+            try:
+                _flush_change_log(change_log, session_model, session_table)
+            except Exception as e:
+                print(f"Error flushing session {session_model}: {e}")
+        change_log.close()
+
+atexit.register(_flush_at_exit)
+
 def add_to_session(subject, predicate, object_val, change_type=None, guidance_ref=None, comment=None):
     """Add a triple to the current session with change tracking.
     
+    The change is appended to the session's local change log straight away
+    and written to the session table once FLUSH_BATCH_SIZE changes are
+    pending, or at exit.
+    
     Args:
         subject: RDF subject
         predicate: RDF predicate
@@ -173,30 +279,18 @@ def add_to_session(subject, predicate, object_val, change_type=None, guidance_re
         print("No active session found")
         return False
     
-    conn = get_connection()
-    cur = conn.cursor()
-    
     try:
-        change_id = str(uuid.uuid4())
-        cur.execute(f"""
-            INSERT INTO {session_table} (
-                triple, change_id, change_type, guidance_ref, change_comment
-            ) VALUES (
-                SDO_RDF_TRIPLE_S(:1, :2, :3, :4),
-                :5, :6, :7, :8
-            )
-        """, [session_model, subject, predicate, object_val, 
-              change_id, change_type, guidance_ref, comment])
-        conn.commit()
-        print(f"Added triple to session {session_model}")
-        return True
+        change_log = get_change_log(session_model, session_table)
+        change_log.record(subject, predicate, object_val, change_type=change_type,
+                          guidance_ref=guidance_ref, comment=comment)
     except Exception as e:
         print(f"Error adding to session: {e}")
-        conn.rollback()
         return False
-    finally:
-        cur.close()
-        conn.close()
+    
+    if len(change_log.pending) >= FLUSH_BATCH_SIZE:
+        flush_session()
+    print(f"Added triple to session {session_model}")
+    return True
 
 def show_session_contents(show_changes=True):
     """Show the contents of the current session.
@@ -209,119 +303,60 @@ def show_session_contents(show_changes=True):
         print("No active session found")
         return
     
-    conn = get_connection()
-    cur = conn.cursor()
-    
     print(f"\n=== Current Session: {session_model} ===")
     try:
-        if show_changes:
-            cur.execute(f"""
-                SELECT s.triple.GET_SUBJECT(), 
-                       s.triple.GET_PROPERTY(),
-                       s.triple.GET_OBJECT(),
-                       s.timestamp,
-                       s.change_id,
-                       s.change_type,
-                       s.guidance_ref,
-                       s.change_comment
-                FROM {session_table} s
-                ORDER BY s.timestamp
-            """)
-            
-            rows = cur.fetchall()
-            if not rows:
-                print("Session is empty")
-            else:
-                current_change = None
-                for row in rows:
-                    if current_change != row[4]:  # New change_id
-                        current_change = row[4]
-                        print(f"\nChange ID: {row[4]}")
-                        print(f"Type: {row[5] or 'N/A'}")
-                        print(f"Guidance: {row[6] or 'N/A'}")
-                        print(f"Comment: {row[7] or 'N/A'}")
-                        print("Triples:")
-                    print(f"  {row[0]} {row[1]} {row[2]}")
-                    print(f"  Timestamp: {row[3]}")
-        else:
-            cur.execute(f"""
-                SELECT s.triple.GET_SUBJECT(), 
-                       s.triple.GET_PROPERTY(),
-                       s.triple.GET_OBJECT(),
-                       s.timestamp
-                FROM {session_table} s
-                ORDER BY s.timestamp
-            """)
-            
-            rows = cur.fetchall()
-            if not rows:
-                print("Session is empty")
-            else:
-                for row in rows:
-                    print(f"\nTimestamp: {row[3]}")
-                    print(f"Subject:   {row[0]}")
-                    print(f"Predicate: {row[1]}")
-                    print(f"Object:    {row[2]}")
+        change_log = get_change_log(session_model, session_table)
     except Exception as e:
         print(f"Error reading session: {e}")
-    finally:
-        cur.close()
-        conn.close()
+        return
+    
+    if not len(change_log):
+        print("Session is empty")
+    elif show_changes:
+        for change_id, changes in change_log.grouped().items():
+            first = changes[0]
+            print(f"\nChange ID: {change_id}")
+            print(f"Type: {first.change_type or 'N/A'}")
+            print(f"Guidance: {first.guidance_ref or 'N/A'}")
+            print(f"Comment: {first.comment or 'N/A'}")
+            print("Triples:")
+            for change in changes:
+                print(f"  {change.subject} {change.predicate} {change.object}")
+                print(f"  Timestamp: {change.timestamp}")
+    else:
+        for change in change_log:
+            print(f"\nTimestamp: {change.timestamp}")
+            print(f"Subject:   {change.subject}")
+            print(f"Predicate: {change.predicate}")
+            print(f"Object:    {change.object}")
 
 def export_session_ttl():
-    """Export the current session to a TTL file."""
+    """Export the current session to a TTL file.
+    
+    Each session has one export file; repeated exports append only the
+    triples added since the previous one.
+    """
     session_model, session_table = get_current_session()
     if not session_model:
         print("No active session found")
         return
     
-    conn = get_connection()
-    cur = conn.cursor()
-    
     try:
-        # Get all triples
-        cur.execute(f"""
-            SELECT s.triple.GET_SUBJECT(), 
-                   s.triple.GET_PROPERTY(),
-                   s.triple.GET_OBJECT()
-            FROM {session_table} s
-            ORDER BY s.timestamp
-        """)
-        
-        rows = cur.fetchall()
-        if not rows:
+        change_log = get_change_log(session_model, session_table)
+        if not len(change_log):
             print("Session is empty, nothing to export")
             return
         
-        # Create TTL file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        ttl_file = Path(f"session_export_{timestamp}.ttl")
-        
-        with ttl_file.open('w') as f:
-            # Write prefixes
-            f.write("@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .\n")
-            f.write("@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n")
-            f.write("@prefix meta: <http://ontologies.louspringer.com/meta#> .\n")
-            f.write("\n")
-            
-            # Write triples
-            for row in rows:
-                subject = row[0]
-                predicate = row[1]
-                obj = row[2]
-                f.write(f"{subject} {predicate} {obj} .\n")
-        
-        print(f"Session exported to {ttl_file}")
+        ttl_file = Path(f"session_export_{session_model}.ttl")
+        written = change_log.export_ttl(ttl_file)
+        print(f"Session exported to {ttl_file} ({written} new triples)")
         
     except Exception as e:
         print(f"Error exporting session: {e}")
-    finally:
-        cur.close()
-        conn.close()
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
-        print("Usage: python manage_models.py [list|new-session|show-session|show-changes|export-ttl]")
+        print("Usage: python manage_models.py [list|new-session|show-session|show-changes|export-ttl|flush]")
         sys.exit(1)
         
     command = sys.argv[1]
@@ -336,6 +371,8 @@ if __name__ == '__main__':
         show_session_contents(show_changes=True)
     elif command == 'export-ttl':
         export_session_ttl()
+    elif command == 'flush':
+        flush_session()
     else:
         print(f"Unknown command: {command}")
         sys.exit(1) 
\ No newline at end of file
@@ -2,13 +2,23 @@
 """Find orphaned guidance modules and suggest integrations."""
 
 import logging
+import re
 from pathlib import Path
 from typing import Dict, Set, Tuple, List
 from rdflib import Graph, URIRef, RDF, RDFS, OWL, Literal
+from ontology_framework.namespace_recovery import RepositoryScanner
 
-def find_references(graph: Graph, include_classes: bool = True) -> Tuple[Set[str], Dict[str, str], Dict[str, str]]:
+MODULE_PATH = 'guidance/modules/'
+
+def find_references(graph: Graph, include_classes: bool = True, include_references: bool = True) -> Tuple[Set[str], Dict[str, str], Dict[str, str]]:
     """Find all URIs and classes referenced in the graph that match our guidance modules pattern.
     
+    Args:
+        graph: Graph to search
+        include_classes: Also collect class and property labels and comments
+        include_references: Walk every triple for module URIs; skip when the
+            source text is known not to mention any module
+    
     Returns:
         Tuple of (module_refs, class_info, property_info)
     """
@@ -17,12 +27,12 @@ def find_references(graph: Graph, include_classes: bool = True) -> Tuple[Set[str
     property_info = {}  # property URI -> label/comment
     
     # Find explicit module references
-    for s, p, o in graph:
+    for s, p, o in graph if include_references else ():
         for node in (s, p, o):
             if isinstance(node, URIRef):
                 uri = str(node)
-                if 'guidance/modules/' in uri:
-                    module = uri.split('guidance/modules/')[1].split('#')[0]
+                if MODULE_PATH in uri:
+                    module = uri.split(MODULE_PATH)[1].split('#')[0]
                     if module:
                         module_refs.add(module)
                         
@@ -126,17 +136,22 @@ def main():
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
     
-    # Load main guidance.ttl
-    main_graph = Graph()
-    main_graph.parse('guidance.ttl', format='turtle')
+    modules_dir = Path('guidance/modules')
+    all_modules = {f.stem for f in modules_dir.glob('*.ttl')}
+    
+    # Text prefilter: only files mentioning a module URI can reference one
+    scanner = RepositoryScanner(re.escape(MODULE_PATH))
+    mentions = set(scanner.scan_files(['guidance.ttl'] + [str(modules_dir / f"{m}.ttl") for m in sorted(all_modules)]))
     
     # Find all module references from main guidance
-    referenced, main_classes, main_properties = find_references(main_graph)
+    referenced: Set[str] = set()
+    if 'guidance.ttl' in mentions:
+        main_graph = Graph()
+        main_graph.parse('guidance.ttl', format='turtle')
+        referenced, _, _ = find_references(main_graph, include_classes=False)
     logger.info(f"References from guidance.ttl: {referenced}")
     
     # Load all modules and find cross-references
-    modules_dir = Path('guidance/modules')
-    all_modules = {f.stem for f in modules_dir.glob('*.ttl')}
     
     # Track module relationships and content
     module_refs: Dict[str, Set[str]] = {}
@@ -147,8 +162,9 @@ def main():
     for module in all_modules:
         try:
             module_graph = Graph()
-            module_graph.parse(modules_dir / f"{module}.ttl", format='turtle')
-            refs, classes, properties = find_references(module_graph)
+            module_path = modules_dir / f"{module}.ttl"
+            module_graph.parse(module_path, format='turtle')
+            refs, classes, properties = find_references(module_graph, include_references=str(module_path) in mentions)
             
             # Store explicit references and content
             module_refs[module] = refs
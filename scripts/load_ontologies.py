@@ -1,14 +1,27 @@
 #!/usr/bin/env python3
 """Script to load ontologies and execute SPARQL updates."""
 
+import argparse
+import hashlib
 import logging
 import os
-from typing import Dict, List, Optional, Union
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Union
 import requests
+from requests.auth import HTTPBasicAuth
 from rdflib import Graph, URIRef
-from rdflib.namespace import RDFS, OWL
+from rdflib.namespace import RDF, RDFS, OWL
 from urllib.parse import urljoin
 
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from ontology_framework.graphdb_batch_writer import UpdateBatchWriter
+from ontology_framework.graphdb_client import GraphDBClient, GraphDBError
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -16,19 +29,150 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+GUIDANCE_ONTOLOGY = "guidance.ttl"
+
+CORE_MODULES = [
+    "guidance/modules/core.ttl",
+    "guidance/modules/model.ttl",
+    "guidance/modules/security.ttl",
+    "guidance/modules/validation.ttl",
+    "guidance/modules/collaboration.ttl",
+    "guidance/modules/sparql_service.ttl",
+    "guidance/modules/environment.ttl",
+    "guidance/modules/deployment_validation.ttl"
+]
+
+@dataclass
+class PreparedModule:
+    """A module parsed, with file:/// IRIs rewritten, ready to upload."""
+    ntriples: bytes
+    ontology_iris: List[str]
+    imports: List[str]
+    triples: int
+    parse_seconds: float
+
+@dataclass
+class ModuleLoadResult:
+    """Outcome and timings for one module.
+    
+    status is loaded, skipped (content hash unchanged), failed, or blocked
+    (a module it imports was not loaded).
+    """
+    module: str
+    status: str
+    triples: int = 0
+    parse_seconds: float = 0.0
+    upload_seconds: float = 0.0
+    imports: List[str] = field(default_factory=list)
+    error: str = ""
+
+def prepare_module(abs_path: str, base_iri: str) -> PreparedModule:
+    """Parse a module and serialize it as N-Triples; runs in a worker process.
+    
+    Args:
+        abs_path: Path to the Turtle file
+        base_iri: IRI that replaces file:/// prefixes
+    """
+    start = time.perf_counter()
+    g = Graph()
+    g.parse(abs_path, format="turtle")
+    
+    # Update IRIs to use GitHub URLs
+    new_g = Graph()
+    for s, p, o in g:
+        if isinstance(s, URIRef) and s.startswith('file:///'):
+            s = URIRef(s.replace('file:///', base_iri))
+        if isinstance(p, URIRef) and p.startswith('file:///'):
+            p = URIRef(p.replace('file:///', base_iri))
+        if isinstance(o, URIRef) and o.startswith('file:///'):
+            o = URIRef(o.replace('file:///', base_iri))
+        new_g.add((s, p, o))
+    
+    return PreparedModule(
+        ntriples=new_g.serialize(format="nt", encoding="utf-8"),
+        ontology_iris=[str(o) for o in new_g.subjects(RDF.type, OWL.Ontology)],
+        imports=[str(o) for o in new_g.objects(None, OWL.imports)],
+        triples=len(new_g),
+        parse_seconds=time.perf_counter() - start
+    )
+
+def _iri_key(iri: str) -> str:
+    key = iri.rstrip("#/")
+    return key[:-4] if key.endswith(".ttl") else key
+
+def resolve_dependencies(prepared: Dict[str, PreparedModule], base_iri: str,
+                         unparsed: Iterable[str] = ()) -> Dict[str, Set[str]]:
+    """Map each prepared module to the modules in the set that it imports.
+    
+    An import matches a module by its ontology IRI or published URL, ignoring a
+    trailing '#', '/' or '.ttl'; failing that, by file name when only one
+    module has it. Unparsed modules (skipped or failed) can only match by URL
+    or file name. Imports of anything outside the set are ignored.
+    """
+    by_key: Dict[str, str] = {}
+    by_stem: Dict[str, Set[str]] = defaultdict(set)
+    for module in list(prepared) + list(unparsed):
+        iris = [f"{base_iri}{module}"] + (prepared[module].ontology_iris if module in prepared else [])
+        for iri in iris:
+            by_key[_iri_key(iri)] = module
+        by_stem[_iri_key(module).rsplit("/", 1)[-1]].add(module)
+    
+    dependencies: Dict[str, Set[str]] = {}
+    for module, prep in prepared.items():
+        deps = set()
+        for iri in prep.imports:
+            key = _iri_key(iri)
+            target = by_key.get(key)
+            if target is None:
+                candidates = by_stem.get(key.rsplit("/", 1)[-1], set())
+                target = next(iter(candidates)) if len(candidates) == 1 else None
+            if target is not None and target != module:
+                deps.add(target)
+        dependencies[module] = deps
+    return dependencies
+
+def format_load_report(results: List[ModuleLoadResult]) -> str:
+    """Per-module timing table"""
+    width = max([len(r.module) for r in results] + [6])
+    lines = [f"{'Module':<{width}}  {'Status':<8} {'Triples':>8} {'Parse s':>8} {'Upload s':>8}"]
+    for r in results:
+        lines.append(f"{r.module:<{width}}  {r.status:<8} {r.triples:>8} "
+                     f"{r.parse_seconds:>8.3f} {r.upload_seconds:>8.3f}"
+                     + (f"  {r.error}" if r.error else ""))
+    return "\n".join(lines)
+
 class OntologyLoader:
-    def __init__(self, base_url: str = "http://localhost:7200", repo_id: str = "test-ontology-framework") -> None:
+    def __init__(self, base_url: str = "http://localhost:7200", repo_id: str = "test-ontology-framework",
+                 writer: Optional[UpdateBatchWriter] = None, root: Optional[str] = None) -> None:
         """Initialize the OntologyLoader.
         
         Args:
             base_url: Base URL for GraphDB
             repo_id: Repository ID in GraphDB
+            writer: Batched writer for tracking updates; created on first
+                use if omitted, with GRAPHDB_USERNAME/GRAPHDB_PASSWORD if set
+            root: Directory module paths are relative to; the workspace root
+                if omitted
         """
+        self.root = root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.base_url = base_url
         self.repo_id = repo_id
         self.repo_url = f"{base_url}/repositories/{repo_id}"
         self.statements_url = f"{self.repo_url}/statements"
         self.base_iri = "https://raw.githubusercontent.com/louspringer/ontology-framework/main/"
+        # Uploads, hash reads and tracking updates all use this; None if unset
+        username = os.environ.get("GRAPHDB_USERNAME")
+        password = os.environ.get("GRAPHDB_PASSWORD")
+        self.auth = HTTPBasicAuth(username, password) if username and password else None
+        self._writer = writer
+        
+    @property
+    def writer(self) -> UpdateBatchWriter:
+        """Batched writer shared by tracking updates"""
+        if self._writer is None:
+            client = GraphDBClient(self.base_url, self.repo_id, auth=self.auth, require_credentials=False)
+            self._writer = UpdateBatchWriter(client, max_latency=None)
+        return self._writer
         
     def _get_absolute_path(self, relative_path: str) -> str:
         """Convert relative path to absolute path.
@@ -39,9 +183,7 @@ class OntologyLoader:
         Returns:
             Absolute path in the filesystem
         """
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        workspace_root = os.path.dirname(base_dir)
-        return os.path.join(workspace_root, relative_path)
+        return os.path.join(self.root, relative_path)
         
     def load_ontology(self, file_path: str) -> bool:
         """Load an ontology file into GraphDB.
@@ -56,23 +198,8 @@ class OntologyLoader:
             # Convert relative path to absolute
             abs_path = self._get_absolute_path(file_path)
             
-            # Parse the ontology and set base IRI
-            g = Graph()
-            g.parse(abs_path, format="turtle")
-            
-            # Update IRIs to use GitHub URLs
-            new_g = Graph()
-            for s, p, o in g:
-                if isinstance(s, URIRef) and s.startswith('file:///'):
-                    s = URIRef(s.replace('file:///', self.base_iri))
-                if isinstance(p, URIRef) and p.startswith('file:///'):
-                    p = URIRef(p.replace('file:///', self.base_iri))
-                if isinstance(o, URIRef) and o.startswith('file:///'):
-                    o = URIRef(o.replace('file:///', self.base_iri))
-                new_g.add((s, p, o))
-            
-            # Convert to N-Triples format
-            nt_data = new_g.serialize(format="nt")
+            # Parse the ontology, set base IRI and convert to N-Triples
+            nt_data = prepare_module(abs_path, self.base_iri).ntriples
             
             # Load into GraphDB
             headers = {
@@ -83,7 +210,8 @@ class OntologyLoader:
             response = requests.post(
                 self.statements_url,
                 headers=headers,
-                data=nt_data
+                data=nt_data,
+                auth=self.auth
             )
             
             if response.status_code == 204:
@@ -98,82 +226,257 @@ class OntologyLoader:
             return False
             
     def update_tracking_status(self, module_uri: str, status: str = "LOADED") -> bool:
-        """Update the tracking status of a module.
+        """Queue a tracking status update for a module.
+        
+        Updates are sent together by flush_tracking_status(); load_all_modules()
+        sends one request for all modules.
         
         Args:
             module_uri: URI of the module to update
             status: Status to set
             
         Returns:
-            True if update was successful, False otherwise
+            True if the update was queued, False otherwise
         """
         try:
-            query = f"""
-            PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-            PREFIX owl: <http://www.w3.org/2002/07/owl#>
-            PREFIX : <{self.base_iri}guidance#>
-            
-            INSERT DATA {{
-                <{module_uri}> :hasStatus "{status}" .
-            }}
-            """
-            
-            response = requests.post(
-                f"{self.repo_url}/statements",
-                headers={"Content-Type": "application/sparql-update"},
-                data=query
+            self.writer.insert_data(
+                f'<{module_uri}> :hasStatus "{status}" .',
+                {"": f"{self.base_iri}guidance#"}
             )
-            
-            if response.status_code == 204:
-                logger.info(f"Updated status for {module_uri} to {status}")
-                return True
-            else:
-                logger.error(f"Failed to update status for {module_uri}: {response.status_code} - {response.text}")
-                return False
-                
+            logger.info(f"Queued status {status} for {module_uri}")
+            return True
         except Exception as e:
             logger.error(f"Error updating status for {module_uri}: {str(e)}")
             return False
             
-    def load_all_modules(self) -> bool:
-        """Load all core modules defined in guidance.ttl.
+    def flush_tracking_status(self) -> bool:
+        """Send queued tracking status updates in one request.
         
         Returns:
-            True if all modules were loaded successfully, False otherwise
+            True if all queued updates were stored, False otherwise
         """
-        # First load the guidance ontology
-        if not self.load_ontology("guidance.ttl"):
-            logger.error("Failed to load guidance ontology, aborting")
+        if self._writer is None:
+            return True
+        try:
+            count = self._writer.flush()
+            if count:
+                logger.info(f"Stored {count} tracking status updates")
+            return True
+        except GraphDBError as e:
+            logger.error(f"Failed to store tracking status updates: {str(e)}")
             return False
             
-        # Load core modules
-        modules = [
-            "guidance/modules/core.ttl",
-            "guidance/modules/model.ttl",
-            "guidance/modules/security.ttl",
-            "guidance/modules/validation.ttl",
-            "guidance/modules/collaboration.ttl",
-            "guidance/modules/sparql_service.ttl",
-            "guidance/modules/environment.ttl",
-            "guidance/modules/deployment_validation.ttl"
-        ]
-        
-        success = True
+    def module_graph(self, module: str) -> str:
+        """Named graph (and tracking URI) for a module path"""
+        return f"{self.base_iri}{module}"
+        
+    def fetch_loaded_hashes(self) -> Dict[str, str]:
+        """Content hashes recorded for modules loaded earlier, by module URI"""
+        query = f"""
+        PREFIX : <{self.base_iri}guidance#>
+        SELECT ?module ?hash WHERE {{ ?module :contentHash ?hash }}
+        """
+        try:
+            response = requests.get(
+                self.repo_url,
+                params={"query": query},
+                headers={"Accept": "application/sparql-results+json"},
+                auth=self.auth
+            )
+            response.raise_for_status()
+            return {row["module"]["value"]: row["hash"]["value"]
+                    for row in response.json()["results"]["bindings"]}
+        except Exception as e:
+            logger.warning(f"Could not read loaded module hashes, loading everything: {str(e)}")
+            return {}
+            
+    def upload_module(self, module: str, prepared: PreparedModule) -> float:
+        """Replace a module's named graph with its prepared triples.
+        
+        Returns:
+            Upload time in seconds
+            
+        Raises:
+            requests.HTTPError: If GraphDB rejects the upload
+        """
+        start = time.perf_counter()
+        response = requests.put(
+            self.statements_url,
+            params={"context": f"<{self.module_graph(module)}>"},
+            headers={"Content-Type": "application/n-triples"},
+            data=prepared.ntriples,
+            auth=self.auth
+        )
+        response.raise_for_status()
+        return time.perf_counter() - start
+        
+    def load_modules(self, modules: List[str], workers: Optional[int] = None,
+                     force: bool = False) -> List[ModuleLoadResult]:
+        """Load modules into their named graphs in owl:imports order.
+        
+        Modules whose content hash matches the one recorded at their last load
+        are skipped unless force is set. The rest are parsed in a process pool
+        and each is uploaded as soon as every module it imports has been, so
+        independent modules upload concurrently. Import cycles are broken by
+        loading the earliest listed module of the cycle first. Status and
+        content hashes of loaded modules are recorded in one batched update.
+        
+        Args:
+            modules: Module paths, relative to the loader root
+            workers: Parallel parses and uploads; the CPU count if omitted
+            force: Reload modules even if unchanged
+            
+        Returns:
+            One result per module, in the order given
+        """
+        workers = workers or os.cpu_count() or 1
+        results: Dict[str, ModuleLoadResult] = {}
+        loaded_hashes = {} if force else self.fetch_loaded_hashes()
+        
+        # Hash files first; unchanged modules are not even parsed
+        hashes: Dict[str, str] = {}
+        to_parse: List[str] = []
         for module in modules:
-            if self.load_ontology(module):
-                # Update tracking status using GitHub URL
-                module_uri = f"{self.base_iri}{module}"
-                self.update_tracking_status(module_uri)
+            try:
+                with open(self._get_absolute_path(module), "rb") as f:
+                    hashes[module] = hashlib.sha256(f.read()).hexdigest()
+            except OSError as e:
+                results[module] = ModuleLoadResult(module, "failed", error=str(e))
+                continue
+            if loaded_hashes.get(self.module_graph(module)) == hashes[module]:
+                results[module] = ModuleLoadResult(module, "skipped")
             else:
-                success = False
+                to_parse.append(module)
                 
-        return success
+        prepared = self._prepare_modules(to_parse, workers, results)
+        dependencies = resolve_dependencies(prepared, self.base_iri, unparsed=list(results))
+        self._upload_in_order(list(prepared), prepared, dependencies, workers, results)
+        
+        loaded = [module for module in prepared if results[module].status == "loaded"]
+        previous = {module: loaded_hashes.get(self.module_graph(module)) for module in loaded}
+        try:
+            for module in loaded:
+                self._record_loaded(module, hashes[module], previous[module])
+            tracked = self.flush_tracking_status()
+        except Exception as e:
+            # Includes a writer that cannot be created; the modules themselves are loaded
+            logger.error(f"Failed to record loaded modules: {str(e)}")
+            tracked = False
+        if not tracked:
+            for module in loaded:
+                results[module].error = "tracking status not stored"
+                    
+        return [results[module] for module in modules]
+        
+    def _prepare_modules(self, modules: List[str], workers: int,
+                         results: Dict[str, ModuleLoadResult]) -> Dict[str, PreparedModule]:
+        prepared: Dict[str, PreparedModule] = {}
+        if not modules:
+            return prepared
+        if workers == 1 or len(modules) == 1:
+            outcomes = {}
+            for module in modules:
+                try:
+                    outcomes[module] = prepare_module(self._get_absolute_path(module), self.base_iri)
+                except Exception as e:
+                    outcomes[module] = e
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(modules))) as pool:
+                futures = {module: pool.submit(prepare_module, self._get_absolute_path(module), self.base_iri)
+                           for module in modules}
+                outcomes = {module: future.exception() or future.result() for module, future in futures.items()}
+        for module in modules:
+            outcome = outcomes[module]
+            if isinstance(outcome, Exception):
+                logger.error(f"Error parsing {module}: {str(outcome)}")
+                results[module] = ModuleLoadResult(module, "failed", error=str(outcome))
+            else:
+                prepared[module] = outcome
+        return prepared
+        
+    def _upload_in_order(self, order: List[str], prepared: Dict[str, PreparedModule],
+                         dependencies: Dict[str, Set[str]], workers: int,
+                         results: Dict[str, ModuleLoadResult]) -> None:
+        # Skipped modules are already loaded; failed ones block their dependents
+        waiting = {module: dependencies[module] & set(prepared) for module in order}
+        failed = {module for module, result in results.items() if result.status == "failed"}
+        running = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while waiting or running:
+                ready = [module for module in order if module in waiting and not waiting[module]]
+                if not ready and not running:
+                    # Every remaining module waits on another: an import cycle
+                    module = next(module for module in order if module in waiting)
+                    logger.warning(f"Import cycle through {module}; loading it before {sorted(waiting[module])}")
+                    waiting[module].clear()
+                    continue
+                for module in ready:
+                    del waiting[module]
+                    blocked_by = dependencies[module] & failed
+                    if blocked_by:
+                        results[module] = ModuleLoadResult(
+                            module, "blocked", parse_seconds=prepared[module].parse_seconds,
+                            error=f"imports {', '.join(sorted(blocked_by))}")
+                        failed.add(module)
+                        self._finish(module, waiting)
+                    else:
+                        running[pool.submit(self.upload_module, module, prepared[module])] = module
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    module = running.pop(future)
+                    prep = prepared[module]
+                    result = ModuleLoadResult(module, "loaded", triples=prep.triples,
+                                              parse_seconds=prep.parse_seconds,
+                                              imports=sorted(dependencies[module]))
+                    try:
+                        result.upload_seconds = future.result()
+                        logger.info(f"Successfully loaded {module}")
+                        self._finish(module, waiting)
+                    except Exception as e:
+                        logger.error(f"Failed to load {module}: {str(e)}")
+                        result.status, result.error = "failed", str(e)
+                        failed.add(module)
+                        self._finish(module, waiting)
+                    results[module] = result
+                    
+    @staticmethod
+    def _finish(module: str, waiting: Dict[str, Set[str]]) -> None:
+        for deps in waiting.values():
+            deps.discard(module)
+            
+    def _record_loaded(self, module: str, content_hash: str, previous_hash: Optional[str]) -> None:
+        prefixes = {"": f"{self.base_iri}guidance#"}
+        module_uri = self.module_graph(module)
+        if previous_hash:
+            self.writer.delete_data(f'<{module_uri}> :contentHash "{previous_hash}" .', prefixes)
+        self.writer.insert_data(f'<{module_uri}> :contentHash "{content_hash}" .', prefixes)
+        self.update_tracking_status(module_uri)
+        
+    def load_all_modules(self, workers: Optional[int] = None, force: bool = False) -> bool:
+        """Load the guidance ontology and all core modules.
+        
+        Args:
+            workers: Parallel parses and uploads; the CPU count if omitted
+            force: Reload modules even if unchanged
+            
+        Returns:
+            True if all modules were loaded successfully, False otherwise
+        """
+        results = self.load_modules([GUIDANCE_ONTOLOGY] + CORE_MODULES, workers, force)
+        logger.info("Module load report:\n" + format_load_report(results))
+        return all(r.status in ("loaded", "skipped") and not r.error for r in results)
 
 def main() -> None:
     """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description="Load the guidance ontology and core modules into GraphDB")
+    parser.add_argument("--workers", type=int, help="Parallel parses and uploads (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Reload modules even if unchanged")
+    args = parser.parse_args()
+    
     loader = OntologyLoader()
-    if loader.load_all_modules():
+    if loader.load_all_modules(args.workers, args.force):
         logger.info("Successfully loaded all modules")
     else:
         logger.error("Failed to load some modules")
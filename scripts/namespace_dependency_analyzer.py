@@ -2,11 +2,18 @@
 import os
 import re
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import logging
 from datetime import datetime
 import networkx as nx
 import matplotlib.pyplot as plt
+from ontology_framework.namespace_recovery import ExampleOrgFinder
+
+# Paths never worth scanning when building the inventory
+INVENTORY_IGNORE_PATTERNS = [
+    '.git', '.venv', 'venv', 'node_modules', '__pycache__', '.mypy_cache', '.pytest_cache',
+    'logs', '*.pyc', '*.png', '*.svg', '*.pdf', 'example_org_inventory.md'
+]
 
 # Configure logging with detailed error monitoring
 class ErrorMonitor(logging.Handler):
@@ -82,6 +89,33 @@ class NamespaceDependencyAnalyzer:
         })
         return True
 
+    def generate_inventory(self, root: str = '.', cache_path: Optional[str] = None) -> int:
+        """Scan a repository for example.org usage and write the inventory file.
+
+        Uses the parallel, incremental example.org scanner; with a cache_path,
+        files unchanged since the last run are not read again.
+
+        Returns:
+            Number of references written
+        """
+        self.log_processing_step("generate_inventory")
+        finder = ExampleOrgFinder(INVENTORY_IGNORE_PATTERNS, cache_path=cache_path)
+        references = finder.scan_directory(root)
+        by_file: Dict[str, List[str]] = {}
+        for ref in references:
+            relative = os.path.relpath(ref.file_path, root)
+            by_file.setdefault(relative, []).append(f"Line {ref.line_number}: {ref.line_content}")
+
+        lines = ["# Example.org Usage Inventory", f"Generated: {datetime.now().isoformat()}", ""]
+        for file_path in sorted(by_file):
+            lines.append(f"## {file_path}")
+            lines.extend(by_file[file_path])
+            lines.append("")
+        self.inventory_file.parent.mkdir(parents=True, exist_ok=True)
+        self.inventory_file.write_text("\n".join(lines), encoding='utf-8')
+        logging.info(f"Inventory of {len(references)} references in {len(by_file)} files saved to {self.inventory_file}")
+        return len(references)
+
     def parse_inventory(self) -> None:
         """Parse the inventory file to extract namespace definitions and usage."""
         try:
@@ -246,6 +280,7 @@ def main() -> None:
     """Main function to run the namespace dependency analyzer."""
     analyzer = NamespaceDependencyAnalyzer()
     logging.info("Starting namespace dependency analysis...")
+    analyzer.generate_inventory('.', cache_path='logs/example_org_scan_cache.json')
     analyzer.parse_inventory()
     analyzer.generate_dependency_graph()
     analyzer.save_analysis_report()
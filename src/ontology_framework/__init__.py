@@ -4,50 +4,81 @@ Ontology Framework for semantic web applications.
 
 __version__ = "0.1.0"
 
-from .meta import MetaOntology, OntologyPatch
-from .ontology_types import PatchType, PatchStatus, ValidationRuleType, ErrorSeverity, ErrorType, ErrorStep, ErrorResult, ValidationRule, RiskLevel, ComplianceLevel, SecurityLevel, PerformanceMetric, ValidationResult, ValidationError
-from .metameta import MetaMetaOntology
-from .exceptions import (
-    OntologyFrameworkError,
-    ValidationError,
-    ConformanceError,
-    ConcurrentModificationError,
-    BoldoAPIError,
-    AuthenticationError,
-    APIRequestError,
-    PatchNotFoundError,
-    PatchApplicationError,
-    ResourceNotFoundError
-)
-from .modules import (
-    ErrorHandler,
-    ValidationRule,
-    ErrorResult,
-    ErrorStep,
-    ErrorSeverity,
-    SecurityLevel,
-    ComplianceLevel,
-    RiskLevel,
-    ValidationHandler,
-    MetricsHandler,
-    ComplianceHandler,
-    RDFHandler,
-    PatchManager,
-    GraphDBPatchManager,
-    fix_turtle_syntax,
-    validate_turtle,
-    validate_shacl,
-    load_and_fix_turtle,
-    OntologyAnalyzer,
-    TestSetupManager,
-    PackageManager
-)
-from .deployment_modeler import DeploymentModeler
-from .graphdb_client import GraphDBClient
-from .sparql_operations import QueryType, QueryResult, QueryExecutor, GraphDBExecutor, Neo4jExecutor, execute_sparql, SparqlOperations
+import importlib
+from typing import Any, Dict, Tuple
+
+# Public names and the (module, attribute) they are imported from on first
+# access (PEP 562), so that importing the package, or any of its submodules,
+# does not pull in rdflib, pyshacl, requests and the CLI up front.
+_LAZY_ATTRIBUTES: Dict[str, Tuple[str, str]] = {
+    'MetaOntology': ('.meta', 'MetaOntology'),
+    'OntologyPatch': ('.meta', 'OntologyPatch'),
+    'MetaMetaOntology': ('.metameta', 'MetaMetaOntology'),
+    'PatchType': ('.ontology_types', 'PatchType'),
+    'PatchStatus': ('.ontology_types', 'PatchStatus'),
+    'ValidationRuleType': ('.ontology_types', 'ValidationRuleType'),
+    'ErrorType': ('.ontology_types', 'ErrorType'),
+    'PerformanceMetric': ('.ontology_types', 'PerformanceMetric'),
+    'ValidationResult': ('.ontology_types', 'ValidationResult'),
+    'OntologyFrameworkError': ('.exceptions', 'OntologyFrameworkError'),
+    'ValidationError': ('.exceptions', 'ValidationError'),
+    'ConformanceError': ('.exceptions', 'ConformanceError'),
+    'ConcurrentModificationError': ('.exceptions', 'ConcurrentModificationError'),
+    'BoldoAPIError': ('.exceptions', 'BoldoAPIError'),
+    'AuthenticationError': ('.exceptions', 'AuthenticationError'),
+    'APIRequestError': ('.exceptions', 'APIRequestError'),
+    'PatchNotFoundError': ('.exceptions', 'PatchNotFoundError'),
+    'PatchApplicationError': ('.exceptions', 'PatchApplicationError'),
+    'ResourceNotFoundError': ('.exceptions', 'ResourceNotFoundError'),
+    'ErrorHandler': ('.modules', 'ErrorHandler'),
+    'ValidationRule': ('.modules', 'ValidationRule'),
+    'ErrorResult': ('.modules', 'ErrorResult'),
+    'ErrorStep': ('.modules', 'ErrorStep'),
+    'ErrorSeverity': ('.modules', 'ErrorSeverity'),
+    'SecurityLevel': ('.modules', 'SecurityLevel'),
+    'ComplianceLevel': ('.modules', 'ComplianceLevel'),
+    'RiskLevel': ('.modules', 'RiskLevel'),
+    'ValidationHandler': ('.modules', 'ValidationHandler'),
+    'MetricsHandler': ('.modules', 'MetricsHandler'),
+    'ComplianceHandler': ('.modules', 'ComplianceHandler'),
+    'RDFHandler': ('.modules', 'RDFHandler'),
+    'PatchManager': ('.modules', 'PatchManager'),
+    'GraphDBPatchManager': ('.modules', 'GraphDBPatchManager'),
+    'fix_turtle_syntax': ('.modules', 'fix_turtle_syntax'),
+    'validate_turtle': ('.modules', 'validate_turtle'),
+    'validate_shacl': ('.modules', 'validate_shacl'),
+    'load_and_fix_turtle': ('.modules', 'load_and_fix_turtle'),
+    'OntologyAnalyzer': ('.modules', 'OntologyAnalyzer'),
+    'TestSetupManager': ('.modules', 'TestSetupManager'),
+    'PackageManager': ('.modules', 'PackageManager'),
+    'DeploymentModeler': ('.deployment_modeler', 'DeploymentModeler'),
+    'GraphDBClient': ('.graphdb_client', 'GraphDBClient'),
+    'QueryType': ('.sparql_operations', 'QueryType'),
+    'QueryResult': ('.sparql_operations', 'QueryResult'),
+    'QueryExecutor': ('.sparql_operations', 'QueryExecutor'),
+    'GraphDBExecutor': ('.sparql_operations', 'GraphDBExecutor'),
+    'Neo4jExecutor': ('.sparql_operations', 'Neo4jExecutor'),
+    'execute_sparql': ('.sparql_operations', 'execute_sparql'),
+    'SparqlOperations': ('.sparql_operations', 'SparqlOperations'),
+    # Expose the CLI main function
+    'main': ('.cli', 'cli'),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
-# Expose the CLI main function
-from .cli import cli as main
 
 __all__ = [
     'MetaOntology',
@@ -6,6 +6,8 @@ from typing import Dict, List, Optional, Any, Set
 from rdflib import Graph, URIRef, Literal, Namespace, BNode
 from rdflib.namespace import RDF, RDFS, OWL, XSD, SH
 
+from .core.overlay_graph import OverlayGraph
+
 class BowTieTransformation:
     """Class for transforming ontologies using the bow-tie pattern."""
     
@@ -23,12 +25,13 @@ class BowTieTransformation:
         """Transform the ontology using the bow-tie pattern.
         
         Returns:
-            The transformed RDF graph
+            The transformed RDF graph, an overlay over the original that
+            leaves it unchanged until committed. The overlay reads through to
+            the original, so the original must not be modified while the
+            result is in use; commit() it, or copy it into a new Graph, first.
         """
-        # Create a copy of the original graph
-        transformed_graph = Graph()
-        for triple in self.graph:
-            transformed_graph.add(triple)
+        # Layer the pattern over the original graph instead of copying it
+        transformed_graph = OverlayGraph(self.graph)
             
         # Add bow-tie pattern structure
         # Transformation class
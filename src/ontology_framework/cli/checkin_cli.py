@@ -3,7 +3,6 @@ CLI interface for the check-in manager.
 """
 
 import click
-from ontology_framework.modules.checkin_manager import CheckinManager
 from pathlib import Path
 
 @click.group()
@@ -15,6 +14,7 @@ def cli():
 @click.argument('plan_id')
 def create(plan_id):
     """Create a new check-in plan."""
+    from ontology_framework.modules.checkin_manager import CheckinManager
     manager = CheckinManager()
     plan_uri = manager.create_checkin_plan(plan_id)
     manager.save_plan(f"{plan_id}.ttl")
@@ -24,6 +24,7 @@ def create(plan_id):
 @click.argument('plan_file')
 def load(plan_file):
     """Load an existing check-in plan."""
+    from ontology_framework.modules.checkin_manager import CheckinManager
     manager = CheckinManager()
     manager.load_plan(plan_file)
     click.echo(f"Loaded check-in plan: {plan_file}")
@@ -32,6 +33,7 @@ def load(plan_file):
 @click.argument('plan_file')
 def status(plan_file):
     """Show the status of a check-in plan."""
+    from ontology_framework.modules.checkin_manager import CheckinManager
     manager = CheckinManager()
     manager.load_plan(plan_file)
     
@@ -50,6 +52,7 @@ def status(plan_file):
 @click.argument('plan_file')
 def execute(plan_file):
     """Execute the next pending step in a check-in plan."""
+    from ontology_framework.modules.checkin_manager import CheckinManager
     manager = CheckinManager()
     manager.load_plan(plan_file)
     
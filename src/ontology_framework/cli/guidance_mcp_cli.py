@@ -1,7 +1,6 @@
 import argparse
 import sys
 import json
-from ontology_framework.mcp.guidance_mcp_service import GuidanceMCPService
 
 def main():
     parser = argparse.ArgumentParser(description="Guidance MCP CLI: Manage ontologies conforming to guidance.")
@@ -36,6 +35,7 @@ def main():
     load_parser.add_argument('path', type=str, help='Path to ontology file to load')
 
     args = parser.parse_args()
+    from ontology_framework.mcp.guidance_mcp_service import GuidanceMCPService
     mcp = GuidanceMCPService(args.ontology)
 
     if args.command == 'add-imports':
@@ -150,6 +150,57 @@ def mcp(ontology: Path, targets: tuple[Path, ...], verbose: bool, config: Path)
         for phase, status in results["phases"].items():
             click.echo(f"{phase}: {status}")
 
+@cli.command()
+@click.argument(
+    "sources",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path),
+    help="Snapshot file for a single source, or a directory for several"
+)
+@click.option(
+    "--format",
+    "-f",
+    "rdf_format",
+    default=None,
+    help="RDF format of the sources (guessed from the extension by default)"
+)
+@click.option(
+    "--benchmark",
+    is_flag=True,
+    help="Compare parse time with snapshot load time"
+)
+def snapshot(sources: tuple[Path, ...], output: Optional[Path], rdf_format: Optional[str], benchmark: bool) -> None:
+    """Write compact binary snapshots of RDF files for fast loading."""
+    from rdflib import Graph
+    from rdflib.util import guess_format
+    from ..core import graph_snapshot
+    
+    for source in sources:
+        if output is None:
+            target = source.with_suffix(graph_snapshot.SUFFIX)
+        elif len(sources) > 1 or output.is_dir():
+            output.mkdir(parents=True, exist_ok=True)
+            target = output / source.with_suffix(graph_snapshot.SUFFIX).name
+        else:
+            target = output
+        
+        graph = Graph()
+        graph.parse(str(source), format=rdf_format or guess_format(str(source)) or "turtle")
+        graph_snapshot.write_snapshot(graph, target)
+        click.echo(f"{source} -> {target} ({len(graph)} triples, {target.stat().st_size} bytes)")
+        
+        if benchmark:
+            results = graph_snapshot.benchmark(source, target, format=rdf_format)
+            click.echo(f"  parse: {results['parse_ms']:.2f} ms, "
+                       f"snapshot open: {results['open_ms']:.2f} ms, "
+                       f"open and scan: {results['open_and_scan_ms']:.2f} ms")
+
 def main() -> None:
     """Main entry point for the CLI."""
     cli()
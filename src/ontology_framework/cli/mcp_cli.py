@@ -8,8 +8,6 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 import pprint
 
-from ..modules.mcp_prompt import PromptContext, MCPPrompt, PromptError
-
 def setup_logging(verbose: bool = False, log_file: Optional[str] = None) -> None:
     """Set up logging configuration."""
     level = logging.DEBUG if verbose else logging.INFO
@@ -133,6 +131,8 @@ def add_mcp_subparser(subparsers: argparse._SubParsersAction) -> None:
 
 def run_mcp(args: argparse.Namespace) -> int:
     """Run MCP prompt with given arguments."""
+    from ..modules.mcp_prompt import PromptContext, MCPPrompt, PromptError
+
     setup_logging(args.verbose, args.log_file)
     logger = logging.getLogger(__name__)
     pp = pprint.PrettyPrinter(indent=2)
@@ -3,7 +3,6 @@
 import click
 import logging
 from pathlib import Path
-from ..triggers.model_trigger import ModelTrigger
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,6 +17,7 @@ def cli():
 def watch(path):
     """Start watching a directory for new Python files."""
     try:
+        from ..triggers.model_trigger import ModelTrigger
         trigger = ModelTrigger(path)
         trigger.start()
         click.echo(f"Started watching {path} for new Python files")
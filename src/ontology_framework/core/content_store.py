@@ -0,0 +1,327 @@
+"""
+Write-behind content store for ReflectiveModule.store_content.
+
+Writes are buffered and coalesced per (collection, content_id), then flushed
+in batches by a background thread once enough are pending or the flush
+interval passes. Reads are served from pending and in-flight writes, then
+from a bounded LRU cache, and only then from the backend (Directus, SQLite
+or memory).
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ContentKey = Tuple[str, str]
+
+
+class ContentBackend(ABC):
+    """Durable side of the content store"""
+
+    @abstractmethod
+    def write_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Persist (collection, content_data) pairs"""
+
+    @abstractmethod
+    def read(self, collection: str, content_id: str) -> Optional[Dict[str, Any]]:
+        """Stored content_data for an id, or None"""
+
+
+class MemoryBackend(ContentBackend):
+    """Process-local dictionary backend"""
+
+    def __init__(self):
+        self.items: Dict[ContentKey, Dict[str, Any]] = {}
+        self.batches = 0
+
+    def write_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        self.batches += 1
+        for collection, content_data in items:
+            self.items[(collection, content_data["id"])] = content_data
+
+    def read(self, collection: str, content_id: str) -> Optional[Dict[str, Any]]:
+        return self.items.get((collection, content_id))
+
+
+class SQLiteBackend(ContentBackend):
+    """Local SQLite stand-in for the CMS"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS content ("
+                "collection TEXT NOT NULL, id TEXT NOT NULL, payload TEXT NOT NULL, "
+                "PRIMARY KEY (collection, id))"
+            )
+            self._connection.commit()
+
+    def write_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        rows = [(collection, data["id"], json.dumps(data, default=str)) for collection, data in items]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO content (collection, id, payload) VALUES (?, ?, ?) "
+                "ON CONFLICT(collection, id) DO UPDATE SET payload = excluded.payload",
+                rows
+            )
+            self._connection.commit()
+
+    def read(self, collection: str, content_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload FROM content WHERE collection = ? AND id = ?", (collection, content_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class DirectusBackend(ContentBackend):
+    """Directus CMS backend, using bulk creation when the client supports it"""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def write_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        by_collection: Dict[str, List[Dict[str, Any]]] = {}
+        for collection, content_data in items:
+            by_collection.setdefault(collection, []).append(content_data)
+        for collection, batch in by_collection.items():
+            if hasattr(self.client, "create_items"):
+                if not self.client.create_items(collection, batch):
+                    raise IOError(f"Directus rejected {len(batch)} items for {collection}")
+                continue
+            for content_data in batch:
+                if not self.client.create_item(collection, content_data):
+                    raise IOError(f"Directus rejected content {content_data['id']}")
+
+    def read(self, collection: str, content_id: str) -> Optional[Dict[str, Any]]:
+        items = self.client.get_items(collection, {"filter": {"id": {"_eq": content_id}}})
+        return items[0] if items else None
+
+
+def default_content_db() -> Optional[Path]:
+    """Local content database: BEAST_MODE_CONTENT_DB, or one in the user cache; '' keeps content in memory"""
+    configured = os.environ.get("BEAST_MODE_CONTENT_DB")
+    if configured is not None:
+        return Path(configured) if configured else None
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "ontology_framework" / "content.db"
+
+
+def default_backend() -> ContentBackend:
+    """Directus if its client is importable and reachable, else SQLite at default_content_db() or memory"""
+    try:
+        from src.beast_mode.directus_cms.directus_client import DirectusClient
+        client = DirectusClient(base_url=os.getenv("DIRECTUS_URL", "http://localhost:8055"),
+                                token=os.getenv("DIRECTUS_TOKEN"))
+        if client.health_check():
+            logger.info("Content store using Directus")
+            return DirectusBackend(client)
+        logger.warning("Directus not accessible, using local content store")
+    except ImportError:
+        logger.debug("DirectusClient not available, using local content store")
+    except Exception as e:
+        logger.error(f"Failed to initialize CMS client: {e}")
+    path = default_content_db()
+    if path is None:
+        logger.info("BEAST_MODE_CONTENT_DB is empty, keeping content in memory")
+        return MemoryBackend()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        backend = SQLiteBackend(str(path))
+        logger.info(f"Content store using {path} (set BEAST_MODE_CONTENT_DB to move it, or to '' to disable)")
+        return backend
+    except (OSError, sqlite3.Error) as e:
+        # Content kept only in memory is lost at exit and grows without bound
+        logger.error(f"Cannot open content database {path}, keeping content in memory: {e}")
+        return MemoryBackend()
+
+
+class WriteBehindContentStore:
+    """Buffered, coalescing content store with an LRU read cache"""
+
+    def __init__(self, backend: Optional[ContentBackend] = None,
+                 backend_factory: Callable[[], ContentBackend] = default_backend,
+                 max_pending: int = 100, flush_interval: float = 1.0, cache_size: int = 1000):
+        """
+        Args:
+            backend: Backend to flush to; resolved lazily from backend_factory if omitted
+            backend_factory: Builds the backend on the flusher thread, off the caller's path
+            max_pending: Pending writes that trigger an early flush
+            flush_interval: Longest time in seconds a write stays buffered
+            cache_size: Entries kept in the read cache
+        """
+        self._backend = backend
+        self._backend_factory = backend_factory
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.cache_size = cache_size
+        self._pending: "OrderedDict[ContentKey, Dict[str, Any]]" = OrderedDict()
+        self._flushing: "OrderedDict[ContentKey, Dict[str, Any]]" = OrderedDict()
+        self._generation = 0
+        self._cache: "OrderedDict[ContentKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.writes = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def backend(self) -> ContentBackend:
+        if self._backend is None:
+            self._backend = self._backend_factory()
+        return self._backend
+
+    def put(self, collection: str, content_data: Dict[str, Any]) -> None:
+        """Buffer a write; repeated writes to one content ID before a flush are coalesced"""
+        key = (collection, content_data["id"])
+        with self._lock:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = content_data
+            self._pending.move_to_end(key)
+            self._remember(key, content_data)
+            self.writes += 1
+            self._generation += 1
+            pending = len(self._pending)
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="content-store-flusher", daemon=True)
+                self._thread.start()
+        if pending >= self.max_pending:
+            self._wakeup.set()
+
+    def get(self, collection: str, content_id: str) -> Optional[Dict[str, Any]]:
+        """Read through unflushed writes and the cache before the backend"""
+        key = (collection, content_id)
+        with self._lock:
+            buffered = self._buffered(key)
+            if buffered is not None:
+                self.cache_hits += 1
+                return buffered
+            self.cache_misses += 1
+            generation = self._generation
+        content_data = self.backend.read(collection, content_id)
+        with self._lock:
+            if self._generation != generation:
+                # A write or flush landed during the read; the backend value may be stale
+                return self._buffered(key) or content_data
+            if content_data is not None:
+                self._remember(key, content_data)
+        return content_data
+
+    def _buffered(self, key: ContentKey) -> Optional[Dict[str, Any]]:
+        """Latest content held in memory: pending, then in flight, then cached"""
+        content_data = self._pending.get(key) or self._flushing.get(key)
+        if content_data is not None:
+            return content_data
+        content_data = self._cache.get(key)
+        if content_data is not None:
+            self._cache.move_to_end(key)
+        return content_data
+
+    def _remember(self, key: ContentKey, content_data: Dict[str, Any]) -> None:
+        self._cache[key] = content_data
+        self._cache.move_to_end(key)
+        self._trim()
+
+    def _trim(self) -> None:
+        """Evict least recently used entries, keeping unflushed writes readable"""
+        excess = len(self._cache) - self.cache_size
+        if excess <= 0:
+            return
+        evictable = islice(
+            (key for key in self._cache if key not in self._pending and key not in self._flushing), excess
+        )
+        for key in list(evictable):
+            del self._cache[key]
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all pending content to the backend; returns the number written"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, OrderedDict()
+                # Reads keep seeing the batch until the backend has it
+                self._flushing = batch
+            try:
+                self.backend.write_batch([(collection, data) for (collection, _), data in batch.items()])
+            except Exception as e:
+                logger.error(f"Failed to flush {len(batch)} content items, will retry: {e}")
+                with self._lock:
+                    # Keep writes that arrived during the failed flush
+                    batch.update(self._pending)
+                    self._pending = batch
+                    self._flushing = OrderedDict()
+                return 0
+            with self._lock:
+                self._flushing = OrderedDict()
+                self._generation += 1
+                self._trim()
+            self.flushes += 1
+            return len(batch)
+
+    def close(self) -> None:
+        """Flush pending writes and stop the flusher thread"""
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "cached": len(self._cache),
+            "writes": self.writes,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+
+_store: Optional[WriteBehindContentStore] = None
+_store_lock = threading.Lock()
+
+
+def get_content_store() -> WriteBehindContentStore:
+    """Get the process-wide content store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = WriteBehindContentStore()
+    return _store
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    if _store is not None:
+        _store.flush()
@@ -0,0 +1,229 @@
+"""
+Process-wide registry of parsed ontology graphs.
+
+Each ontology file (guidance.ttl, guidance/modules/*.ttl, ...) is parsed once
+per process and shared. Entries are keyed by resolved path and revalidated on
+every lookup by (mtime, size); when those change the content hash decides
+whether the file is actually re-parsed. With a snapshot directory, parsed
+files are also cached as binary snapshots keyed by that hash, so later
+processes map the snapshot instead of parsing. Callers get either a
+read-only view over the shared store or a copy-on-write graph that keeps
+its own changes in an overlay. Either way, prefix bindings made on a view
+stay local to it.
+"""
+
+import hashlib
+import logging
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from rdflib import Graph
+from rdflib.util import guess_format
+
+from .graph_snapshot import SnapshotError, default_snapshot_dir, load_snapshot, snapshot_path_for, write_snapshot
+from .overlay_graph import OverlayStore
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# Rough cost of one triple in the Memory store's three indexes, measured on rdflib 7
+STORE_BYTES_PER_TRIPLE = 1700
+
+
+class ReadOnlyGraphError(TypeError):
+    """Raised when a shared read-only graph is modified"""
+
+
+def estimate_graph_bytes(graph: Graph) -> int:
+    """Approximate resident size of a graph: its distinct terms plus store indexes"""
+    terms = set()
+    for triple in graph:
+        terms.update(triple)
+    return sum(sys.getsizeof(term) for term in terms) + len(graph) * STORE_BYTES_PER_TRIPLE
+
+
+class SharedGraph(Graph):
+    """Graph over a store shared with the registry.
+
+    Each view has its own OverlayStore over the shared graph. Reads pass
+    through to the shared triples, and prefix bindings shadow the shared
+    ones without changing what other views see. Read-only views reject
+    writes; copy-on-write graphs keep theirs in the overlay, so a writer
+    never copies the base triples.
+    """
+
+    def __init__(self, shared: Graph, copy_on_write: bool = False):
+        super().__init__(store=OverlayStore(shared), identifier=shared.identifier, bind_namespaces="none")
+        self.shared = shared
+        self.copy_on_write = copy_on_write
+        # Whether this graph has written to its overlay
+        self.detached = False
+
+    def _before_write(self) -> None:
+        if not self.copy_on_write:
+            raise ReadOnlyGraphError("Shared registry graphs are read-only; use checkout() to modify")
+        self.detached = True
+
+    def add(self, triple):
+        self._before_write()
+        return super().add(triple)
+
+    def addN(self, quads):
+        self._before_write()
+        return super().addN(quads)
+
+    def remove(self, triple):
+        self._before_write()
+        return super().remove(triple)
+
+    def set(self, triple):
+        self._before_write()
+        return super().set(triple)
+
+    def parse(self, *args: Any, **kwargs: Any):
+        self._before_write()
+        return super().parse(*args, **kwargs)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self._before_write()
+        return super().update(*args, **kwargs)
+
+
+@dataclass
+class _Entry:
+    graph: Graph
+    mtime_ns: int
+    size: int
+    sha256: str
+    triples: int
+    bytes: int
+    loads: int = 1
+    hits: int = 0
+
+
+class GraphRegistry:
+    """Parses each ontology file once and hands out shared views of it"""
+
+    def __init__(self, snapshot_dir: Optional[PathLike] = None) -> None:
+        """
+        Args:
+            snapshot_dir: Directory for cached binary snapshots; None parses every new file
+        """
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir is not None else None
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(path: PathLike) -> str:
+        return str(Path(path).resolve())
+
+    def _load(self, key: str, format: Optional[str]) -> _Entry:
+        stat = os.stat(key)
+        entry = self._entries.get(key)
+        if entry is not None and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+            entry.hits += 1
+            return entry
+
+        with open(key, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if entry is not None and entry.sha256 == digest:
+            # Touched but unchanged
+            entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+            entry.hits += 1
+            return entry
+
+        graph, size = self._parse(key, data, digest, format or guess_format(key) or "turtle")
+        loads = entry.loads + 1 if entry is not None else 1
+        entry = _Entry(graph, stat.st_mtime_ns, stat.st_size, digest, len(graph), size, loads)
+        self._entries[key] = entry
+        logger.info(f"Loaded shared graph {key} ({entry.triples} triples, ~{entry.bytes // 1024} KiB)")
+        return entry
+
+    def _parse(self, key: str, data: bytes, digest: str, format: str) -> Tuple[Graph, int]:
+        """Parse source bytes, or map their cached snapshot; returns the graph and its size in bytes"""
+        base = Path(key).as_uri()
+        snapshot = None
+        if self.snapshot_dir is not None:
+            snapshot = snapshot_path_for(self.snapshot_dir, digest, base, format)
+            if snapshot.exists():
+                try:
+                    graph = load_snapshot(snapshot)
+                    logger.debug(f"Mapped snapshot {snapshot} for {key}")
+                    return graph, snapshot.stat().st_size
+                except (OSError, SnapshotError) as e:
+                    logger.warning(f"Ignoring unreadable snapshot {snapshot}: {e}")
+
+        graph = Graph()
+        graph.parse(data=data, format=format, publicID=base)
+        if snapshot is not None:
+            try:
+                snapshot.parent.mkdir(parents=True, exist_ok=True)
+                write_snapshot(graph, snapshot)
+            except (OSError, SnapshotError) as e:
+                logger.warning(f"Could not cache snapshot for {key}: {e}")
+        return graph, estimate_graph_bytes(graph)
+
+    def get(self, path: PathLike, format: Optional[str] = None) -> SharedGraph:
+        """Get a read-only view of the ontology at path, re-parsing it only if its content changed"""
+        with self._lock:
+            return SharedGraph(self._load(self._key(path), format).graph)
+
+    def checkout(self, path: PathLike, format: Optional[str] = None) -> SharedGraph:
+        """Get a writable graph that shares the parsed triples until its first write"""
+        with self._lock:
+            return SharedGraph(self._load(self._key(path), format).graph, copy_on_write=True)
+
+    def load_into(self, graph: Graph, path: PathLike, format: Optional[str] = None) -> Graph:
+        """Merge a shared ontology into an existing graph instead of parsing it again"""
+        shared = self.get(path, format)
+        graph += shared
+        for prefix, namespace in shared.namespaces():
+            graph.bind(prefix, namespace, override=False)
+        return graph
+
+    def invalidate(self, path: Optional[PathLike] = None) -> None:
+        """Drop one cached graph, or all of them"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(path), None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Size, load and hit counts per cached graph"""
+        with self._lock:
+            return {
+                key: {
+                    "triples": entry.triples,
+                    "bytes": entry.bytes,
+                    "sha256": entry.sha256,
+                    "loads": entry.loads,
+                    "hits": entry.hits,
+                }
+                for key, entry in self._entries.items()
+            }
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.bytes for entry in self._entries.values())
+
+
+_registry: Optional[GraphRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_graph_registry() -> GraphRegistry:
+    """Get the process-wide graph registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = GraphRegistry(default_snapshot_dir())
+    return _registry
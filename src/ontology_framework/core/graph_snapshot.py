@@ -0,0 +1,364 @@
+"""
+Compact binary snapshots of RDF graphs.
+
+A snapshot is a dictionary-encoded term table plus three sorted arrays of
+integer triples (SPO, POS and OSP). Loading one maps the file and serves
+triple patterns by binary search over the arrays, so nothing is parsed and
+terms are only decoded when a pattern touches them.
+
+Layout (little-endian, version 1)::
+
+    header     magic, version, term count, triple count, section offsets
+    namespaces JSON object of prefix -> namespace
+    offsets    uint64[terms + 1], byte offset of each term record
+    terms      term records, sorted by their encoding so ids follow that order
+    spo/pos/osp  uint32[triples * 3] rows in (s, p, o), (p, o, s), (o, s, p) order
+
+A term record is a kind byte (U, B or L) followed by the UTF-8 value; a
+literal's value is ``uint32 lexical length, lexical, uint16 language length,
+language, datatype``.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.store import Store
+from rdflib.term import Node
+from rdflib.util import guess_format
+
+MAGIC = b"OFSNAP\0\0"
+VERSION = 1
+SUFFIX = ".ofsnap"
+
+# magic, version, flags, terms, triples, then offsets of namespaces (and its
+# length), term offsets, term data, spo, pos and osp
+_HEADER = struct.Struct("<8sIIQQQQQQQQQ")
+
+# Position of each of (s, p, o) inside the rows of each index
+_INDEX_ORDER = {"spo": (0, 1, 2), "pos": (1, 2, 0), "osp": (2, 0, 1)}
+
+PathLike = Union[str, Path]
+
+
+class SnapshotError(ValueError):
+    """Raised for files that are not snapshots this version can read"""
+
+
+def encode_term(term: Node) -> bytes:
+    """Encode one term as a snapshot term record"""
+    if isinstance(term, Literal):
+        lexical = str(term).encode("utf-8")
+        language = (term.language or "").encode("utf-8")
+        datatype = str(term.datatype or "").encode("utf-8")
+        return b"L" + struct.pack("<I", len(lexical)) + lexical + struct.pack("<H", len(language)) + language + datatype
+    if isinstance(term, BNode):
+        return b"B" + str(term).encode("utf-8")
+    if isinstance(term, URIRef):
+        return b"U" + str(term).encode("utf-8")
+    raise SnapshotError(f"Cannot snapshot term of type {type(term).__name__}")
+
+
+def decode_term(record: bytes) -> Node:
+    """Decode one snapshot term record"""
+    kind = record[:1]
+    if kind == b"U":
+        return URIRef(record[1:].decode("utf-8"))
+    if kind == b"B":
+        return BNode(record[1:].decode("utf-8"))
+    if kind == b"L":
+        (lexical_length,) = struct.unpack_from("<I", record, 1)
+        start = 5 + lexical_length
+        (language_length,) = struct.unpack_from("<H", record, start)
+        lexical = record[5:start].decode("utf-8")
+        language = record[start + 2:start + 2 + language_length].decode("utf-8") or None
+        datatype = record[start + 2 + language_length:].decode("utf-8") or None
+        return Literal(lexical, lang=language, datatype=datatype)
+    raise SnapshotError(f"Unknown term kind {kind!r}")
+
+
+def _align(f, boundary: int = 8) -> int:
+    position = f.tell()
+    padding = -position % boundary
+    if padding:
+        f.write(b"\0" * padding)
+    return position + padding
+
+
+def write_snapshot(graph: Graph, path: PathLike) -> Path:
+    """Write a graph as a snapshot file, atomically replacing any existing one"""
+    records = sorted({encode_term(term) for triple in graph for term in triple})
+    if len(records) >= 2 ** 32:
+        raise SnapshotError("Snapshots hold at most 2**32 - 1 distinct terms")
+    ids = {record: i for i, record in enumerate(records)}
+    rows = [(ids[encode_term(s)], ids[encode_term(p)], ids[encode_term(o)]) for s, p, o in graph]
+
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    namespaces = json.dumps({prefix: str(ns) for prefix, ns in graph.namespaces()}).encode("utf-8")
+    with open(tmp_path, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        ns_offset = f.tell()
+        f.write(namespaces)
+
+        offsets = array("Q", [0])
+        for record in records:
+            offsets.append(offsets[-1] + len(record))
+        offsets_offset = _align(f)
+        _write_array(f, offsets)
+        terms_offset = f.tell()
+        for record in records:
+            f.write(record)
+
+        index_offsets = []
+        for order in _INDEX_ORDER.values():
+            index_offsets.append(_align(f))
+            flat = array("I")
+            for row in sorted(tuple(r[i] for i in order) for r in rows):
+                flat.extend(row)
+            _write_array(f, flat)
+
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(records), len(rows), ns_offset, len(namespaces),
+                             offsets_offset, terms_offset, *index_offsets))
+    os.replace(tmp_path, path)
+    return path
+
+
+def _write_array(f, values: array) -> None:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    values.tofile(f)
+
+
+def _read_array(buffer: memoryview, typecode: str, offset: int, count: int) -> Sequence[int]:
+    size = array(typecode).itemsize
+    view = buffer[offset:offset + count * size]
+    if sys.byteorder == "little":
+        return view.cast(typecode)
+    values = array(typecode, view.tobytes())
+    values.byteswap()
+    return values
+
+
+class SnapshotStore(Store):
+    """Read-only rdflib store over a memory-mapped snapshot file"""
+
+    # A single graph; contexts are ignored, but Dataset wrappers (pyshacl) need the flags
+    context_aware = True
+    formula_aware = False
+    graph_aware = True
+    transaction_aware = False
+
+    def __init__(self, path: PathLike):
+        super().__init__()
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        if len(self._buffer) < _HEADER.size:
+            raise SnapshotError(f"{self.path} is not a graph snapshot")
+        (magic, version, _, self.term_count, self.triple_count, ns_offset, ns_length,
+         offsets_offset, self._terms_offset, *index_offsets) = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a graph snapshot")
+        if version != VERSION:
+            raise SnapshotError(f"{self.path} is snapshot version {version}, expected {VERSION}")
+
+        self._namespaces: Dict[str, URIRef] = {
+            prefix: URIRef(ns) for prefix, ns in json.loads(bytes(self._buffer[ns_offset:ns_offset + ns_length])).items()
+        }
+        self._offsets = _read_array(self._buffer, "Q", offsets_offset, self.term_count + 1)
+        self._indexes = {
+            name: _read_array(self._buffer, "I", offset, self.triple_count * 3)
+            for name, offset in zip(_INDEX_ORDER, index_offsets)
+        }
+        self._decoded: Dict[int, Node] = {}
+
+    def _record(self, term_id: int) -> bytes:
+        start = self._terms_offset + self._offsets[term_id]
+        end = self._terms_offset + self._offsets[term_id + 1]
+        return bytes(self._buffer[start:end])
+
+    def term(self, term_id: int) -> Node:
+        """Decode a term id, caching the result"""
+        term = self._decoded.get(term_id)
+        if term is None:
+            term = self._decoded[term_id] = decode_term(self._record(term_id))
+        return term
+
+    def term_id(self, term: Node) -> Optional[int]:
+        """Find a term's id by binary search over the sorted term table"""
+        try:
+            record = encode_term(term)
+        except SnapshotError:
+            return None
+        i = bisect_left(range(self.term_count), record, key=self._record)
+        if i < self.term_count and self._record(i) == record:
+            return i
+        return None
+
+    def _rows(self, index: str, prefix: Tuple[int, ...]) -> Iterator[Tuple[int, int, int]]:
+        """Rows of an index whose leading columns equal prefix, as (s, p, o)"""
+        rows = self._indexes[index]
+        width = len(prefix)
+        key = (lambda i: tuple(rows[3 * i:3 * i + width])) if width else None
+        lo, hi = 0, self.triple_count
+        if width:
+            lo = bisect_left(range(self.triple_count), prefix, key=key)
+            hi = bisect_right(range(self.triple_count), prefix, lo=lo, key=key)
+        order = _INDEX_ORDER[index]
+        for i in range(lo, hi):
+            row = rows[3 * i:3 * i + 3]
+            spo = [0, 0, 0]
+            for column, position in enumerate(order):
+                spo[position] = row[column]
+            yield tuple(spo)
+
+    def triples(self, triple_pattern, context=None):
+        ids = []
+        for term in triple_pattern:
+            if term is None:
+                ids.append(None)
+                continue
+            term_id = self.term_id(term)
+            if term_id is None:
+                return
+            ids.append(term_id)
+
+        s, p, o = ids
+        if s is not None:
+            index, prefix = ("spo", (s, p, o) if o is not None else (s, p)) if p is not None else (
+                ("osp", (o, s)) if o is not None else ("spo", (s,)))
+        elif p is not None:
+            index, prefix = "pos", (p, o) if o is not None else (p,)
+        elif o is not None:
+            index, prefix = "osp", (o,)
+        else:
+            index, prefix = "spo", ()
+        for row in self._rows(index, prefix):
+            yield (self.term(row[0]), self.term(row[1]), self.term(row[2])), iter(())
+
+    def __len__(self, context=None) -> int:
+        return self.triple_count
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def add_graph(self, graph) -> None:
+        pass
+
+    def remove_graph(self, graph) -> None:
+        pass
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        # Prefixes are kept in memory only; the snapshot file is never written
+        bound = self._namespaces.get(prefix)
+        if bound is None or override:
+            self._namespaces[prefix] = URIRef(namespace)
+
+    def namespace(self, prefix: str) -> Optional[URIRef]:
+        return self._namespaces.get(prefix)
+
+    def prefix(self, namespace: URIRef) -> Optional[str]:
+        for prefix, ns in self._namespaces.items():
+            if ns == namespace:
+                return prefix
+        return None
+
+    def namespaces(self):
+        return iter(list(self._namespaces.items()))
+
+    def add(self, triple, context, quoted=False):
+        raise TypeError("Snapshot stores are read-only")
+
+    def addN(self, quads):
+        raise TypeError("Snapshot stores are read-only")
+
+    def remove(self, triple, context=None):
+        raise TypeError("Snapshot stores are read-only")
+
+    def close(self, commit_pending_transaction: bool = False) -> None:
+        if self._mmap.closed:
+            return
+        self._decoded.clear()
+        # Views into the map must be released before it can be closed
+        for values in [self._offsets, *self._indexes.values()]:
+            if isinstance(values, memoryview):
+                values.release()
+        self._indexes.clear()
+        self._buffer.release()
+        self._mmap.close()
+
+
+def load_snapshot(path: PathLike, identifier: Optional[Node] = None) -> Graph:
+    """Open a snapshot as a graph backed by the mapped file"""
+    return Graph(store=SnapshotStore(path), identifier=identifier, bind_namespaces="none")
+
+
+def snapshot_path_for(cache_dir: PathLike, content_hash: str, base: str = "", format: str = "") -> Path:
+    """Cache location of a source's snapshot, keyed by its content hash.
+
+    The base IRI and format are part of the key because relative IRIs and the
+    parser both change the triples the same bytes produce.
+    """
+    key = hashlib.sha256(f"{content_hash}\0{base}\0{format}\0{VERSION}".encode("utf-8")).hexdigest()
+    return Path(cache_dir) / f"{key}{SUFFIX}"
+
+
+def default_snapshot_dir() -> Optional[Path]:
+    """Snapshot cache directory: BEAST_MODE_SNAPSHOT_DIR, or the user cache; '' disables caching"""
+    configured = os.environ.get("BEAST_MODE_SNAPSHOT_DIR")
+    if configured is not None:
+        return Path(configured) if configured else None
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "ontology_framework" / "snapshots"
+
+
+def benchmark(source: PathLike, snapshot: Optional[PathLike] = None, repeat: int = 5,
+              format: Optional[str] = None) -> Dict[str, Any]:
+    """Compare parsing a source file with opening (and fully scanning) its snapshot"""
+    source = Path(source)
+    format = format or guess_format(str(source)) or "turtle"
+    parse_times: List[float] = []
+    graph = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        graph = Graph()
+        graph.parse(str(source), format=format)
+        parse_times.append(time.perf_counter() - start)
+
+    snapshot = Path(snapshot) if snapshot else source.with_suffix(SUFFIX)
+    if not snapshot.exists():
+        write_snapshot(graph, snapshot)
+
+    open_times: List[float] = []
+    scan_times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loaded = load_snapshot(snapshot)
+        open_times.append(time.perf_counter() - start)
+        count = sum(1 for _ in loaded)
+        scan_times.append(time.perf_counter() - start)
+        loaded.store.close()
+
+    return {
+        "source": str(source),
+        "snapshot": str(snapshot),
+        "triples": count,
+        "source_bytes": source.stat().st_size,
+        "snapshot_bytes": snapshot.stat().st_size,
+        "parse_ms": min(parse_times) * 1000,
+        "open_ms": min(open_times) * 1000,
+        "open_and_scan_ms": min(scan_times) * 1000,
+    }
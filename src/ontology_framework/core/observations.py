@@ -0,0 +1,255 @@
+"""
+Background, batched delivery of ReflectiveModule observations.
+
+emit_observation only enqueues; a daemon thread drains the bounded queue in
+batches and hands them to each observation's sink. When the queue is full,
+repeats of a queued event are coalesced into it and otherwise the oldest
+event is dropped.
+"""
+
+import atexit
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_UNRESOLVED = object()
+_global_handler_getter: Any = _UNRESOLVED
+
+
+def resolve_global_handler_getter() -> Optional[Callable[[], Any]]:
+    """Import the Observatory's global handler accessor once, caching failures too"""
+    global _global_handler_getter
+    if _global_handler_getter is _UNRESOLVED:
+        try:
+            from src.beast_mode.observatory.observation_handler import get_global_observation_handler
+            _global_handler_getter = get_global_observation_handler
+        except ImportError:
+            logger.debug("Observatory observation handler not available")
+            _global_handler_getter = None
+    return _global_handler_getter
+
+
+class ObservationSink(ABC):
+    """Destination for batches of observations"""
+
+    @abstractmethod
+    def send_batch(self, observations: List[Dict[str, Any]]) -> None:
+        """Deliver a batch of observations"""
+
+
+class WebSocketSink(ObservationSink):
+    """Broadcast through an Observatory WebSocket observation handler"""
+
+    def __init__(self, handler: Any):
+        self.handler = handler
+
+    def send_batch(self, observations: List[Dict[str, Any]]) -> None:
+        broadcast_batch = getattr(self.handler, "broadcast_observations", None)
+        if broadcast_batch is not None:
+            broadcast_batch(observations)
+            return
+        for observation in observations:
+            self.handler.broadcast_observation(observation)
+
+
+class ObservatorySink(ObservationSink):
+    """Broadcast through the global Observatory handler, when one is installed"""
+
+    def __init__(self, tracer_getter: Optional[Callable[[], Any]] = None):
+        self.tracer_getter = tracer_getter
+
+    def send_batch(self, observations: List[Dict[str, Any]]) -> None:
+        getter = resolve_global_handler_getter()
+        handler = getter() if getter else None
+        if not handler:
+            return
+        sink = WebSocketSink(handler)
+        tracer = self._tracer()
+        if tracer is None:
+            sink.send_batch(observations)
+            return
+        for observation in observations:
+            with tracer.trace_observation_flow(observation):
+                handler.broadcast_observation(observation)
+
+    def _tracer(self) -> Any:
+        if self.tracer_getter is None:
+            return None
+        try:
+            tracer = self.tracer_getter()
+            return tracer if tracer.is_available() else None
+        except Exception as e:
+            logger.debug(f"Tracing failed, continuing without: {e}")
+            return None
+
+
+class FileSink(ObservationSink):
+    """Append observations to a JSON lines file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send_batch(self, observations: List[Dict[str, Any]]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(o, default=str) + "\n" for o in observations))
+
+
+class MemorySink(ObservationSink):
+    """Keep delivered observations and batch sizes in memory, for tests"""
+
+    def __init__(self):
+        self.observations: List[Dict[str, Any]] = []
+        self.batch_sizes: List[int] = []
+
+    def send_batch(self, observations: List[Dict[str, Any]]) -> None:
+        self.observations.extend(observations)
+        self.batch_sizes.append(len(observations))
+
+
+class ObservationEmitter:
+    """Bounded queue drained by a background thread into per-sink batches"""
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 100, flush_interval: float = 0.05):
+        """
+        Args:
+            max_queue: Observations held before the overflow policy applies
+            batch_size: Most observations delivered to a sink at once
+            flush_interval: Seconds the worker waits to fill a batch
+        """
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Deque[Tuple[ObservationSink, Dict[str, Any]]] = deque()
+        self._queued_by_key: Dict[Tuple, Dict[str, Any]] = {}
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    @staticmethod
+    def _key(sink: ObservationSink, observation: Dict[str, Any]) -> Tuple:
+        return (id(sink), observation.get("module"), observation.get("event_type"), observation.get("message"))
+
+    def emit(self, sink: ObservationSink, observation: Dict[str, Any]) -> bool:
+        """Queue an observation; returns False if it was dropped or coalesced"""
+        with self._condition:
+            if self._closed:
+                self.dropped += 1
+                return False
+            key = self._key(sink, observation)
+            if len(self._queue) >= self.max_queue:
+                queued = self._queued_by_key.get(key)
+                if queued is not None:
+                    queued["repeat_count"] = queued.get("repeat_count", 1) + 1
+                    self.coalesced += 1
+                    return False
+                old_sink, oldest = self._queue.popleft()
+                self._forget(old_sink, oldest)
+                self.dropped += 1
+            self._queue.append((sink, observation))
+            self._queued_by_key.setdefault(key, observation)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="observation-emitter", daemon=True)
+                self._thread.start()
+            if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                self._condition.notify()
+        return True
+
+    def _forget(self, sink: ObservationSink, observation: Dict[str, Any]) -> None:
+        key = self._key(sink, observation)
+        if self._queued_by_key.get(key) is observation:
+            del self._queued_by_key[key]
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._queue and not self._closed:
+                    self._condition.wait()
+                if len(self._queue) < self.batch_size and not self._closed:
+                    self._condition.wait(self.flush_interval)
+                if not self._queue:
+                    if self._closed:
+                        return
+                    continue
+                items = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                for sink, observation in items:
+                    self._forget(sink, observation)
+                self._in_flight = len(items)
+            self._deliver(items)
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    def _deliver(self, items: List[Tuple[ObservationSink, Dict[str, Any]]]) -> None:
+        batches: Dict[int, Tuple[ObservationSink, List[Dict[str, Any]]]] = {}
+        for sink, observation in items:
+            batches.setdefault(id(sink), (sink, []))[1].append(observation)
+        for sink, observations in batches.values():
+            try:
+                sink.send_batch(observations)
+                self.delivered += len(observations)
+            except Exception as e:
+                # Don't let observation delivery break the main functionality
+                self.failed += len(observations)
+                logger.debug(f"Could not deliver {len(observations)} observations: {e}")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued observation has been handed to its sink"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify_all()
+            while self._queue or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(min(remaining, self.flush_interval))
+                self._condition.notify_all()
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Deliver what is queued and stop the worker thread"""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": len(self._queue),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+        }
+
+
+_emitter: Optional[ObservationEmitter] = None
+_emitter_lock = threading.Lock()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    if _emitter is not None:
+        _emitter.flush(timeout=1.0)
+
+
+def get_observation_emitter() -> ObservationEmitter:
+    """Get the process-wide observation emitter"""
+    global _emitter
+    if _emitter is None:
+        with _emitter_lock:
+            if _emitter is None:
+                _emitter = ObservationEmitter()
+    return _emitter
@@ -0,0 +1,193 @@
+"""
+Copy-on-write overlay over an existing graph.
+
+An OverlayGraph reads through to a base graph and records its own writes as
+an added graph and a removed set, so transformations, patches and what-if
+validations can run on a large graph without copying it. The delta can be
+committed into the base, discarded, or extracted as a SPARQL Update.
+
+The base must not be modified while an overlay over it is in use: the delta
+is recorded against the base as it was when each write was made. Reads stay
+consistent if it does change (a triple the base gains after the overlay added
+it is reported once), but the overlay then sees the base's later state.
+"""
+
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from rdflib import BNode, Graph, URIRef
+from rdflib.store import Store
+from rdflib.term import Node
+
+Triple = Tuple[Node, Node, Node]
+
+
+class OverlayStore(Store):
+    """rdflib store that layers an added graph and a removed set over a base graph.
+
+    Invariants, as long as the base is not modified: added triples are not in
+    the base, removed triples are. Reads and len() hold up if the base does
+    change under the overlay, at a cost proportional to the delta. Prefix
+    bindings made on the overlay shadow the base's without changing it.
+    """
+
+    # A single graph; contexts are ignored, but Dataset wrappers (pyshacl) need the flags
+    context_aware = True
+    formula_aware = False
+    graph_aware = True
+    transaction_aware = False
+
+    def __init__(self, base: Graph):
+        super().__init__()
+        self.base = base
+        self.added = Graph(bind_namespaces="none")
+        self.removed: Set[Triple] = set()
+        self._namespaces: Dict[str, URIRef] = {}
+
+    def add(self, triple: Triple, context=None, quoted: bool = False) -> None:
+        if triple in self.removed:
+            self.removed.discard(triple)
+        elif triple not in self.base:
+            self.added.add(triple)
+
+    def addN(self, quads) -> None:
+        for s, p, o, _ in quads:
+            self.add((s, p, o))
+
+    def remove(self, triple_pattern, context=None) -> None:
+        for triple, _ in list(self.triples(triple_pattern)):
+            if triple in self.added:
+                self.added.remove(triple)
+            else:
+                self.removed.add(triple)
+
+    def triples(self, triple_pattern, context=None) -> Iterator:
+        removed = self.removed
+        base = self.base
+        for triple in base.triples(triple_pattern):
+            if triple not in removed:
+                yield triple, iter(())
+        for triple in self.added.triples(triple_pattern):
+            # Skip triples the base has gained since they were added here
+            if triple not in base:
+                yield triple, iter(())
+
+    def __len__(self, context=None) -> int:
+        base = self.base
+        hidden = sum(1 for triple in self.removed if triple in base)
+        added = sum(1 for triple in self.added if triple not in base)
+        return len(base) - hidden + added
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def add_graph(self, graph) -> None:
+        pass
+
+    def remove_graph(self, graph) -> None:
+        pass
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        if override or self.namespace(prefix) is None:
+            self._namespaces[prefix] = URIRef(namespace)
+
+    def namespace(self, prefix: str) -> Optional[URIRef]:
+        if prefix in self._namespaces:
+            return self._namespaces[prefix]
+        return self.base.store.namespace(prefix)
+
+    def prefix(self, namespace: URIRef) -> Optional[str]:
+        for prefix, ns in self._namespaces.items():
+            if ns == namespace:
+                return prefix
+        prefix = self.base.store.prefix(namespace)
+        return None if prefix in self._namespaces else prefix
+
+    def namespaces(self):
+        merged = {prefix: ns for prefix, ns in self.base.namespaces()}
+        merged.update(self._namespaces)
+        return iter(list(merged.items()))
+
+    def reset(self) -> None:
+        self.added = Graph(bind_namespaces="none")
+        self.removed = set()
+        self._namespaces = {}
+
+
+class OverlayGraph(Graph):
+    """Graph whose writes stay in an overlay until commit() or discard().
+
+    The base graph must not be modified while the overlay is in use.
+    """
+
+    def __init__(self, base: Graph, identifier: Optional[Node] = None):
+        super().__init__(store=OverlayStore(base), identifier=identifier or base.identifier,
+                         bind_namespaces="none")
+
+    @property
+    def base_graph(self) -> Graph:
+        return self.store.base
+
+    @property
+    def added(self) -> Set[Triple]:
+        """Triples the overlay adds to the base"""
+        return set(self.store.added)
+
+    @property
+    def removed(self) -> Set[Triple]:
+        """Base triples the overlay hides"""
+        return set(self.store.removed)
+
+    @property
+    def dirty(self) -> bool:
+        return bool(len(self.store.added) or self.store.removed or self.store._namespaces)
+
+    def commit(self) -> Tuple[int, int]:
+        """Apply the delta and prefix bindings to the base graph and clear the overlay.
+
+        Returns:
+            Number of triples added to and removed from the base
+        """
+        store = self.store
+        added, removed = len(store.added), len(store.removed)
+        for triple in store.removed:
+            self.base_graph.remove(triple)
+        self.base_graph.addN((s, p, o, self.base_graph) for s, p, o in store.added)
+        for prefix, namespace in store._namespaces.items():
+            self.base_graph.bind(prefix, namespace, override=True, replace=True)
+        store.reset()
+        return added, removed
+
+    def discard(self) -> None:
+        """Drop every change made through the overlay"""
+        self.store.reset()
+
+    def to_sparql_update(self) -> str:
+        """The delta as a SPARQL Update request: DELETE DATA then INSERT DATA.
+
+        Raises:
+            ValueError: If a removed triple contains a blank node, which DELETE DATA cannot match
+        """
+        parts = []
+        removed = sorted(self.store.removed)
+        if removed:
+            if any(isinstance(term, BNode) for triple in removed for term in triple):
+                raise ValueError("DELETE DATA cannot remove triples with blank nodes")
+            parts.append("DELETE DATA {\n" + _triples_block(removed) + "}")
+        added = sorted(self.store.added)
+        if added:
+            parts.append("INSERT DATA {\n" + _triples_block(added) + "}")
+        return " ;\n".join(parts)
+
+    def to_patch(self) -> str:
+        """The delta as patch content: Turtle for pure additions, otherwise a SPARQL Update"""
+        if self.store.removed:
+            return self.to_sparql_update()
+        additions = Graph(bind_namespaces="none")
+        for prefix, namespace in self.namespaces():
+            additions.bind(prefix, namespace)
+        additions += self.store.added
+        return additions.serialize(format="turtle")
+
+
+def _triples_block(triples) -> str:
+    return "".join(f"    {s.n3()} {p.n3()} {o.n3()} .\n" for s, p, o in triples)
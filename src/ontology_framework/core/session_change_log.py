@@ -0,0 +1,197 @@
+"""
+Append-only, indexed change log for modelling sessions.
+
+Each recorded change is appended as one JSON line to a local file and kept in
+memory with hash indexes by subject, predicate, change type and change id, so
+recording and lookups cost the same however long the session gets. Progress
+markers for flushes to the store and for exports are appended to the same
+file; reopening the log replays it, so only changes made since the last
+flush or export are written again.
+"""
+
+import json
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Union
+import uuid
+
+TTL_PREFIXES = (
+    "@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .\n"
+    "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n"
+    "@prefix meta: <http://ontologies.louspringer.com/meta#> .\n"
+    "\n"
+)
+
+
+@dataclass
+class SessionChange:
+    """One triple recorded in a session.
+
+    Terms are kept as given, in N-Triples/Turtle syntax (e.g. '<http://...>'
+    or '"label"').
+    """
+
+    subject: str
+    predicate: str
+    object: str
+    change_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    change_type: Optional[str] = None
+    guidance_ref: Optional[str] = None
+    comment: Optional[str] = None
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+class SessionChangeLog:
+    """In-memory indexed change-set backed by an append-only file."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Open the log, replaying any existing file.
+
+        Args:
+            path: Log file; created on the first write
+        """
+        self.path = Path(path)
+        self.changes: List[SessionChange] = []
+        self.flushed = 0
+        self.exported: Dict[str, int] = {}
+        self._by_subject: Dict[str, List[int]] = defaultdict(list)
+        self._by_predicate: Dict[str, List[int]] = defaultdict(list)
+        self._by_change_type: Dict[Optional[str], List[int]] = defaultdict(list)
+        self._by_change_id: Dict[str, List[int]] = defaultdict(list)
+        self._file: Optional[TextIO] = None
+        if self.path.exists():
+            self._replay()
+
+    def _replay(self) -> None:
+        intact = 0
+        with self.path.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                intact += len(line)
+                op = record.pop("op")
+                if op == "change":
+                    self._index(SessionChange(**record))
+                elif op == "flushed":
+                    self.flushed = record["count"]
+                elif op == "exported":
+                    self.exported[record["path"]] = record["count"]
+        if intact < self.path.stat().st_size:
+            # Drop a write interrupted mid-line so later appends start on a fresh line
+            with self.path.open("r+b") as f:
+                f.truncate(intact)
+
+    def _append(self, record: dict) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def _index(self, change: SessionChange) -> None:
+        position = len(self.changes)
+        self.changes.append(change)
+        self._by_subject[change.subject].append(position)
+        self._by_predicate[change.predicate].append(position)
+        self._by_change_type[change.change_type].append(position)
+        self._by_change_id[change.change_id].append(position)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "SessionChangeLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __iter__(self) -> Iterator[SessionChange]:
+        return iter(self.changes)
+
+    def record(self, subject: str, predicate: str, object_val: str,
+               change_type: Optional[str] = None, guidance_ref: Optional[str] = None,
+               comment: Optional[str] = None, change_id: Optional[str] = None,
+               timestamp: Optional[str] = None) -> SessionChange:
+        """Record one triple; pass the same change_id to group triples into one change"""
+        change = SessionChange(subject, predicate, object_val,
+                               change_type=change_type, guidance_ref=guidance_ref, comment=comment)
+        if change_id is not None:
+            change.change_id = change_id
+        if timestamp is not None:
+            change.timestamp = timestamp
+        self._append({"op": "change", **asdict(change)})
+        self._index(change)
+        return change
+
+    def by_subject(self, subject: str) -> List[SessionChange]:
+        return [self.changes[i] for i in self._by_subject.get(subject, ())]
+
+    def by_predicate(self, predicate: str) -> List[SessionChange]:
+        return [self.changes[i] for i in self._by_predicate.get(predicate, ())]
+
+    def by_change_type(self, change_type: Optional[str]) -> List[SessionChange]:
+        return [self.changes[i] for i in self._by_change_type.get(change_type, ())]
+
+    def by_change_id(self, change_id: str) -> List[SessionChange]:
+        return [self.changes[i] for i in self._by_change_id.get(change_id, ())]
+
+    def grouped(self) -> Dict[str, List[SessionChange]]:
+        """Changes by change id, in the order each change was first recorded"""
+        return {change_id: [self.changes[i] for i in positions]
+                for change_id, positions in self._by_change_id.items()}
+
+    @property
+    def pending(self) -> List[SessionChange]:
+        """Changes not yet flushed to the store"""
+        return self.changes[self.flushed:]
+
+    def flush(self, write_batch: Callable[[List[SessionChange]], None], batch_size: int = 500) -> int:
+        """Write pending changes to the store in batches.
+
+        write_batch must store its batch atomically; progress is recorded after
+        each batch, so a failure leaves only the failed batch and later ones
+        pending. A crash after a batch is stored but before its progress is
+        recorded sends that batch again, so write_batch must skip changes it
+        already holds, e.g. by change id.
+
+        Returns:
+            Number of changes flushed
+        """
+        start = self.flushed
+        while self.flushed < len(self.changes):
+            batch = self.changes[self.flushed:self.flushed + batch_size]
+            write_batch(batch)
+            self.flushed += len(batch)
+            self._append({"op": "flushed", "count": self.flushed})
+        return self.flushed - start
+
+    def export_ttl(self, path: Union[str, Path]) -> int:
+        """Append changes not yet exported to path to a Turtle file.
+
+        Returns:
+            Number of triples written
+        """
+        path = Path(path)
+        key = str(path.resolve())
+        start = self.exported.get(key, 0) if path.exists() else 0
+        if start == len(self.changes) and path.exists():
+            return 0
+        with path.open("a" if start else "w", encoding="utf-8") as f:
+            if not start:
+                f.write(TTL_PREFIXES)
+            for change in self.changes[start:]:
+                f.write(f"{change.subject} {change.predicate} {change.object} .\n")
+        self.exported[key] = len(self.changes)
+        self._append({"op": "exported", "path": key, "count": len(self.changes)})
+        return len(self.changes) - start
@@ -0,0 +1,355 @@
+"""
+Sampled operation tracing for ReflectiveModule.
+
+Every operation updates counters and a per-operation latency histogram.
+Only sampled operations (and failed ones) build an OperationTrace, which is
+kept in a bounded ring and can be exported as OTLP-compatible JSON lines.
+Sampled traces hold raw RSS snapshots; memory deltas are derived on read.
+"""
+
+import json
+import os
+import random
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Upper bounds of the histogram buckets in milliseconds; the last bucket is open
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000
+)
+
+BYTES_PER_MB = 1024 * 1024
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_statm_fd: Optional[int] = None
+_statm_pid = 0
+_process = None
+
+
+def _psutil_rss_bytes() -> int:
+    """Get current RSS in bytes through psutil, resolving the process handle once"""
+    global _process
+    if _process is None:
+        try:
+            import psutil
+            _process = psutil.Process(os.getpid())
+        except Exception:
+            _process = False
+    if not _process:
+        return 0
+    try:
+        return _process.memory_info().rss
+    except Exception:
+        return 0
+
+
+def get_rss_bytes() -> int:
+    """Cheap RSS snapshot in bytes: one pread of /proc/<pid>/statm, psutil elsewhere"""
+    global _statm_fd, _statm_pid
+    pid = os.getpid()
+    if pid != _statm_pid:
+        # Reopened per process so a forked child does not read its parent's statm
+        _statm_pid = pid
+        try:
+            _statm_fd = os.open(f"/proc/{pid}/statm", os.O_RDONLY)
+        except (OSError, AttributeError):
+            _statm_fd = None
+    if _statm_fd is not None:
+        try:
+            return int(os.pread(_statm_fd, 64, 0).split()[1]) * _PAGE_SIZE
+        except (OSError, IndexError, ValueError):
+            pass
+    return _psutil_rss_bytes()
+
+
+def get_memory_usage_mb() -> float:
+    """Get current RSS in MB"""
+    return get_rss_bytes() / BYTES_PER_MB
+
+
+@dataclass
+class OperationTrace:
+    """Complete operation trace with performance metrics - Requirement 22.2"""
+    trace_id: str
+    operation_name: str
+    component_name: str
+    start_time: datetime
+    end_time: Optional[datetime]
+    duration_ms: Optional[float]
+    input_parameters: Dict[str, Any]
+    output_result: Optional[Any]
+    error_info: Optional[Dict[str, Any]]
+    performance_metrics: Dict[str, float]
+    correlation_id: str
+    start_unix_ns: int = 0
+    end_unix_ns: int = 0
+    rss_start_bytes: int = 0
+    rss_end_bytes: int = 0
+
+    @property
+    def memory_usage(self) -> Dict[str, float]:
+        """RSS before and after the operation in MB, derived from the raw snapshots"""
+        if not self.rss_start_bytes:
+            return {}
+        usage = {'start_mb': self.rss_start_bytes / BYTES_PER_MB}
+        if self.rss_end_bytes:
+            usage['end_mb'] = self.rss_end_bytes / BYTES_PER_MB
+            usage['delta_mb'] = (self.rss_end_bytes - self.rss_start_bytes) / BYTES_PER_MB
+        return usage
+
+
+class DiscardedTrace:
+    """Stand-in yielded for unsampled operations; attribute writes are ignored"""
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        return None
+
+
+DISCARDED_TRACE = DiscardedTrace()
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram"""
+
+    __slots__ = ("counts", "count", "total_ms", "min_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms < self.min_ms:
+            self.min_ms = duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "min_ms": self.min_ms if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": dict(zip([*map(str, LATENCY_BUCKETS_MS), "+Inf"], self.counts)),
+        }
+
+
+class OperationTracer:
+    """Sampling tracer shared by the operations of one module"""
+
+    def __init__(self, component_name: str, correlation_id: str,
+                 sample_rate: Optional[float] = None, capacity: int = 1000,
+                 trace_memory: Optional[bool] = None, export_path: Optional[str] = None):
+        """
+        Args:
+            component_name: Name recorded on every trace
+            correlation_id: Module correlation ID, also used as the OTLP trace ID
+            sample_rate: Fraction of operations traced in full (BEAST_MODE_TRACE_SAMPLE_RATE, default 1.0)
+            capacity: Traces kept in the ring
+            trace_memory: Snapshot RSS around sampled operations (BEAST_MODE_TRACE_MEMORY, default true)
+            export_path: Default OTLP JSON lines file (BEAST_MODE_TRACE_EXPORT_PATH)
+        """
+        if sample_rate is None:
+            sample_rate = float(os.getenv("BEAST_MODE_TRACE_SAMPLE_RATE", "1.0"))
+        if trace_memory is None:
+            trace_memory = os.getenv("BEAST_MODE_TRACE_MEMORY", "true").lower() == "true"
+        self.component_name = component_name
+        self.correlation_id = correlation_id
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.trace_memory = trace_memory
+        self.export_path = export_path or os.getenv("BEAST_MODE_TRACE_EXPORT_PATH")
+        self.traces: Deque[OperationTrace] = deque(maxlen=capacity)
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.operation_count = 0
+        self.error_count = 0
+        self.total_time_ms = 0.0
+        self.peak_rss_bytes = 0
+        self._last_exported: Optional[OperationTrace] = None
+
+    @property
+    def peak_memory_mb(self) -> float:
+        return self.peak_rss_bytes / BYTES_PER_MB
+
+    def should_sample(self) -> bool:
+        rate = self.sample_rate
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    def begin(self, operation_name: str, input_params: Dict[str, Any]) -> OperationTrace:
+        """Create the trace for a sampled operation"""
+        start_unix_ns = time.time_ns()
+        trace = OperationTrace(
+            trace_id=os.urandom(8).hex(),
+            operation_name=operation_name,
+            component_name=self.component_name,
+            start_time=datetime.fromtimestamp(start_unix_ns / 1e9),
+            end_time=None,
+            duration_ms=None,
+            input_parameters=input_params,
+            output_result=None,
+            error_info=None,
+            performance_metrics={},
+            correlation_id=self.correlation_id,
+            start_unix_ns=start_unix_ns
+        )
+        if self.trace_memory:
+            trace.rss_start_bytes = get_rss_bytes()
+        return trace
+
+    def finish(self, operation_name: str, trace: Optional[OperationTrace], start_ns: int,
+               error: Optional[BaseException] = None, input_params: Optional[Dict[str, Any]] = None) -> float:
+        """Record an operation's latency and store its trace; returns the duration in ms"""
+        end_ns = time.perf_counter_ns()
+        duration_ms = (end_ns - start_ns) / 1e6
+
+        histogram = self.histograms.get(operation_name)
+        if histogram is None:
+            histogram = self.histograms.setdefault(operation_name, LatencyHistogram())
+        histogram.record(duration_ms)
+
+        if error is None:
+            self.operation_count += 1
+            self.total_time_ms += duration_ms
+        else:
+            self.error_count += 1
+            # Failures are always kept, even when the operation was not sampled
+            if trace is None:
+                trace = self.begin(operation_name, input_params or {})
+                trace.start_unix_ns -= end_ns - start_ns
+                trace.start_time = datetime.fromtimestamp(trace.start_unix_ns / 1e9)
+        if trace is None:
+            return duration_ms
+
+        trace.end_time = datetime.now()
+        trace.end_unix_ns = trace.start_unix_ns + (end_ns - start_ns)
+        trace.duration_ms = duration_ms
+        trace.performance_metrics = {'duration_ms': duration_ms, 'success': error is None}
+        if error is not None:
+            trace.error_info = {
+                'error_type': type(error).__name__,
+                'error_message': str(error),
+                'error_occurred_at': trace.end_time.isoformat()
+            }
+        elif trace.rss_start_bytes:
+            trace.rss_end_bytes = get_rss_bytes()
+            if trace.rss_end_bytes > self.peak_rss_bytes:
+                self.peak_rss_bytes = trace.rss_end_bytes
+        self.traces.append(trace)
+        return duration_ms
+
+    def recent(self, limit: int = 100) -> List[OperationTrace]:
+        """Get the most recent traces"""
+        for _ in range(3):
+            try:
+                snapshot = list(self.traces)
+                break
+            except RuntimeError:
+                # Another thread appended while copying; retry
+                continue
+        else:
+            snapshot = []
+        return snapshot[-limit:] if limit else []
+
+    def latency_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Histogram summaries keyed by operation name"""
+        return {name: histogram.summary() for name, histogram in list(self.histograms.items())}
+
+    def to_otlp(self, traces: Optional[List[OperationTrace]] = None) -> Dict[str, Any]:
+        """Build an OTLP/JSON ExportTraceServiceRequest for the given traces"""
+        trace_hex = self.correlation_id.replace("-", "")[:32].rjust(32, "0")
+        spans = []
+        for trace in self.recent(len(self.traces)) if traces is None else traces:
+            attributes = [
+                {"key": f"input.{key}", "value": _otlp_value(value)}
+                for key, value in trace.input_parameters.items()
+            ]
+            attributes += [
+                {"key": f"memory.{key}", "value": _otlp_value(value)}
+                for key, value in trace.memory_usage.items()
+            ]
+            start_ns = trace.start_unix_ns or int(trace.start_time.timestamp() * 1e9)
+            end_ns = trace.end_unix_ns or start_ns + int((trace.duration_ms or 0) * 1e6)
+            status = {"code": 1}
+            if trace.error_info:
+                status = {"code": 2, "message": trace.error_info['error_message']}
+            spans.append({
+                "traceId": trace_hex,
+                "spanId": trace.trace_id[:16],
+                "name": trace.operation_name,
+                "kind": 1,
+                "startTimeUnixNano": str(start_ns),
+                "endTimeUnixNano": str(end_ns),
+                "attributes": attributes,
+                "status": status
+            })
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": self.component_name}}
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": "ontology_framework.core.tracing"},
+                    "spans": spans
+                }]
+            }]
+        }
+
+    def export(self, path: Optional[str] = None) -> int:
+        """Append traces stored since the last export to an OTLP JSON lines file; returns the span count"""
+        path = path or self.export_path
+        if not path:
+            raise ValueError("No trace export path configured")
+        snapshot = self.recent(len(self.traces))
+        start = 0
+        if self._last_exported is not None:
+            # Resume after the last exported trace; if it was evicted, everything left is new
+            for index in range(len(snapshot) - 1, -1, -1):
+                if snapshot[index] is self._last_exported:
+                    start = index + 1
+                    break
+        pending = snapshot[start:]
+        if not pending:
+            return 0
+        request = self.to_otlp(pending)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(request, default=str) + "\n")
+        self._last_exported = pending[-1]
+        return len(pending)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """Encode a Python value as an OTLP AnyValue"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
@@ -17,8 +17,10 @@ import os
 import logging
 import uuid
 import time
-import threading
 from contextlib import contextmanager
+from .tracing import OperationTrace, OperationTracer, DISCARDED_TRACE, get_memory_usage_mb
+from .observations import ObservationSink, ObservatorySink, WebSocketSink, get_observation_emitter
+from .content_store import WriteBehindContentStore, get_content_store
 
 # Import tracing capabilities
 try:
@@ -27,6 +29,9 @@ try:
 except ImportError:
     TRACING_AVAILABLE = False
 
+# Shared sink for modules without their own Observatory handler
+DEFAULT_OBSERVATION_SINK = ObservatorySink(get_tracer if TRACING_AVAILABLE else None)
+
 
 class ModuleStatus(Enum):
     """Module operational status - RDI Compliant"""
@@ -49,22 +54,6 @@ class ModuleCapability(Enum):
     MONITORING = "monitoring"
 
 
-@dataclass
-class OperationTrace:
-    """Complete operation trace with performance metrics - Requirement 22.2"""
-    trace_id: str
-    operation_name: str
-    component_name: str
-    start_time: datetime
-    end_time: Optional[datetime]
-    duration_ms: Optional[float]
-    input_parameters: Dict[str, Any]
-    output_result: Optional[Any]
-    error_info: Optional[Dict[str, Any]]
-    performance_metrics: Dict[str, float]
-    memory_usage: Dict[str, int]
-    correlation_id: str
-
 @dataclass
 class ModuleHealth:
     """Module health information - RDI Compliant"""
@@ -100,12 +89,9 @@ class ReflectiveModule(ABC):
 
         # Correlation ID and tracing infrastructure - Requirement 22.1
         self._correlation_id = str(uuid.uuid4())
-        self._operation_traces: List[OperationTrace] = []
-        self._trace_lock = threading.Lock()
+        self._tracer = OperationTracer(self.__class__.__name__, self._correlation_id)
         
         # Performance and resource tracking - Requirement 22.4
-        self._operation_count = 0
-        self._total_operation_time = 0.0
         self._resource_usage = {
             'peak_memory_mb': 0,
             'total_cpu_time_ms': 0,
@@ -265,13 +251,12 @@ class ReflectiveModule(ABC):
             self._prometheus_exporter = None
 
     def store_content(self, content_id: str, collection: str, data: Dict[str, Any]) -> bool:
-        """Store content in unified CMS (Directus integration)."""
+        """Store content in unified CMS (Directus integration).
+
+        Writes are buffered by the write-behind content store and flushed in
+        batches, so this never waits on a CMS round-trip.
+        """
         try:
-            # Initialize CMS connection if needed
-            if not hasattr(self, '_cms_client'):
-                self._initialize_cms_client()
-            
-            # Store content with metadata
             content_data = {
                 "id": content_id,
                 "data": data,
@@ -279,79 +264,33 @@ class ReflectiveModule(ABC):
                 "timestamp": datetime.now().isoformat(),
                 "version": "1.0.0"
             }
-            
-            # Try to use real Directus client
-            if hasattr(self._cms_client, 'create_item'):
-                result = self._cms_client.create_item(collection, content_data)
-                if result:
-                    self._logger.info(f"Stored content {content_id} in Directus collection {collection}")
-                    return True
-                else:
-                    self._logger.warning(f"Failed to store content {content_id} in Directus, using memory fallback")
-            
-            # Fallback to memory storage
-            if not hasattr(self, '_content_store'):
-                self._content_store = {}
-            
-            self._content_store[content_id] = content_data
-            self._logger.info(f"Stored content {content_id} in memory collection {collection}")
+            self._get_content_store().put(collection, content_data)
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug(f"Queued content {content_id} for collection {collection}")
             return True
-            
+
         except Exception as e:
             self._logger.error(f"Failed to store content {content_id}: {e}")
             return False
 
     def get_content(self, content_id: str, collection: str = "content") -> Optional[Dict[str, Any]]:
-        """Retrieve content from unified CMS."""
+        """Retrieve content from unified CMS, through the content store's read cache."""
         try:
-            # Initialize CMS connection if needed
-            if not hasattr(self, '_cms_client'):
-                self._initialize_cms_client()
-            
-            # Try to use real Directus client
-            if hasattr(self._cms_client, 'get_items'):
-                items = self._cms_client.get_items(collection, {"filter": {"id": {"_eq": content_id}}})
-                if items:
-                    return items[0]
-            
-            # Fallback to memory store
-            if hasattr(self, '_content_store') and content_id in self._content_store:
-                return self._content_store[content_id]
-            
-            self._logger.warning(f"Content {content_id} not found in Directus or memory")
-            return None
-            
+            content = self._get_content_store().get(collection, content_id)
+            if content is None:
+                self._logger.warning(f"Content {content_id} not found in collection {collection}")
+            return content
+
         except Exception as e:
             self._logger.error(f"Failed to retrieve content {content_id}: {e}")
             return None
 
-    def _initialize_cms_client(self):
-        """Initialize CMS client connection."""
-        try:
-            # Initialize actual Directus client
-            from src.beast_mode.directus_cms.directus_client import DirectusClient
-            
-            # Get Directus configuration from environment
-            directus_url = os.getenv("DIRECTUS_URL", "http://localhost:8055")
-            directus_token = os.getenv("DIRECTUS_TOKEN")
-            
-            self._cms_client = DirectusClient(base_url=directus_url, token=directus_token)
-            
-            # Test connection
-            if self._cms_client.health_check():
-                self._logger.info("CMS client initialized (Directus connected)")
-            else:
-                self._logger.warning("CMS client initialized (Directus not accessible, will retry)")
-            
-        except ImportError:
-            # Fallback to memory storage if DirectusClient not available
-            self._cms_client = "memory_store"
-            self._logger.warning("DirectusClient not available, using memory storage fallback")
-        except Exception as e:
-            self._logger.error(f"Failed to initialize CMS client: {e}")
-            # Fallback to memory storage
-            self._cms_client = "memory_store"
-            self._logger.warning("Using memory storage fallback due to CMS client error")
+    def _get_content_store(self) -> WriteBehindContentStore:
+        return getattr(self, '_content_store', None) or get_content_store()
+
+    def set_content_store(self, store: Optional[WriteBehindContentStore]):
+        """Use a specific content store instead of the process-wide one"""
+        self._content_store = store
 
     def get_cli_interface(self) -> Dict[str, Any]:
         """
@@ -488,79 +427,21 @@ class ReflectiveModule(ABC):
         Context manager for operation tracing - Requirement 22.1, 22.2
         
         Provides complete operation traceability with correlation IDs
-        and performance metrics collection.
+        and performance metrics collection. Every operation feeds the
+        latency histograms; only sampled operations and failures build a
+        full trace, so unsampled ones yield a trace that ignores writes.
         """
-        trace_id = str(uuid.uuid4())
-        start_time = datetime.now()
-        start_memory = self._get_memory_usage()
-        
-        trace = OperationTrace(
-            trace_id=trace_id,
-            operation_name=operation_name,
-            component_name=self.__class__.__name__,
-            start_time=start_time,
-            end_time=None,
-            duration_ms=None,
-            input_parameters=input_params,
-            output_result=None,
-            error_info=None,
-            performance_metrics={},
-            memory_usage={'start_mb': start_memory},
-            correlation_id=self._correlation_id
-        )
-        
+        tracer = self._tracer
+        trace = tracer.begin(operation_name, input_params) if tracer.should_sample() else None
+        start_ns = time.perf_counter_ns()
         try:
-            yield trace
-            
-            # Success path
-            end_time = datetime.now()
-            duration_ms = (end_time - start_time).total_seconds() * 1000
-            end_memory = self._get_memory_usage()
-            
-            trace.end_time = end_time
-            trace.duration_ms = duration_ms
-            trace.memory_usage['end_mb'] = end_memory
-            trace.memory_usage['delta_mb'] = end_memory - start_memory
-            trace.performance_metrics = {
-                'duration_ms': duration_ms,
-                'memory_delta_mb': end_memory - start_memory,
-                'success': True
-            }
-            
-            # Update statistics
-            self._operation_count += 1
-            self._total_operation_time += duration_ms
-            self._resource_usage['peak_memory_mb'] = max(
-                self._resource_usage['peak_memory_mb'], 
-                end_memory
-            )
-            
+            yield trace if trace is not None else DISCARDED_TRACE
         except Exception as e:
-            # Error path
-            end_time = datetime.now()
-            duration_ms = (end_time - start_time).total_seconds() * 1000
-            
-            trace.end_time = end_time
-            trace.duration_ms = duration_ms
-            trace.error_info = {
-                'error_type': type(e).__name__,
-                'error_message': str(e),
-                'error_occurred_at': end_time.isoformat()
-            }
-            trace.performance_metrics = {
-                'duration_ms': duration_ms,
-                'success': False
-            }
-            
+            tracer.finish(operation_name, trace, start_ns, error=e, input_params=input_params)
             self._error_count += 1
             raise
-        finally:
-            # Store trace
-            with self._trace_lock:
-                self._operation_traces.append(trace)
-                # Keep only last 1000 traces to prevent memory bloat
-                if len(self._operation_traces) > 1000:
-                    self._operation_traces = self._operation_traces[-1000:]
+        else:
+            tracer.finish(operation_name, trace, start_ns)
     
     def get_operation_traces(self, limit: int = 100) -> List[OperationTrace]:
         """
@@ -568,8 +449,25 @@ class ReflectiveModule(ABC):
         
         Provides complete operation traceability for debugging and audit.
         """
-        with self._trace_lock:
-            return self._operation_traces[-limit:] if self._operation_traces else []
+        return self._tracer.recent(limit)
+    
+    def get_latency_histograms(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-operation latency histograms, covering unsampled operations too"""
+        return self._tracer.latency_summary()
+    
+    def configure_tracing(self, sample_rate: Optional[float] = None, trace_memory: Optional[bool] = None,
+                          export_path: Optional[str] = None):
+        """Adjust trace sampling, memory measurement and the default export file"""
+        if sample_rate is not None:
+            self._tracer.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        if trace_memory is not None:
+            self._tracer.trace_memory = trace_memory
+        if export_path is not None:
+            self._tracer.export_path = export_path
+    
+    def export_traces(self, path: Optional[str] = None) -> int:
+        """Append stored traces to a local file as OTLP-compatible JSON lines"""
+        return self._tracer.export(path)
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """
@@ -577,22 +475,28 @@ class ReflectiveModule(ABC):
         
         Tracks usage patterns, frequency, and performance metrics for all operations.
         """
+        operation_count = self._tracer.operation_count
+        total_operation_time = self._tracer.total_time_ms
         avg_operation_time = (
-            self._total_operation_time / self._operation_count 
-            if self._operation_count > 0 else 0.0
+            total_operation_time / operation_count 
+            if operation_count > 0 else 0.0
         )
         
         return {
-            'operation_count': self._operation_count,
-            'total_operation_time_ms': self._total_operation_time,
+            'operation_count': operation_count,
+            'total_operation_time_ms': total_operation_time,
             'average_operation_time_ms': avg_operation_time,
             'error_count': self._error_count,
             'warning_count': self._warning_count,
-            'error_rate': self._error_count / max(self._operation_count, 1),
+            'error_rate': self._error_count / max(operation_count, 1),
             'uptime_seconds': (datetime.now() - self._start_time).total_seconds(),
-            'resource_usage': self._resource_usage.copy(),
+            'resource_usage': {
+                **self._resource_usage,
+                'peak_memory_mb': max(self._resource_usage['peak_memory_mb'], self._tracer.peak_memory_mb)
+            },
             'correlation_id': self._correlation_id,
-            'traces_stored': len(self._operation_traces)
+            'traces_stored': len(self._tracer.traces),
+            'trace_sample_rate': self._tracer.sample_rate
         }
     
     def get_usage_tracking(self) -> Dict[str, Any]:
@@ -622,15 +526,7 @@ class ReflectiveModule(ABC):
     
     def _get_memory_usage(self) -> float:
         """Get current memory usage in MB"""
-        try:
-            import psutil
-            process = psutil.Process(os.getpid())
-            return process.memory_info().rss / 1024 / 1024  # Convert to MB
-        except ImportError:
-            # Fallback if psutil not available
-            return 0.0
-        except Exception:
-            return 0.0
+        return get_memory_usage_mb()
     
     def get_cli_cache_options(self) -> Dict[str, Any]:
         """
@@ -832,12 +728,13 @@ class ReflectiveModule(ABC):
                 "correlation_id": self._correlation_id
             }
             
-            # Send to Observatory if available
+            # Queue for background delivery to the Observatory
             self._send_observation_to_observatory(observation)
             
             # Log the observation
             log_level = self._get_log_level_for_event_type(event_type)
-            self._logger.log(log_level, f"📰 {message} {emoji or ''}")
+            if self._logger.isEnabledFor(log_level):
+                self._logger.log(log_level, f"📰 {message} {emoji or ''}")
             
         except Exception as e:
             self._logger.error(f"Failed to emit observation: {e}")
@@ -899,47 +796,15 @@ class ReflectiveModule(ABC):
         return level_map.get(severity, logging.INFO)
     
     def _send_observation_to_observatory(self, observation: Dict[str, Any]):
-        """Send observation to Observatory WebSocket if available"""
-        try:
-            # Add distributed tracing if available (graceful degradation)
-            if TRACING_AVAILABLE:
-                try:
-                    tracer = get_tracer()
-                    if tracer.is_available():
-                        with tracer.trace_observation_flow(observation):
-                            self._do_send_observation(observation)
-                    else:
-                        self._do_send_observation(observation)
-                except Exception as e:
-                    # Tracing failed, continue without it
-                    self._logger.debug(f"Tracing failed, continuing without: {e}")
-                    self._do_send_observation(observation)
-            else:
-                # No tracing available, work normally
-                self._do_send_observation(observation)
-                
-        except Exception as e:
-            # Don't let observation emission break the main functionality
-            self._logger.debug(f"Could not send observation to Observatory: {e}")
-    
-    def _do_send_observation(self, observation: Dict[str, Any]):
-        """Actually send the observation"""
-        # Try to get the global Observatory observation handler
-        if hasattr(self, '_observatory_handler'):
-            self._observatory_handler.broadcast_observation(observation)
-        else:
-            # Try to import and use the global handler
-            try:
-                from src.beast_mode.observatory.observation_handler import get_global_observation_handler
-                handler = get_global_observation_handler()
-                if handler:
-                    handler.broadcast_observation(observation)
-                else:
-                    self._logger.debug("No global observation handler available")
-            except ImportError:
-                # Observatory not available, just log
-                self._logger.debug("Observatory observation handler not available")
+        """Queue observation for batched delivery to the Observatory"""
+        sink = getattr(self, '_observation_sink', None) or DEFAULT_OBSERVATION_SINK
+        get_observation_emitter().emit(sink, observation)
     
     def set_observatory_handler(self, handler):
         """Set the Observatory observation handler for this module"""
         self._observatory_handler = handler
+        self._observation_sink = WebSocketSink(handler)
+    
+    def set_observation_sink(self, sink: Optional[ObservationSink]):
+        """Deliver this module's observations to a specific sink (file, memory, ...)"""
+        self._observation_sink = sink
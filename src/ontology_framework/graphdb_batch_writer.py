@@ -0,0 +1,248 @@
+"""Micro-batched SPARQL UPDATE writer for GraphDB.
+
+Callers that make many small changes queue INSERT DATA / DELETE DATA
+operations on an UpdateBatchWriter instead of sending one request each. The
+queue is merged into a single SPARQL UPDATE request when it reaches an
+operation count or size limit, when the oldest queued operation has waited
+max_latency seconds, on flush(), or at interpreter exit.
+
+Example:
+    >>> writer = UpdateBatchWriter(GraphDBClient(repository="test"))
+    >>> for module in modules:
+    ...     writer.insert_data(f'<{module}> :hasStatus "LOADED" .', {"": GUIDANCE})
+    >>> writer.flush()
+    500
+"""
+
+import atexit
+import logging
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rdflib.term import Node
+
+from .graphdb_client import GraphDBClient, GraphDBError
+
+logger = logging.getLogger(__name__)
+
+INSERT = "INSERT"
+DELETE = "DELETE"
+
+
+@dataclass
+class BatchWriterStats:
+    """Counters for the requests an UpdateBatchWriter has sent."""
+
+    operations: int = 0
+    batches: int = 0
+    bytes_sent: int = 0
+    largest_batch: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def ops_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.operations / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.operations / self.batches if self.batches else 0.0
+
+
+class UpdateBatchWriter:
+    """Accumulate INSERT DATA / DELETE DATA operations and send them in batches.
+
+    Operations keep their order: consecutive operations of the same kind are
+    merged into one DATA block, and blocks are joined with ';' into a single
+    request. Inside transaction(), batches go through GraphDBClient's RDF4J
+    transaction API and become visible together on commit.
+    """
+
+    def __init__(self, client: GraphDBClient, max_operations: int = 1000,
+                 max_bytes: int = 1 << 20, max_latency: Optional[float] = 0.5,
+                 flush_at_exit: bool = True):
+        """Initialize the writer.
+
+        Args:
+            client: Client used to send updates
+            max_operations: Queued operations that trigger a flush
+            max_bytes: Queued data size that triggers a flush
+            max_latency: Seconds an operation may wait before a background
+                flush; None waits for an explicit flush
+            flush_at_exit: Flush whatever is queued when the interpreter exits
+        """
+        self.client = client
+        self.max_operations = max_operations
+        self.max_bytes = max_bytes
+        self.max_latency = max_latency
+        self.stats = BatchWriterStats()
+        self._pending: List[Tuple[str, str]] = []
+        self._pending_bytes = 0
+        self._prefixes: Dict[str, str] = {}
+        self._tx_id: Optional[str] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        if flush_at_exit:
+            _open_writers.add(self)
+
+    def __enter__(self) -> "UpdateBatchWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """Number of queued operations"""
+        return len(self._pending)
+
+    def insert_data(self, triples: str, prefixes: Optional[Dict[str, str]] = None) -> None:
+        """Queue triples, in Turtle/N-Triples syntax, for INSERT DATA"""
+        self._queue(INSERT, triples, prefixes)
+
+    def delete_data(self, triples: str, prefixes: Optional[Dict[str, str]] = None) -> None:
+        """Queue triples, in Turtle/N-Triples syntax, for DELETE DATA"""
+        self._queue(DELETE, triples, prefixes)
+
+    def insert_triples(self, triples: Iterable[Tuple[Node, Node, Node]]) -> None:
+        """Queue rdflib triples for INSERT DATA"""
+        self._queue(INSERT, _ntriples(triples), None)
+
+    def delete_triples(self, triples: Iterable[Tuple[Node, Node, Node]]) -> None:
+        """Queue rdflib triples for DELETE DATA"""
+        self._queue(DELETE, _ntriples(triples), None)
+
+    def _queue(self, kind: str, triples: str, prefixes: Optional[Dict[str, str]]) -> None:
+        triples = triples.strip()
+        if not triples:
+            return
+        with self._lock:
+            prefixes = {prefix: str(iri) for prefix, iri in (prefixes or {}).items()}
+            if any(self._prefixes.get(prefix, iri) != iri for prefix, iri in prefixes.items()):
+                # Same prefix bound to another IRI; the request can only declare one
+                self.flush()
+            self._prefixes.update(prefixes)
+            self._pending.append((kind, triples))
+            self._pending_bytes += len(triples)
+            if len(self._pending) >= self.max_operations or self._pending_bytes >= self.max_bytes:
+                self.flush()
+            elif self._timer is None and self.max_latency is not None:
+                self._timer = threading.Timer(self.max_latency, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def build_update(self) -> str:
+        """The SPARQL UPDATE request for the queued operations"""
+        with self._lock:
+            lines = [f"PREFIX {prefix}: <{iri}>" for prefix, iri in self._prefixes.items()]
+            blocks: List[str] = []
+            kind: Optional[str] = None
+            body: List[str] = []
+            for op_kind, triples in self._pending:
+                if op_kind != kind and body:
+                    blocks.append(f"{kind} DATA {{\n" + "\n".join(body) + "\n}")
+                    body = []
+                kind = op_kind
+                body.append(triples if triples.endswith(".") else triples + " .")
+            if body:
+                blocks.append(f"{kind} DATA {{\n" + "\n".join(body) + "\n}")
+            return "\n".join(lines + [" ;\n".join(blocks)])
+
+    def flush(self) -> int:
+        """Send all queued operations as one request.
+
+        Queued operations are kept if the request fails.
+
+        Returns:
+            Number of operations sent
+
+        Raises:
+            GraphDBError: If the update is rejected
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return 0
+            update = self.build_update()
+            if self._tx_id is not None:
+                if not self.client.update_in_transaction(self._tx_id, update):
+                    raise GraphDBError("Batched update was rejected")
+            else:
+                self.client.update(update)
+
+            count = len(self._pending)
+            self.stats.operations += count
+            self.stats.batches += 1
+            self.stats.bytes_sent += len(update.encode("utf-8"))
+            self.stats.largest_batch = max(self.stats.largest_batch, count)
+            self._pending.clear()
+            self._pending_bytes = 0
+            self._prefixes.clear()
+            return count
+
+    def _flush_in_background(self) -> None:
+        with self._lock:
+            self._timer = None
+            try:
+                self.flush()
+            except GraphDBError as e:
+                logger.error(f"Background flush failed, {self.pending} operations still queued: {e}")
+
+    @contextmanager
+    def transaction(self) -> Iterator["UpdateBatchWriter"]:
+        """Group every operation queued in the block into one RDF4J transaction.
+
+        Operations queued before the block are flushed first. The block's
+        operations are committed together on exit, or rolled back and
+        dropped if it raises.
+        """
+        with self._lock:
+            if self._tx_id is not None:
+                raise GraphDBError("A transaction is already open on this writer")
+            self.flush()
+            self._tx_id = self.client.start_transaction()
+        try:
+            yield self
+            with self._lock:
+                self.flush()
+                if not self.client.commit_transaction(self._tx_id):
+                    raise GraphDBError("Commit was rejected")
+        except BaseException:
+            with self._lock:
+                self._pending.clear()
+                self._pending_bytes = 0
+                self._prefixes.clear()
+                try:
+                    self.client.rollback_transaction(self._tx_id)
+                except GraphDBError as e:
+                    logger.error(f"Rollback failed: {e}")
+            raise
+        finally:
+            self._tx_id = None
+
+    def close(self) -> None:
+        """Flush queued operations and stop flushing at exit."""
+        self.flush()
+        _open_writers.discard(self)
+
+
+def _ntriples(triples: Iterable[Tuple[Node, Node, Node]]) -> str:
+    return "\n".join(f"{s.n3()} {p.n3()} {o.n3()} ." for s, p, o in triples)
+
+
+_open_writers: "weakref.WeakSet[UpdateBatchWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_writers() -> None:
+    for writer in list(_open_writers):
+        try:
+            writer.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush {writer.pending} queued updates at exit: {e}")
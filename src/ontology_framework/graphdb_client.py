@@ -15,10 +15,10 @@ import logging
 import json
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Union, List, TypedDict, cast
+from typing import Any, Dict, Iterable, Iterator, Optional, Union, List, TypedDict, cast
 
 import requests
-from requests.auth import HTTPBasicAuth
+from requests.auth import AuthBase, HTTPBasicAuth
 from rdflib import Graph, URIRef, RDFS, RDF, Literal, BNode, Namespace
 import tempfile
 import os
@@ -57,12 +57,17 @@ class GraphDBClient:
         [{'s': '...', 'p': '...', 'o': '...'}]
     """
     
-    def __init__(self, base_url: str = "http://localhost:7200", repository: str = "test"):
+    def __init__(self, base_url: str = "http://localhost:7200", repository: str = "test",
+                 auth: Optional[AuthBase] = None, require_credentials: bool = True):
         """Initialize the GraphDB client.
         
         Args:
             base_url: Base URL of the GraphDB server
             repository: Repository name
+            auth: Authentication to send; read from GRAPHDB_USERNAME and
+                GRAPHDB_PASSWORD if omitted
+            require_credentials: Raise if no auth is given and the environment
+                has no credentials; False talks to servers without security
             
         Example:
             >>> client = GraphDBClient(base_url="http://localhost:7200", repository="myrepo")
@@ -70,16 +75,22 @@ class GraphDBClient:
         self.base_url = base_url.rstrip('/')
         self.repository = repository
         self.logger = logging.getLogger(__name__)
-        # Load credentials from environment
+        self._auth = auth if auth is not None else self._auth_from_environment(require_credentials)
+        
+    def _auth_from_environment(self, require_credentials: bool) -> Optional[HTTPBasicAuth]:
+        """Basic auth from GRAPHDB_USERNAME and GRAPHDB_PASSWORD, or None if unset and optional."""
         username = os.environ.get("GRAPHDB_USERNAME")
         password = os.environ.get("GRAPHDB_PASSWORD")
         if not username or not password:
-            raise RuntimeError(
-                "GRAPHDB_USERNAME and GRAPHDB_PASSWORD environment variables must be set. "
-                "Do not use hardcoded defaults for credentials."
-            )
-        self._auth = HTTPBasicAuth(username, password)
+            if require_credentials:
+                raise RuntimeError(
+                    "GRAPHDB_USERNAME and GRAPHDB_PASSWORD environment variables must be set. "
+                    "Do not use hardcoded defaults for credentials."
+                )
+            self.logger.debug("GraphDBClient initialized without credentials")
+            return None
         self.logger.debug(f"GraphDBClient initialized with user: {username}")
+        return HTTPBasicAuth(username, password)
         
     def _get_endpoint(self, path: str) -> str:
         """Get the full endpoint URL.
@@ -565,48 +576,80 @@ class GraphDBClient:
         except Exception as e:
             raise GraphDBError(f"Failed to get repository settings: {str(e)}")
             
+    def _transaction_url(self, tx_id: str) -> str:
+        return self._get_endpoint(f"/transactions/{tx_id}")
+
     def start_transaction(self) -> str:
         """Start a new transaction.
         
+        Uses the RDF4J transaction protocol: changes made in the transaction
+        are invisible to other readers until commit_transaction().
+        
         Returns:
             Transaction ID
             
         Example:
             >>> tx_id = client.start_transaction()
-            >>> client.add_to_transaction(tx_id, "INSERT DATA { ... }")
+            >>> client.add_to_transaction(tx_id, "@prefix ex: <http://example.org/> . ex:s ex:p ex:o .")
+            >>> client.commit_transaction(tx_id)
         """
         try:
             response = requests.post(
-                f"{self.base_url}/rest/repositories/{self.repository}/transactions",
+                self._get_endpoint("/transactions"),
                 auth=self._auth
             )
             if response.status_code == 201:
-                return response.headers["Location"].split("/")[-1]
+                return response.headers["Location"].rstrip("/").split("/")[-1]
             raise GraphDBError("Failed to start transaction")
         except Exception as e:
             raise GraphDBError(f"Failed to start transaction: {str(e)}")
             
-    def add_to_transaction(self, tx_id: str, data: str) -> bool:
-        """Add data to a transaction.
+    def add_to_transaction(self, tx_id: str, data: Union[str, bytes, Iterable[bytes]],
+                           content_type: str = "text/turtle") -> bool:
+        """Add RDF data to a transaction.
         
         Args:
             tx_id: Transaction ID
-            data: Data to add (SPARQL update or RDF data)
+            data: RDF data to add; an iterable of bytes is streamed
+            content_type: MIME type of the data
             
         Returns:
             True if successful
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/rest/repositories/{self.repository}/transactions/{tx_id}/statements",
+            response = requests.put(
+                self._transaction_url(tx_id),
+                params={"action": "ADD"},
                 data=data,
-                headers={"Content-Type": "text/turtle"},
+                headers={"Content-Type": content_type},
                 auth=self._auth
             )
-            return response.status_code == 204
+            return response.ok
         except Exception as e:
             raise GraphDBError(f"Failed to add to transaction: {str(e)}")
             
+    def update_in_transaction(self, tx_id: str, update_query: str) -> bool:
+        """Execute a SPARQL UPDATE inside a transaction.
+        
+        Args:
+            tx_id: Transaction ID
+            update_query: The SPARQL UPDATE to execute
+            
+        Returns:
+            True if successful
+        """
+        try:
+            response = requests.put(
+                self._transaction_url(tx_id),
+                params={"action": "UPDATE"},
+                data=update_query.encode("utf-8"),
+                headers={"Content-Type": "application/sparql-update"},
+                auth=self._auth
+            )
+            return response.ok
+        except Exception as e:
+            raise GraphDBError(f"Failed to update in transaction: {str(e)}")
+            
     def commit_transaction(self, tx_id: str) -> bool:
         """Commit a transaction.
         
@@ -618,10 +661,11 @@ class GraphDBClient:
         """
         try:
             response = requests.put(
-                f"{self.base_url}/rest/repositories/{self.repository}/transactions/{tx_id}",
+                self._transaction_url(tx_id),
+                params={"action": "COMMIT"},
                 auth=self._auth
             )
-            return response.status_code == 204
+            return response.ok
         except Exception as e:
             raise GraphDBError(f"Failed to commit transaction: {str(e)}")
             
@@ -636,13 +680,41 @@ class GraphDBClient:
         """
         try:
             response = requests.delete(
-                f"{self.base_url}/rest/repositories/{self.repository}/transactions/{tx_id}",
+                self._transaction_url(tx_id),
                 auth=self._auth
             )
-            return response.status_code == 204
+            return response.ok
         except Exception as e:
             raise GraphDBError(f"Failed to rollback transaction: {str(e)}")
 
+    def iter_statements(self, infer: bool = True, content_type: str = "application/n-triples",
+                        chunk_size: int = 1 << 16) -> Iterator[bytes]:
+        """Stream the repository's statements without holding them in memory.
+        
+        Args:
+            infer: Include inferred statements; False streams explicit statements only
+            content_type: RDF serialization to request
+            chunk_size: Bytes per yielded chunk
+            
+        Yields:
+            Chunks of the serialized statements
+            
+        Raises:
+            GraphDBError: If the export fails
+        """
+        try:
+            with requests.get(
+                self._get_endpoint("/statements"),
+                params={"infer": str(infer).lower()},
+                headers={"Accept": content_type},
+                auth=self._auth,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                yield from response.iter_content(chunk_size=chunk_size)
+        except requests.exceptions.RequestException as e:
+            raise GraphDBError(f"Statement export failed: {str(e)}")
+
     def upload_binary_rdf(self, data: bytes, graph_uri: str | None = None) -> bool:
         """Upload binary RDF data to the repository.
         
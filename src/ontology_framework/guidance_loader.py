@@ -7,9 +7,10 @@ define rules and requirements for ontology development.
 from typing import Dict, List, Optional, Set, Union
 import logging
 from pathlib import Path
-from rdflib import Graph, URIRef, Literal, Namespace
+from rdflib import URIRef, Literal, Namespace
 from rdflib.namespace import RDF, RDFS, OWL
 from .exceptions import GuidanceError
+from .core.graph_registry import get_graph_registry
 
 logger = logging.getLogger(__name__)
 
@@ -33,10 +34,9 @@ class GuidanceLoader:
             GuidanceError: If guidance file cannot be loaded
         """
         self.guidance_file = Path(guidance_file)
-        self.graph = Graph()
         
         try:
-            self.graph.parse(str(self.guidance_file), format="turtle")
+            self.graph = get_graph_registry().checkout(self.guidance_file, format="turtle")
             logger.info(f"Loaded guidance from {self.guidance_file}")
         except Exception as e:
             raise GuidanceError(f"Failed to load guidance file: {str(e)}")
@@ -3,17 +3,43 @@ BFG9K targeting system for ontology validation and issue detection.
 """
 
 from typing import Dict, List, Any, Optional, Tuple
+from bisect import bisect_left
 from dataclasses import dataclass, field
 import numpy as np
 from datetime import datetime
 import logging
-from rdflib import Graph, URIRef, Namespace, RDF, RDFS, OWL, BNode, Literal
+from rdflib import Graph, URIRef, Namespace, RDF, RDFS, OWL, BNode
 from rdflib.namespace import SH
+from rdflib.plugins.sparql import prepareQuery
 import pyshacl
 from .hypercube_analysis import HypercubeAnalyzer, TrajectoryVector
 
 logger = logging.getLogger(__name__)
 
+GUIDANCE = Namespace("https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#")
+
+_RULES_QUERY = prepareQuery("""
+    SELECT ?rule ?type ?priority
+    WHERE {
+        ?rule a guidance:ValidationRule ;
+              guidance:hasType ?type ;
+              guidance:hasPriority ?priority .
+    }
+""", initNs={"guidance": GUIDANCE})
+
+_SHAPES_QUERY = prepareQuery("""
+    CONSTRUCT {
+        ?shape ?p ?o .
+        ?o ?p2 ?o2 .
+    }
+    WHERE {
+        ?rule guidance:hasShape ?shape .
+        ?shape a sh:NodeShape .
+        ?shape ?p ?o .
+        OPTIONAL { ?o ?p2 ?o2 }
+    }
+""", initNs={"guidance": GUIDANCE, "sh": SH})
+
 @dataclass
 class Target:
     """A target for BFG9K validation."""
@@ -58,13 +84,16 @@ class BFG9KTargeter:
         
         # Initialize semantic validation components
         self.validation_graph = Graph()
-        self.GUIDANCE = Namespace("https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#")
+        self.GUIDANCE = GUIDANCE
         self.validation_graph.bind("guidance", self.GUIDANCE)
         self.validation_graph.bind("sh", SH)
         self.validation_graph.bind("rdf", RDF)
         self.validation_graph.bind("rdfs", RDFS)
         self.validation_graph.bind("owl", OWL)
         
+        # Rule indexes, rebuilt whenever validation rules are (re)loaded
+        self._invalidate_rule_indexes()
+        
         # Load validation rules
         self._load_validation_rules()
     
@@ -72,27 +101,71 @@ class BFG9KTargeter:
         """Load validation rules from guidance ontology."""
         try:
             self.validation_graph.parse("guidance.ttl", format="turtle")
+            self._build_rule_indexes()
             
-            # Query for validation rules
-            rules_query = """
-            PREFIX guidance: <https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#>
-            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-            
-            SELECT ?rule ?type ?priority
-            WHERE {
-                ?rule a guidance:ValidationRule ;
-                      guidance:hasType ?type ;
-                      guidance:hasPriority ?priority .
-            }
-            """
-            
-            for row in self.validation_graph.query(rules_query):
-                logger.info(f"Loaded validation rule: {row.rule} ({row.type})")
+            for rule, rule_type in self._rule_types.items():
+                logger.info(f"Loaded validation rule: {rule} ({rule_type})")
                 
         except Exception as e:
             logger.error(f"Failed to load validation rules: {str(e)}")
             raise
     
+    def _invalidate_rule_indexes(self) -> None:
+        """Drop all rule indexes derived from the validation graph."""
+        self._rule_types: Dict[URIRef, str] = {}
+        self._rules_by_type: Dict[str, List[URIRef]] = {}
+        self._priority_keys: List[float] = []
+        self._priority_rules: List[URIRef] = []
+        self._rule_priorities: Dict[URIRef, float] = {}
+        self._rule_shapes: Dict[URIRef, Graph] = {}
+    
+    def _build_rule_indexes(self) -> None:
+        """Build in-memory rule indexes from the validation graph.
+        
+        Rule types, priorities and SHACL shapes are extracted once here so
+        that targeting and validation calls do not re-run SPARQL.
+        """
+        self._invalidate_rule_indexes()
+        
+        by_priority: List[Tuple[float, str, URIRef]] = []
+        for row in self.validation_graph.query(_RULES_QUERY):
+            rule = row.rule
+            rule_type = str(row.type)
+            self._rule_types[rule] = rule_type
+            self._rules_by_type.setdefault(rule_type, []).append(rule)
+            try:
+                priority = float(row.priority.toPython())
+            except (TypeError, ValueError):
+                # Non-numeric priorities (e.g. "HIGH") never pass the threshold
+                continue
+            self._rule_priorities[rule] = priority
+            by_priority.append((priority, str(rule), rule))
+        
+        by_priority.sort()
+        self._priority_keys = [priority for priority, _, _ in by_priority]
+        self._priority_rules = [rule for _, _, rule in by_priority]
+        
+        for rule in self._rule_types:
+            shapes_graph = Graph()
+            results = self.validation_graph.query(_SHAPES_QUERY, initBindings={"rule": rule})
+            if results.graph is not None:
+                shapes_graph += results.graph
+            self._rule_shapes[rule] = shapes_graph
+    
+    def get_rules_above_priority(self, min_priority: float) -> List[URIRef]:
+        """Get rules whose numeric priority is at least ``min_priority``."""
+        start = bisect_left(self._priority_keys, min_priority)
+        return self._priority_rules[start:]
+    
+    def get_rules_by_type(self, validation_type: str) -> List[URIRef]:
+        """Get rules of the given validation type."""
+        return list(self._rules_by_type.get(validation_type, []))
+    
+    def get_rule_shapes(self, rule: URIRef) -> Graph:
+        """Get the pre-extracted SHACL shapes graph for a rule."""
+        shapes_graph = self._rule_shapes.get(rule)
+        return shapes_graph if shapes_graph is not None else Graph()
+    
     def detect_targets(self, metrics: Dict[str, float]) -> List[Target]:
         """Detect potential validation targets based on metrics."""
         current_position = self.analyzer.analyze_position(metrics)
@@ -101,33 +174,17 @@ class BFG9KTargeter:
         # Calculate deviation from optimal trajectory
         deviation = float(np.linalg.norm(future_position - current_position))
         
-        # Query for applicable validation rules
-        rules_query = """
-        PREFIX guidance: <https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        
-        SELECT ?rule ?type ?priority
-        WHERE {
-            ?rule a guidance:ValidationRule ;
-                  guidance:hasType ?type ;
-                  guidance:hasPriority ?priority .
-            FILTER (?priority >= ?min_priority)
-        }
-        """
-        
         min_priority = 0.5  # Threshold for rule selection
-        results = self.validation_graph.query(rules_query, 
-                                           initBindings={"min_priority": Literal(min_priority)})
         
         targets = []
-        for row in results:
+        for rule in self.get_rules_above_priority(min_priority):
             target = Target(
-                uri=row.rule,
+                uri=rule,
                 position=current_position,
                 velocity=self.analyzer.trajectories[-1].velocity,
                 confidence=float(1.0 - deviation),
-                priority=float(row.priority),
-                validation_type=str(row.type)
+                priority=self._rule_priorities[rule],
+                validation_type=self._rule_types[rule]
             )
             targets.append(target)
             self.targets.append(target)
@@ -147,23 +204,7 @@ class BFG9KTargeter:
         current_position = self.analyzer.analyze_position({})
         approach_vector = target.position - current_position
         
-        # Query for validation rules
-        rules_query = """
-        PREFIX guidance: <https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        
-        SELECT ?rule
-        WHERE {
-            ?rule a guidance:ValidationRule ;
-                  guidance:hasType ?type .
-            FILTER (?type = ?target_type)
-        }
-        """
-        
-        results = self.validation_graph.query(rules_query, 
-                                           initBindings={"target_type": Literal(target.validation_type)})
-        
-        validation_rules = [row.rule for row in results]
+        validation_rules = self.get_rules_by_type(target.validation_type)
         
         plan = ValidationPlan(
             target=target,
@@ -180,29 +221,7 @@ class BFG9KTargeter:
         try:
             # Apply validation rules using SHACL
             for rule in plan.validation_rules:
-                # Get SHACL shapes for this rule
-                shapes_query = """
-                PREFIX guidance: <https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#>
-                PREFIX sh: <http://www.w3.org/ns/shacl#>
-                
-                CONSTRUCT {
-                    ?shape ?p ?o .
-                    ?o ?p2 ?o2 .
-                }
-                WHERE {
-                    ?rule guidance:hasShape ?shape .
-                    ?shape a sh:NodeShape .
-                    ?shape ?p ?o .
-                    OPTIONAL { ?o ?p2 ?o2 }
-                }
-                """
-                
-                shapes_graph = Graph()
-                results = self.validation_graph.query(shapes_query, 
-                                                   initBindings={"rule": rule})
-                
-                if hasattr(results, 'graph'):
-                    shapes_graph += results.graph
+                shapes_graph = self.get_rule_shapes(rule)
                 
                 # Validate using PyShacl
                 conforms, _, _ = pyshacl.validate(
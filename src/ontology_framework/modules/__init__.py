@@ -2,35 +2,73 @@
 Modules package for the ontology framework.
 """
 
+import importlib
+from typing import Any, Dict, Tuple, Type
+
 from rdflib import Namespace
 
 # Define SHACL namespace
 SHACL = Namespace('http://www.w3.org/ns/shacl#')
 
-from .error_handling import (
-    ErrorHandler,
-    ValidationRule,
-    ErrorResult,
-    ErrorStep,
-    ErrorSeverity,
-    SecurityLevel,
-    ComplianceLevel,
-    RiskLevel,
-    ValidationHandler,
-    MetricsHandler,
-    ComplianceHandler,
-    RDFHandler
-)
-from .patch_management import (
-    PatchManager,
-    GraphDBPatchManager,
-    PatchNotFoundError,
-    PatchApplicationError
-)
-from .turtle_syntax import fix_turtle_syntax, validate_turtle, validate_shacl, load_and_fix_turtle
-from .ontology_analyzer import OntologyAnalyzer
-from .test_setup_manager import TestSetupManager
-from .package_manager import PackageManager
+# Exported names resolved from their submodule on first access (PEP 562), so
+# importing one module of this package does not import all the others
+_LAZY_ATTRIBUTES: Dict[str, Tuple[str, str]] = {
+    'ErrorHandler': ('.error_handling', 'ErrorHandler'),
+    'ValidationRule': ('.error_handling', 'ValidationRule'),
+    'ErrorResult': ('.error_handling', 'ErrorResult'),
+    'ErrorStep': ('.error_handling', 'ErrorStep'),
+    'ErrorSeverity': ('.error_handling', 'ErrorSeverity'),
+    'SecurityLevel': ('.error_handling', 'SecurityLevel'),
+    'ComplianceLevel': ('.error_handling', 'ComplianceLevel'),
+    'RiskLevel': ('.error_handling', 'RiskLevel'),
+    'ValidationHandler': ('.error_handling', 'ValidationHandler'),
+    'MetricsHandler': ('.error_handling', 'MetricsHandler'),
+    'ComplianceHandler': ('.error_handling', 'ComplianceHandler'),
+    'RDFHandler': ('.error_handling', 'RDFHandler'),
+    'PatchManager': ('.patch_management', 'PatchManager'),
+    'GraphDBPatchManager': ('.patch_management', 'GraphDBPatchManager'),
+    'PatchNotFoundError': ('.patch_management', 'PatchNotFoundError'),
+    'PatchApplicationError': ('.patch_management', 'PatchApplicationError'),
+    'fix_turtle_syntax': ('.turtle_syntax', 'fix_turtle_syntax'),
+    'validate_turtle': ('.turtle_syntax', 'validate_turtle'),
+    'validate_shacl': ('.turtle_syntax', 'validate_shacl'),
+    'load_and_fix_turtle': ('.turtle_syntax', 'load_and_fix_turtle'),
+    'OntologyAnalyzer': ('.ontology_analyzer', 'OntologyAnalyzer'),
+    'TestSetupManager': ('.test_setup_manager', 'TestSetupManager'),
+    'PackageManager': ('.package_manager', 'PackageManager'),
+    'BaseModule': ('.base', 'BaseModule'),
+    'ValidationModule': ('.validation', 'ValidationModule'),
+    'ConsistencyModule': ('.consistency', 'ConsistencyModule'),
+    'SemanticModule': ('.semantic', 'SemanticModule'),
+    'SyntaxModule': ('.syntax', 'SyntaxModule'),
+}
+
+# Registry of available modules: name -> (submodule, class)
+_MODULE_CLASSES: Dict[str, Tuple[str, str]] = {
+    "validation": ('.validation', 'ValidationModule'),
+    "consistency": ('.consistency', 'ConsistencyModule'),
+    "semantic": ('.semantic', 'SemanticModule'),
+    "syntax": ('.syntax', 'SyntaxModule'),
+}
+
+_module_registry: Dict[str, Type[Any]] = {}
+
+
+def __getattr__(name: str) -> Any:
+    if name == 'MODULE_REGISTRY':
+        return {module_name: get_module(module_name) for module_name in _MODULE_CLASSES}
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | {'MODULE_REGISTRY'})
+
 
 __all__ = [
     'ErrorHandler',
@@ -58,34 +96,16 @@ __all__ = [
     'PackageManager'
 ]
 
-"""
-Ontology Framework Modules
-"""
-
-"""Module registry for the ontology framework."""
-
-from typing import Dict, Type
-
-from ontology_framework.modules.base import BaseModule
-from ontology_framework.modules.validation import ValidationModule
-from ontology_framework.modules.consistency import ConsistencyModule
-from ontology_framework.modules.semantic import SemanticModule
-from ontology_framework.modules.syntax import SyntaxModule
-
-# Registry of available modules
-MODULE_REGISTRY: Dict[str, Type[BaseModule]] = {
-    "validation": ValidationModule,
-    "consistency": ConsistencyModule,
-    "semantic": SemanticModule,
-    "syntax": SyntaxModule,
-}
 
-def get_module(module_name: str) -> Type[BaseModule]:
+def get_module(module_name: str) -> Type[Any]:
     """Get a module class by name."""
-    if module_name not in MODULE_REGISTRY:
+    if module_name not in _MODULE_CLASSES:
         raise ValueError(f"Module {module_name} not found in registry")
-    return MODULE_REGISTRY[module_name]
+    if module_name not in _module_registry:
+        submodule, attribute = _MODULE_CLASSES[module_name]
+        _module_registry[module_name] = getattr(importlib.import_module(submodule, __name__), attribute)
+    return _module_registry[module_name]
 
 def list_modules() -> list[str]:
     """List all available modules."""
-    return list(MODULE_REGISTRY.keys()) 
\ No newline at end of file
+    return list(_MODULE_CLASSES.keys())
@@ -0,0 +1,186 @@
+from typing import Dict, Any, List, Optional, Iterator, IO
+from bisect import bisect_left, bisect_right
+import json
+import tempfile
+
+HISTORY_FIELDS = (
+    "rule", "result", "timestamp", "priority", "target",
+    "validator", "message", "error_message", "data"
+)
+
+class ValidationHistory:
+    """Bounded, append-only store of validation attempts.
+
+    The most recent ``max_entries`` attempts are kept in memory in timestamp
+    order so date ranges can be located with bisect. Older attempts spill to a
+    JSONL log, which is streamed back when a query or export reaches past the
+    in-memory window. Counters by rule, priority and target cover the whole
+    history and are updated on append, so statistics never rescan entries.
+    """
+
+    def __init__(self, max_entries: int = 10000, spill_path: Optional[str] = None) -> None:
+        """Initialize the history store.
+
+        Args:
+            max_entries: Number of attempts kept in memory
+            spill_path: Optional JSONL file for spilled attempts (anonymous temporary file if omitted)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.spill_path = spill_path
+        self._spill: Optional[IO[str]] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """Reset entries and counters."""
+        self._entries: List[Dict[str, Any]] = []
+        self._timestamps: List[str] = []
+        self._start = 0
+        self._spilled = 0
+        self._last_spilled_timestamp = ""
+        self._total = 0
+        self._successes = 0
+        self._by_rule: Dict[str, Dict[str, int]] = {}
+        self._by_priority: Dict[str, Dict[str, int]] = {}
+        self._by_target: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_entries()
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Record a validation attempt and update the counters."""
+        timestamp = entry["timestamp"]
+        if not self._timestamps or timestamp >= self._timestamps[-1]:
+            self._entries.append(entry)
+            self._timestamps.append(timestamp)
+        else:
+            position = bisect_right(self._timestamps, timestamp, self._start)
+            self._entries.insert(position, entry)
+            self._timestamps.insert(position, timestamp)
+
+        success = bool(entry["result"])
+        self._total += 1
+        self._successes += success
+        for counters, key in ((self._by_rule, entry["rule"]),
+                              (self._by_priority, entry.get("priority", "MEDIUM")),
+                              (self._by_target, entry.get("target", "data"))):
+            bucket = counters.get(key)
+            if bucket is None:
+                bucket = counters[key] = {"total": 0, "successes": 0}
+            bucket["total"] += 1
+            bucket["successes"] += success
+
+        if len(self._entries) - self._start > self.max_entries:
+            self._spill_oldest()
+
+    def _spill_oldest(self) -> None:
+        """Move the oldest in-memory attempt to the spill log."""
+        if self._spill is None:
+            if self.spill_path:
+                self._spill = open(self.spill_path, "w+", encoding="utf-8")
+            else:
+                self._spill = tempfile.TemporaryFile("w+", encoding="utf-8")
+        entry = self._entries[self._start]
+        self._spill.seek(0, 2)
+        self._spill.write(json.dumps(entry, default=str) + "\n")
+        self._entries[self._start] = None
+        self._last_spilled_timestamp = max(self._last_spilled_timestamp, self._timestamps[self._start])
+        self._start += 1
+        self._spilled += 1
+        # Compact lazily so dropping the head stays amortized O(1)
+        if self._start >= self.max_entries:
+            del self._entries[:self._start]
+            del self._timestamps[:self._start]
+            self._start = 0
+
+    def _iter_spilled(self) -> Iterator[Dict[str, Any]]:
+        """Stream attempts from the spill log, oldest first."""
+        if self._spill is None or not self._spilled:
+            return
+        self._spill.flush()
+        self._spill.seek(0)
+        try:
+            while True:
+                line = self._spill.readline()
+                if not line:
+                    break
+                position = self._spill.tell()
+                yield json.loads(line)
+                self._spill.seek(position)
+        finally:
+            self._spill.seek(0, 2)
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Stream every recorded attempt, spilled ones first."""
+        yield from self._iter_spilled()
+        yield from self._entries[self._start:]
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Get the attempts still held in memory."""
+        return self._entries[self._start:]
+
+    def query(self, rule: Optional[str] = None,
+              start_date: Optional[str] = None,
+              end_date: Optional[str] = None,
+              result: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Find attempts matching every given criterion, in timestamp order."""
+        lo = bisect_left(self._timestamps, start_date, self._start) if start_date else self._start
+        hi = bisect_right(self._timestamps, end_date, lo) if end_date else len(self._timestamps)
+
+        def matches(entry: Dict[str, Any]) -> bool:
+            return ((rule is None or entry["rule"] == rule)
+                    and (result is None or entry["result"] == result))
+
+        matched: List[Dict[str, Any]] = []
+        if self._spilled and (not start_date or start_date <= self._last_spilled_timestamp):
+            for entry in self._iter_spilled():
+                timestamp = entry["timestamp"]
+                if ((not start_date or timestamp >= start_date)
+                        and (not end_date or timestamp <= end_date) and matches(entry)):
+                    matched.append(entry)
+        matched.extend(entry for entry in self._entries[lo:hi] if matches(entry))
+        return matched
+
+    def recent_failures(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Get the latest failed attempts, reading the spill log only if needed."""
+        failures: List[Dict[str, Any]] = []
+        for entry in reversed(self._entries[self._start:]):
+            if not entry["result"]:
+                failures.append(entry)
+                if len(failures) == limit:
+                    return failures[::-1]
+        if self._spilled and self._successes + len(failures) < self._total:
+            return self.query(result=False)[-limit:]
+        return failures[::-1]
+
+    def statistics(self) -> Dict[str, Any]:
+        """Get counters for the whole history without scanning entries."""
+        total = self._total
+        failures = total - self._successes
+        return {
+            "total_validations": total,
+            "successful_validations": self._successes,
+            "failed_validations": failures,
+            "success_rate": self._successes / total if total else 0.0,
+            "failure_rate": failures / total if total else 0.0,
+            "by_rule": {key: dict(value) for key, value in self._by_rule.items()},
+            "by_priority": {key: dict(value) for key, value in self._by_priority.items()},
+            "by_target": {key: dict(value) for key, value in self._by_target.items()}
+        }
+
+    def clear(self) -> None:
+        """Drop every attempt, including the spill log."""
+        if self._spill is not None:
+            self._spill.seek(0)
+            self._spill.truncate()
+        self._reset()
+
+    def close(self) -> None:
+        """Close the spill log."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
@@ -0,0 +1,19 @@
+from typing import Dict, Any, List, Optional, Iterator, IO, Tuple
+
+HISTORY_FIELDS: Tuple[str, ...]
+
+class ValidationHistory:
+    max_entries: int
+    spill_path: Optional[str]
+    def __init__(self, max_entries: int = 10000, spill_path: Optional[str] = None) -> None: ...
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[Dict[str, Any]]: ...
+    def append(self, entry: Dict[str, Any]) -> None: ...
+    def iter_entries(self) -> Iterator[Dict[str, Any]]: ...
+    def recent(self) -> List[Dict[str, Any]]: ...
+    def query(self, rule: Optional[str] = None, start_date: Optional[str] = None,
+              end_date: Optional[str] = None, result: Optional[bool] = None) -> List[Dict[str, Any]]: ...
+    def recent_failures(self, limit: int = 5) -> List[Dict[str, Any]]: ...
+    def statistics(self) -> Dict[str, Any]: ...
+    def clear(self) -> None: ...
+    def close(self) -> None: ...
@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Callable, Optional, Union, Tuple
+from typing import Dict, Any, List, Callable, Optional, Union, Tuple, IO
 from rdflib import Graph, Namespace
 from rdflib.namespace import RDF, RDFS, SH
 from ...ontology_types import (
@@ -12,6 +12,7 @@ import csv
 import io
 import re
 from .types import ErrorType
+from .history import ValidationHistory, HISTORY_FIELDS
 
 class ValidationHandler:
     """Handler for validation rules and history tracking."""
@@ -27,9 +28,14 @@ class ValidationHandler:
             self.validator = validator
             self.validator_func: Optional[Callable[[Dict[str, Any]], bool]] = None  # Store the actual validator function
 
-    def __init__(self):
-        """Initialize validation handler."""
-        self._validation_history = []
+    def __init__(self, history_size: int = 10000, history_path: Optional[str] = None):
+        """Initialize validation handler.
+
+        Args:
+            history_size: Number of validation attempts kept in memory
+            history_path: Optional JSONL file that older attempts spill to
+        """
+        self._validation_history = ValidationHistory(history_size, history_path)
         self._validation_thresholds: Dict[str, Tuple[float, Callable[[float], bool]]] = {}
         self._custom_rules = {}
         self._validation_rules = {
@@ -173,8 +179,8 @@ class ValidationHandler:
         return conforms
 
     def get_validation_history(self) -> List[Dict[str, Any]]:
-        """Get the validation history."""
-        return self._validation_history.copy()
+        """Get the validation attempts held in memory."""
+        return self._validation_history.recent()
 
     def _validate_matrix(self, data: Dict[str, Any]) -> bool:
         """Validate matrix data."""
@@ -527,76 +533,14 @@ class ValidationHandler:
         Returns:
             List of filtered history entries
         """
-        filtered = self._validation_history.copy()
-        
+        rule_str = None
         if rule:
             rule_str = rule.value if isinstance(rule, ValidationRule) else str(rule)
-            filtered = [h for h in filtered if h["rule"] == rule_str]
-            
-        if start_date:
-            filtered = [h for h in filtered if h["timestamp"] >= start_date]
-            
-        if end_date:
-            filtered = [h for h in filtered if h["timestamp"] <= end_date]
-            
-        if result is not None:
-            filtered = [h for h in filtered if h["result"] == result]
-            
-        return filtered
+        return self._validation_history.query(rule_str, start_date, end_date, result)
 
     def get_validation_statistics(self) -> Dict[str, Any]:
-        """Get validation statistics."""
-        total = len(self._validation_history)
-        if total == 0:
-            return {
-                "total_validations": 0,
-                "success_rate": 0.0,
-                "failure_rate": 0.0,
-                "by_rule": {},
-                "by_priority": {},
-                "by_target": {}
-            }
-            
-        successes = sum(1 for entry in self._validation_history if entry["result"])
-        
-        # Calculate statistics by rule
-        by_rule = {}
-        for entry in self._validation_history:
-            rule = entry["rule"]
-            if rule not in by_rule:
-                by_rule[rule] = {"total": 0, "successes": 0}
-            by_rule[rule]["total"] += 1
-            if entry["result"]:
-                by_rule[rule]["successes"] += 1
-                
-        # Calculate statistics by priority
-        by_priority = {}
-        for entry in self._validation_history:
-            priority = entry.get("priority", "MEDIUM")
-            if priority not in by_priority:
-                by_priority[priority] = {"total": 0, "successes": 0}
-            by_priority[priority]["total"] += 1
-            if entry["result"]:
-                by_priority[priority]["successes"] += 1
-                
-        # Calculate statistics by target
-        by_target = {}
-        for entry in self._validation_history:
-            target = entry.get("target", "data")
-            if target not in by_target:
-                by_target[target] = {"total": 0, "successes": 0}
-            by_target[target]["total"] += 1
-            if entry["result"]:
-                by_target[target]["successes"] += 1
-                
-        return {
-            "total_validations": total,
-            "success_rate": successes / total,
-            "failure_rate": (total - successes) / total,
-            "by_rule": by_rule,
-            "by_priority": by_priority,
-            "by_target": by_target
-        }
+        """Get validation statistics from the history counters."""
+        return self._validation_history.statistics()
 
     def add_custom_rule(self, name: str, validator_func: Callable[[Dict[str, Any]], bool],
                        message: Optional[str] = None, priority: str = "MEDIUM", target: str = "data") -> None:
@@ -646,34 +590,41 @@ class ValidationHandler:
 
     def export_validation_history(self, format: str = "json") -> str:
         """Export validation history in specified format."""
+        output = io.StringIO()
+        self.stream_validation_history(output, format)
+        return output.getvalue()
+
+    def stream_validation_history(self, output: IO[str], format: str = "json") -> int:
+        """
+        Write the full validation history, including spilled attempts, to a stream.
+
+        Args:
+            output: Text stream to write to
+            format: 'json' or 'csv'
+
+        Returns:
+            Number of attempts written
+        """
         if format not in ["json", "csv"]:
             raise ValueError("Format must be 'json' or 'csv'")
-            
+
+        count = 0
         if format == "json":
-            return json.dumps(self._validation_history, indent=2)
-        else:
-            if not self._validation_history:
-                return ""
-                
-            # Get all possible fields
-            fields = set()
-            for entry in self._validation_history:
-                fields.update(entry.keys())
-                
-            # Create CSV header
-            header = list(fields)
-            rows = [header]
-            
-            # Add data rows
-            for entry in self._validation_history:
-                row = [entry.get(field, "") for field in header]
-                rows.append(row)
-                
-            # Convert to CSV
-            output = io.StringIO()
-            writer = csv.writer(output)
-            writer.writerows(rows)
-            return output.getvalue()
+            output.write("[")
+            for entry in self._validation_history.iter_entries():
+                output.write(",\n" if count else "\n")
+                output.write(json.dumps([entry], indent=2, default=str)[2:-2])
+                count += 1
+            output.write("\n]" if count else "]")
+            return count
+
+        writer = csv.DictWriter(output, fieldnames=HISTORY_FIELDS, extrasaction="ignore", restval="")
+        for entry in self._validation_history.iter_entries():
+            if not count:
+                writer.writeheader()
+            writer.writerow(entry)
+            count += 1
+        return count
 
     def generate_validation_report(self) -> Dict[str, Any]:
         """Generate a comprehensive validation report."""
@@ -693,9 +644,7 @@ class ValidationHandler:
         }
         
         # Add recent failures
-        recent_failures = self.filter_validation_history(result=False)
-        if recent_failures:
-            report["recent_failures"] = recent_failures[-5:]  # Last 5 failures
+        report["recent_failures"] = self._validation_history.recent_failures(5)
             
         # Check threshold violations
         for rule_name, (threshold, check) in self._validation_thresholds.items():
@@ -6,10 +6,12 @@ from enum import Enum, auto
 from rdflib import Graph, URIRef, Literal as RDFLiteral, BNode, Namespace, XSD, Node
 from rdflib.namespace import RDF, RDFS, OWL, XSD, SH
 from rdflib.query import ResultRow, Result
+from rdflib.plugins.stores.memory import Memory
 from pathlib import Path
 import math
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
+from array import array
 from ontology_framework.modules.ontology import Ontology
 from ontology_framework.modules.constants import CONFORMANCE_LEVELS
 from ontology_framework.modules.template_ontology import TemplateOntology
@@ -735,6 +737,154 @@ class DependencyInfo(TypedDict):
     depended_by: Dict[URIRef, Relationship]
     relation_types: Set[RelationType]
 
+class DependencySummary(TypedDict):
+    """Lightweight dependency information keyed by neighbour, valued by predicate."""
+    depends_on: Dict[URIRef, URIRef]
+    depended_by: Dict[URIRef, URIRef]
+    relation_types: Set[RelationType]
+
+class VersionedMemory(Memory):
+    """In-memory store that counts writes, so caches over it know when to rebuild.
+    
+    Every add and remove bumps version, including those made through
+    Graph.parse, += and SPARQL UPDATE, which all end in the store.
+    """
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = 0
+    
+    def add(self, triple: Any, context: Any, quoted: bool = False) -> None:
+        self.version += 1
+        super().add(triple, context, quoted)
+    
+    def remove(self, triple: Any, context: Any = None) -> None:
+        self.version += 1
+        super().remove(triple, context)
+
+def versioned_graph(graph: Graph) -> Graph:
+    """Copy of a graph, with its namespace bindings, over a VersionedMemory store."""
+    copy = Graph(store=VersionedMemory(), identifier=graph.identifier)
+    for prefix, namespace in graph.namespaces():
+        copy.bind(prefix, namespace, override=True, replace=True)
+    copy += graph
+    return copy
+
+class AdjacencyIndex:
+    """Integer-coded CSR adjacency over the URI-to-URI edges of a graph.
+    
+    Nodes and predicates are assigned dense integer ids. Outgoing and incoming
+    edges are stored as offset/neighbour/predicate arrays so that neighbourhood
+    lookups and BFS never touch the rdflib store.
+    """
+    
+    def __init__(self, graph: Graph) -> None:
+        """Build the index in a single pass over the graph.
+        
+        Args:
+            graph: Graph to index
+        """
+        self.node_ids: Dict[URIRef, int] = {}
+        self.nodes: List[URIRef] = []
+        self.predicate_ids: Dict[URIRef, int] = {}
+        self.predicates: List[URIRef] = []
+        # Every predicate used in the graph, including literal/blank-node edges
+        self.all_predicates: Set[Node] = set()
+        
+        edges: List[Tuple[int, int, int]] = []
+        for s, p, o in graph:
+            self.all_predicates.add(p)
+            if isinstance(s, URIRef) and isinstance(o, URIRef) and isinstance(p, URIRef):
+                edges.append((self._node_id(s), self._predicate_id(p), self._node_id(o)))
+        
+        node_count = len(self.nodes)
+        self.out_offsets, self.out_targets, self.out_predicates = self._build_csr(
+            node_count, ((s, p, o) for s, p, o in edges))
+        self.in_offsets, self.in_sources, self.in_predicates = self._build_csr(
+            node_count, ((o, p, s) for s, p, o in edges))
+    
+    def _node_id(self, node: URIRef) -> int:
+        node_id = self.node_ids.get(node)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self.node_ids[node] = node_id
+            self.nodes.append(node)
+        return node_id
+    
+    def _predicate_id(self, predicate: URIRef) -> int:
+        predicate_id = self.predicate_ids.get(predicate)
+        if predicate_id is None:
+            predicate_id = len(self.predicates)
+            self.predicate_ids[predicate] = predicate_id
+            self.predicates.append(predicate)
+        return predicate_id
+    
+    @staticmethod
+    def _build_csr(node_count: int, edges: Iterator[Tuple[int, int, int]]) -> Tuple[array, array, array]:
+        """Build offset, neighbour and predicate arrays from (from, pred, to) edges."""
+        edge_list = list(edges)
+        offsets = array("l", [0]) * (node_count + 1)
+        for source, _, _ in edge_list:
+            offsets[source + 1] += 1
+        for i in range(node_count):
+            offsets[i + 1] += offsets[i]
+        
+        neighbours = array("l", [0]) * len(edge_list)
+        predicates = array("l", [0]) * len(edge_list)
+        cursor = array("l", offsets[:-1])
+        for source, predicate, target in edge_list:
+            position = cursor[source]
+            neighbours[position] = target
+            predicates[position] = predicate
+            cursor[source] = position + 1
+        return offsets, neighbours, predicates
+    
+    def out_edges(self, node_id: int) -> Iterator[Tuple[int, int]]:
+        """Yield (predicate id, target id) for a node's outgoing edges."""
+        for i in range(self.out_offsets[node_id], self.out_offsets[node_id + 1]):
+            yield self.out_predicates[i], self.out_targets[i]
+    
+    def in_edges(self, node_id: int) -> Iterator[Tuple[int, int]]:
+        """Yield (predicate id, source id) for a node's incoming edges."""
+        for i in range(self.in_offsets[node_id], self.in_offsets[node_id + 1]):
+            yield self.in_predicates[i], self.in_sources[i]
+    
+    def bfs(self, sources: Sequence[int], max_depth: int) -> Dict[int, int]:
+        """Multi-source BFS over edges in both directions.
+        
+        Args:
+            sources: Node ids to start from (depth 0)
+            max_depth: Maximum depth to explore
+            
+        Returns:
+            Mapping of reached node id to its depth
+        """
+        depths: Dict[int, int] = {}
+        queue: deque = deque()
+        for source in sources:
+            if source not in depths:
+                depths[source] = 0
+                queue.append(source)
+        
+        out_offsets, out_targets = self.out_offsets, self.out_targets
+        in_offsets, in_sources = self.in_offsets, self.in_sources
+        while queue:
+            node = queue.popleft()
+            depth = depths[node]
+            if depth >= max_depth:
+                continue
+            for i in range(out_offsets[node], out_offsets[node + 1]):
+                neighbour = out_targets[i]
+                if neighbour not in depths:
+                    depths[neighbour] = depth + 1
+                    queue.append(neighbour)
+            for i in range(in_offsets[node], in_offsets[node + 1]):
+                neighbour = in_sources[i]
+                if neighbour not in depths:
+                    depths[neighbour] = depth + 1
+                    queue.append(neighbour)
+        return depths
+
 class GuidanceOntology(TemplateOntology):
     """Class for managing the guidance ontology."""
     
@@ -746,8 +896,12 @@ class GuidanceOntology(TemplateOntology):
             guidance_file: Optional path to a guidance file to load
         """
         super().__init__(base_uri)
+        # Count writes so the adjacency index sees every edit, not just size changes
+        self.graph = versioned_graph(self.graph)
         self._initialize_uris()
         self.relationship_cache: Dict[Tuple[URIRef, URIRef], Relationship] = {}
+        self._adjacency_index: Optional[AdjacencyIndex] = None
+        self._adjacency_version: Optional[Tuple[int, int]] = None
         
         if guidance_file:
             self.load(guidance_file)
@@ -782,7 +936,7 @@ class GuidanceOntology(TemplateOntology):
             )
         
         # Analyze semantic dimension
-        if predicate in self.graph.predicates():
+        if predicate in self.get_adjacency_index().all_predicates:
             quality.dimensional_scores[KnowledgeDimension.SEMANTIC].update_score(
                 0.6, "Predicate is defined in the ontology"
             )
@@ -803,24 +957,63 @@ class GuidanceOntology(TemplateOntology):
             quality=quality
         )
 
+    def load(self, file_path: Union[str, Path]) -> None:
+        """Load an ontology from a file and drop the adjacency index.
+        
+        Args:
+            file_path: Path to the ontology file.
+        """
+        super().load(file_path)
+        self.invalidate_adjacency_index()
+
+    def invalidate_adjacency_index(self) -> None:
+        """Force the adjacency index to be rebuilt on next use."""
+        self._adjacency_index = None
+        self._adjacency_version = None
+
+    def _graph_version(self) -> Tuple[int, int]:
+        """Identity of the graph and a value that changes with every edit to it."""
+        version = getattr(self.graph.store, "version", None)
+        if version is None:
+            # A graph assigned from outside; fall back to hashing its triples
+            version = 0
+            for triple in self.graph:
+                version ^= hash(triple)
+        return (id(self.graph), version)
+
+    def get_adjacency_index(self) -> AdjacencyIndex:
+        """Get the adjacency index, rebuilding it if the graph has changed.
+        
+        Changes are detected by the write counter of the graph's
+        VersionedMemory store, so edits that keep the size are seen too.
+        """
+        version = self._graph_version()
+        if self._adjacency_index is None or self._adjacency_version != version:
+            self._adjacency_index = AdjacencyIndex(self.graph)
+            self._adjacency_version = version
+        return self._adjacency_index
+
     def get_dependencies(self, uri: URIRef) -> DependencyInfo:
         """Get qualified dependencies for a given URI in both directions."""
+        index = self.get_adjacency_index()
         depends_on: Dict[URIRef, Relationship] = {}
         depended_by: Dict[URIRef, Relationship] = {}
         relation_types: Set[RelationType] = set()
         
-        # Analyze outgoing relationships
-        for s, p, o in self.graph.triples((uri, None, None)):
-            if isinstance(o, URIRef):
-                rel = self._analyze_relationship(cast(URIRef, s), cast(URIRef, o), cast(URIRef, p))
-                depends_on[o] = rel
+        node_id = index.node_ids.get(uri)
+        if node_id is not None:
+            # Analyze outgoing relationships
+            for predicate_id, target_id in index.out_edges(node_id):
+                target = index.nodes[target_id]
+                rel = self._analyze_relationship(uri, target, index.predicates[predicate_id])
+                depends_on[target] = rel
                 relation_types.add(rel.rel_type)
-        
-        # Analyze incoming relationships
-        for s, p, o in self.graph.triples((None, None, uri)):
-            if isinstance(s, URIRef):
-                rel = self._analyze_relationship(cast(URIRef, s), cast(URIRef, uri), cast(URIRef, p))
-                depended_by[s] = rel
+            
+            # Analyze incoming relationships
+            for predicate_id, source_id in index.in_edges(node_id):
+                source = index.nodes[source_id]
+                rel = self._analyze_relationship(source, uri, index.predicates[predicate_id])
+                depended_by[source] = rel
                 relation_types.add(rel.rel_type)
         
         return DependencyInfo(
@@ -829,29 +1022,55 @@ class GuidanceOntology(TemplateOntology):
             relation_types=relation_types
         )
 
-    def analyze_adjacency(self, uri: URIRef, max_depth: int = 1) -> Dict[URIRef, DependencyInfo]:
-        """Analyze relationships up to a certain depth from a given URI."""
-        results: Dict[URIRef, DependencyInfo] = {}
-        visited: Set[URIRef] = {uri}
-        to_visit: List[Tuple[URIRef, int]] = [(uri, 0)]  # (uri, current_depth)
-        
-        while to_visit:
-            current_uri, depth = to_visit.pop(0)
-            if depth > max_depth:
-                continue
-                
-            # Get dependencies for current URI
-            deps = self.get_dependencies(current_uri)
-            results[current_uri] = deps
-            
-            # Add new URIs to visit
-            for next_uri in deps.depends_on.keys() | deps.depended_by.keys():
-                if next_uri not in visited:
-                    visited.add(next_uri)
-                    to_visit.append((next_uri, depth + 1))
+    def get_dependencies_batch(self, uris: Sequence[URIRef]) -> Dict[URIRef, DependencySummary]:
+        """Get unqualified dependencies for many URIs at once.
         
+        Unlike get_dependencies(), no Relationship objects are created; each
+        neighbour maps to the predicate linking it to the URI.
+        """
+        index = self.get_adjacency_index()
+        results: Dict[URIRef, DependencySummary] = {}
+        for uri in uris:
+            depends_on: Dict[URIRef, URIRef] = {}
+            depended_by: Dict[URIRef, URIRef] = {}
+            predicate_ids: Set[int] = set()
+            node_id = index.node_ids.get(uri)
+            if node_id is not None:
+                for predicate_id, target_id in index.out_edges(node_id):
+                    depends_on[index.nodes[target_id]] = index.predicates[predicate_id]
+                    predicate_ids.add(predicate_id)
+                for predicate_id, source_id in index.in_edges(node_id):
+                    depended_by[index.nodes[source_id]] = index.predicates[predicate_id]
+                    predicate_ids.add(predicate_id)
+            results[uri] = DependencySummary(
+                depends_on=depends_on,
+                depended_by=depended_by,
+                relation_types={self._infer_relationship_type(index.predicates[i]) for i in predicate_ids}
+            )
         return results
 
+    def get_neighborhood(self, uris: Sequence[URIRef], max_depth: int = 1) -> Dict[URIRef, int]:
+        """Get every URI within max_depth of any of the given URIs.
+        
+        Returns:
+            Mapping of reached URI to its distance from the nearest source
+        """
+        index = self.get_adjacency_index()
+        sources = [index.node_ids[uri] for uri in uris if uri in index.node_ids]
+        depths = {index.nodes[node_id]: depth for node_id, depth in index.bfs(sources, max_depth).items()}
+        for uri in uris:
+            depths.setdefault(uri, 0)
+        return depths
+
+    def analyze_adjacency(self, uri: URIRef, max_depth: int = 1) -> Dict[URIRef, DependencyInfo]:
+        """Analyze relationships up to a certain depth from a given URI."""
+        if max_depth < 0:
+            return {}
+        return {
+            node: self.get_dependencies(node)
+            for node in self.get_neighborhood([uri], max_depth)
+        }
+
     def _initialize_uris(self) -> None:
         """Initialize core URIs as class attributes."""
         # Core classes
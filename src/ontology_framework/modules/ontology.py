@@ -8,6 +8,7 @@ from rdflib.query import Result, ResultRow
 import glob
 from .compliance import ComplianceOntology
 from .base_ontology import BaseOntology
+from ..core.graph_registry import get_graph_registry
 
 T = TypeVar('T')
 
@@ -85,7 +86,7 @@ class Ontology(BaseOntology):
         Args:
             file_path: Path to the ontology file.
         """
-        self.graph.parse(file_path, format="turtle")
+        get_graph_registry().load_into(self.graph, file_path, format="turtle")
         
     def save(self, file_path: Union[str, Path]) -> None:
         """Save the ontology to a file.
@@ -2,6 +2,7 @@
 Module for managing patches in the ontology framework.
 """
 
+import re
 from typing import Optional, List, Dict, Any, Union
 from pathlib import Path
 from datetime import datetime
@@ -12,9 +13,16 @@ from ..meta import MetaOntology, OntologyPatch, PatchType, PatchStatus
 from .error_handling import ErrorHandler
 from .turtle_syntax import load_and_fix_turtle
 from ..exceptions import PatchNotFoundError, PatchApplicationError
+from ..core.overlay_graph import OverlayGraph
 
 PATCH = Namespace("http://example.org/ontology/")
 
+# Patch content that is a SPARQL Update rather than Turtle
+SPARQL_UPDATE_PATTERN = re.compile(
+    r"\s*(?:(?:PREFIX|BASE)\s[^\n]*\n\s*|#[^\n]*\n\s*)*(?:INSERT|DELETE|WITH|CLEAR|DROP|LOAD|CREATE)\b",
+    re.IGNORECASE
+)
+
 class PatchManager:
     """Class for managing patches in the ontology framework."""
     
@@ -107,32 +115,57 @@ class PatchManager:
         """
         return [str(s).split("/")[-1] for s in self.graph.subjects(RDF.type, PATCH.Patch)]
         
-    def apply_patch(self, patch_id: str, target_graph: Graph) -> None:
+    def apply_patch(self, patch_id: str, target_graph: Graph, commit: bool = True) -> OverlayGraph:
         """Apply a patch to a target graph.
         
+        The patch is applied to an overlay over the target, so a patch that
+        fails to parse leaves the target untouched.
+        
         Args:
             patch_id: The ID of the patch to apply.
             target_graph: The graph to apply the patch to.
+            commit: Write the changes into the target graph. With False the
+                target is left as is and the returned overlay holds the
+                patched view, to validate and then commit() or discard().
+                
+        Returns:
+            The overlay holding the patch's changes (empty once committed).
+            
+        Raises:
+            PatchApplicationError: If the patch content cannot be applied.
         """
         patch = self.get_patch(patch_id)
         
         # Get patch content
         patch_uri = next(patch.subjects(RDF.type, PATCH.Patch))
         content = patch.value(patch_uri, RDFS.comment)
+        overlay = OverlayGraph(target_graph)
         
         if content:
             # Bind required namespaces
-            target_graph.bind("rdf", RDF)
-            target_graph.bind("rdfs", RDFS)
-            target_graph.bind("owl", OWL)
-            target_graph.bind("xsd", XSD)
+            overlay.bind("rdf", RDF)
+            overlay.bind("rdfs", RDFS)
+            overlay.bind("owl", OWL)
+            overlay.bind("xsd", XSD)
             
-            # Parse and add content to target graph
-            target_graph.parse(data=str(content), format="turtle")
+            # Patch content is Turtle to add, or a SPARQL Update
+            try:
+                if SPARQL_UPDATE_PATTERN.match(str(content)):
+                    overlay.update(str(content))
+                else:
+                    overlay.parse(data=str(content), format="turtle")
+            except Exception as e:
+                overlay.discard()
+                raise PatchApplicationError(f"Failed to apply patch {patch_id}: {str(e)}")
+                
+        if not commit:
+            return overlay
+        overlay.commit()
             
         # Update patch status
         self.graph.set((patch_uri, PATCH.status, Literal(PatchStatus.APPLIED.name)))
         self.graph.set((patch_uri, PATCH.updatedAt, Literal(datetime.now().isoformat(), datatype=XSD.dateTime)))
+        return overlay
         
     def validate_patch(self, patch_id: Union[str, URIRef]) -> bool:
         """Validate a patch.
@@ -10,6 +10,7 @@ from rdflib.query import Result as ResultRow
 from rdflib.term import Node, Identifier
 from rdflib.namespace import RDFS, OWL, SH, RDF, XSD
 import pyshacl
+from ..prepared_queries import PREPARED_QUERIES
 import sys
 import json
 
@@ -26,6 +27,85 @@ logger.setLevel(logging.DEBUG)
 BFG = Namespace("https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#")
 GUIDANCE = Namespace("https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#")
 
+# Issues on ValidationRule, its subclasses, properties, shapes and targets
+RULE_ISSUES_QUERY = PREPARED_QUERIES.register("validator.rule_issues", """
+PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+PREFIX owl: <http://www.w3.org/2002/07/owl#>
+PREFIX sh: <http://www.w3.org/ns/shacl#>
+PREFIX : <https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#>
+
+SELECT ?rule ?issue WHERE {
+    {
+        # Check ValidationRule class
+        :ValidationRule ?p ?o .
+        BIND("ValidationRule" AS ?rule)
+        BIND(
+            IF(?p = rdfs:label && !BOUND(?o), "missing_label",
+            IF(?p = rdfs:comment && !BOUND(?o), "missing_comment",
+            IF(?p = :message && !BOUND(?o), "missing_message",
+            IF(?p = :priority && !BOUND(?o), "missing_priority",
+            IF(?p = :target && !BOUND(?o), "missing_target",
+            IF(?p = :validator && !BOUND(?o), "missing_validator", ""))))))
+            AS ?issue
+        )
+        FILTER(?issue != "")
+    }
+    UNION
+    {
+        # Check subclasses
+        ?subclass rdfs:subClassOf :ValidationRule .
+        BIND(STR(?subclass) AS ?rule)
+        BIND(
+            IF(NOT EXISTS { ?subclass owl:versionInfo ?v }, "missing_version_info",
+            IF(NOT EXISTS { ?subclass rdfs:label ?l }, "missing_label",
+            IF(NOT EXISTS { ?subclass rdfs:comment ?c }, "missing_comment", "")))
+            AS ?issue
+        )
+        FILTER(?issue != "")
+    }
+    UNION
+    {
+        # Check properties
+        ?property rdfs:domain :ValidationRule .
+        BIND(STR(?property) AS ?rule)
+        BIND(
+            IF(NOT EXISTS { ?property rdfs:range ?r }, "missing_range",
+            IF(NOT EXISTS { ?property rdfs:label ?l }, "missing_label",
+            IF(NOT EXISTS { ?property rdfs:comment ?c }, "missing_comment", "")))
+            AS ?issue
+        )
+        FILTER(?issue != "")
+    }
+    UNION
+    {
+        # Check SHACL shapes
+        ?shape sh:targetClass :ValidationRule .
+        BIND(STR(?shape) AS ?rule)
+        BIND(
+            IF(NOT EXISTS { ?shape sh:property ?p }, "missing_property_constraints",
+            IF(NOT EXISTS { ?shape rdfs:label ?l }, "missing_label",
+            IF(NOT EXISTS { ?shape rdfs:comment ?c }, "missing_comment", "")))
+            AS ?issue
+        )
+        FILTER(?issue != "")
+    }
+    UNION
+    {
+        # Check validation targets
+        ?target rdf:type :ValidationTarget .
+        BIND(STR(?target) AS ?rule)
+        BIND(
+            IF(NOT EXISTS { ?target rdfs:label ?l }, "missing_label",
+            IF(NOT EXISTS { ?target rdfs:comment ?c }, "missing_comment",
+            IF(NOT EXISTS { ?target owl:versionInfo ?v }, "missing_version_info", "")))
+            AS ?issue
+        )
+        FILTER(?issue != "")
+    }
+}
+""")
+
 class ValidationTarget:
     """Represents a validation target with priority and metadata."""
     def __init__(self, uri: URIRef, target_type: str, priority: str = "LOW"):
@@ -182,88 +262,10 @@ class MCPValidator:
             'individuals': []
         }
         
-        # Check ValidationRule hierarchy
-        rule_query = """
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        PREFIX owl: <http://www.w3.org/2002/07/owl#>
-        PREFIX sh: <http://www.w3.org/ns/shacl#>
-        PREFIX : <https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#>
-        
-        SELECT ?rule ?issue WHERE {
-            {
-                # Check ValidationRule class
-                :ValidationRule ?p ?o .
-                BIND("ValidationRule" AS ?rule)
-                BIND(
-                    IF(?p = rdfs:label && !BOUND(?o), "missing_label",
-                    IF(?p = rdfs:comment && !BOUND(?o), "missing_comment",
-                    IF(?p = :message && !BOUND(?o), "missing_message",
-                    IF(?p = :priority && !BOUND(?o), "missing_priority",
-                    IF(?p = :target && !BOUND(?o), "missing_target",
-                    IF(?p = :validator && !BOUND(?o), "missing_validator", ""))))))
-                    AS ?issue
-                )
-                FILTER(?issue != "")
-            }
-            UNION
-            {
-                # Check subclasses
-                ?subclass rdfs:subClassOf :ValidationRule .
-                BIND(STR(?subclass) AS ?rule)
-                BIND(
-                    IF(NOT EXISTS { ?subclass owl:versionInfo ?v }, "missing_version_info",
-                    IF(NOT EXISTS { ?subclass rdfs:label ?l }, "missing_label",
-                    IF(NOT EXISTS { ?subclass rdfs:comment ?c }, "missing_comment", "")))
-                    AS ?issue
-                )
-                FILTER(?issue != "")
-            }
-            UNION
-            {
-                # Check properties
-                ?property rdfs:domain :ValidationRule .
-                BIND(STR(?property) AS ?rule)
-                BIND(
-                    IF(NOT EXISTS { ?property rdfs:range ?r }, "missing_range",
-                    IF(NOT EXISTS { ?property rdfs:label ?l }, "missing_label",
-                    IF(NOT EXISTS { ?property rdfs:comment ?c }, "missing_comment", "")))
-                    AS ?issue
-                )
-                FILTER(?issue != "")
-            }
-            UNION
-            {
-                # Check SHACL shapes
-                ?shape sh:targetClass :ValidationRule .
-                BIND(STR(?shape) AS ?rule)
-                BIND(
-                    IF(NOT EXISTS { ?shape sh:property ?p }, "missing_property_constraints",
-                    IF(NOT EXISTS { ?shape rdfs:label ?l }, "missing_label",
-                    IF(NOT EXISTS { ?shape rdfs:comment ?c }, "missing_comment", "")))
-                    AS ?issue
-                )
-                FILTER(?issue != "")
-            }
-            UNION
-            {
-                # Check validation targets
-                ?target rdf:type :ValidationTarget .
-                BIND(STR(?target) AS ?rule)
-                BIND(
-                    IF(NOT EXISTS { ?target rdfs:label ?l }, "missing_label",
-                    IF(NOT EXISTS { ?target rdfs:comment ?c }, "missing_comment",
-                    IF(NOT EXISTS { ?target owl:versionInfo ?v }, "missing_version_info", "")))
-                    AS ?issue
-                )
-                FILTER(?issue != "")
-            }
-        }
-        """
-        
         try:
-            results = graph.query(rule_query)
-            self._log_query_results(rule_query, results)
+            # Check ValidationRule hierarchy
+            results = RULE_ISSUES_QUERY.query(graph)
+            self._log_query_results(RULE_ISSUES_QUERY.text, results)
             
             for row in results:
                 if isinstance(row, (ResultRow, Tuple)):
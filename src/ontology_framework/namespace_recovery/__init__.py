@@ -5,6 +5,7 @@ such as the use of example.org domains that should be replaced with proper names
 """
 
 from .find_example_org import ExampleOrgFinder
+from .repo_scanner import RepositoryScanner
 from .namespace_recovery import create_namespace_recovery_project, get_project_status
 
-__all__ = ["ExampleOrgFinder", "create_namespace_recovery_project", "get_project_status"] 
\ No newline at end of file
+__all__ = ["ExampleOrgFinder", "RepositoryScanner", "create_namespace_recovery_project", "get_project_status"] 
\ No newline at end of file
@@ -4,12 +4,13 @@ This module provides functionality to scan files and directories for references
 example.org domains that should be replaced with proper namespaces.
 """
 
-import os
 import re
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Set
 from dataclasses import dataclass
 
+from .repo_scanner import LineMatch, RepositoryScanner, scan_path
+
 @dataclass
 class ExampleOrgReference:
     """Represents a reference to example.org found in a file."""
@@ -21,14 +22,21 @@ class ExampleOrgReference:
 class ExampleOrgFinder:
     """Class for finding example.org references in files and directories."""
 
-    def __init__(self, ignore_patterns: Optional[List[str]] = None):
+    def __init__(self, ignore_patterns: Optional[List[str]] = None,
+                 workers: Optional[int] = None, cache_path: Optional[str] = None):
         """Initialize the finder.
         
         Args:
             ignore_patterns: List of glob patterns to ignore
+            workers: Number of processes used to scan large directories
+            cache_path: JSON file caching results between runs
         """
         self.ignore_patterns = ignore_patterns or []
         self._example_org_pattern = re.compile(r'example\.org', re.IGNORECASE)
+        self._scanner = RepositoryScanner(
+            r'example\.org', self.ignore_patterns, flags=re.IGNORECASE,
+            workers=workers, cache_path=cache_path
+        )
         
     def _should_ignore(self, path: str) -> bool:
         """Check if a path should be ignored based on ignore patterns.
@@ -39,8 +47,7 @@ class ExampleOrgFinder:
         Returns:
             True if path should be ignored, False otherwise
         """
-        from fnmatch import fnmatch
-        return any(fnmatch(path, pattern) for pattern in self.ignore_patterns)
+        return self._scanner.should_ignore(path)
 
     def scan_file(self, file_path: str) -> List[ExampleOrgReference]:
         """Scan a single file for example.org references.
@@ -53,30 +60,13 @@ class ExampleOrgFinder:
         """
         if self._should_ignore(file_path):
             return []
-            
-        references = []
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for i, line in enumerate(f, 1):
-                    if self._example_org_pattern.search(line):
-                        context = self._determine_context(file_path)
-                        ref = ExampleOrgReference(
-                            file_path=file_path,
-                            line_number=i,
-                            line_content=line.strip(),
-                            context=context
-                        )
-                        references.append(ref)
-        except UnicodeDecodeError:
-            # Skip binary files
-            pass
-        except Exception as e:
-            print(f"Error scanning file {file_path}: {e}")
-            
-        return references
+        return self._to_references(file_path, scan_path(file_path, self._scanner.pattern))
 
     def scan_directory(self, directory: str) -> List[ExampleOrgReference]:
         """Recursively scan a directory for example.org references.
+
+        Ignored directories are not descended into, and files unchanged since
+        a previous scan with this finder are not read again.
         
         Args:
             directory: Path to the directory to scan
@@ -85,19 +75,22 @@ class ExampleOrgFinder:
             List of ExampleOrgReference objects
         """
         references = []
-        for root, _, files in os.walk(directory):
-            if self._should_ignore(root):
-                continue
-                
-            for file in files:
-                if self._should_ignore(file):
-                    continue
-                    
-                file_path = os.path.join(root, file)
-                references.extend(self.scan_file(file_path))
-                
+        for file_path, matches in self._scanner.scan(directory).items():
+            references.extend(self._to_references(file_path, matches))
         return references
 
+    def _to_references(self, file_path: str, matches: List[LineMatch]) -> List[ExampleOrgReference]:
+        context = self._determine_context(file_path)
+        return [
+            ExampleOrgReference(
+                file_path=file_path,
+                line_number=line_number,
+                line_content=line_content,
+                context=context
+            )
+            for line_number, line_content in matches
+        ]
+
     def _determine_context(self, file_path: str) -> str:
         """Determine the context of a file based on its extension.
         
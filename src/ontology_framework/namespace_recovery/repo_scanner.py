@@ -0,0 +1,219 @@
+"""Fast, incremental repository text scanner.
+
+This module provides the search engine behind the namespace recovery tools.
+Ignore globs are compiled into a single regular expression and ignored
+directories are pruned during the walk. Files are memory-mapped and searched
+as bytes, so only matching lines are ever decoded, and files are spread
+across a process pool. Results are cached by (path, mtime, size) so that a
+rescan only reads files that changed.
+"""
+
+import json
+import logging
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import translate
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (line number, stripped line content) for each matching line of a file
+LineMatch = Tuple[int, str]
+
+# Bytes sniffed for NUL characters to recognise binary files
+_BINARY_SNIFF = 8192
+
+
+def compile_ignore_patterns(patterns: Sequence[str]) -> Optional["re.Pattern[str]"]:
+    """Compile fnmatch-style globs into one regex, or None if there are none.
+
+    Args:
+        patterns: Glob patterns, matched like fnmatch against a name or path
+
+    Returns:
+        Compiled alternation of all patterns
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{translate(pattern)})" for pattern in patterns))
+
+
+def scan_path(file_path: str, pattern: "re.Pattern[bytes]") -> List[LineMatch]:
+    """Find the lines of a file matching a bytes pattern.
+
+    The whole file is searched in one pass over a memory map; line numbers
+    and line content are only computed for matches.
+
+    Args:
+        file_path: Path to the file to scan
+        pattern: Compiled bytes regular expression
+
+    Returns:
+        Matching lines, or an empty list for binary or non-UTF-8 files
+    """
+    try:
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                first = pattern.search(data)
+                if first is None or b"\0" in data[:_BINARY_SNIFF]:
+                    return []
+                return _matching_lines(data, pattern, first.start())
+    except UnicodeDecodeError:
+        # Skip binary files
+        return []
+    except Exception as e:
+        logger.warning(f"Error scanning file {file_path}: {e}")
+        return []
+
+
+def _matching_lines(data: mmap.mmap, pattern: "re.Pattern[bytes]", start: int) -> List[LineMatch]:
+    matches: List[LineMatch] = []
+    line_number = 1
+    counted_to = 0
+    line_end = -1
+    for match in pattern.finditer(data, start):
+        if match.start() <= line_end:
+            continue
+        line_number += data[counted_to:match.start()].count(b"\n")
+        counted_to = match.start()
+        line_start = data.rfind(b"\n", 0, match.start()) + 1
+        line_end = data.find(b"\n", match.start())
+        if line_end < 0:
+            line_end = len(data)
+        matches.append((line_number, data[line_start:line_end].decode("utf-8").strip()))
+    return matches
+
+
+def _scan_chunk(paths: List[str], pattern_source: bytes, flags: int) -> List[List[LineMatch]]:
+    """Process pool entry point: scan a chunk of files with one compiled pattern"""
+    pattern = re.compile(pattern_source, flags)
+    return [scan_path(path, pattern) for path in paths]
+
+
+class RepositoryScanner:
+    """Parallel, incremental line scanner for a repository."""
+
+    def __init__(self, pattern: str, ignore_patterns: Optional[List[str]] = None,
+                 flags: int = 0, workers: Optional[int] = None,
+                 cache_path: Optional[str] = None, parallel_threshold: int = 64,
+                 chunk_size: int = 32):
+        """Initialize the scanner.
+
+        Args:
+            pattern: Regular expression to search for
+            ignore_patterns: Glob patterns for files and directories to skip
+            flags: re flags for the pattern, e.g. re.IGNORECASE
+            workers: Process pool size; defaults to the CPU count
+            cache_path: JSON file persisting results between runs
+            parallel_threshold: Fewer changed files than this are scanned in-process
+            chunk_size: Files sent to a worker at a time
+        """
+        self.pattern = re.compile(pattern.encode("utf-8"), flags)
+        self.ignore_patterns = ignore_patterns or []
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_path = cache_path
+        self.parallel_threshold = parallel_threshold
+        self.chunk_size = chunk_size
+        self._ignore = compile_ignore_patterns(self.ignore_patterns)
+        self._cache: Dict[str, Tuple[int, int, List[LineMatch]]] = {}
+        self.files_scanned = 0
+        self.cache_hits = 0
+        if cache_path and os.path.exists(cache_path):
+            self._load_cache()
+
+    def should_ignore(self, path: str) -> bool:
+        """Check a path, or any single name, against the ignore patterns."""
+        return bool(self._ignore and self._ignore.match(path))
+
+    def walk(self, directory: str) -> Iterator[str]:
+        """Yield the files under a directory, pruning ignored directories."""
+        if self.should_ignore(directory):
+            return
+        for root, dirs, files in os.walk(directory):
+            if self._ignore is not None:
+                dirs[:] = [
+                    d for d in dirs
+                    if not self.should_ignore(d) and not self.should_ignore(os.path.join(root, d))
+                ]
+            for file in files:
+                if self.should_ignore(file):
+                    continue
+                file_path = os.path.join(root, file)
+                if not self.should_ignore(file_path):
+                    yield file_path
+
+    def scan(self, directory: str) -> Dict[str, List[LineMatch]]:
+        """Scan every file under a directory.
+
+        Returns:
+            Matching lines keyed by file path, in walk order, for files with matches
+        """
+        return self.scan_files(list(self.walk(directory)))
+
+    def scan_files(self, paths: List[str]) -> Dict[str, List[LineMatch]]:
+        """Scan the given files, reusing cached results for unchanged ones.
+
+        Returns:
+            Matching lines keyed by file path, in input order, for files with matches
+        """
+        results: Dict[str, List[LineMatch]] = {}
+        changed: List[Tuple[str, int, int]] = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self.cache_hits += 1
+                results[path] = cached[2]
+            else:
+                results[path] = []
+                changed.append((path, stat.st_mtime_ns, stat.st_size))
+
+        for (path, mtime_ns, size), matches in zip(changed, self._scan_changed([c[0] for c in changed])):
+            self._cache[path] = (mtime_ns, size, matches)
+            results[path] = matches
+        self.files_scanned += len(changed)
+
+        if changed and self.cache_path:
+            self._save_cache()
+        return {path: matches for path, matches in results.items() if matches}
+
+    def _scan_changed(self, paths: List[str]) -> List[List[LineMatch]]:
+        if self.workers <= 1 or len(paths) < self.parallel_threshold:
+            return [scan_path(path, self.pattern) for path in paths]
+        chunks = [paths[i:i + self.chunk_size] for i in range(0, len(paths), self.chunk_size)]
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks))) as pool:
+            futures = [
+                pool.submit(_scan_chunk, chunk, self.pattern.pattern, self.pattern.flags)
+                for chunk in chunks
+            ]
+            return [matches for future in futures for matches in future.result()]
+
+    def _load_cache(self) -> None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if stored.get("pattern") != self.pattern.pattern.decode("utf-8") or stored.get("flags") != self.pattern.flags:
+            return
+        self._cache = {
+            path: (mtime_ns, size, [tuple(match) for match in matches])
+            for path, (mtime_ns, size, matches) in stored["files"].items()
+        }
+
+    def _save_cache(self) -> None:
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "pattern": self.pattern.pattern.decode("utf-8"),
+                "flags": self.pattern.flags,
+                "files": self._cache
+            }, f)
+        os.replace(tmp_path, self.cache_path)
@@ -0,0 +1,198 @@
+"""
+Registry of prepared SPARQL queries.
+
+Queries are registered once by name, compiled with prepareQuery on first
+use, and executed with parameters bound through initBindings, so rdflib does
+not re-parse and re-translate the algebra on every call. Each query keeps
+its own timing statistics.
+
+Simple star-shaped SELECT queries (one typed subject plus single-triple
+OPTIONAL properties, nothing else) are planned into direct subjects() and
+objects() index lookups that produce the same rows without the SPARQL engine.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from itertools import product
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from rdflib import ConjunctiveGraph, Graph, URIRef, Variable
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.sparql import Query
+from rdflib.query import Result
+
+
+@dataclass(frozen=True)
+class StarPlan:
+    """Index-lookup plan for `?s <predicate> O . OPTIONAL { ?s <p> ?v } ...`"""
+    subject: Variable
+    predicate: URIRef
+    object: Any  # URIRef, or a Variable that may be bound at call time
+    optionals: Tuple[Tuple[URIRef, Variable], ...]
+    projection: Tuple[Variable, ...]
+
+    def rows(self, graph: Graph, bindings: Mapping[Variable, Any]) -> List[Tuple[Any, ...]]:
+        obj = bindings.get(self.object, self.object) if isinstance(self.object, Variable) else self.object
+        if isinstance(obj, Variable):
+            base = ({self.subject: s, obj: o} for s, o in graph.subject_objects(self.predicate))
+        else:
+            base = ({self.subject: s, self.object: obj} for s in graph.subjects(self.predicate, obj))
+
+        rows = []
+        for solution in base:
+            subject = solution[self.subject]
+            values = [list(graph.objects(subject, predicate)) or [None] for predicate, _ in self.optionals]
+            for combination in product(*values):
+                row = dict(solution)
+                row.update(zip((var for _, var in self.optionals), combination))
+                rows.append(tuple(row.get(var) for var in self.projection))
+        return rows
+
+
+def plan_star(query: Query) -> Optional[StarPlan]:
+    """Recognise a star-shaped SELECT that can be answered with index lookups"""
+    algebra = query.algebra
+    if algebra.name != "SelectQuery" or algebra.p.name != "Project":
+        return None
+    node = algebra.p.p
+    optional_triples = []
+    while node.name == "LeftJoin":
+        right = node.p2
+        if node.expr.name != "TrueFilter" or right.name != "BGP" or len(right.triples) != 1:
+            return None
+        optional_triples.append(right.triples[0])
+        node = node.p1
+    if node.name != "BGP" or len(node.triples) != 1:
+        return None
+    subject, predicate, obj = node.triples[0]
+    if not isinstance(subject, Variable) or not isinstance(predicate, URIRef) or obj == subject:
+        return None
+
+    # Every OPTIONAL must hang off the subject and introduce its own variable
+    optionals = []
+    seen = {subject, obj}
+    for s, p, o in reversed(optional_triples):
+        if s != subject or not isinstance(p, URIRef) or not isinstance(o, Variable) or o in seen:
+            return None
+        seen.add(o)
+        optionals.append((p, o))
+    return StarPlan(subject, predicate, obj, tuple(optionals), tuple(algebra.p.PV))
+
+
+class PreparedQuery:
+    """A named query compiled once and timed on every execution"""
+
+    def __init__(self, name: str, text: str, init_ns: Optional[Mapping[str, Any]] = None,
+                 use_index: bool = True):
+        self.name = name
+        self.text = text
+        self.init_ns = dict(init_ns or {})
+        self.use_index = use_index
+        self._compiled: Optional[Query] = None
+        self._plan: Optional[StarPlan] = None
+        self._lock = threading.Lock()
+        # Separate from _lock so recording a call never waits on a compile
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.index_calls = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    @property
+    def compiled(self) -> Query:
+        if self._compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    compiled = prepareQuery(self.text, initNs=self.init_ns)
+                    self._plan = plan_star(compiled) if self.use_index else None
+                    self._compiled = compiled
+        return self._compiled
+
+    @property
+    def plan(self) -> Optional[StarPlan]:
+        self.compiled
+        return self._plan
+
+    def _record(self, start: float, index: bool) -> None:
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.calls += 1
+            self.index_calls += index
+            self.total_s += elapsed
+            if elapsed > self.max_s:
+                self.max_s = elapsed
+
+    def query(self, graph: Graph, **bindings: Any) -> Result:
+        """Run the compiled query through the SPARQL engine"""
+        start = time.perf_counter()
+        try:
+            return graph.query(self.compiled, initBindings=bindings or None)
+        finally:
+            self._record(start, False)
+
+    def rows(self, graph: Graph, **bindings: Any) -> Sequence[Sequence[Any]]:
+        """Get result rows, using index lookups when the query was planned for them"""
+        plan = self.plan
+        # Index lookups can only bind the typed object; anything else goes through SPARQL
+        if (plan is None or isinstance(graph, ConjunctiveGraph)
+                or any(Variable(name) != plan.object for name in bindings)):
+            start = time.perf_counter()
+            try:
+                return list(graph.query(self.compiled, initBindings=bindings or None))
+            finally:
+                self._record(start, False)
+        start = time.perf_counter()
+        try:
+            return plan.rows(graph, {Variable(k): v for k, v in bindings.items()})
+        finally:
+            self._record(start, True)
+
+    def timing(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            calls, index_calls, total_s, max_s = self.calls, self.index_calls, self.total_s, self.max_s
+        return {
+            "calls": calls,
+            "index_calls": index_calls,
+            "total_ms": total_s * 1000,
+            "mean_ms": total_s * 1000 / calls if calls else 0.0,
+            "max_ms": max_s * 1000,
+        }
+
+
+class QueryRegistry:
+    """Central, named collection of prepared queries"""
+
+    def __init__(self) -> None:
+        self._queries: Dict[str, PreparedQuery] = {}
+
+    def register(self, name: str, text: str, init_ns: Optional[Mapping[str, Any]] = None,
+                 use_index: bool = True) -> PreparedQuery:
+        """Register a query; registering the same name again returns the existing query"""
+        existing = self._queries.get(name)
+        if existing is not None:
+            if existing.text != text:
+                raise ValueError(f"Query {name} is already registered with different text")
+            return existing
+        prepared = PreparedQuery(name, text, init_ns, use_index)
+        self._queries[name] = prepared
+        return prepared
+
+    def get(self, name: str) -> PreparedQuery:
+        return self._queries[name]
+
+    def names(self) -> Iterable[str]:
+        return list(self._queries)
+
+    def compile_all(self) -> None:
+        """Compile every registered query ahead of first use"""
+        for prepared in list(self._queries.values()):
+            prepared.compiled
+
+    def timings(self) -> Dict[str, Dict[str, Any]]:
+        """Timing statistics keyed by query name"""
+        return {name: prepared.timing() for name, prepared in list(self._queries.items())}
+
+
+# Process-wide registry shared by the framework's query helpers
+PREPARED_QUERIES = QueryRegistry()
@@ -2,16 +2,16 @@
 Common SPARQL operations and patterns.
 """
 
-from typing import Dict, List, Any, Optional, Union, cast
+from typing import Dict, List, Any, Optional, Union
 from enum import Enum
 from datetime import datetime
 from abc import ABC, abstractmethod
 import requests
 from rdflib import Graph, URIRef, Literal, Namespace
 from rdflib.namespace import RDF, RDFS, OWL, SH
-from rdflib.query import ResultRow
 import warnings
 from .graphdb_client import GraphDBClient
+from .prepared_queries import PREPARED_QUERIES
 
 class QueryType(Enum):
     """Types of SPARQL queries."""
@@ -180,6 +180,74 @@ def execute_sparql(
         executor = GraphDBExecutor()
     return executor.execute_query(query, query_type)
 
+# Queries behind SparqlOperations, compiled once on first use
+CLASSES_QUERY = PREPARED_QUERIES.register("sparql_operations.classes", """
+PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+SELECT ?class_uri ?label ?comment
+WHERE {
+    ?class_uri a rdfs:Class .
+    OPTIONAL { ?class_uri rdfs:label ?label }
+    OPTIONAL { ?class_uri rdfs:comment ?comment }
+}
+""")
+
+PROPERTIES_QUERY = PREPARED_QUERIES.register("sparql_operations.properties", """
+PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+SELECT ?property ?label ?comment ?domain ?range
+WHERE {
+    ?property a rdf:Property .
+    OPTIONAL { ?property rdfs:label ?label }
+    OPTIONAL { ?property rdfs:comment ?comment }
+    OPTIONAL { ?property rdfs:domain ?domain }
+    OPTIONAL { ?property rdfs:range ?range }
+}
+""")
+
+INDIVIDUALS_QUERY = PREPARED_QUERIES.register("sparql_operations.individuals", """
+PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+SELECT ?individual ?label ?comment
+WHERE {
+    ?individual a ?class_uri .
+    OPTIONAL { ?individual rdfs:label ?label }
+    OPTIONAL { ?individual rdfs:comment ?comment }
+}
+""")
+
+SHACL_SHAPES_QUERY = PREPARED_QUERIES.register("sparql_operations.shacl_shapes", """
+PREFIX sh: <http://www.w3.org/ns/shacl#>
+SELECT ?shape ?targetClass ?property ?minCount ?maxCount ?datatype
+WHERE {
+    ?shape a sh:NodeShape .
+    OPTIONAL { ?shape sh:targetClass ?targetClass }
+    OPTIONAL {
+        ?shape sh:property ?propertyNode .
+        ?propertyNode sh:path ?property .
+        OPTIONAL { ?propertyNode sh:minCount ?minCount }
+        OPTIONAL { ?propertyNode sh:maxCount ?maxCount }
+        OPTIONAL { ?propertyNode sh:datatype ?datatype }
+    }
+}
+""")
+
+ONTOLOGY_METADATA_QUERY = PREPARED_QUERIES.register("sparql_operations.ontology_metadata", """
+PREFIX owl: <http://www.w3.org/2002/07/owl#>
+PREFIX dc: <http://purl.org/dc/elements/1.1/>
+PREFIX dcterms: <http://purl.org/dc/terms/>
+SELECT ?title ?description ?version ?creator ?created ?modified
+WHERE {
+    ?ontology a owl:Ontology .
+    OPTIONAL { ?ontology dc:title ?title }
+    OPTIONAL { ?ontology dc:description ?description }
+    OPTIONAL { ?ontology owl:versionInfo ?version }
+    OPTIONAL { ?ontology dc:creator ?creator }
+    OPTIONAL { ?ontology dcterms:created ?created }
+    OPTIONAL { ?ontology dcterms:modified ?modified }
+}
+""")
+
 class SparqlOperations:
     """Class containing common SPARQL operations and patterns."""
     
@@ -193,24 +261,13 @@ class SparqlOperations:
         Returns:
             List of class information dictionaries
         """
-        query = """
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        SELECT ?class_uri ?label ?comment
-        WHERE {
-            ?class_uri a rdfs:Class .
-            OPTIONAL { ?class_uri rdfs:label ?label }
-            OPTIONAL { ?class_uri rdfs:comment ?comment }
-        }
-        """
-        results = graph.query(query)
         return [
             {
-                'uri': str(cast(ResultRow, row)[0]),
-                'label': str(cast(ResultRow, row)[1]) if cast(ResultRow, row)[1] else None,
-                'comment': str(cast(ResultRow, row)[2]) if cast(ResultRow, row)[2] else None
+                'uri': str(row[0]),
+                'label': str(row[1]) if row[1] else None,
+                'comment': str(row[2]) if row[2] else None
             }
-            for row in results
+            for row in CLASSES_QUERY.rows(graph)
         ]
         
     @staticmethod
@@ -223,28 +280,15 @@ class SparqlOperations:
         Returns:
             List of property information dictionaries
         """
-        query = """
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        SELECT ?property ?label ?comment ?domain ?range
-        WHERE {
-            ?property a rdf:Property .
-            OPTIONAL { ?property rdfs:label ?label }
-            OPTIONAL { ?property rdfs:comment ?comment }
-            OPTIONAL { ?property rdfs:domain ?domain }
-            OPTIONAL { ?property rdfs:range ?range }
-        }
-        """
-        results = graph.query(query)
         return [
             {
-                'uri': str(cast(ResultRow, row)[0]),
-                'label': str(cast(ResultRow, row)[1]) if cast(ResultRow, row)[1] else None,
-                'comment': str(cast(ResultRow, row)[2]) if cast(ResultRow, row)[2] else None,
-                'domain': str(cast(ResultRow, row)[3]) if cast(ResultRow, row)[3] else None,
-                'range': str(cast(ResultRow, row)[4]) if cast(ResultRow, row)[4] else None
+                'uri': str(row[0]),
+                'label': str(row[1]) if row[1] else None,
+                'comment': str(row[2]) if row[2] else None,
+                'domain': str(row[3]) if row[3] else None,
+                'range': str(row[4]) if row[4] else None
             }
-            for row in results
+            for row in PROPERTIES_QUERY.rows(graph)
         ]
         
     @staticmethod
@@ -258,27 +302,14 @@ class SparqlOperations:
         Returns:
             List of individual information dictionaries
         """
-        query = """
-        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        SELECT ?individual ?label ?comment
-        WHERE {
-            ?individual a ?class_uri .
-            OPTIONAL { ?individual rdfs:label ?label }
-            OPTIONAL { ?individual rdfs:comment ?comment }
-        }
-        """
-        if class_uri:
-            query = query.replace("?class_uri", f"<{class_uri}>")
-            
-        results = graph.query(query)
+        bindings = {'class_uri': URIRef(class_uri)} if class_uri else {}
         return [
             {
-                'uri': str(cast(ResultRow, row)[0]),
-                'label': str(cast(ResultRow, row)[1]) if cast(ResultRow, row)[1] else None,
-                'comment': str(cast(ResultRow, row)[2]) if cast(ResultRow, row)[2] else None
+                'uri': str(row[0]),
+                'label': str(row[1]) if row[1] else None,
+                'comment': str(row[2]) if row[2] else None
             }
-            for row in results
+            for row in INDIVIDUALS_QUERY.rows(graph, **bindings)
         ]
         
     @staticmethod
@@ -291,32 +322,16 @@ class SparqlOperations:
         Returns:
             List of SHACL shape information dictionaries
         """
-        query = """
-        PREFIX sh: <http://www.w3.org/ns/shacl#>
-        SELECT ?shape ?targetClass ?property ?minCount ?maxCount ?datatype
-        WHERE {
-            ?shape a sh:NodeShape .
-            OPTIONAL { ?shape sh:targetClass ?targetClass }
-            OPTIONAL {
-                ?shape sh:property ?propertyNode .
-                ?propertyNode sh:path ?property .
-                OPTIONAL { ?propertyNode sh:minCount ?minCount }
-                OPTIONAL { ?propertyNode sh:maxCount ?maxCount }
-                OPTIONAL { ?propertyNode sh:datatype ?datatype }
-            }
-        }
-        """
-        results = graph.query(query)
         return [
             {
-                'uri': str(cast(ResultRow, row)[0]),
-                'targetClass': str(cast(ResultRow, row)[1]) if cast(ResultRow, row)[1] else None,
-                'property': str(cast(ResultRow, row)[2]) if cast(ResultRow, row)[2] else None,
-                'minCount': int(cast(ResultRow, row)[3]) if cast(ResultRow, row)[3] else None,
-                'maxCount': int(cast(ResultRow, row)[4]) if cast(ResultRow, row)[4] else None,
-                'datatype': str(cast(ResultRow, row)[5]) if cast(ResultRow, row)[5] else None
+                'uri': str(row[0]),
+                'targetClass': str(row[1]) if row[1] else None,
+                'property': str(row[2]) if row[2] else None,
+                'minCount': int(row[3]) if row[3] else None,
+                'maxCount': int(row[4]) if row[4] else None,
+                'datatype': str(row[5]) if row[5] else None
             }
-            for row in results
+            for row in SHACL_SHAPES_QUERY.rows(graph)
         ]
         
     @staticmethod
@@ -329,31 +344,16 @@ class SparqlOperations:
         Returns:
             Dictionary containing ontology metadata
         """
-        query = """
-        PREFIX owl: <http://www.w3.org/2002/07/owl#>
-        PREFIX dc: <http://purl.org/dc/elements/1.1/>
-        PREFIX dcterms: <http://purl.org/dc/terms/>
-        SELECT ?title ?description ?version ?creator ?created ?modified
-        WHERE {
-            ?ontology a owl:Ontology .
-            OPTIONAL { ?ontology dc:title ?title }
-            OPTIONAL { ?ontology dc:description ?description }
-            OPTIONAL { ?ontology owl:versionInfo ?version }
-            OPTIONAL { ?ontology dc:creator ?creator }
-            OPTIONAL { ?ontology dcterms:created ?created }
-            OPTIONAL { ?ontology dcterms:modified ?modified }
-        }
-        """
-        results = graph.query(query)
-        if results:
-            row = next(results)
+        rows = ONTOLOGY_METADATA_QUERY.rows(graph)
+        if rows:
+            row = rows[0]
             return {
-                'title': str(cast(ResultRow, row)[0]) if cast(ResultRow, row)[0] else None,
-                'description': str(cast(ResultRow, row)[1]) if cast(ResultRow, row)[1] else None,
-                'version': str(cast(ResultRow, row)[2]) if cast(ResultRow, row)[2] else None,
-                'creator': str(cast(ResultRow, row)[3]) if cast(ResultRow, row)[3] else None,
-                'created': str(cast(ResultRow, row)[4]) if cast(ResultRow, row)[4] else None,
-                'modified': str(cast(ResultRow, row)[5]) if cast(ResultRow, row)[5] else None
+                'title': str(row[0]) if row[0] else None,
+                'description': str(row[1]) if row[1] else None,
+                'version': str(row[2]) if row[2] else None,
+                'creator': str(row[3]) if row[3] else None,
+                'created': str(row[4]) if row[4] else None,
+                'modified': str(row[5]) if row[5] else None
             }
         return {}
 
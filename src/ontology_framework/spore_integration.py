@@ -4,11 +4,12 @@ import logging
 import traceback
 import os
 from pathlib import Path
-from typing import List, Union, Tuple, Optional, Set, cast, Dict, Mapping, Any
+from typing import List, Union, Tuple, Optional, Set, cast, Dict, Mapping, Any, Iterable
 from rdflib import Graph, URIRef, Literal, Namespace, BNode
-from rdflib.namespace import RDF, RDFS, OWL
+from rdflib.namespace import RDF, RDFS, OWL, NamespaceManager
 
 from .spore_validation import SporeValidator
+from .core.graph_registry import get_graph_registry
 from .exceptions import ConcurrentModificationError, ConformanceError
 
 # Configure logging
@@ -35,6 +36,86 @@ CONFORMANCE_LEVEL_STRINGS = {
     GUIDANCE.RELAXED: "RELAXED"
 }
 
+class _BindingWatcher(NamespaceManager):
+    """Namespace manager that reports every prefix binding to a callback.
+    
+    Bindings live in the graph's store, so swapping this in for a graph's
+    manager keeps the existing ones.
+    """
+    
+    def __init__(self, graph: Graph, on_bind: Any):
+        super().__init__(graph, bind_namespaces="none")
+        self._on_bind = on_bind
+    
+    def bind(self, prefix: Optional[str], namespace: Any, override: bool = True, replace: bool = False) -> None:
+        super().bind(prefix, namespace, override=override, replace=replace)
+        self._on_bind()
+
+
+class NamespaceTrie:
+    """Prefix trie over registered namespace IRIs.
+    
+    An IRI resolves to the longest registered namespace it starts with, which
+    covers both hash and slash namespaces. The IRI of a hash namespace without
+    its trailing '#' (the ontology IRI) also resolves to that namespace.
+    Resolutions are memoized per IRI.
+    """
+    
+    _TERMINAL = ""
+    
+    def __init__(self, namespaces: Iterable[str] = ()):
+        """Initialize the trie.
+        
+        Args:
+            namespaces: Namespace IRIs to register
+        """
+        self._root: Dict[str, Any] = {}
+        self._ontology_iris: Dict[str, str] = {}
+        self._cache: Dict[str, Optional[str]] = {}
+        for namespace in namespaces:
+            self.add(namespace)
+    
+    def add(self, namespace: str) -> None:
+        """Register a namespace IRI."""
+        if not namespace:
+            return
+        node = self._root
+        for char in namespace:
+            node = node.setdefault(char, {})
+        node[self._TERMINAL] = namespace
+        if namespace.endswith("#"):
+            self._ontology_iris[namespace[:-1]] = namespace
+        self._cache.clear()
+    
+    def resolve(self, iri: str) -> Optional[str]:
+        """Get the registered namespace of an IRI, or None if unregistered."""
+        try:
+            return self._cache[iri]
+        except KeyError:
+            pass
+        # An ontology IRI is longer than any namespace that prefixes it
+        match = self._ontology_iris.get(iri)
+        if match is not None:
+            self._cache[iri] = match
+            return match
+        node = self._root
+        for char in iri:
+            node = node.get(char)
+            if node is None:
+                break
+            if self._TERMINAL in node:
+                match = node[self._TERMINAL]
+        self._cache[iri] = match
+        return match
+    
+    def __contains__(self, iri: object) -> bool:
+        return isinstance(iri, str) and self.resolve(iri) is not None
+
+def _guess_namespace(iri: str) -> str:
+    """Guess the namespace part of an IRI for error reporting."""
+    cut = max(iri.rfind("#"), iri.rfind("/"))
+    return iri[:cut + 1] if cut >= 0 else iri
+
 class SporeIntegrator:
     """Class for managing spore integration into target models."""
     
@@ -49,13 +130,14 @@ class SporeIntegrator:
         self.conformance_level: URIRef = GUIDANCE.STRICT
         
         # Initialize graphs
-        self.guidance_graph: Graph = Graph()
         self.graph: Graph = Graph()
         
-        # Load guidance ontology
+        # Load guidance ontology, shared with the rest of the process until written to
         guidance_file = os.path.join(data_dir, "guidance.ttl")
         if os.path.exists(guidance_file):
-            self.guidance_graph.parse(guidance_file, format="turtle")
+            self.guidance_graph: Graph = get_graph_registry().checkout(guidance_file, format="turtle")
+        else:
+            self.guidance_graph = Graph()
             
         # Initialize namespaces
         self.guidance_graph.bind("guidance", GUIDANCE)
@@ -68,6 +150,10 @@ class SporeIntegrator:
             self.data_dir.mkdir(exist_ok=True)
             self.validator: SporeValidator = SporeValidator(ontology_graph=self.graph)
             self.spore_uri: Optional[URIRef] = None  # Initialize spore_uri as None
+            self._namespace_trie: Optional[NamespaceTrie] = None
+            for graph in (self.validator.graph, self.guidance_graph):
+                graph.namespace_manager = _BindingWatcher(graph, self._invalidate_namespace_trie)
+            self.last_batch_report: Optional[Any] = None
             logger.debug("SporeIntegrator initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize SporeIntegrator: {str(e)}")
@@ -245,6 +331,41 @@ class SporeIntegrator:
                 
         return True
 
+    def _invalidate_namespace_trie(self) -> None:
+        """Drop the namespace trie; called whenever either graph binds a prefix."""
+        self._namespace_trie = None
+
+    def get_namespace_trie(self) -> NamespaceTrie:
+        """Get the trie of registered namespaces, rebuilding it after a bind.
+        
+        Returns:
+            NamespaceTrie: Namespaces bound in the validator and guidance graphs
+        """
+        trie = self._namespace_trie
+        if trie is None:
+            trie = NamespaceTrie()
+            for graph in (self.validator.graph, self.guidance_graph):
+                for _, ns in graph.namespaces():
+                    trie.add(str(ns))
+            self._namespace_trie = trie
+            logger.debug("Rebuilt namespace index")
+        return trie
+
+    def _check_spore_terms(self, spore_uri: URIRef, kind: str) -> None:
+        """Raise ConformanceError for the first unregistered term of a spore.
+        
+        Args:
+            spore_uri: URI of the spore to check
+            kind: Either "prefix" or "namespace", used in the error message
+        """
+        trie = self.get_namespace_trie()
+        for triple in self.validator.graph.triples((spore_uri, None, None)):
+            for position, term in zip(("subject", "predicate", "object"), triple):
+                if isinstance(term, URIRef) and trie.resolve(term) is None:
+                    msg = f"Unregistered {kind} used in {position}: {_guess_namespace(str(term))}"
+                    logger.error(msg)
+                    raise ConformanceError(msg)
+
     def validate_prefixes(self, spore_uri: URIRef) -> bool:
         """Validate prefixes used in a spore based on conformance level.
         
@@ -263,52 +384,7 @@ class SporeIntegrator:
             logger.debug("Skipping validation due to RELAXED conformance level")
             return True
         
-        # Get registered prefixes from both validator and guidance graphs
-        registered_prefixes: Set[str] = set()
-        
-        # Add prefixes from validator graph
-        for prefix, ns in self.validator.graph.namespaces():
-            validator_prefix: str = str(ns).split('#')[0]
-            logger.debug(f"Found registered prefix in validator: {validator_prefix}")
-            registered_prefixes.add(validator_prefix)
-            
-        # Add prefixes from guidance graph
-        for prefix, ns in self.guidance_graph.namespaces():
-            guidance_prefix: str = str(ns).split('#')[0]
-            logger.debug(f"Found registered prefix in guidance: {guidance_prefix}")
-            registered_prefixes.add(guidance_prefix)
-        
-        # Get prefixes used in spore
-        for s, p, o in self.validator.graph.triples((spore_uri, None, None)):
-            # Handle subject prefix
-            if isinstance(s, URIRef):
-                # Extract prefix string from URIRef
-                subj_prefix: str = str(s).split('#')[0]
-                logger.debug(f"Checking subject prefix: {subj_prefix}")
-                if subj_prefix not in registered_prefixes:
-                    msg = f"Unregistered prefix used in subject: {subj_prefix}"
-                    logger.error(msg)
-                    raise ConformanceError(msg)
-            
-            # Handle predicate prefix
-            if isinstance(p, URIRef):
-                # Extract prefix string from URIRef
-                pred_prefix: str = str(p).split('#')[0]
-                logger.debug(f"Checking predicate prefix: {pred_prefix}")
-                if pred_prefix not in registered_prefixes:
-                    msg = f"Unregistered prefix used in predicate: {pred_prefix}"
-                    logger.error(msg)
-                    raise ConformanceError(msg)
-            
-            # Handle object prefix
-            if isinstance(o, URIRef):
-                # Extract prefix string from URIRef
-                obj_prefix: str = str(o).split('#')[0]
-                logger.debug(f"Checking object prefix: {obj_prefix}")
-                if obj_prefix not in registered_prefixes:
-                    msg = f"Unregistered prefix used in object: {obj_prefix}"
-                    logger.error(msg)
-                    raise ConformanceError(msg)
+        self._check_spore_terms(spore_uri, "prefix")
         
         logger.debug("Prefix validation completed successfully")
         return True
@@ -331,56 +407,49 @@ class SporeIntegrator:
             logger.debug("Skipping validation due to RELAXED conformance level")
             return True
         
-        # Get registered namespaces from both validator and guidance graphs
-        registered_namespaces: Set[str] = set()
-        
-        # Add namespaces from validator graph
-        for prefix, ns in self.validator.graph.namespaces():
-            validator_ns_str: str = str(ns)
-            logger.debug(f"Found registered namespace in validator: {validator_ns_str}")
-            registered_namespaces.add(validator_ns_str)
-            
-        # Add namespaces from guidance graph
-        for prefix, ns in self.guidance_graph.namespaces():
-            guidance_ns_str: str = str(ns)
-            logger.debug(f"Found registered namespace in guidance: {guidance_ns_str}")
-            registered_namespaces.add(guidance_ns_str)
-        
-        # Get namespaces used in spore
-        for s, p, o in self.validator.graph.triples((spore_uri, None, None)):
-            # Handle subject namespace
-            if isinstance(s, URIRef):
-                # Extract namespace string from URIRef
-                subj_ns_str: str = str(s).split('#')[0] + '#'
-                logger.debug(f"Checking subject namespace: {subj_ns_str}")
-                if subj_ns_str not in registered_namespaces:
-                    msg = f"Unregistered namespace used in subject: {subj_ns_str}"
-                    logger.error(msg)
-                    raise ConformanceError(msg)
-            
-            # Handle predicate namespace
-            if isinstance(p, URIRef):
-                # Extract namespace string from URIRef
-                pred_ns_str: str = str(p).split('#')[0] + '#'
-                logger.debug(f"Checking predicate namespace: {pred_ns_str}")
-                if pred_ns_str not in registered_namespaces:
-                    msg = f"Unregistered namespace used in predicate: {pred_ns_str}"
-                    logger.error(msg)
-                    raise ConformanceError(msg)
-            
-            # Handle object namespace
-            if isinstance(o, URIRef):
-                # Extract namespace string from URIRef
-                obj_ns_str: str = str(o).split('#')[0] + '#'
-                logger.debug(f"Checking object namespace: {obj_ns_str}")
-                if obj_ns_str not in registered_namespaces:
-                    msg = f"Unregistered namespace used in object: {obj_ns_str}"
-                    logger.error(msg)
-                    raise ConformanceError(msg)
+        self._check_spore_terms(spore_uri, "namespace")
         
         logger.debug("Namespace validation completed successfully")
         return True
 
+    def find_unregistered_namespaces(self, spores: Iterable[URIRef]) -> Dict[URIRef, Set[str]]:
+        """Check many spores against the registered namespaces in one graph pass.
+        
+        Args:
+            spores: URIs of the spores to check
+            
+        Returns:
+            Dict[URIRef, Set[str]]: Unregistered namespaces per offending spore
+        """
+        spore_set = set(spores)
+        violations: Dict[URIRef, Set[str]] = {}
+        if not spore_set:
+            return violations
+        
+        trie = self.get_namespace_trie()
+        for spore in spore_set:
+            for triple in self.validator.graph.triples((spore, None, None)):
+                for term in triple:
+                    if isinstance(term, URIRef) and trie.resolve(term) is None:
+                        violations.setdefault(spore, set()).add(_guess_namespace(str(term)))
+        return violations
+
+    def validate_model_namespaces(self, model: URIRef) -> Dict[URIRef, Set[str]]:
+        """Check every spore targeting a model against the registered namespaces.
+        
+        Args:
+            model: URI of the target model
+            
+        Returns:
+            Dict[URIRef, Set[str]]: Unregistered namespaces per offending spore
+        """
+        spores = [
+            cast(URIRef, spore)
+            for spore in self.validator.graph.subjects(GUIDANCE.targetModel, model)
+            if isinstance(spore, URIRef)
+        ]
+        return self.find_unregistered_namespaces(spores)
+
     def integrate_spore(self, spore: URIRef, target_model: URIRef) -> bool:
         """Integrate a spore into a target model with validation.
         
@@ -470,15 +539,21 @@ class SporeIntegrator:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return False
 
-    def integrate_concurrent(self, spores: List[URIRef], target_model: URIRef) -> bool:
+    def integrate_concurrent(self, spores: List[URIRef], target_model: URIRef, max_workers: int = 4) -> bool:
         """Integrate multiple spores concurrently.
         
+        Spores are checked and their patches applied on worker threads. The
+        outcome of the batch, including which spores were integrated when
+        only some were, is kept in ``last_batch_report``.
+        
         Args:
             spores (List[URIRef]): List of spore URIs
             target_model (URIRef): URI of the target model
+            max_workers (int): Number of integration worker threads
             
         Returns:
-            bool: True if all spores integrated successfully
+            bool: True if all spores integrated successfully; False if any failed,
+            including a partially integrated batch
             
         Raises:
             ConcurrentModificationError: If concurrent modification detected
@@ -494,10 +569,26 @@ class SporeIntegrator:
             if len(patches) != len(set(patches)):
                 raise ConcurrentModificationError("Conflicting patches detected")
             
-            # Integrate each spore
-            for spore in spores:
-                if not self.integrate_spore(spore, target_model):
-                    return False
+            # Check namespaces of the whole batch in a single pass; offending
+            # spores fail on their own and the rest of the batch goes ahead
+            violations: Dict[URIRef, Set[str]] = {}
+            if self.conformance_level != CONFORMANCE_LEVELS["RELAXED"]:
+                violations = self.find_unregistered_namespaces(spores)
+            
+            # Integrate non-conflicting groups of spores concurrently
+            from .spore_concurrency import ConcurrentSporeIntegrator
+            engine = ConcurrentSporeIntegrator(self, max_workers=max_workers)
+            report = engine.integrate([spore for spore in spores if spore not in violations], target_model)
+            report.total = len(spores)
+            for spore, namespaces in violations.items():
+                report.failed[spore] = f"Unregistered namespaces: {', '.join(sorted(namespaces))}"
+            self.last_batch_report = report
+            for spore, error in report.failed.items():
+                logger.error(f"Spore {spore} not integrated: {error}")
+            if report.partial:
+                logger.warning(f"Batch partially integrated: {len(report.integrated)} of {report.total} spores")
+            if not report.succeeded:
+                return False
             
             logger.info("Concurrent integration completed successfully")
             return True
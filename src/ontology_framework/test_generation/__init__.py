@@ -4,6 +4,7 @@ from .data_models import TestCase, TestSuite, TestResult, TestGenerationConfig,
 from .test_generator import TestGenerator
 from .async_executor import AsyncTestExecutor
 from .dag_test_executor import DAGTestExecutor
+from .duration_store import TestDurationStore
 from .test_dag_builder import TestDAGBuilder, TestDAG, TestNode
 
 __all__ = [
@@ -15,6 +16,7 @@ __all__ = [
     "TestGenerator",
     "AsyncTestExecutor",
     "DAGTestExecutor",
+    "TestDurationStore",
     "TestDAGBuilder",
     "TestDAG",
     "TestNode"
@@ -8,6 +8,7 @@ from concurrent.futures import ThreadPoolExecutor
 from .data_models import TestCase, TestResult, TestSuite, TestSuiteResult, ProgressUpdate, TestStatus, ExecutionConfig
 from ..core.enhanced_reflective_module import OntologyReflectiveModule
 from .real_executor import RealTestExecutor
+from .worker_pool import TestWorkerPool
 
 
 class AsyncTestExecutor(OntologyReflectiveModule):
@@ -19,8 +20,12 @@ class AsyncTestExecutor(OntologyReflectiveModule):
         self.semaphore = asyncio.Semaphore(self.config.max_concurrent_tests)
         self.thread_pool = ThreadPoolExecutor(max_workers=self.config.thread_pool_size)
         
-        # Initialize real test executor for actual test execution
-        self.real_executor = RealTestExecutor()
+        # Initialize real test executor on a warm worker pool
+        self.real_executor = RealTestExecutor(pool=TestWorkerPool(
+            size=self.config.worker_processes,
+            batch_size=self.config.worker_batch_size,
+            max_tests_per_worker=self.config.worker_max_tests
+        ))
         
         # Store execution configuration in CMS
         self.store_content(
@@ -237,4 +242,5 @@ class AsyncTestExecutor(OntologyReflectiveModule):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self.thread_pool.shutdown(wait=True)
\ No newline at end of file
+        self.thread_pool.shutdown(wait=True)
+        self.real_executor.cleanup()
\ No newline at end of file
@@ -1,10 +1,12 @@
 """DAG-aware test executor for intelligent parallel execution"""
 
 import asyncio
+import heapq
 import time
-from typing import List, Dict, Set
-from .data_models import TestSuite, TestSuiteResult, TestResult, TestStatus, ProgressUpdate
+from typing import List, Dict, Optional
+from .data_models import TestCase, TestSuite, TestSuiteResult, TestResult, TestStatus, ProgressUpdate
 from .async_executor import AsyncTestExecutor
+from .duration_store import TestDurationStore
 from .test_dag_builder import TestDAGBuilder, TestDAG
 from ..core.enhanced_reflective_module import OntologyReflectiveModule
 
@@ -12,10 +14,11 @@ from ..core.enhanced_reflective_module import OntologyReflectiveModule
 class DAGTestExecutor(OntologyReflectiveModule):
     """Execute tests using DAG orchestration for optimal parallelism"""
     
-    def __init__(self, environment: str = None):
+    def __init__(self, environment: str = None, duration_store_path: Optional[str] = None):
         super().__init__(environment)
         self.dag_builder = TestDAGBuilder()
         self.base_executor = AsyncTestExecutor(environment=environment)
+        self.duration_store = TestDurationStore(duration_store_path)
     
     async def execute_test_suite_with_dag(self, test_suite: TestSuite) -> TestSuiteResult:
         """Execute test suite using DAG orchestration"""
@@ -57,44 +60,17 @@ class DAGTestExecutor(OntologyReflectiveModule):
                 emoji="🚀"
             )
             
-            # Execute DAG in batches
+            # Execute DAG through a ready queue ordered by critical path
             start_time = time.time()
-            all_results = []
-            completed_tests = set()
-            
-            for batch_index, batch in enumerate(dag.execution_order):
-                batch_start = time.time()
-                
-                self.emit_observation(
-                    f"Executing batch {batch_index + 1}/{total_batches}: {len(batch)} tests in parallel",
-                    event_type="deployment",
-                    context={"batch_tests": batch},
-                    emoji="⚡"
-                )
-                
-                # Execute tests in current batch concurrently
-                batch_results = await self._execute_test_batch(batch, dag, completed_tests)
-                all_results.extend(batch_results)
-                
-                # Update completed tests
-                for result in batch_results:
-                    if result.status in [TestStatus.PASSED, TestStatus.FAILED, TestStatus.SKIPPED]:
-                        completed_tests.add(result.test_name)
-                
-                batch_duration = time.time() - batch_start
-                self.emit_observation(
-                    f"Batch {batch_index + 1} completed in {batch_duration:.2f}s",
-                    event_type="success",
-                    context={"batch_duration": batch_duration, "completed_count": len(completed_tests)},
-                    emoji="✅"
-                )
+            all_results = await self._execute_ready_queue(dag)
+            self.duration_store.save()
             
             # Aggregate results
             total_duration = time.time() - start_time
             suite_result = self._aggregate_dag_results(test_suite.name, all_results, total_duration)
             
             # Calculate efficiency metrics
-            sequential_estimate = len(test_suite.test_cases) * 0.1  # Rough estimate
+            sequential_estimate = sum(result.duration for result in all_results)
             efficiency = (sequential_estimate / total_duration) if total_duration > 0 else 1.0
             
             self.emit_observation(
@@ -119,28 +95,64 @@ class DAGTestExecutor(OntologyReflectiveModule):
             
             return suite_result
     
-    async def _execute_test_batch(self, batch: List[str], dag: TestDAG, completed_tests: Set[str]) -> List[TestResult]:
-        """Execute a batch of tests concurrently"""
-        # Get test cases for this batch
-        test_cases = []
-        for test_name in batch:
-            if test_name in dag.nodes:
-                test_cases.append(dag.nodes[test_name].test_case)
+    async def _execute_ready_queue(self, dag: TestDAG) -> List[TestResult]:
+        """Execute tests as soon as their own dependencies finish
         
-        if not test_cases:
-            return []
+        Ready tests start in order of descending critical path, estimated from
+        historical durations, up to the base executor's concurrency limit.
+        Tests in a dependency cycle never become ready; once nothing else can
+        run they are all released, as TestDAGBuilder._calculate_execution_order does.
+        """
+        critical_path = self.dag_builder.critical_path_lengths(dag, self.duration_store.estimate)
+        waiting = {
+            name: sum(1 for dep in node.dependencies if dep in dag.nodes and dep != name)
+            for name, node in dag.nodes.items()
+        }
+        ready = [(-critical_path.get(name, 0.0), name) for name, count in waiting.items() if count == 0]
+        heapq.heapify(ready)
+        released = {name for _, name in ready}
         
-        # Create a mini test suite for this batch
-        from .data_models import TestSuite
-        batch_suite = TestSuite(
-            name=f"batch_{len(batch)}_tests",
-            test_cases=test_cases
-        )
+        limit = max(1, self.base_executor.config.max_concurrent_tests)
+        running: Dict[asyncio.Task, str] = {}
+        results: List[TestResult] = []
         
-        # Execute using base executor
-        batch_result = await self.base_executor.execute_test_suite(batch_suite)
+        while True:
+            if not ready and not running:
+                remaining = [name for name in waiting if name not in released]
+                if not remaining:
+                    break
+                # Circular dependency: run the remaining tests
+                for name in remaining:
+                    heapq.heappush(ready, (-critical_path.get(name, 0.0), name))
+                released.update(remaining)
+            
+            while ready and len(running) < limit:
+                _, name = heapq.heappop(ready)
+                task = asyncio.ensure_future(self._run_test(dag.nodes[name].test_case))
+                running[task] = name
+            
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    result = TestResult(test_name=name, status=TestStatus.ERROR, duration=0.0, error_message=str(e))
+                results.append(result)
+                self.duration_store.record(name, result.duration)
+                
+                for dependent in dag.nodes[name].dependents:
+                    if dependent in waiting:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0 and dependent not in released:
+                            heapq.heappush(ready, (-critical_path.get(dependent, 0.0), dependent))
+                            released.add(dependent)
         
-        return batch_result.test_results
+        return results
+    
+    async def _run_test(self, test_case: TestCase) -> TestResult:
+        """Run one test through the base executor"""
+        return await self.base_executor._run_test_case(test_case)
     
     def _aggregate_dag_results(self, suite_name: str, results: List[TestResult], total_duration: float) -> TestSuiteResult:
         """Aggregate DAG execution results"""
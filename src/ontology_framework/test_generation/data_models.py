@@ -115,4 +115,7 @@ class ExecutionConfig:
     timeout_max: float = 300.0
     capture_output: bool = True
     verbose_reporting: bool = True
-    fail_fast: bool = False
\ No newline at end of file
+    fail_fast: bool = False
+    worker_processes: int = 4
+    worker_batch_size: int = 32
+    worker_max_tests: int = 500
\ No newline at end of file
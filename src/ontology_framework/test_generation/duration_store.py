@@ -0,0 +1,56 @@
+"""Local store of historical test durations used for scheduling"""
+
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TestDurationStore:
+    """Exponentially smoothed test durations, optionally persisted as JSON"""
+
+    def __init__(self, path: Optional[str] = None, default_duration: float = 0.1, smoothing: float = 0.5):
+        """
+        Args:
+            path: JSON file to load from and save to (memory only if omitted)
+            default_duration: Estimate for tests with no recorded runs
+            smoothing: Weight of the newest run in the moving average
+        """
+        self.path = path
+        self.default_duration = default_duration
+        self.smoothing = smoothing
+        self.durations: Dict[str, float] = {}
+        if path and os.path.exists(path):
+            self.load()
+
+    def estimate(self, test_name: str) -> float:
+        """Expected duration of a test"""
+        return self.durations.get(test_name, self.default_duration)
+
+    def record(self, test_name: str, duration: float) -> None:
+        """Fold an observed run into the test's moving average"""
+        previous = self.durations.get(test_name)
+        if previous is None:
+            self.durations[test_name] = duration
+        else:
+            self.durations[test_name] = self.smoothing * duration + (1 - self.smoothing) * previous
+
+    def load(self) -> None:
+        """Load durations from the store file"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.durations = {name: float(value) for name, value in json.load(f).items()}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable duration store {self.path}: {e}")
+            self.durations = {}
+
+    def save(self) -> None:
+        """Write durations to the store file, if one is configured"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.durations, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
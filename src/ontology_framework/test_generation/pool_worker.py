@@ -0,0 +1,93 @@
+"""Long-lived worker process that runs generated tests sent over stdin.
+
+Each request is one JSON line with the test name, the generated test file
+source and a timeout. Each reply is one JSON line on the original stdout; the
+test's own output is captured and fd 1 is pointed at stderr so stray writes
+cannot corrupt the protocol. Run as a script so the worker does not import the
+test_generation package itself; modules named on the command line are
+imported up front so every test after the first runs warm.
+"""
+
+import contextlib
+import importlib
+import io
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+
+MAX_OUTPUT = 10000
+
+
+class TestTimeout(BaseException):
+    """Raised in the test when its time limit expires"""
+
+
+def _on_alarm(signum, frame):
+    raise TestTimeout()
+
+
+def preload(modules):
+    """Import modules ahead of the first test, ignoring ones that are unavailable"""
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+
+def run_test(request):
+    """Execute one generated test function and describe the outcome"""
+    name = request["name"]
+    timeout = float(request.get("timeout") or 0)
+    captured = io.StringIO()
+    status, error = "passed", None
+    has_timer = hasattr(signal, "setitimer")
+    start = time.perf_counter()
+    try:
+        if has_timer and timeout > 0:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        with contextlib.redirect_stdout(captured), contextlib.redirect_stderr(captured):
+            namespace = {"__name__": f"generated_{name}"}
+            exec(compile(request["source"], f"<{name}>", "exec"), namespace)
+            namespace[name]()
+    except TestTimeout:
+        status, error = "timeout", f"Test timed out after {timeout} seconds"
+    except BaseException as e:
+        status = "skipped" if type(e).__name__ == "Skipped" else "failed"
+        error = "".join(traceback.format_exception_only(type(e), e)).strip()
+        captured.write(traceback.format_exc())
+    finally:
+        if has_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return {
+        "name": name,
+        "status": status,
+        "error": error,
+        "output": captured.getvalue()[-MAX_OUTPUT:],
+        "duration": time.perf_counter() - start,
+    }
+
+
+def main(argv):
+    # Keep sibling modules of this script from shadowing top-level imports
+    if sys.path and os.path.abspath(sys.path[0]) == os.path.dirname(os.path.abspath(__file__)):
+        sys.path.pop(0)
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _on_alarm)
+    preload(argv)
+    protocol.write(json.dumps({"ready": os.getpid()}) + "\n")
+    protocol.flush()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        protocol.write(json.dumps(run_test(json.loads(line))) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
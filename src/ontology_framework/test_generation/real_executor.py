@@ -8,17 +8,57 @@ import json
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from .data_models import TestCase, TestResult, TestStatus
+from .worker_pool import TestWorkerPool
+
+WORKER_STATUSES = {
+    "passed": TestStatus.PASSED,
+    "failed": TestStatus.FAILED,
+    "skipped": TestStatus.SKIPPED,
+    "timeout": TestStatus.TIMEOUT,
+    "error": TestStatus.ERROR,
+}
 
 
 class RealTestExecutor:
-    """Execute actual pytest/unittest tests using subprocess - macOS compatible"""
+    """Execute actual pytest/unittest tests on warm workers or in a subprocess - macOS compatible"""
     
-    def __init__(self):
+    def __init__(self, pool: Optional[TestWorkerPool] = None, use_pool: bool = True):
+        """
+        Args:
+            pool: Worker pool to run tests on (created lazily if omitted)
+            use_pool: Run each test in its own pytest subprocess instead when False
+        """
         self.temp_dir = None
+        self.use_pool = use_pool
+        self.pool = pool
     
     async def execute_real_test(self, test_case: TestCase) -> TestResult:
-        """Execute a real test case using subprocess"""
+        """Execute a real test case on a pooled worker"""
+        if not self.use_pool:
+            return await self.execute_in_subprocess(test_case)
+        if self.pool is None:
+            self.pool = TestWorkerPool()
+        
+        try:
+            future = self.pool.submit(
+                test_case.name, self._generate_test_file_content(test_case), test_case.timeout
+            )
+            reply = await asyncio.wrap_future(future)
+        except Exception as e:
+            return TestResult(test_name=test_case.name, status=TestStatus.ERROR, duration=0.0, error_message=str(e))
+        
+        return TestResult(
+            test_name=test_case.name,
+            status=WORKER_STATUSES.get(reply["status"], TestStatus.ERROR),
+            duration=reply.get("duration", 0.0),
+            error_message=reply.get("error"),
+            output=reply.get("output")
+        )
+    
+    async def execute_in_subprocess(self, test_case: TestCase) -> TestResult:
+        """Execute a real test case in a fresh pytest subprocess"""
         start_time = asyncio.get_event_loop().time()
+        test_file_path = None
         
         try:
             # Create temporary test file
@@ -47,9 +87,9 @@ class RealTestExecutor:
             )
         finally:
             # Cleanup temp file
-            if hasattr(self, '_current_test_file') and self._current_test_file:
+            if test_file_path:
                 try:
-                    os.unlink(self._current_test_file)
+                    os.unlink(test_file_path)
                 except:
                     pass
     
@@ -66,7 +106,6 @@ class RealTestExecutor:
         with open(test_file, 'w') as f:
             f.write(test_content)
         
-        self._current_test_file = str(test_file)
         return str(test_file)
     
     def _generate_test_file_content(self, test_case: TestCase) -> str:
@@ -219,8 +258,10 @@ if __name__ == "__main__":
                 "return_code": -1
             }
     
-    def cleanup(self):
-        """Clean up temporary files and directories"""
+    def cleanup(self, wait: bool = True):
+        """Shut down pooled workers and clean up temporary files and directories"""
+        if self.pool is not None:
+            self.pool.shutdown(wait=wait)
         if self.temp_dir and Path(self.temp_dir).exists():
             import shutil
             try:
@@ -230,4 +271,4 @@ if __name__ == "__main__":
     
     def __del__(self):
         """Cleanup on destruction"""
-        self.cleanup()
\ No newline at end of file
+        self.cleanup(wait=False)
\ No newline at end of file
@@ -1,7 +1,7 @@
 """DAG builder for test execution with dependency management"""
 
-from typing import Dict, List, Set, Optional, Tuple
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Set, Optional, Tuple
+from dataclasses import dataclass, field
 from .data_models import TestCase, TestSuite
 
 
@@ -32,6 +32,15 @@ class TestDAG:
             self.execution_order = []
 
 
+@dataclass
+class DependencyIndex:
+    """Hash indexes over a suite used to infer test dependencies"""
+    test_names: List[Tuple[str, str]]  # (name, lowercased name)
+    setup_by_group: Dict[str, List[str]]  # Naming group -> setup tests
+    init_by_class: Dict[str, List[str]]  # Class name -> init/setup tests
+    fixture_providers: Dict[str, List[str]] = field(default_factory=dict)
+
+
 class TestDAGBuilder:
     """Build DAG structures for test execution with dependency analysis"""
     
@@ -43,10 +52,12 @@ class TestDAGBuilder:
     
     def build_test_dag(self, test_suite: TestSuite) -> TestDAG:
         """Build a DAG from a test suite by analyzing dependencies"""
+        index = self._build_dependency_index(test_suite.test_cases)
+        
         # Create nodes for each test
         nodes = {}
         for test_case in test_suite.test_cases:
-            dependencies = self._analyze_test_dependencies(test_case, test_suite.test_cases)
+            dependencies = self._analyze_test_dependencies(test_case, test_suite.test_cases, index)
             nodes[test_case.name] = TestNode(
                 test_case=test_case,
                 dependencies=dependencies,
@@ -60,28 +71,46 @@ class TestDAGBuilder:
                     nodes[dep].dependents.add(test_name)
         
         # Calculate execution order (topological sort)
-        execution_order = self._calculate_execution_order(nodes)
+        execution_order = self._calculate_execution_order(dict(nodes))
         
         return TestDAG(nodes=nodes, execution_order=execution_order)
     
-    def _analyze_test_dependencies(self, test_case: TestCase, all_tests: List[TestCase]) -> Set[str]:
+    def _build_dependency_index(self, all_tests: List[TestCase]) -> DependencyIndex:
+        """Index a suite by naming group, class and setup markers in one pass"""
+        index = DependencyIndex(test_names=[], setup_by_group={}, init_by_class={})
+        for test_case in all_tests:
+            name = test_case.name
+            lowered = name.lower()
+            index.test_names.append((name, lowered))
+            
+            if self._is_setup_test(lowered):
+                group = self._naming_group(name)
+                if group is not None:
+                    index.setup_by_group.setdefault(group, []).append(name)
+            
+            test_class = self._extract_class_name(name)
+            if test_class and ('init' in lowered or 'setup' in lowered):
+                index.init_by_class.setdefault(test_class, []).append(name)
+        return index
+    
+    def _analyze_test_dependencies(self, test_case: TestCase, all_tests: List[TestCase],
+                                   index: Optional[DependencyIndex] = None) -> Set[str]:
         """Analyze dependencies for a test case"""
+        if index is None:
+            index = self._build_dependency_index(all_tests)
         dependencies = set()
         
         # Check for explicit fixture dependencies
         if hasattr(test_case, 'fixtures') and test_case.fixtures:
             for fixture in test_case.fixtures:
-                # Find tests that provide this fixture
-                for other_test in all_tests:
-                    if self._provides_fixture(other_test, fixture):
-                        dependencies.add(other_test.name)
+                dependencies.update(self._fixture_providers(fixture, index))
         
         # Check for setup/teardown patterns
-        setup_deps = self._find_setup_dependencies(test_case, all_tests)
+        setup_deps = self._find_setup_dependencies(test_case, all_tests, index)
         dependencies.update(setup_deps)
         
         # Check for class-level dependencies
-        class_deps = self._find_class_dependencies(test_case, all_tests)
+        class_deps = self._find_class_dependencies(test_case, all_tests, index)
         dependencies.update(class_deps)
         
         return dependencies
@@ -91,37 +120,49 @@ class TestDAGBuilder:
         # Simple heuristic: test name contains fixture name
         return fixture_name.lower() in test_case.name.lower()
     
-    def _find_setup_dependencies(self, test_case: TestCase, all_tests: List[TestCase]) -> Set[str]:
+    def _fixture_providers(self, fixture_name: str, index: DependencyIndex) -> List[str]:
+        """Find tests providing a fixture, scanning the suite once per distinct fixture"""
+        providers = index.fixture_providers.get(fixture_name)
+        if providers is None:
+            needle = fixture_name.lower()
+            providers = [name for name, lowered in index.test_names if needle in lowered]
+            index.fixture_providers[fixture_name] = providers
+        return providers
+    
+    def _is_setup_test(self, lowered_name: str) -> bool:
+        """Check whether a lowercased test name carries a setup marker"""
+        return any(pattern in lowered_name for pattern in self.setup_teardown_patterns['setup'])
+    
+    def _naming_group(self, test_name: str) -> Optional[str]:
+        """Get the name segment _are_related_tests compares (class or module)"""
+        parts = test_name.split('_')
+        return parts[1] if len(parts) >= 2 else None
+    
+    def _find_setup_dependencies(self, test_case: TestCase, all_tests: List[TestCase],
+                                 index: Optional[DependencyIndex] = None) -> Set[str]:
         """Find setup dependencies based on naming patterns"""
-        dependencies = set()
-        
-        # If this is not a setup test, it might depend on setup tests
-        if not any(pattern in test_case.name.lower() for pattern in self.setup_teardown_patterns['setup']):
-            for other_test in all_tests:
-                if any(pattern in other_test.name.lower() for pattern in self.setup_teardown_patterns['setup']):
-                    # Check if they're related (same class or module)
-                    if self._are_related_tests(test_case, other_test):
-                        dependencies.add(other_test.name)
+        if index is None:
+            index = self._build_dependency_index(all_tests)
         
-        return dependencies
+        # If this is not a setup test, it might depend on related setup tests
+        if self._is_setup_test(test_case.name.lower()):
+            return set()
+        group = self._naming_group(test_case.name)
+        return set(index.setup_by_group.get(group, ())) if group is not None else set()
     
-    def _find_class_dependencies(self, test_case: TestCase, all_tests: List[TestCase]) -> Set[str]:
+    def _find_class_dependencies(self, test_case: TestCase, all_tests: List[TestCase],
+                                 index: Optional[DependencyIndex] = None) -> Set[str]:
         """Find dependencies based on class structure"""
-        dependencies = set()
-        
         # Extract class name from test case name
         test_class = self._extract_class_name(test_case.name)
         if not test_class:
-            return dependencies
-        
-        # Look for class initialization tests
-        for other_test in all_tests:
-            other_class = self._extract_class_name(other_test.name)
-            if (other_class == test_class and 
-                other_test.name != test_case.name and
-                ('init' in other_test.name.lower() or 'setup' in other_test.name.lower())):
-                dependencies.add(other_test.name)
+            return set()
+        if index is None:
+            index = self._build_dependency_index(all_tests)
         
+        # Class initialization tests other than this one
+        dependencies = set(index.init_by_class.get(test_class, ()))
+        dependencies.discard(test_case.name)
         return dependencies
     
     def _are_related_tests(self, test1: TestCase, test2: TestCase) -> bool:
@@ -181,6 +222,21 @@ class TestDAGBuilder:
         
         return execution_order
     
+    def critical_path_lengths(self, dag: TestDAG, estimate: Callable[[str], float]) -> Dict[str, float]:
+        """Estimate for each test the longest remaining chain of work it starts
+        
+        Args:
+            dag: DAG whose execution order is already calculated
+            estimate: Expected duration of a test by name
+        """
+        lengths: Dict[str, float] = {}
+        for batch in reversed(dag.execution_order):
+            for name in batch:
+                node = dag.nodes[name]
+                tail = max((lengths.get(dep, 0.0) for dep in node.dependents), default=0.0)
+                lengths[name] = estimate(name) + tail
+        return lengths
+    
     def validate_dag(self, dag: TestDAG) -> Tuple[bool, List[str]]:
         """Validate that the DAG has no cycles"""
         issues = []
@@ -0,0 +1,255 @@
+"""Pool of warm worker processes for executing generated tests"""
+
+import json
+import logging
+import os
+import queue
+import select
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).with_name("pool_worker.py")
+SRC_DIR = Path(__file__).resolve().parents[2]
+
+
+class WorkerCrashed(Exception):
+    """Raised when a worker exits or stops answering"""
+
+
+@dataclass
+class _Request:
+    """A test waiting for a worker"""
+    name: str
+    source: str
+    timeout: float
+    future: Future = field(default_factory=Future)
+
+    @cached_property
+    def line(self) -> bytes:
+        return (json.dumps({"name": self.name, "source": self.source, "timeout": self.timeout}) + "\n").encode("utf-8")
+
+
+class _Worker:
+    """One worker process and its protocol pipe"""
+
+    def __init__(self, preload: Sequence[str], startup_timeout: float):
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (str(SRC_DIR), str(Path.cwd()), env.get("PYTHONPATH")) if p
+        )
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", str(WORKER_SCRIPT), *preload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            cwd=str(Path.cwd())
+        )
+        self.completed = 0
+        self._buffer = bytearray()
+        try:
+            self.read_reply(time.monotonic() + startup_timeout)
+        except Exception:
+            self.stop(kill=True)
+            raise
+
+    def send(self, data: bytes) -> None:
+        try:
+            self.process.stdin.write(data)
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerCrashed(f"Worker {self.process.pid} closed its input: {e}")
+
+    def read_reply(self, deadline: float) -> Dict[str, Any]:
+        """Read one JSON reply, waiting no later than deadline"""
+        fd = self.process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Worker {self.process.pid} did not answer in time")
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise WorkerCrashed(f"Worker {self.process.pid} exited with code {self.process.poll()}")
+            self._buffer.extend(chunk)
+        line, _, rest = bytes(self._buffer).partition(b"\n")
+        self._buffer = bytearray(rest)
+        return json.loads(line)
+
+    def stop(self, kill: bool = False) -> None:
+        try:
+            if kill:
+                self.process.kill()
+            else:
+                self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except Exception:
+            self.process.kill()
+
+
+class TestWorkerPool:
+    """Run generated tests on long-lived worker processes.
+
+    Workers import pytest and the project once, then receive tests in batches
+    over their stdin pipe. Each test has its own deadline; a worker that
+    crashes or hangs is killed and replaced, and the rest of its batch is
+    retried on the replacement. Workers are recycled after a fixed number of
+    tests to bound state leaking between generated tests.
+    """
+
+    # Unanswered request bytes allowed in a pipe, kept under the OS buffer size
+    PIPE_WINDOW = 32768
+
+    def __init__(self, size: int = 4, batch_size: int = 32, max_tests_per_worker: int = 500,
+                 timeout_grace: float = 5.0, startup_timeout: float = 60.0,
+                 preload: Sequence[str] = ("pytest", "ontology_framework")):
+        """
+        Args:
+            size: Number of worker processes
+            batch_size: Most tests sent to a worker at once
+            max_tests_per_worker: Tests a worker runs before it is replaced
+            timeout_grace: Extra seconds allowed past a test's own timeout before its worker is killed
+            startup_timeout: Seconds a new worker has to finish its imports
+            preload: Modules each worker imports before its first test
+        """
+        self.size = max(1, size)
+        self.batch_size = max(1, batch_size)
+        self.max_tests_per_worker = max(1, max_tests_per_worker)
+        self.timeout_grace = timeout_grace
+        self.startup_timeout = startup_timeout
+        self.preload = list(preload)
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.workers_started = 0
+
+    def submit(self, name: str, source: str, timeout: float) -> Future:
+        """Queue a generated test; the future resolves to the worker's reply"""
+        if self._closed:
+            raise RuntimeError("Worker pool is shut down")
+        self._ensure_started()
+        request = _Request(name=name, source=source, timeout=timeout)
+        self._queue.put(request)
+        return request.future
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.size):
+                thread = threading.Thread(target=self._serve, name=f"test-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _serve(self) -> None:
+        """Feed batches from the queue to one worker process"""
+        worker: Optional[_Worker] = None
+        try:
+            while True:
+                request = self._queue.get()
+                if request is None:
+                    return
+                batch = [request] if request.future.set_running_or_notify_cancel() else []
+                while len(batch) < self.batch_size:
+                    try:
+                        request = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if request is None:
+                        self._queue.put(None)
+                        break
+                    if request.future.set_running_or_notify_cancel():
+                        batch.append(request)
+                if not batch:
+                    continue
+                try:
+                    worker = self._run_batch(worker, batch)
+                except Exception as e:
+                    logger.exception("Test worker batch failed")
+                    for request in batch:
+                        self._resolve(request, self._failure(request, "error", str(e)))
+                    if worker is not None:
+                        worker.stop(kill=True)
+                        worker = None
+        finally:
+            if worker is not None:
+                worker.stop()
+
+    def _start_worker(self) -> _Worker:
+        self.workers_started += 1
+        return _Worker(self.preload, self.startup_timeout)
+
+    def _run_batch(self, worker: Optional[_Worker], batch: List[_Request]) -> Optional[_Worker]:
+        """Run a batch, replacing the worker on crashes, hangs and recycling"""
+        pending = list(batch)
+        while pending:
+            if worker is None:
+                try:
+                    worker = self._start_worker()
+                except Exception as e:
+                    for request in pending:
+                        self._resolve(request, self._failure(request, "error", f"Worker failed to start: {e}"))
+                    return None
+
+            chunk = pending[:self.max_tests_per_worker - worker.completed]
+            answered = 0
+            try:
+                sent = in_flight = 0
+                while answered < len(chunk):
+                    # Keep the pipe fed without letting unread requests fill its buffer
+                    while sent < len(chunk) and (sent == answered or in_flight + len(chunk[sent].line) <= self.PIPE_WINDOW):
+                        worker.send(chunk[sent].line)
+                        in_flight += len(chunk[sent].line)
+                        sent += 1
+                    request = chunk[answered]
+                    reply = worker.read_reply(time.monotonic() + request.timeout + self.timeout_grace)
+                    self._resolve(request, reply)
+                    in_flight -= len(request.line)
+                    answered += 1
+                    worker.completed += 1
+            except (WorkerCrashed, TimeoutError) as e:
+                request = chunk[answered]
+                status = "timeout" if isinstance(e, TimeoutError) else "error"
+                logger.warning(f"Replacing test worker after {request.name}: {e}")
+                self._resolve(request, self._failure(request, status, str(e)))
+                answered += 1
+                worker.stop(kill=True)
+                worker = None
+
+            pending = pending[answered:]
+            if worker is not None and worker.completed >= self.max_tests_per_worker:
+                worker.stop()
+                worker = None
+        return worker
+
+    def _resolve(self, request: _Request, reply: Dict[str, Any]) -> None:
+        try:
+            request.future.set_result(reply)
+        except InvalidStateError:
+            pass
+
+    def _failure(self, request: _Request, status: str, error: str) -> Dict[str, Any]:
+        return {"name": request.name, "status": status, "error": error, "output": "", "duration": 0.0}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop all workers once queued tests have run"""
+        with self._lock:
+            self._closed = True
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
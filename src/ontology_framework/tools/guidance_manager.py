@@ -2,21 +2,87 @@ from rdflib import Graph, Namespace, URIRef, Literal, BNode, Node
 from rdflib.namespace import RDF, RDFS, OWL, XSD, SH
 from rdflib.query import ResultRow
 import pyshacl
-from typing import Dict, List, Optional, Set, Tuple, Union, Any
+from rdflib.util import from_n3
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, Any
 from pathlib import Path
+from datetime import datetime
 from ontology_framework.validation.validation_rule_type import ValidationRuleType
 from ontology_framework.validation.error_severity import ErrorSeverity
+from ontology_framework.core.graph_registry import get_graph_registry
+import json
+import os
 import uuid
 import logging
 
+Triple = Tuple[Node, Node, Node]
+TriplePattern = Tuple[Optional[Node], Optional[Node], Optional[Node]]
+
+class GuidanceTransaction:
+    """Copy-on-write transaction over the guidance graph.
+    
+    Changes are recorded as add/remove delta sets and never touch the base
+    graph until commit. Reads see the base graph as it was when the
+    transaction began, with the transaction's own delta applied.
+    """
+    
+    def __init__(self, manager: 'GuidanceManager', transaction_id: str) -> None:
+        self.id = transaction_id
+        self.manager = manager
+        self.base_version = manager.version
+        self.added: Set[Triple] = set()
+        self.removed: Set[Triple] = set()
+    
+    def add(self, triple: Triple) -> None:
+        """Record a triple addition."""
+        self.removed.discard(triple)
+        self.added.add(triple)
+    
+    def remove(self, triple: Triple) -> None:
+        """Record a triple removal."""
+        self.added.discard(triple)
+        self.removed.add(triple)
+    
+    def triples(self, pattern: TriplePattern) -> Iterator[Triple]:
+        """Iterate triples matching a pattern in the transaction's snapshot."""
+        newer_added, newer_removed = self.manager._changes_since(self.base_version)
+        hidden = newer_added | self.removed
+        for triple in self.manager.graph.triples(pattern):
+            if triple not in hidden and triple not in self.added:
+                yield triple
+        for triple in (newer_removed - self.removed) | self.added:
+            if _matches(triple, pattern):
+                yield triple
+    
+    def __contains__(self, triple: Triple) -> bool:
+        return any(True for _ in self.triples(triple))
+
+def _matches(triple: Triple, pattern: TriplePattern) -> bool:
+    """Check whether a triple matches a pattern with None wildcards."""
+    return all(p is None or p == t for t, p in zip(triple, pattern))
+
+def _fingerprint(triples: Iterable[Triple]) -> int:
+    """Order-independent hash of a set of triples; XOR lets commits update it incrementally."""
+    value = 0
+    for triple in triples:
+        value ^= hash(triple)
+    return value
+
 class GuidanceManager:
     """Manages the guidance ontology using semantic web tools."""
     
-    def __init__(self, guidance_path: str = 'guidance.ttl'):
-        self.guidance_path = guidance_path
-        self.graph = Graph()
-        self.graph.parse(guidance_path, format='turtle')
-        self.transaction_stack = []
+    def __init__(self, guidance_path: str = 'guidance.ttl', compact_threshold: int = 100):
+        """Initialize the manager.
+        
+        Args:
+            guidance_path: Path to the guidance ontology in Turtle
+            compact_threshold: Number of journaled commits after which save() compacts
+        """
+        self.logger = logging.getLogger(__name__)
+        self.compact_threshold = compact_threshold
+        self.transaction_stack: List[GuidanceTransaction] = []
+        self.version = 0
+        self._history: List[Tuple[int, Set[Triple], Set[Triple]]] = []
+        self.load(guidance_path)
         
         # Define namespaces
         self.GUIDANCE = Namespace('https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#')
@@ -35,7 +101,169 @@ class GuidanceManager:
         self.graph.bind('rdfs', RDFS)
         self.graph.bind('xsd', XSD)
         
-        self.logger = logging.getLogger(__name__)
+    @property
+    def journal_path(self) -> Path:
+        """Append-only journal of commits not yet compacted into the source."""
+        return Path(f"{self.guidance_path}.journal")
+    
+    @property
+    def snapshot_path(self) -> Path:
+        """N-Triples snapshot of the source written at compaction time."""
+        return Path(f"{self.guidance_path}.snapshot.nt")
+    
+    def _source_stamp(self) -> str:
+        """Identify the current state of the Turtle source file."""
+        stat = os.stat(self.guidance_path)
+        return f"{stat.st_size} {stat.st_mtime_ns}"
+    
+    def _load_base(self) -> Graph:
+        """Load the base graph, preferring a snapshot that matches the source."""
+        graph = Graph()
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, encoding='utf-8') as f:
+                header = f.readline().strip()
+            if header == f"# source: {self._source_stamp()}":
+                graph.parse(str(self.snapshot_path), format='nt')
+                return graph
+        # Shared with other readers of the same file until the first commit
+        return get_graph_registry().checkout(self.guidance_path, format='turtle')
+    
+    def _replay_journal(self) -> int:
+        """Apply journaled commits to the graph.
+        
+        Returns:
+            int: Number of commits replayed
+        """
+        if not self.journal_path.exists():
+            return 0
+        count = 0
+        with open(self.journal_path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final write from a crash; everything before it is intact
+                    self.logger.warning(f"Ignoring truncated journal record in {self.journal_path}")
+                    break
+                for terms in record['remove']:
+                    self.graph.remove(tuple(from_n3(term) for term in terms))
+                for terms in record['add']:
+                    self.graph.add(tuple(from_n3(term) for term in terms))
+                count += 1
+        return count
+    
+    def _append_journal(self, transaction_id: str, added: Set[Triple], removed: Set[Triple]) -> None:
+        """Durably append a commit to the journal."""
+        record = {
+            'id': transaction_id,
+            'timestamp': datetime.now().isoformat(),
+            'add': [[term.n3() for term in triple] for triple in added],
+            'remove': [[term.n3() for term in triple] for triple in removed],
+        }
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_entries += 1
+    
+    def _apply_commit(self, transaction_id: str, added: Iterable[Triple], removed: Iterable[Triple]) -> None:
+        """Journal and apply the effective part of a delta to the base graph."""
+        effective_removed = {t for t in removed if t in self.graph}
+        effective_added = {t for t in added if t not in self.graph}
+        if not effective_added and not effective_removed:
+            return
+        self._append_journal(transaction_id, effective_added, effective_removed)
+        for triple in effective_removed:
+            self.graph.remove(triple)
+        for triple in effective_added:
+            self.graph.add(triple)
+        self.version += 1
+        if self.transaction_stack:
+            self._history.append((self.version, effective_added, effective_removed))
+        self._journaled_fingerprint ^= _fingerprint(effective_added) ^ _fingerprint(effective_removed)
+    
+    def _changes_since(self, version: int) -> Tuple[Set[Triple], Set[Triple]]:
+        """Net triples added to and removed from the base graph since a version."""
+        net_added: Set[Triple] = set()
+        net_removed: Set[Triple] = set()
+        for commit_version, added, removed in self._history:
+            if commit_version <= version:
+                continue
+            for triple in added:
+                if triple in net_removed:
+                    net_removed.discard(triple)
+                else:
+                    net_added.add(triple)
+            for triple in removed:
+                if triple in net_added:
+                    net_added.discard(triple)
+                else:
+                    net_removed.add(triple)
+        return net_added, net_removed
+    
+    def _trim_history(self) -> None:
+        """Drop commit history no active transaction can still observe."""
+        if not self.transaction_stack:
+            self._history.clear()
+            return
+        oldest = min(tx.base_version for tx in self.transaction_stack)
+        self._history = [entry for entry in self._history if entry[0] > oldest]
+    
+    def _write(self, triple: Triple) -> None:
+        """Add a triple in the current transaction, or commit it immediately."""
+        tx = self._get_current_transaction()
+        if tx is not None:
+            tx.add(triple)
+        else:
+            self._apply_commit(str(uuid.uuid4()), [triple], [])
+    
+    def _write_many(self, triples: Iterable[Triple]) -> None:
+        """Add triples in the current transaction, or commit them as one."""
+        tx = self._get_current_transaction()
+        if tx is not None:
+            for triple in triples:
+                tx.add(triple)
+        else:
+            self._apply_commit(str(uuid.uuid4()), list(triples), [])
+    
+    def remove(self, triple: TriplePattern) -> None:
+        """Remove triples matching a pattern in the current transaction or immediately."""
+        tx = self._get_current_transaction()
+        if tx is not None:
+            for match in list(tx.triples(triple)):
+                tx.remove(match)
+        else:
+            self._apply_commit(str(uuid.uuid4()), [], list(self.graph.triples(triple)))
+    
+    def triples(self, pattern: TriplePattern) -> Iterator[Triple]:
+        """Iterate triples visible to the current transaction, or the base graph."""
+        tx = self._get_current_transaction()
+        return tx.triples(pattern) if tx is not None else self.graph.triples(pattern)
+    
+    def compact(self) -> None:
+        """Fold journaled commits into the source file and a fast-loading snapshot."""
+        if self.transaction_stack:
+            raise RuntimeError("Cannot compact while transactions are active")
+        # Replace the source atomically; the journal is only dropped once it has
+        tmp_path = Path(f"{self.guidance_path}.tmp")
+        try:
+            self.graph.serialize(destination=str(tmp_path), format='turtle')
+            os.replace(tmp_path, self.guidance_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        stamp = self._source_stamp()
+        tmp_path = Path(f"{self.snapshot_path}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(f"# source: {stamp}\n")
+            f.write(self.graph.serialize(format='nt'))
+        os.replace(tmp_path, self.snapshot_path)
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self._journal_entries = 0
+        self._journaled_fingerprint = _fingerprint(self.graph)
         
     def begin_transaction(self) -> str:
         """Start a new transaction.
@@ -44,11 +272,7 @@ class GuidanceManager:
             str: Transaction ID
         """
         transaction_id = str(uuid.uuid4())
-        self.transaction_stack.append({
-            'id': transaction_id,
-            'graph': Graph(),
-            'changes': []
-        })
+        self.transaction_stack.append(GuidanceTransaction(self, transaction_id))
         return transaction_id
 
     def commit_transaction(self, transaction_id: str) -> bool:
@@ -64,11 +288,11 @@ class GuidanceManager:
             ValueError: If transaction ID is invalid
         """
         for i, tx in enumerate(self.transaction_stack):
-            if tx['id'] == transaction_id:
-                # Apply changes to main graph
-                self.graph += tx['graph']
-                # Remove transaction from stack
+            if tx.id == transaction_id:
+                # Remove transaction from stack, then journal and apply its delta
                 self.transaction_stack.pop(i)
+                self._apply_commit(tx.id, tx.added, tx.removed)
+                self._trim_history()
                 return True
         raise ValueError(f"Invalid transaction ID: {transaction_id}")
 
@@ -85,17 +309,18 @@ class GuidanceManager:
             ValueError: If transaction ID is invalid
         """
         for i, tx in enumerate(self.transaction_stack):
-            if tx['id'] == transaction_id:
+            if tx.id == transaction_id:
                 # Remove transaction from stack without applying changes
                 self.transaction_stack.pop(i)
+                self._trim_history()
                 return True
         raise ValueError(f"Invalid transaction ID: {transaction_id}")
 
-    def _get_current_transaction(self) -> Optional[Dict]:
+    def _get_current_transaction(self) -> Optional[GuidanceTransaction]:
         """Get the current transaction if one exists.
         
         Returns:
-            Optional[Dict]: Current transaction or None
+            Optional[GuidanceTransaction]: Current transaction or None
         """
         return self.transaction_stack[-1] if self.transaction_stack else None
 
@@ -274,44 +499,62 @@ class GuidanceManager:
             ValueError: If required parameters are missing.
         """
         rule_uri = URIRef(f"{self.GUIDANCE}{rule_id}")
-        target_graph = self._get_current_transaction()['graph'] if self._get_current_transaction() else self.graph
+        triples: List[Triple] = []
         # Add basic rule properties
-        target_graph.add((rule_uri, RDF.type, self.GUIDANCE.ValidationRule))
-        target_graph.add((rule_uri, RDFS.label, Literal(rule_id)))
+        triples.append((rule_uri, RDF.type, self.GUIDANCE.ValidationRule))
+        triples.append((rule_uri, RDFS.label, Literal(rule_id)))
         # Priority as string
         priority_str = priority if priority in ("HIGH", "MEDIUM", "LOW") else "MEDIUM"
-        target_graph.add((rule_uri, self.GUIDANCE.hasPriority, Literal(priority_str)))
+        triples.append((rule_uri, self.GUIDANCE.hasPriority, Literal(priority_str)))
         # Message
         if message:
-            target_graph.add((rule_uri, self.GUIDANCE.hasMessage, Literal(message)))
+            triples.append((rule_uri, self.GUIDANCE.hasMessage, Literal(message)))
         # Map required properties from rule JSON
         if 'validator' in rule:
-            target_graph.add((rule_uri, self.GUIDANCE.hasValidator, Literal(rule['validator'])))
+            triples.append((rule_uri, self.GUIDANCE.hasValidator, Literal(rule['validator'])))
         if 'target' in rule:
             # Try to resolve as URIRef in guidance namespace
-            target_graph.add((rule_uri, self.GUIDANCE.hasTarget, self.GUIDANCE[rule['target']]))
+            triples.append((rule_uri, self.GUIDANCE.hasTarget, self.GUIDANCE[rule['target']]))
         if 'type' in rule:
             # Try to resolve as URIRef in guidance namespace for hasRuleType
-            target_graph.add((rule_uri, self.GUIDANCE.hasRuleType, self.GUIDANCE[rule['type'].upper()]))
+            triples.append((rule_uri, self.GUIDANCE.hasRuleType, self.GUIDANCE[rule['type'].upper()]))
         if 'pattern' in rule:
-            target_graph.add((rule_uri, self.GUIDANCE.hasPattern, Literal(rule['pattern'])))
+            triples.append((rule_uri, self.GUIDANCE.hasPattern, Literal(rule['pattern'])))
         # Add type as string for compatibility
-        target_graph.add((rule_uri, self.GUIDANCE.hasType, Literal(type)))
+        triples.append((rule_uri, self.GUIDANCE.hasType, Literal(type)))
+        self._write_many(triples)
         return rule_uri
         
     def save(self, path: Optional[str] = None) -> None:
-        """Save changes back to the guidance ontology."""
+        """Save changes back to the guidance ontology.
+        
+        Committed changes are already durable in the journal, so saving to the
+        managed file only compacts once the journal reaches compact_threshold
+        commits, or when the graph's content no longer matches what the
+        manager journaled, i.e. it was modified directly. Saving to another
+        path always writes the full graph there.
+        """
         if self.transaction_stack:
             raise RuntimeError("Cannot save while transactions are active")
             
-        target_path = path if path else self.guidance_path
-        self.graph.serialize(destination=target_path, format='turtle')
+        if path and Path(path).resolve() != Path(self.guidance_path).resolve():
+            self.graph.serialize(destination=path, format='turtle')
+            return
+        
+        if (self._journal_entries >= self.compact_threshold
+                or _fingerprint(self.graph) != self._journaled_fingerprint):
+            self.compact()
         
     def load(self, path: str) -> None:
-        """Load guidance ontology from a file."""
+        """Load guidance ontology from a file, replaying any journaled commits."""
+        if self.transaction_stack:
+            raise RuntimeError("Cannot load while transactions are active")
         self.guidance_path = path
-        self.graph = Graph()
-        self.graph.parse(path, format='turtle')
+        self.graph = self._load_base()
+        self.version = 0
+        self._history = []
+        self._journal_entries = self._replay_journal()
+        self._journaled_fingerprint = _fingerprint(self.graph)
         
     def _get_rule_details(self, rule_uri: URIRef) -> Dict[str, Any]:
         """Get detailed configuration for a validation rule.
@@ -399,8 +642,7 @@ class GuidanceManager:
             if base_iri is None:
                 raise ValueError("Base ontology IRI could not be determined. Please specify base_iri explicitly.")
         base_ref = URIRef(base_iri)
-        for import_iri in import_iris:
-            self.graph.add((base_ref, OWL.imports, URIRef(import_iri)))
+        self._write_many((base_ref, OWL.imports, URIRef(import_iri)) for import_iri in import_iris)
         self.logger.info(f"Added owl:imports for: {import_iris} to {base_iri}") 
 
     def add_validation_pattern(self, pattern_id: str, pattern: Dict[str, str]) -> URIRef:
@@ -414,7 +656,8 @@ class GuidanceManager:
             URIRef: The URI of the added validation pattern.
         """
         pattern_uri = self.GUIDANCE[pattern_id]
-        self.graph.add((pattern_uri, RDF.type, self.GUIDANCE.ValidationPattern))
+        triples: List[Triple] = [(pattern_uri, RDF.type, self.GUIDANCE.ValidationPattern)]
         for key, value in pattern.items():
-            self.graph.add((pattern_uri, self.GUIDANCE[key], Literal(value)))
+            triples.append((pattern_uri, self.GUIDANCE[key], Literal(value)))
+        self._write_many(triples)
         return pattern_uri 
\ No newline at end of file
@@ -11,6 +11,7 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileModifiedEvent
 from rdflib import Graph, Namespace, Literal, URIRef
 from rdflib.namespace import RDF, RDFS, OWL
+from ..core.graph_registry import get_graph_registry
 
 # Define namespaces
 CODE = Namespace("http://example.org/code#")
@@ -40,9 +41,7 @@ class ModelTriggerHandler(FileSystemEventHandler):
         
     def _load_guidance(self):
         """Load guidance ontology for validation rules."""
-        guidance_graph = Graph()
-        guidance_graph.parse("guidance.ttl", format="turtle")
-        self.model_graph += guidance_graph
+        self.model_graph += get_graph_registry().get("guidance.ttl", format="turtle")
         
     def _requires_model(self, file_path: Path) -> bool:
         """Check if a file requires model backing based on guidance rules.
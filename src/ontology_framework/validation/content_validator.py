@@ -0,0 +1,200 @@
+"""
+In-memory validation of Turtle content against a resident shapes graph.
+
+Content is parsed once from memory, never from a temporary file. The shapes
+graph is loaded once per process and reused across calls. The isomorphism
+round-trip and OWLReady2 reasoning are opt-in. Results are cached by content
+hash, and validate_async runs the CPU-heavy work in a process pool so an
+event loop stays responsive.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from pyshacl import validate
+from rdflib import Graph
+
+logger = logging.getLogger(__name__)
+
+# Shapes graphs loaded in this process, keyed by path (None: no shapes graph)
+_resident_shapes: Dict[Optional[str], Optional[Graph]] = {None: None}
+_resident_lock = threading.Lock()
+
+
+def content_hash(content: str) -> str:
+    """Hash used to key cached validation results"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def resident_shapes(shapes_path: Optional[str]) -> Optional[Graph]:
+    """Get the shapes graph for a path, parsing it only the first time in this process"""
+    shapes = _resident_shapes.get(shapes_path)
+    if shapes is None and shapes_path is not None:
+        with _resident_lock:
+            shapes = _resident_shapes.get(shapes_path)
+            if shapes is None:
+                shapes = Graph()
+                shapes.parse(shapes_path, format="turtle")
+                _resident_shapes[shapes_path] = shapes
+                logger.info(f"Loaded resident shapes graph {shapes_path} ({len(shapes)} triples)")
+    return shapes
+
+
+def _init_worker(shapes_path: Optional[str]) -> None:
+    """Process pool initializer: preload the shapes graph and pyshacl"""
+    resident_shapes(shapes_path)
+
+
+def _check_owlready2(graph: Graph, digest: str) -> Tuple[bool, list]:
+    """Run the OWLReady2 reasoner on an in-memory graph, in a fresh world"""
+    try:
+        from owlready2 import World, sync_reasoner
+        world = World()
+        onto = world.get_ontology(f"http://bfg9k.local/validation/{digest}#")
+        onto.load(fileobj=io.BytesIO(graph.serialize(format="nt", encoding="utf-8")), format="ntriples")
+        with onto:
+            sync_reasoner(world)
+        return True, [str(icls) for icls in world.inconsistent_classes()]
+    except Exception as e:
+        return False, [str(e)]
+
+
+def validate_content(content: str, shapes_path: Optional[str] = None,
+                     check_isomorphism: bool = False, check_owlready2: bool = False,
+                     content_format: str = "turtle") -> Dict[str, Any]:
+    """Validate RDF content held in memory.
+
+    Args:
+        content: Serialized RDF content
+        shapes_path: SHACL shapes graph, loaded once per process; None for basic RDF/OWL checks
+        check_isomorphism: Serialize, re-parse and compare the graph
+        check_owlready2: Run the OWLReady2 reasoner
+        content_format: rdflib parser format of content
+
+    Returns:
+        Dictionary with shacl_conforms and shacl_results, plus the keys of the
+        optional checks that were requested
+    """
+    graph = Graph()
+    graph.parse(data=content, format=content_format)
+
+    conforms, _, results_text = validate(
+        graph, shacl_graph=resident_shapes(shapes_path), inference="rdfs", abort_on_first=False
+    )
+    result: Dict[str, Any] = {
+        "shacl_conforms": conforms,
+        "shacl_results": results_text,
+        "triple_count": len(graph),
+    }
+
+    if check_isomorphism:
+        reparsed = Graph()
+        reparsed.parse(data=graph.serialize(format="turtle"), format="turtle")
+        result["isomorphic"] = graph.isomorphic(reparsed)
+
+    if check_owlready2:
+        consistent, inconsistencies = _check_owlready2(graph, content_hash(content))
+        result["owlready2_consistent"] = consistent
+        result["owlready2_inconsistencies"] = inconsistencies
+
+    return result
+
+
+class ContentValidator:
+    """Validator with a resident shapes graph, a result cache and a warm process pool"""
+
+    def __init__(self, shapes_path: Optional[str] = None, workers: Optional[int] = None,
+                 cache_size: int = 256):
+        """
+        Args:
+            shapes_path: SHACL shapes graph kept resident in every process
+            workers: Process pool size for validate_async; defaults to min(4, CPU count)
+            cache_size: Validation results kept, keyed by content hash and options
+        """
+        self.shapes_path = shapes_path
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self.cache_hits = 0
+        self.validations = 0
+
+    def _key(self, content: str, check_isomorphism: bool, check_owlready2: bool,
+             content_format: str) -> Tuple:
+        return (content_hash(content), content_format, check_isomorphism, check_owlready2)
+
+    def _cached(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return dict(result)
+        return None
+
+    def _store(self, key: Tuple, result: Dict[str, Any]) -> None:
+        with self._cache_lock:
+            self.validations += 1
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def validate(self, content: str, check_isomorphism: bool = False, check_owlready2: bool = False,
+                 content_format: str = "turtle") -> Dict[str, Any]:
+        """Validate content in this process"""
+        key = self._key(content, check_isomorphism, check_owlready2, content_format)
+        result = self._cached(key)
+        if result is None:
+            result = validate_content(content, self.shapes_path, check_isomorphism, check_owlready2, content_format)
+            self._store(key, result)
+            result = dict(result)
+        return result
+
+    async def validate_async(self, content: str, check_isomorphism: bool = False,
+                             check_owlready2: bool = False, content_format: str = "turtle") -> Dict[str, Any]:
+        """Validate content in the process pool without blocking the event loop"""
+        key = self._key(content, check_isomorphism, check_owlready2, content_format)
+        result = self._cached(key)
+        if result is None:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), validate_content,
+                content, self.shapes_path, check_isomorphism, check_owlready2, content_format
+            )
+            self._store(key, result)
+            result = dict(result)
+        return result
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # Spawned workers are safe to start from a threaded server
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(self.shapes_path,)
+                    )
+        return self._pool
+
+    def warm(self) -> None:
+        """Start every worker and load its shapes graph before the first request"""
+        pool = self._get_pool()
+        for future in [pool.submit(_init_worker, self.shapes_path) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the process pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
@@ -1,5 +1,39 @@
 """Visualization package for ontology framework."""
 
-from .cognition_dashboard import CognitionDashboard, CognitionPattern
+import importlib
+from typing import Any, Dict, Tuple
 
-__all__ = ['CognitionDashboard', 'CognitionPattern'] 
\ No newline at end of file
+# The dashboard needs plotly; resolve exports on first access (PEP 562) so the
+# graph extraction helpers can be imported without it
+_LAZY_ATTRIBUTES: Dict[str, Tuple[str, str]] = {
+    'CognitionDashboard': ('.cognition_dashboard', 'CognitionDashboard'),
+    'CognitionPattern': ('.cognition_dashboard', 'CognitionPattern'),
+    'OntologyGraphData': ('.ontology_graph', 'OntologyGraphData'),
+    'extract_graph_data': ('.ontology_graph', 'extract_graph_data'),
+    'cluster_nodes': ('.lod_layout', 'cluster_nodes'),
+    'multilevel_layout': ('.lod_layout', 'multilevel_layout'),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+__all__ = [
+    'CognitionDashboard',
+    'CognitionPattern',
+    'OntologyGraphData',
+    'extract_graph_data',
+    'cluster_nodes',
+    'multilevel_layout',
+]
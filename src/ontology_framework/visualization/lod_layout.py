@@ -0,0 +1,355 @@
+"""Level-of-detail clustering and layout for large ontology graphs.
+
+Large ontologies are drawn in two levels: nodes are grouped into clusters
+(by namespace or by class subtree), the cluster graph is laid out first, and
+each cluster's members are then laid out around their cluster's position.
+Layouts run on NumPy arrays; above a few thousand nodes the repulsive forces
+are approximated Barnes–Hut style by cell centroids of a uniform grid. Positions are
+precomputed so browser physics can stay off. For on-demand expansion, each
+cluster's members can be written to a script shard that a page loads with a
+<script> tag, which unlike fetch() also works for pages opened from file://.
+"""
+
+import json
+import math
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .ontology_graph import Edge, OntologyGraphData
+
+Position = Tuple[float, float]
+
+CLUSTER_MODES = ("namespace", "subtree")
+
+# Above this many nodes, repulsion is approximated by grid cell centroids
+EXACT_REPULSION_LIMIT = 2000
+
+# Nodes per row when repulsion is computed in chunks
+_CHUNK = 2048
+
+# Function a cluster shard script calls with its data
+SHARD_CALLBACK = "registerClusterShard"
+
+
+def cluster_node_id(key: str) -> str:
+    """Node id of a collapsed cluster; kept apart from the URIs of its members"""
+    return f"cluster:{key}"
+
+
+def namespace_of(uri: str) -> str:
+    """Namespace part of a URI: up to the last '#', else up to the last '/'"""
+    if '#' in uri:
+        return uri.rsplit('#', 1)[0] + '#'
+    if '/' in uri:
+        return uri.rsplit('/', 1)[0] + '/'
+    return uri
+
+
+def cluster_by_namespace(data: OntologyGraphData) -> Dict[str, List[str]]:
+    """Group nodes by namespace"""
+    clusters: Dict[str, List[str]] = defaultdict(list)
+    for node in data.degree:
+        clusters[namespace_of(node)].append(node)
+    return dict(clusters)
+
+
+def _class_chains(subclass_edges: Iterable[Edge]) -> Dict[str, Tuple[str, ...]]:
+    """Each class's ancestors from its root down to itself, following first parents"""
+    parent: Dict[str, str] = {}
+    for child, superclass in subclass_edges:
+        if child != superclass:
+            parent.setdefault(child, superclass)
+
+    chains: Dict[str, Tuple[str, ...]] = {}
+    for start in list(parent) + list(parent.values()):
+        path = []
+        node = start
+        while node not in chains and node in parent and node not in path:
+            path.append(node)
+            node = parent[node]
+        chain = chains.get(node, (node,))
+        if node in path:
+            # A cycle: treat the node it closes on as the root
+            chain = (node,)
+            path = path[:path.index(node)]
+        chains.setdefault(node, chain)
+        for visited in reversed(path):
+            chain = chain + (visited,)
+            chains[visited] = chain
+    return chains
+
+
+def _split_by_depth(items: List[Tuple[str, Tuple[str, ...]]], depth: int,
+                    max_size: Optional[int], clusters: Dict[str, List[str]]) -> None:
+    groups: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = defaultdict(list)
+    for node, chain in items:
+        groups[chain[min(depth, len(chain) - 1)]].append((node, chain))
+    for key, members in groups.items():
+        deeper = any(len(chain) > depth + 1 for _, chain in members)
+        if max_size is not None and len(members) > max_size and deeper:
+            _split_by_depth(members, depth + 1, max_size, clusters)
+        else:
+            clusters[key].extend(node for node, _ in members)
+
+
+def cluster_by_subtree(data: OntologyGraphData, max_size: Optional[int] = None) -> Dict[str, List[str]]:
+    """Group nodes by the root of their rdfs:subClassOf tree.
+
+    Instances join their class's tree and properties their domain's. Trees
+    larger than max_size are split into the subtrees one level down, as far
+    as the hierarchy allows. Nodes outside any tree are grouped by namespace.
+    """
+    chains = _class_chains(data.edges.get("subClassOf", ()))
+    anchor = {node: node for node in chains}
+    for relation in ("type", "domain"):
+        for source, target in data.edges.get(relation, ()):
+            if source not in anchor and target in chains:
+                anchor[source] = target
+
+    clusters: Dict[str, List[str]] = defaultdict(list)
+    items = []
+    for node in data.degree:
+        if node in anchor:
+            items.append((node, chains[anchor[node]]))
+        else:
+            clusters[namespace_of(node)].append(node)
+    _split_by_depth(items, 0, max_size, clusters)
+    return dict(clusters)
+
+
+def cluster_nodes(data: OntologyGraphData, by: str = "namespace",
+                  max_size: Optional[int] = None) -> Dict[str, List[str]]:
+    """Group nodes into clusters keyed by namespace, or by subtree root URI.
+
+    Raises:
+        ValueError: If by is not one of CLUSTER_MODES
+    """
+    if by == "namespace":
+        return cluster_by_namespace(data)
+    if by == "subtree":
+        return cluster_by_subtree(data, max_size)
+    raise ValueError(f"Unknown cluster mode {by!r}; expected one of {', '.join(CLUSTER_MODES)}")
+
+
+def cluster_edges(edges: Dict[str, List[Edge]],
+                  membership: Dict[str, str]) -> Dict[Tuple[str, str], Counter]:
+    """Edges between distinct clusters, with a count per relation"""
+    counts: Dict[Tuple[str, str], Counter] = defaultdict(Counter)
+    for relation, pairs in edges.items():
+        for source, target in pairs:
+            a, b = membership[source], membership[target]
+            if a != b:
+                counts[(a, b)][relation] += 1
+    return dict(counts)
+
+
+def _pairwise(x: np.ndarray, y: np.ndarray, px: np.ndarray, py: np.ndarray,
+              scale: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Summed repulsion of points (x, y) from points (px, py) weighted by scale / d^2"""
+    dx = x[:, None] - px[None, :]
+    dy = y[:, None] - py[None, :]
+    weight = scale / np.maximum(dx * dx + dy * dy, 1e-9)
+    return (dx * weight).sum(axis=1), (dy * weight).sum(axis=1)
+
+
+def _repulsion(pos: np.ndarray, k2: float, exact_limit: int) -> np.ndarray:
+    """Sum of k^2/d repulsive displacements on each node"""
+    n = len(pos)
+    x, y = pos[:, 0], pos[:, 1]
+    disp = np.zeros_like(pos)
+    if n <= exact_limit:
+        scale = np.full(n, k2)
+        for start in range(0, n, _CHUNK):
+            rows = slice(start, start + _CHUNK)
+            disp[rows, 0], disp[rows, 1] = _pairwise(x[rows], y[rows], x, y, scale)
+        return disp
+
+    # Grid approximation: exact forces within a node's own cell, cell centroids beyond.
+    # About sqrt(n) cells balances the centroid and in-cell work at O(n^1.5)
+    side = max(2, round(n ** 0.25))
+    lo = pos.min(axis=0)
+    span = np.maximum(pos.max(axis=0) - lo, 1e-9)
+    cells = np.minimum(((pos - lo) / span * side).astype(np.int64), side - 1)
+    cell = cells[:, 0] * side + cells[:, 1]
+    mass = np.bincount(cell, minlength=side * side).astype(float)
+    occupied = np.flatnonzero(mass)
+    mass = mass[occupied]
+    cx = np.bincount(cell, weights=x, minlength=side * side)[occupied] / mass
+    cy = np.bincount(cell, weights=y, minlength=side * side)[occupied] / mass
+    own = np.searchsorted(occupied, cell)
+
+    # A node's own cell is counted exactly below, not by its centroid
+    scale = k2 * mass
+    for start in range(0, n, _CHUNK):
+        rows = slice(start, start + _CHUNK)
+        rx, ry = x[rows], y[rows]
+        fx, fy = _pairwise(rx, ry, cx, cy, scale)
+        ox, oy = rx - cx[own[rows]], ry - cy[own[rows]]
+        own_weight = scale[own[rows]] / np.maximum(ox * ox + oy * oy, 1e-9)
+        disp[rows, 0] = fx - ox * own_weight
+        disp[rows, 1] = fy - oy * own_weight
+
+    # Skewed layouts can put most nodes in one cell, so chunk rows here too
+    order = np.argsort(cell, kind="stable")
+    bounds = np.flatnonzero(np.diff(cell[order])) + 1
+    for members in np.split(order, bounds):
+        mx, my = x[members], y[members]
+        member_scale = np.full(len(members), k2)
+        for start in range(0, len(members), _CHUNK):
+            rows = members[start:start + _CHUNK]
+            fx, fy = _pairwise(x[rows], y[rows], mx, my, member_scale)
+            disp[rows, 0] += fx
+            disp[rows, 1] += fy
+    return disp
+
+
+def force_layout(count: int, edges: Union[np.ndarray, Sequence[Tuple[int, int]]],
+                 weights: Optional[Sequence[float]] = None, iterations: int = 50,
+                 seed: int = 42, exact_limit: int = EXACT_REPULSION_LIMIT) -> np.ndarray:
+    """Fruchterman–Reingold layout of count nodes joined by index pairs.
+
+    Returns:
+        A (count, 2) array of positions scaled into [-1, 1]
+    """
+    if count == 0:
+        return np.zeros((0, 2))
+    if count == 1:
+        return np.zeros((1, 2))
+    rng = np.random.default_rng(seed)
+    pos = rng.random((count, 2))
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    weights = np.ones(len(edges)) if weights is None else np.asarray(weights, dtype=float)
+    k = math.sqrt(1.0 / count)
+    temperature = 0.1
+
+    for step in range(iterations):
+        disp = _repulsion(pos, k * k, exact_limit)
+        if len(edges):
+            delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+            dist = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 1e-9)
+            pull = delta * (dist * weights / k)[:, None]
+            np.add.at(disp, edges[:, 0], -pull)
+            np.add.at(disp, edges[:, 1], pull)
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 1e-9)
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= 0.1 / (iterations + 1)
+
+    pos -= pos.mean(axis=0)
+    extent = np.abs(pos).max()
+    return pos / extent if extent > 0 else pos
+
+
+def multilevel_layout(edges: Iterable[Edge], groups: Dict[str, List[str]], iterations: int = 50,
+                      seed: int = 42) -> Tuple[Dict[str, Position], Dict[str, Position]]:
+    """Lay out clusters, then each cluster's members around its centre.
+
+    Args:
+        edges: (source, target) pairs between member nodes
+        groups: Cluster id -> member nodes; every edge end must be a member
+
+    Returns:
+        Node positions and cluster centres
+    """
+    membership = {node: group for group, members in groups.items() for node in members}
+    group_ids = list(groups)
+    group_index = {group: i for i, group in enumerate(group_ids)}
+
+    internal: Dict[str, List[Edge]] = defaultdict(list)
+    between: Counter = Counter()
+    for source, target in edges:
+        a, b = membership[source], membership[target]
+        if a == b:
+            internal[a].append((source, target))
+        else:
+            between[(group_index[a], group_index[b])] += 1
+
+    pairs = list(between)
+    centres = force_layout(len(group_ids), pairs, [1 + math.log(between[p]) for p in pairs],
+                           iterations=iterations, seed=seed)
+    # Spread centres so a cluster's radius grows with the square root of its size
+    total = sum(len(members) for members in groups.values()) or 1
+    radius = {group: 0.6 * math.sqrt(len(groups[group]) / total) for group in group_ids}
+    scale = max(1.0, 2.5 * max(radius.values(), default=0) * math.sqrt(len(group_ids)))
+    centres *= scale
+
+    positions: Dict[str, Position] = {}
+    cluster_centres: Dict[str, Position] = {}
+    for i, group in enumerate(group_ids):
+        members = groups[group]
+        index = {node: j for j, node in enumerate(members)}
+        local = force_layout(len(members), [(index[s], index[t]) for s, t in internal[group]],
+                             iterations=iterations, seed=seed)
+        cx, cy = centres[i]
+        cluster_centres[group] = (float(cx), float(cy))
+        for node, (x, y) in zip(members, local):
+            positions[node] = (float(cx + radius[group] * x), float(cy + radius[group] * y))
+    return positions, cluster_centres
+
+
+def write_cluster_shards(directory: Union[str, Path], data: OntologyGraphData,
+                         groups: Dict[str, List[str]], positions: Dict[str, Position],
+                         labels: Dict[str, str], node_colors: Dict[str, str],
+                         edge_colors: Dict[str, str], position_scale: float = 1000.0) -> Dict[str, str]:
+    """Write one vis.js shard script per cluster for expand-on-click.
+
+    Each shard is a script calling SHARD_CALLBACK with the cluster's nodes at
+    their precomputed positions, its internal and outgoing edges ("edges"),
+    and the edges into it from other clusters ("incoming"). Edges that cross
+    clusters carry the other end's cluster node id (toCluster or
+    fromCluster), for while that cluster is still collapsed.
+
+    Returns:
+        Cluster id -> shard file name, relative to directory
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    membership = {node: group for group, members in groups.items() for node in members}
+    max_degree = data.max_degree
+
+    shard_edges: Dict[str, List[dict]] = defaultdict(list)
+    incoming: Dict[str, List[dict]] = defaultdict(list)
+    for relation, pairs in data.edges.items():
+        color = edge_colors.get(relation, "#7f8c8d")
+        for source, target in pairs:
+            group, target_group = membership[source], membership[target]
+            edge = {"from": source, "to": target, "title": relation, "color": color, "arrows": "to"}
+            if target_group != group:
+                edge["toCluster"] = cluster_node_id(target_group)
+                incoming[target_group].append(dict(edge, fromCluster=cluster_node_id(group)))
+            shard_edges[group].append(edge)
+
+    files: Dict[str, str] = {}
+    for i, (group, members) in enumerate(groups.items()):
+        nodes = []
+        for node in members:
+            node_type = data.node_types.get(node, "Unknown")
+            x, y = positions[node]
+            nodes.append({
+                "id": node,
+                "label": labels.get(node, node),
+                "title": f"{node_type}: {labels.get(node, node)}<br>{node}",
+                "color": node_colors.get(node_type, "#dfe6e9"),
+                "size": 10 + data.degree.get(node, 1) / max_degree * 40,
+                "x": x * position_scale,
+                "y": y * position_scale,
+                "physics": False,
+            })
+        name = f"cluster-{i}.js"
+        shard = {"cluster": cluster_node_id(group), "nodes": nodes,
+                 "edges": shard_edges[group], "incoming": incoming[group]}
+        with open(directory / name, "w", encoding="utf-8") as f:
+            f.write(f"{SHARD_CALLBACK}({json.dumps(shard)});\n")
+        files[group] = name
+    return files
+
+
+def read_cluster_shard(path: Union[str, Path]) -> dict:
+    """Data of a shard script written by write_cluster_shards"""
+    text = Path(path).read_text(encoding="utf-8").strip()
+    prefix = f"{SHARD_CALLBACK}("
+    if not text.startswith(prefix) or not text.endswith(");"):
+        raise ValueError(f"{path} is not a cluster shard")
+    return json.loads(text[len(prefix):-2])
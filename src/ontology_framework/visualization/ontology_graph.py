@@ -0,0 +1,143 @@
+"""Relationship extraction shared by the ontology graph renderers.
+
+visualize_ontology.py (networkx/matplotlib) and interactive_ontology_vis.py
+(PyVis) both draw the same edges and node typing. This module reads each
+requested relation straight off the store's predicate index, in one pass per
+predicate, and derives node types and degrees from those edges once, so
+renderers look them up instead of rescanning edge lists per node.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rdflib import Graph, URIRef
+from rdflib.namespace import OWL, RDF, RDFS
+
+Edge = Tuple[str, str]
+
+# Relation name -> predicate
+RELATION_PREDICATES: Dict[str, URIRef] = {
+    "subClassOf": RDFS.subClassOf,
+    "domain": RDFS.domain,
+    "range": RDFS.range,
+    "imports": OWL.imports,
+    "type": RDF.type,
+    "seeAlso": RDFS.seeAlso,
+}
+
+DEFAULT_RELATION_TYPES = ["subClassOf", "imports", "domain", "range", "type", "seeAlso"]
+
+# Node types in precedence order, with the relation and edge end that implies each
+NODE_TYPE_RULES: List[Tuple[str, str, int]] = [
+    ("Class", "subClassOf", 1),
+    ("Property", "domain", 0),
+    ("Property", "range", 0),
+    ("Ontology", "imports", 0),
+    ("Instance", "type", 0),
+]
+
+
+@dataclass
+class OntologyGraphData:
+    """Typed edges of an ontology with precomputed per-node attributes.
+
+    Attributes:
+        edges: Relation name -> (source, target) pairs, in graph order
+        node_types: Node -> Class, Property, Ontology, Instance or Unknown
+        degree: Node -> number of distinct neighbours, ignoring direction
+    """
+
+    edges: Dict[str, List[Edge]] = field(default_factory=dict)
+    node_types: Dict[str, str] = field(default_factory=dict)
+    degree: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self.degree)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(edges) for edges in self.edges.values())
+
+    @property
+    def max_degree(self) -> int:
+        return max(self.degree.values(), default=1) or 1
+
+
+def _keep(relation: str, target) -> bool:
+    if relation == "subClassOf":
+        return isinstance(target, URIRef) and target != OWL.Thing
+    if relation == "type":
+        return isinstance(target, URIRef)
+    return True
+
+
+def extract_relationships(g: Graph, relation_types: Optional[Iterable[str]] = None,
+                          exclude_classes: Optional[Iterable[str]] = None) -> Dict[str, List[Edge]]:
+    """Extract (source, target) edges for each requested relation.
+
+    Unknown relation names are skipped. Edges touching an excluded URI are dropped.
+    """
+    if relation_types is None:
+        relation_types = DEFAULT_RELATION_TYPES
+    excluded = {str(uri) for uri in exclude_classes or ()}
+
+    relationships: Dict[str, List[Edge]] = {}
+    for relation in relation_types:
+        predicate = RELATION_PREDICATES.get(relation)
+        if predicate is None or relation in relationships:
+            continue
+        edges = []
+        for source, _, target in g.triples((None, predicate, None)):
+            if not _keep(relation, target):
+                continue
+            edge = (str(source), str(target))
+            if excluded and (edge[0] in excluded or edge[1] in excluded):
+                continue
+            edges.append(edge)
+        relationships[relation] = edges
+    return relationships
+
+
+def compute_node_types(relationships: Dict[str, List[Edge]]) -> Dict[str, str]:
+    """Type every node by the strongest relation it takes part in"""
+    node_types: Dict[str, str] = {}
+    for edges in relationships.values():
+        for source, target in edges:
+            node_types[source] = "Unknown"
+            node_types[target] = "Unknown"
+    # Apply rules weakest first so stronger types overwrite
+    for node_type, relation, end in reversed(NODE_TYPE_RULES):
+        for edge in relationships.get(relation, ()):
+            node_types[edge[end]] = node_type
+    return node_types
+
+
+def compute_degrees(relationships: Dict[str, List[Edge]]) -> Dict[str, int]:
+    """Distinct neighbours per node, ignoring edge direction and relation"""
+    neighbours: Dict[str, Set[str]] = defaultdict(set)
+    for edges in relationships.values():
+        for source, target in edges:
+            neighbours[source].add(target)
+            neighbours[target].add(source)
+    return {node: len(adjacent) for node, adjacent in neighbours.items()}
+
+
+def extract_graph_data(g: Graph, relation_types: Optional[Iterable[str]] = None,
+                       exclude_classes: Optional[Iterable[str]] = None) -> OntologyGraphData:
+    """Extract edges, node types and degrees for rendering"""
+    relationships = extract_relationships(g, relation_types, exclude_classes)
+    return OntologyGraphData(
+        edges=relationships,
+        node_types=compute_node_types(relationships),
+        degree=compute_degrees(relationships),
+    )
+
+
+def shorten_uri(uri: str, namespaces: Dict[str, str]) -> str:
+    """Shorten URI using namespace prefixes"""
+    for prefix, namespace in namespaces.items():
+        if uri.startswith(str(namespace)):
+            return f"{prefix}:{uri[len(str(namespace)):]}"
+    return uri.split('#')[-1] if '#' in uri else uri.split('/')[-1]
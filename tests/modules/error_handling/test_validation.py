@@ -481,4 +481,48 @@ def test_generate_validation_report():
     
     # Check recent validations
     assert isinstance(report["recent_validations"], list)
-    assert len(report["recent_validations"]) <= 10 
\ No newline at end of file
+    assert len(report["recent_validations"]) <= 10 
+
+def _history_entry(rule: str, result: bool, timestamp: str) -> Dict[str, Any]:
+    return {"rule": rule, "priority": "HIGH", "target": "data", "result": result, "timestamp": timestamp}
+
+def test_validation_history_spills_to_log(tmp_path):
+    """Test bounded history spilling old attempts to the JSONL log."""
+    from ontology_framework.modules.error_handling.history import ValidationHistory
+    history = ValidationHistory(max_entries=3, spill_path=str(tmp_path / "history.jsonl"))
+    for i in range(10):
+        history.append(_history_entry("risk" if i % 2 else "security", i % 3 != 0, f"2024-01-{i + 1:02d}T00:00:00"))
+
+    assert len(history) == 10
+    assert [e["timestamp"][8:10] for e in history.recent()] == ["08", "09", "10"]
+    assert [e["timestamp"][8:10] for e in history.iter_entries()] == [f"{i:02d}" for i in range(1, 11)]
+    assert len((tmp_path / "history.jsonl").read_text().splitlines()) == 7
+
+    in_range = history.query(start_date="2024-01-03", end_date="2024-01-09")
+    assert [e["timestamp"][8:10] for e in in_range] == ["03", "04", "05", "06", "07", "08"]
+    assert len(history.query(rule="risk", result=False)) == 2
+    assert [e["timestamp"][8:10] for e in history.recent_failures(2)] == ["07", "10"]
+
+    stats = history.statistics()
+    assert stats["total_validations"] == 10
+    assert stats["failed_validations"] == 4
+    assert stats["by_rule"]["risk"] == {"total": 5, "successes": 3}
+    assert stats["by_priority"]["HIGH"]["total"] == 10
+
+    history.clear()
+    assert len(history) == 0
+    assert list(history.iter_entries()) == []
+    history.close()
+
+def test_export_streams_spilled_history():
+    """Test exporting history that has spilled past the in-memory window."""
+    handler = ValidationHandler(history_size=2)
+    for _ in range(5):
+        handler.validate(ValidationRule.RISK, {"level": "HIGH", "impact": 8, "probability": 7})
+
+    assert len(handler.get_validation_history()) == 2
+    assert handler.get_validation_statistics()["total_validations"] == 5
+    assert len(handler.filter_validation_history(rule=ValidationRule.RISK)) == 5
+    import json
+    assert len(json.loads(handler.export_validation_history("json"))) == 5
+    assert len(handler.export_validation_history("csv").strip().splitlines()) == 6
@@ -0,0 +1,72 @@
+"""
+Test cases for BFG9K targeter rule indexes.
+"""
+import numpy as np
+import pytest
+from rdflib import Literal, URIRef, RDF
+from rdflib.namespace import SH
+from ontology_framework.mcp.bfg9k_targeting import BFG9KTargeter, GUIDANCE
+from ontology_framework.mcp.hypercube_analysis import HypercubeAnalyzer, TrajectoryVector
+
+EX = "http://example.org/rules#"
+
+
+@pytest.fixture
+def targeter():
+    """Fixture for a targeter with a few numeric-priority rules loaded"""
+    analyzer = HypercubeAnalyzer()
+    analyzer.trajectories.append(
+        TrajectoryVector(velocity=np.ones(4), acceleration=np.zeros(4), jerk=np.zeros(4))
+    )
+    targeter = BFG9KTargeter(analyzer)
+    graph = targeter.validation_graph
+    for name, rule_type, priority in [
+        ("low", "semantic", 0.2),
+        ("mid", "semantic", 0.5),
+        ("high", "structural", 0.9),
+    ]:
+        rule = URIRef(EX + name)
+        shape = URIRef(EX + name + "Shape")
+        graph.add((rule, RDF.type, GUIDANCE.ValidationRule))
+        graph.add((rule, GUIDANCE.hasType, Literal(rule_type)))
+        graph.add((rule, GUIDANCE.hasPriority, Literal(priority)))
+        graph.add((rule, GUIDANCE.hasShape, shape))
+        graph.add((shape, RDF.type, SH.NodeShape))
+        graph.add((shape, SH.targetClass, URIRef(EX + "Thing")))
+    targeter._load_validation_rules()
+    return targeter
+
+
+def test_indexes_rebuilt_on_reload(targeter):
+    """Reloading validation rules rebuilds the rule indexes"""
+    assert targeter.get_rules_by_type("semantic") == [URIRef(EX + "low"), URIRef(EX + "mid")]
+    assert targeter.get_rules_above_priority(0.5) == [URIRef(EX + "mid"), URIRef(EX + "high")]
+
+    rule = URIRef(EX + "extra")
+    targeter.validation_graph.add((rule, RDF.type, GUIDANCE.ValidationRule))
+    targeter.validation_graph.add((rule, GUIDANCE.hasType, Literal("structural")))
+    targeter.validation_graph.add((rule, GUIDANCE.hasPriority, Literal(0.7)))
+    assert rule not in targeter.get_rules_by_type("structural")
+
+    targeter._load_validation_rules()
+    assert rule in targeter.get_rules_by_type("structural")
+    assert targeter.get_rules_above_priority(0.6) == [rule, URIRef(EX + "high")]
+
+
+def test_rule_shapes_pre_extracted(targeter):
+    """Each rule's SHACL shape is extracted once at load time"""
+    shapes = targeter.get_rule_shapes(URIRef(EX + "high"))
+    assert (URIRef(EX + "highShape"), RDF.type, SH.NodeShape) in shapes
+    assert (URIRef(EX + "lowShape"), RDF.type, SH.NodeShape) not in shapes
+    assert len(targeter.get_rule_shapes(URIRef(EX + "unknown"))) == 0
+
+
+def test_detect_targets_and_plan(targeter):
+    """Targets and plans are served from the rule indexes"""
+    targets = targeter.detect_targets({"semantic_accuracy": 0.9})
+    assert {str(t.uri) for t in targets} == {EX + "mid", EX + "high"}
+    assert all(t.priority >= 0.5 for t in targets)
+
+    mid = next(t for t in targets if str(t.uri) == EX + "mid")
+    plan = targeter.generate_validation_plan(mid)
+    assert plan.validation_rules == [URIRef(EX + "low"), URIRef(EX + "mid")]
@@ -0,0 +1,204 @@
+"""Tests for the write-behind content store behind ReflectiveModule.store_content."""
+
+import os
+import threading
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from ontology_framework.core.content_store import (
+    ContentBackend, MemoryBackend, SQLiteBackend, WriteBehindContentStore, default_backend
+)
+from tests.test_tracing import TracedModule
+
+
+class FlakyBackend(MemoryBackend):
+    """Memory backend that fails its first batch"""
+
+    def __init__(self):
+        super().__init__()
+        self.failures = 1
+
+    def write_batch(self, items):
+        if self.failures:
+            self.failures -= 1
+            raise IOError("CMS unavailable")
+        super().write_batch(items)
+
+
+class SlowBackend(MemoryBackend):
+    """Memory backend with a fixed round-trip per batch"""
+
+    def write_batch(self, items):
+        time.sleep(0.05)
+        super().write_batch(items)
+
+
+class GatedBackend(MemoryBackend):
+    """Memory backend whose batches wait until the test releases them"""
+
+    def __init__(self):
+        super().__init__()
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write_batch(self, items):
+        self.writing.set()
+        self.release.wait(5)
+        super().write_batch(items)
+
+
+class TestWriteBehindContentStore(unittest.TestCase):
+    """Test cases for buffered content writes."""
+
+    def test_repeated_writes_coalesced(self):
+        """Only the latest write per content ID reaches the backend."""
+        backend = MemoryBackend()
+        store = WriteBehindContentStore(backend, flush_interval=60)
+        for i in range(50):
+            store.put("content", {"id": "config", "data": {"n": i}})
+        store.put("other", {"id": "config", "data": {"n": -1}})
+        self.assertEqual(store.flush(), 2)
+        self.assertEqual(backend.batches, 1)
+        self.assertEqual(backend.read("content", "config")["data"], {"n": 49})
+        self.assertEqual(backend.read("other", "config")["data"], {"n": -1})
+        self.assertEqual(store.stats()["coalesced"], 49)
+        store.close()
+
+    def test_reads_see_unflushed_writes(self):
+        """Pending writes are readable before they are flushed."""
+        backend = MemoryBackend()
+        store = WriteBehindContentStore(backend, flush_interval=60, cache_size=2)
+        for i in range(5):
+            store.put("content", {"id": f"c{i}", "data": i})
+        self.assertEqual(backend.items, {})
+        self.assertEqual([store.get("content", f"c{i}")["data"] for i in range(5)], list(range(5)))
+        store.close()
+
+    def test_reads_see_writes_being_flushed(self):
+        """A write evicted from the cache mid-flush is still read instead of the old backend value."""
+        backend = GatedBackend()
+        backend.items[("content", "a")] = {"id": "a", "data": 1}
+        store = WriteBehindContentStore(backend, flush_interval=60, cache_size=1)
+        store.put("content", {"id": "a", "data": 2})
+        flusher = threading.Thread(target=store.flush)
+        flusher.start()
+        self.assertTrue(backend.writing.wait(5))
+        store.put("content", {"id": "b", "data": 3})
+        self.assertEqual(store.get("content", "a")["data"], 2)
+        backend.release.set()
+        flusher.join()
+        self.assertEqual(store.get("content", "a")["data"], 2)
+        store.close()
+
+    def test_lru_cache_bounded(self):
+        """Flushed content falls out of the cache and is read back from the backend."""
+        backend = MemoryBackend()
+        store = WriteBehindContentStore(backend, flush_interval=60, cache_size=3)
+        for i in range(10):
+            store.put("content", {"id": f"c{i}", "data": i})
+        store.flush()
+        store.get("content", "c0")
+        self.assertEqual(store.stats()["cached"], 3)
+        self.assertEqual(store.stats()["cache_misses"], 1)
+        store.get("content", "c0")
+        self.assertEqual(store.stats()["cache_hits"], 1)
+        store.close()
+
+    def test_size_threshold_triggers_flush(self):
+        """The flusher writes early once max_pending writes are buffered."""
+        backend = MemoryBackend()
+        store = WriteBehindContentStore(backend, max_pending=10, flush_interval=60)
+        for i in range(10):
+            store.put("content", {"id": f"c{i}", "data": i})
+        deadline = time.monotonic() + 5
+        while len(backend.items) < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(backend.items), 10)
+        store.close()
+
+    def test_failed_flush_retried_without_losing_newer_writes(self):
+        """A failed batch is re-queued behind writes that arrived meanwhile."""
+        backend = FlakyBackend()
+        store = WriteBehindContentStore(backend, flush_interval=60)
+        store.put("content", {"id": "a", "data": 1})
+        self.assertEqual(store.flush(), 0)
+        store.put("content", {"id": "a", "data": 2})
+        self.assertEqual(store.flush(), 1)
+        self.assertEqual(backend.read("content", "a")["data"], 2)
+        store.close()
+
+    def test_sqlite_backend_upserts(self):
+        """The SQLite stand-in persists the latest version of each item."""
+        with TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "content.db")
+            store = WriteBehindContentStore(SQLiteBackend(path), flush_interval=60)
+            store.put("content", {"id": "a", "data": 1})
+            store.flush()
+            store.put("content", {"id": "a", "data": 2})
+            store.close()
+            reopened = SQLiteBackend(path)
+            self.assertEqual(reopened.read("content", "a")["data"], 2)
+            self.assertIsNone(reopened.read("content", "missing"))
+            reopened.close()
+            store._backend.close()
+
+    def test_module_store_does_not_block(self):
+        """store_content returns without waiting on the backend round-trip."""
+        backend = SlowBackend()
+        store = WriteBehindContentStore(backend, flush_interval=0.01)
+        module = TracedModule()
+        module.set_content_store(store)
+        start = time.perf_counter()
+        for i in range(100):
+            self.assertTrue(module.store_content("state", "content", {"step": i}))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(module.get_content("state")["data"], {"step": 99})
+        store.close()
+        self.assertEqual(backend.read("content", "state")["data"], {"step": 99})
+        self.assertLess(backend.batches, 100)
+
+    def test_backend_resolved_lazily(self):
+        """The backend factory only runs when content is flushed or read."""
+        calls = []
+
+        def factory() -> ContentBackend:
+            calls.append(1)
+            return MemoryBackend()
+
+        store = WriteBehindContentStore(backend_factory=factory, flush_interval=60)
+        store.put("content", {"id": "a", "data": 1})
+        self.assertEqual(calls, [])
+        store.close()
+        self.assertEqual(calls, [1])
+
+    def test_default_backend_is_sqlite_in_user_cache(self):
+        """Without Directus, content goes to SQLite in the user cache; BEAST_MODE_CONTENT_DB moves or disables it."""
+        with TemporaryDirectory() as tmp:
+            env = {k: v for k, v in os.environ.items() if k != "BEAST_MODE_CONTENT_DB"}
+            env["XDG_CACHE_HOME"] = tmp
+            with mock.patch.dict(os.environ, env, clear=True):
+                backend = default_backend()
+                self.assertIsInstance(backend, SQLiteBackend)
+                self.assertEqual(Path(backend.path), Path(tmp) / "ontology_framework" / "content.db")
+                backend.close()
+
+                configured = str(Path(tmp) / "configured.db")
+                with mock.patch.dict(os.environ, {"BEAST_MODE_CONTENT_DB": configured}):
+                    backend = default_backend()
+                    self.assertEqual(backend.path, configured)
+                    backend.close()
+
+                with mock.patch.dict(os.environ, {"BEAST_MODE_CONTENT_DB": ""}):
+                    self.assertIsInstance(default_backend(), MemoryBackend)
+
+    def test_backend_must_implement_read_and_write(self):
+        """ContentBackend is abstract."""
+        with self.assertRaises(TypeError):
+            ContentBackend()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Tests for in-memory content validation with a resident shapes graph."""
+
+import asyncio
+import time
+
+import pytest
+
+from ontology_framework.validation import content_validator
+from ontology_framework.validation.content_validator import ContentValidator, validate_content
+
+SHAPES = """
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix ex: <http://example.org/> .
+
+ex:ThingShape a sh:NodeShape ;
+    sh:targetClass ex:Thing ;
+    sh:property [ sh:path rdfs:label ; sh:minCount 1 ] .
+"""
+
+VALID = """
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix ex: <http://example.org/> .
+ex:a a ex:Thing ; rdfs:label "A" .
+"""
+
+INVALID = """
+@prefix ex: <http://example.org/> .
+ex:b a ex:Thing .
+"""
+
+
+@pytest.fixture
+def shapes_path(tmp_path):
+    path = tmp_path / "shapes.ttl"
+    path.write_text(SHAPES)
+    return str(path)
+
+
+def test_validates_against_resident_shapes(shapes_path):
+    """Shapes are applied, and parsed once per process."""
+    assert validate_content(VALID, shapes_path)["shacl_conforms"] is True
+    resident = content_validator.resident_shapes(shapes_path)
+    result = validate_content(INVALID, shapes_path)
+    assert result["shacl_conforms"] is False
+    assert "MinCount" in result["shacl_results"]
+    assert content_validator.resident_shapes(shapes_path) is resident
+
+
+def test_optional_checks_only_when_requested():
+    """Isomorphism is reported only when asked for."""
+    assert "isomorphic" not in validate_content(VALID)
+    assert validate_content(VALID, check_isomorphism=True)["isomorphic"] is True
+
+
+def test_results_cached_by_content_hash(shapes_path, monkeypatch):
+    """Repeated content is not revalidated, and cached results are copies."""
+    validator = ContentValidator(shapes_path)
+    first = validator.validate(INVALID)
+    first["shacl_conforms"] = "mutated"
+    calls = []
+    monkeypatch.setattr(content_validator, "validate_content", lambda *args: calls.append(args))
+    assert validator.validate(INVALID)["shacl_conforms"] is False
+    assert calls == []
+    assert validator.cache_hits == 1
+
+
+def test_async_validation_in_worker_pool(shapes_path):
+    """Concurrent calls run in the warm pool while the event loop keeps ticking."""
+    validator = ContentValidator(shapes_path, workers=2)
+    validator.warm()
+    try:
+        async def run():
+            ticks = 0
+
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            beat = asyncio.create_task(heartbeat())
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                validator.validate_async(VALID),
+                validator.validate_async(INVALID),
+                validator.validate_async(VALID + "\nex:c a ex:Other .")
+            )
+            elapsed = time.perf_counter() - start
+            beat.cancel()
+            return results, ticks, elapsed
+
+        results, ticks, elapsed = asyncio.run(run())
+        assert [r["shacl_conforms"] for r in results] == [True, False, True]
+        assert ticks >= elapsed / 0.05
+    finally:
+        validator.shutdown()
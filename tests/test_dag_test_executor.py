@@ -0,0 +1,125 @@
+"""Tests for DAG test scheduling, including a makespan benchmark on a skewed suite."""
+
+import asyncio
+import time
+from typing import Dict, List
+
+import pytest
+
+from ontology_framework.test_generation.data_models import TestCase, TestSuite, TestResult, TestStatus
+from ontology_framework.test_generation.dag_test_executor import DAGTestExecutor
+from ontology_framework.test_generation.duration_store import TestDurationStore
+from ontology_framework.test_generation.test_dag_builder import TestDAGBuilder
+
+# One slow setup chain and one wide, slow-bodied chain behind a fast setup
+SKEWED_DURATIONS = {
+    "test_alpha_setup": 0.3,
+    "test_alpha_report": 0.02,
+    "test_beta_setup": 0.02,
+    "test_beta_create": 0.2,
+    "test_beta_update": 0.2,
+    "test_beta_delete": 0.2,
+}
+
+
+def make_suite(durations: Dict[str, float]) -> TestSuite:
+    return TestSuite(
+        name="skewed",
+        test_cases=[TestCase(name=name, description=name, test_code="assert True") for name in durations]
+    )
+
+
+@pytest.fixture
+def executor(tmp_path):
+    executor = DAGTestExecutor(duration_store_path=str(tmp_path / "durations.json"))
+    started: List[str] = []
+
+    async def fake_run(test_case: TestCase) -> TestResult:
+        started.append(test_case.name)
+        duration = SKEWED_DURATIONS[test_case.name]
+        await asyncio.sleep(duration)
+        return TestResult(test_name=test_case.name, status=TestStatus.PASSED, duration=duration)
+
+    executor._run_test = fake_run
+    executor.started = started
+    return executor
+
+
+def test_dependencies_from_indexes():
+    """Setup, class and fixture dependencies are inferred from the indexes"""
+    suite = make_suite(SKEWED_DURATIONS)
+    suite.test_cases.append(TestCase(name="test_gamma_uses_report", description="", test_code="",
+                                     fixtures=["alpha_report"]))
+    dag = TestDAGBuilder().build_test_dag(suite)
+
+    assert dag.nodes["test_beta_create"].dependencies == {"test_beta_setup"}
+    assert dag.nodes["test_alpha_report"].dependencies == {"test_alpha_setup"}
+    assert dag.nodes["test_alpha_setup"].dependencies == set()
+    assert dag.nodes["test_gamma_uses_report"].dependencies == {"test_alpha_report"}
+    assert dag.nodes["test_beta_setup"].dependents == {"test_beta_create", "test_beta_update", "test_beta_delete"}
+    assert dag.execution_order[0] == ["test_alpha_setup", "test_beta_setup"]
+
+
+def test_critical_path_lengths():
+    """Critical path sums estimated durations along the longest dependent chain"""
+    builder = TestDAGBuilder()
+    dag = builder.build_test_dag(make_suite(SKEWED_DURATIONS))
+    lengths = builder.critical_path_lengths(dag, SKEWED_DURATIONS.get)
+    assert lengths["test_alpha_setup"] == pytest.approx(0.32)
+    assert lengths["test_beta_setup"] == pytest.approx(0.22)
+
+
+def test_ready_queue_beats_level_batches(executor):
+    """Benchmark: dependents start as soon as their own dependencies finish"""
+    dag = executor.dag_builder.build_test_dag(make_suite(SKEWED_DURATIONS))
+    level_makespan = sum(max(SKEWED_DURATIONS[name] for name in batch) for batch in dag.execution_order)
+
+    start = time.perf_counter()
+    result = asyncio.run(executor.execute_test_suite_with_dag(make_suite(SKEWED_DURATIONS)))
+    makespan = time.perf_counter() - start
+
+    assert result.passed_tests == len(SKEWED_DURATIONS)
+    assert level_makespan == pytest.approx(0.5)
+    assert makespan < 0.85 * level_makespan
+
+
+def test_critical_path_orders_ready_tests(executor, tmp_path):
+    """With one slot, ready tests run longest remaining chain first"""
+    executor.base_executor.config.max_concurrent_tests = 1
+    for name, duration in SKEWED_DURATIONS.items():
+        executor.duration_store.record(name, duration)
+
+    asyncio.run(executor.execute_test_suite_with_dag(make_suite(SKEWED_DURATIONS)))
+    assert executor.started[:2] == ["test_alpha_setup", "test_beta_setup"]
+    assert executor.started[-1] == "test_alpha_report"
+
+    reloaded = TestDurationStore(str(tmp_path / "durations.json"))
+    assert reloaded.estimate("test_beta_create") == pytest.approx(0.2)
+    assert reloaded.estimate("test_unknown") == reloaded.default_duration
+
+
+def test_dependency_cycle_still_runs(tmp_path):
+    """Mutually dependent tests are released once nothing else can run"""
+    executor = DAGTestExecutor(duration_store_path=str(tmp_path / "durations.json"))
+    started: List[str] = []
+
+    async def fake_run(test_case: TestCase) -> TestResult:
+        started.append(test_case.name)
+        return TestResult(test_name=test_case.name, status=TestStatus.PASSED, duration=0.0)
+
+    executor._run_test = fake_run
+    suite = TestSuite(
+        name="cyclic",
+        test_cases=[
+            TestCase(name="test_ping_send", description="", test_code="assert True", fixtures=["pong_reply"]),
+            TestCase(name="test_pong_reply", description="", test_code="assert True", fixtures=["ping_send"]),
+            TestCase(name="test_solo", description="", test_code="assert True"),
+        ]
+    )
+    dag = executor.dag_builder.build_test_dag(suite)
+    assert dag.nodes["test_ping_send"].dependencies == {"test_pong_reply"}
+    assert dag.nodes["test_pong_reply"].dependencies == {"test_ping_send"}
+
+    results = asyncio.run(executor._execute_ready_queue(dag))
+    assert sorted(result.test_name for result in results) == ["test_ping_send", "test_pong_reply", "test_solo"]
+    assert started[0] == "test_solo"
@@ -0,0 +1,102 @@
+"""Tests for the process-wide shared graph registry."""
+
+import os
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import RDFS
+
+from ontology_framework.core.graph_registry import GraphRegistry, ReadOnlyGraphError
+
+TTL = """
+@prefix ex: <http://example.org/> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+ex:A rdfs:label "A" .
+ex:B rdfs:label "B" .
+"""
+
+EX_C = URIRef("http://example.org/C")
+
+
+@pytest.fixture
+def ontology(tmp_path):
+    path = tmp_path / "onto.ttl"
+    path.write_text(TTL)
+    return path
+
+
+def test_parsed_once_and_shared(ontology):
+    """Views of the same file share one parsed graph."""
+    registry = GraphRegistry()
+    first = registry.get(ontology)
+    second = registry.get(str(ontology))
+    assert len(first) == 2
+    assert first.shared is second.shared
+    stats = registry.stats()[str(ontology.resolve())]
+    assert stats["loads"] == 1
+    assert stats["hits"] == 1
+    assert stats["triples"] == 2
+    assert registry.total_bytes == stats["bytes"] > 0
+
+
+def test_views_are_read_only(ontology):
+    """Writes to a view are rejected; prefix bindings are allowed."""
+    view = GraphRegistry().get(ontology)
+    with pytest.raises(ReadOnlyGraphError):
+        view.add((EX_C, RDFS.label, Literal("C")))
+    with pytest.raises(ReadOnlyGraphError):
+        view += Graph()
+    view.bind("example", "http://example.org/")
+
+
+def test_bindings_are_per_view(ontology):
+    """A prefix bound on one view is not seen by other readers of the same file."""
+    registry = GraphRegistry()
+    first, second = registry.get(ontology), registry.checkout(ontology)
+    first.bind("mine", "http://example.org/mine#")
+    second.bind("ex", "http://example.org/other#", replace=True)
+    assert dict(first.namespaces())["mine"] == URIRef("http://example.org/mine#")
+    assert "mine" not in dict(second.namespaces())
+    assert dict(second.namespaces())["ex"] == URIRef("http://example.org/other#")
+    assert dict(registry.get(ontology).namespaces())["ex"] == URIRef("http://example.org/")
+
+
+def test_checkout_copies_on_first_write(ontology):
+    """A writer gets its own triples without disturbing other readers."""
+    registry = GraphRegistry()
+    writer = registry.checkout(ontology)
+    reader = registry.get(ontology)
+    assert writer.shared is reader.shared
+
+    writer.add((EX_C, RDFS.label, Literal("C")))
+    assert writer.detached
+    assert len(writer.shared) == 2
+    assert len(writer) == 3
+    assert len(reader) == len(registry.get(ontology)) == 2
+    assert writer.namespace_manager.store.namespace("ex") == URIRef("http://example.org/")
+
+
+def test_reloads_only_when_content_changes(ontology):
+    """A touched file is re-hashed but not re-parsed; edited content is."""
+    registry = GraphRegistry()
+    original = registry.get(ontology)
+
+    stat = os.stat(ontology)
+    os.utime(ontology, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert registry.get(ontology).shared is original.shared
+
+    ontology.write_text(TTL + 'ex:C rdfs:label "C" .\n')
+    reloaded = registry.get(ontology)
+    assert reloaded.shared is not original.shared
+    assert len(reloaded) == 3
+    assert len(original) == 2
+    assert registry.stats()[str(ontology.resolve())]["loads"] == 2
+
+
+def test_load_into_merges_triples_and_prefixes(ontology):
+    """Merging into an existing graph matches parsing the file into it."""
+    graph = Graph()
+    graph.add((EX_C, RDFS.label, Literal("C")))
+    GraphRegistry().load_into(graph, ontology)
+    assert len(graph) == 3
+    assert dict(graph.namespaces())["ex"] == URIRef("http://example.org/")
@@ -0,0 +1,121 @@
+"""Tests for binary graph snapshots."""
+
+from itertools import product
+
+import pytest
+from click.testing import CliRunner
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import RDF, RDFS, XSD
+
+from ontology_framework.cli.main import cli
+from ontology_framework.core.graph_registry import GraphRegistry
+from ontology_framework.core.graph_snapshot import (
+    SnapshotError,
+    SnapshotStore,
+    load_snapshot,
+    write_snapshot,
+)
+
+EX = "http://example.org/"
+
+
+@pytest.fixture
+def graph():
+    g = Graph()
+    g.bind("ex", EX)
+    node = BNode("b1")
+    for i in range(20):
+        s = URIRef(f"{EX}item{i}")
+        g.add((s, RDF.type, URIRef(f"{EX}Item")))
+        g.add((s, RDFS.label, Literal(f"Item {i}", lang="en")))
+        g.add((s, URIRef(f"{EX}rank"), Literal(i % 4)))
+        g.add((s, URIRef(f"{EX}group"), node))
+    g.add((node, RDFS.comment, Literal("café ☃ \"quoted\"\nline")))
+    g.add((node, URIRef(f"{EX}size"), Literal("1.5", datatype=XSD.decimal)))
+    return g
+
+
+@pytest.fixture
+def snapshot(graph, tmp_path):
+    path = write_snapshot(graph, tmp_path / "graph.ofsnap")
+    loaded = load_snapshot(path)
+    yield loaded
+    loaded.store.close()
+
+
+def test_round_trip(graph, snapshot):
+    """Every term kind survives, and prefixes are kept."""
+    assert len(snapshot) == len(graph)
+    assert set(snapshot) == set(graph)
+    assert snapshot.namespace_manager.store.namespace("ex") == URIRef(EX)
+
+
+def test_patterns_match_memory_store(graph, snapshot):
+    """Every combination of bound and unbound positions gives the same triples."""
+    s, p, o = URIRef(f"{EX}item3"), URIRef(f"{EX}rank"), Literal(3)
+    for mask in product([False, True], repeat=3):
+        pattern = tuple(term if bound else None for term, bound in zip((s, p, o), mask))
+        assert sorted(snapshot.triples(pattern)) == sorted(graph.triples(pattern)), pattern
+    assert list(snapshot.triples((URIRef(f"{EX}missing"), None, None))) == []
+
+
+def test_sparql_over_snapshot(graph, snapshot):
+    """SPARQL runs against the mapped store unchanged."""
+    query = f"""
+    SELECT ?s ?label WHERE {{
+        ?s a <{EX}Item> ; <{EX}rank> 2 ; <{RDFS.label}> ?label .
+    }}"""
+    assert sorted(snapshot.query(query)) == sorted(graph.query(query))
+    assert len(snapshot.query(query)) == 5
+
+
+def test_read_only_and_versioned(snapshot, tmp_path):
+    """Writes are rejected, and foreign or future files are refused."""
+    with pytest.raises(TypeError):
+        snapshot.add((URIRef(f"{EX}x"), RDF.type, URIRef(f"{EX}Item")))
+
+    bogus = tmp_path / "bogus.ofsnap"
+    bogus.write_bytes(b"not a snapshot" * 10)
+    with pytest.raises(SnapshotError):
+        SnapshotStore(bogus)
+
+    future = tmp_path / "future.ofsnap"
+    data = bytearray(snapshot.store.path.read_bytes())
+    data[8] = 99
+    future.write_bytes(bytes(data))
+    with pytest.raises(SnapshotError):
+        SnapshotStore(future)
+
+
+def test_empty_graph(tmp_path):
+    """An empty graph still round-trips."""
+    loaded = load_snapshot(write_snapshot(Graph(), tmp_path / "empty.ofsnap"))
+    assert len(loaded) == 0
+    assert list(loaded.triples((None, RDF.type, None))) == []
+
+
+def test_registry_caches_snapshots_by_content(graph, tmp_path):
+    """A second process-like registry maps the snapshot instead of parsing."""
+    source = tmp_path / "onto.ttl"
+    source.write_text(graph.serialize(format="turtle"))
+    cache = tmp_path / "cache"
+
+    first = GraphRegistry(snapshot_dir=cache).get(source)
+    assert not isinstance(first.shared.store, SnapshotStore)
+    assert len(list(cache.glob("*.ofsnap"))) == 1
+
+    second = GraphRegistry(snapshot_dir=cache).checkout(source)
+    assert isinstance(second.shared.store, SnapshotStore)
+    assert set(second) == set(first)
+    second.add((URIRef(f"{EX}new"), RDF.type, URIRef(f"{EX}Item")))
+    assert len(second) == len(first) + 1
+
+
+def test_snapshot_command(graph, tmp_path):
+    """The CLI writes a snapshot next to the source and can benchmark it."""
+    source = tmp_path / "onto.ttl"
+    source.write_text(graph.serialize(format="turtle"))
+    result = CliRunner().invoke(cli, ["snapshot", str(source), "--benchmark"])
+    assert result.exit_code == 0, result.output
+    assert "parse:" in result.output
+    assert load_snapshot(tmp_path / "onto.ofsnap").isomorphic(graph)
@@ -0,0 +1,165 @@
+"""Tests for the micro-batched SPARQL UPDATE writer against a GraphDB stand-in."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from rdflib import RDF, RDFS, Literal, URIRef
+
+from ontology_framework.graphdb_batch_writer import UpdateBatchWriter
+from ontology_framework.graphdb_client import GraphDBClient, GraphDBError
+from tests.utils.graphdb_standin import GraphDBStandIn
+
+EX = "http://example.org/"
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    monkeypatch.setenv("GRAPHDB_USERNAME", "test")
+    monkeypatch.setenv("GRAPHDB_PASSWORD", "test")
+    with GraphDBStandIn(repository="onto") as server:
+        yield server
+
+
+@pytest.fixture
+def client(standin):
+    return GraphDBClient(standin.url, "onto")
+
+
+def _updates(standin):
+    return [r for r in standin.requests_matching("POST") if r["path"].endswith("/statements")]
+
+
+def test_merges_operations_in_order(standin, client):
+    """Inserts and deletes keep their order in one request."""
+    with UpdateBatchWriter(client, max_latency=None) as writer:
+        writer.insert_data(f"<{EX}a> <{EX}p> 1 .")
+        writer.insert_triples([(URIRef(f"{EX}b"), URIRef(f"{EX}p"), Literal(2))])
+        writer.delete_data("ex:a ex:p 1", {"ex": EX})
+        writer.insert_data("ex:a ex:p 3 .", {"ex": EX})
+        assert writer.pending == 4
+        assert not _updates(standin)
+    assert len(_updates(standin)) == 1
+    values = sorted(o.toPython() for o in standin.explicit.objects(None, URIRef(f"{EX}p")))
+    assert values == [2, 3]
+    assert writer.stats.operations == 4 and writer.stats.batches == 1
+
+
+def test_size_threshold_and_prefix_conflict(standin, client):
+    """Full batches go out on their own; a rebound prefix starts a new request."""
+    writer = UpdateBatchWriter(client, max_operations=100, max_latency=None, flush_at_exit=False)
+    for i in range(250):
+        writer.insert_data(f"ex:s{i} ex:p {i} .", {"ex": EX})
+    assert len(_updates(standin)) == 2
+    writer.insert_data("ex:t ex:p 0 .", {"ex": "http://other.example.org/"})
+    assert len(_updates(standin)) == 3
+    writer.close()
+    assert len(standin.explicit) == 251
+    assert writer.stats.largest_batch == 100
+    assert writer.stats.mean_batch_size == pytest.approx(251 / 4)
+    assert writer.stats.ops_per_second > 0
+
+
+def test_latency_threshold_flushes_in_background(standin, client):
+    """A lone operation is sent once it has waited max_latency."""
+    writer = UpdateBatchWriter(client, max_latency=0.05, flush_at_exit=False)
+    writer.insert_data(f"<{EX}a> <{EX}p> <{EX}b> .")
+    deadline = time.monotonic() + 5
+    while writer.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not writer.pending
+    assert len(standin.explicit) == 1
+
+
+def test_transaction_commits_or_rolls_back(standin, client):
+    """Batches inside a transaction land together, or not at all."""
+    writer = UpdateBatchWriter(client, max_operations=10, max_latency=None, flush_at_exit=False)
+    with writer.transaction():
+        for i in range(25):
+            writer.insert_data(f"<{EX}s{i}> <{EX}p> {i} .")
+        assert len(standin.explicit) == 0
+    assert len(standin.explicit) == 25
+    assert len(standin.requests_matching("PUT", "UPDATE")) == 3
+    assert len(standin.requests_matching("PUT", "COMMIT")) == 1
+
+    with pytest.raises(ValueError):
+        with writer.transaction():
+            writer.insert_data(f"<{EX}x> <{EX}p> 0 .")
+            writer.flush()
+            raise ValueError("abort")
+    assert len(standin.explicit) == 25
+    assert len(standin.requests_matching("DELETE")) == 1
+    assert not standin.transactions and not writer.pending
+
+
+def test_failed_flush_keeps_operations(standin, client):
+    """A rejected request leaves its operations queued."""
+    writer = UpdateBatchWriter(client, max_latency=None, flush_at_exit=False)
+    writer.insert_data("this is not turtle")
+    with pytest.raises(GraphDBError):
+        writer.flush()
+    assert writer.pending == 1
+
+
+def test_tracking_status_for_many_modules_is_one_request(standin, client):
+    """OntologyLoader queues tracking updates and stores them in one round-trip."""
+    sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+    try:
+        from load_ontologies import OntologyLoader
+    finally:
+        sys.path.pop(0)
+    loader = OntologyLoader(standin.url, "onto")
+    for i in range(500):
+        assert loader.update_tracking_status(f"{loader.base_iri}guidance/modules/m{i}.ttl")
+    assert not _updates(standin)
+    assert loader.flush_tracking_status()
+    assert len(_updates(standin)) == 1
+    status = URIRef(f"{loader.base_iri}guidance#hasStatus")
+    assert len(list(standin.explicit.triples((None, status, Literal("LOADED"))))) == 500
+
+
+def test_client_without_credentials(standin, monkeypatch):
+    """Credentials are only mandatory unless the caller says they are optional."""
+    monkeypatch.delenv("GRAPHDB_USERNAME")
+    monkeypatch.delenv("GRAPHDB_PASSWORD")
+    with pytest.raises(RuntimeError):
+        GraphDBClient(standin.url, "onto")
+    with UpdateBatchWriter(GraphDBClient(standin.url, "onto", require_credentials=False),
+                           max_latency=None) as writer:
+        writer.insert_data(f"<{EX}a> <{EX}p> 1 .")
+    assert len(standin.explicit) == 1
+
+
+@pytest.fixture
+def manager(standin, monkeypatch):
+    monkeypatch.delenv("GRAPHDB_USERNAME")
+    monkeypatch.delenv("GRAPHDB_PASSWORD")
+    monkeypatch.setenv("GRAPHDB_URL", standin.url)
+    monkeypatch.setenv("GRAPHDB_REPOSITORY", "onto")
+    from bfg9k_manager import BFG9KManager
+    return BFG9KManager()
+
+
+def test_governance_rule_is_escaped_and_stored(standin, manager):
+    """The rule is sent before add_governance_rule returns, with literals escaped."""
+    from bfg9k_manager import BFG9K
+    label = 'Rule "one"\nsecond line'
+    assert manager.add_governance_rule(f"{EX}rule", label, "back\\slash")
+    assert len(_updates(standin)) == 1
+    assert manager.update_writer.client._auth is None
+    assert str(standin.explicit.value(URIRef(f"{EX}rule"), URIRef(str(RDFS) + "label"))) == label
+    assert (URIRef(f"{EX}rule"), RDF.type, BFG9K.GovernanceRule) in standin.explicit
+
+
+def test_governance_rule_failure_reaches_its_caller(standin, manager, monkeypatch):
+    """A rejected write is reported by add_governance_rule, not by a later query."""
+    def reject(update):
+        raise GraphDBError("rejected")
+    monkeypatch.setattr(manager.update_writer.client, "update", reject)
+    assert not manager.add_governance_rule(f"{EX}rule", "label", "comment")
+    assert manager.add_governance_rule(f"{EX}other", "label", "comment", flush=False)
+    assert manager.update_writer.pending == 2
+    manager.query_ontology("SELECT * WHERE { ?s ?p ?o }")
+    assert not manager.flush_updates()
+    assert manager.update_writer.pending == 2
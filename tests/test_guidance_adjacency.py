@@ -0,0 +1,76 @@
+"""Tests for the GuidanceOntology adjacency index."""
+
+import unittest
+from rdflib import URIRef, Literal
+from rdflib.namespace import RDF, RDFS, OWL
+from ontology_framework.modules.guidance import GuidanceOntology, AdjacencyIndex, RelationType
+
+EX = "http://example.org/adjacency#"
+
+
+class TestGuidanceAdjacency(unittest.TestCase):
+    """Test cases for adjacency analysis over the CSR index."""
+
+    def setUp(self) -> None:
+        """Build a small chain A <- B <- C <- D plus a literal edge."""
+        self.guidance = GuidanceOntology()
+        self.a, self.b, self.c, self.d = (URIRef(EX + n) for n in "ABCD")
+        graph = self.guidance.graph
+        graph.add((self.b, RDFS.subClassOf, self.a))
+        graph.add((self.c, RDFS.subClassOf, self.b))
+        graph.add((self.d, RDF.type, self.c))
+        graph.add((self.a, RDFS.label, Literal("A")))
+
+    def test_index_edges(self) -> None:
+        """Out and in edges are recorded with predicate ids."""
+        index = AdjacencyIndex(self.guidance.graph)
+        b = index.node_ids[self.b]
+        out = {(index.predicates[p], index.nodes[t]) for p, t in index.out_edges(b)}
+        incoming = {(index.predicates[p], index.nodes[s]) for p, s in index.in_edges(b)}
+        self.assertEqual(out, {(RDFS.subClassOf, self.a)})
+        self.assertEqual(incoming, {(RDFS.subClassOf, self.c)})
+        self.assertIn(RDFS.label, index.all_predicates)
+
+    def test_analyze_adjacency_depth(self) -> None:
+        """BFS follows edges in both directions up to max_depth."""
+        results = self.guidance.analyze_adjacency(self.a, max_depth=2)
+        self.assertEqual(set(results), {self.a, self.b, self.c})
+        self.assertIn(self.c, results[self.b]["depended_by"])
+        self.assertEqual(set(self.guidance.analyze_adjacency(self.a, max_depth=0)), {self.a})
+
+    def test_multi_source_neighborhood(self) -> None:
+        """Depths are measured from the nearest source."""
+        depths = self.guidance.get_neighborhood([self.a, self.d], max_depth=1)
+        self.assertEqual(depths, {self.a: 0, self.d: 0, self.b: 1, self.c: 1})
+
+    def test_dependencies_batch(self) -> None:
+        """Batch lookups return predicates without qualifying relationships."""
+        missing = URIRef(EX + "Missing")
+        batch = self.guidance.get_dependencies_batch([self.c, missing])
+        self.assertEqual(batch[self.c]["depends_on"], {self.b: RDFS.subClassOf})
+        self.assertEqual(batch[self.c]["depended_by"], {self.d: RDF.type})
+        self.assertEqual(batch[self.c]["relation_types"], {RelationType.SUBCLASS, RelationType.INSTANCE})
+        self.assertEqual(batch[missing]["depends_on"], {})
+
+    def test_index_rebuilt_after_change(self) -> None:
+        """Adding triples invalidates the cached index."""
+        before = self.guidance.get_adjacency_index()
+        self.assertIs(before, self.guidance.get_adjacency_index())
+        e = URIRef(EX + "E")
+        self.guidance.graph.add((e, OWL.sameAs, self.d))
+        deps = self.guidance.get_dependencies(self.d)
+        self.assertIn(e, deps["depended_by"])
+        self.assertIsNot(before, self.guidance.get_adjacency_index())
+
+    def test_index_rebuilt_after_same_size_edit(self) -> None:
+        """Replacing an edge keeps the triple count but still refreshes the index."""
+        self.assertEqual(set(self.guidance.get_dependencies(self.c)["depends_on"]), {self.b})
+        graph = self.guidance.graph
+        graph.remove((self.c, RDFS.subClassOf, self.b))
+        graph.add((self.c, RDFS.subClassOf, self.a))
+        self.assertEqual(set(self.guidance.get_dependencies(self.c)["depends_on"]), {self.a})
+        self.assertEqual(self.guidance.get_neighborhood([self.b], max_depth=1), {self.b: 0, self.a: 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
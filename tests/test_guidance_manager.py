@@ -7,6 +7,7 @@ from ontology_framework.tools.guidance_manager import GuidanceManager
 from pathlib import Path
 import tempfile
 import shutil
+from unittest.mock import patch
 
 class TestGuidanceManager(unittest.TestCase):
     def setUp(self):
@@ -231,5 +232,107 @@ class TestGuidanceManager(unittest.TestCase):
         self.assertEqual(int(result.priority), priority)
         self.assertEqual(str(result.rule_text), rule["query"])
 
+class TestGuidanceManagerTransactions(unittest.TestCase):
+    """Test journaled copy-on-write transactions."""
+    
+    GUIDANCE = Namespace('https://raw.githubusercontent.com/louspringer/ontology-framework/main/guidance#')
+    
+    def setUp(self):
+        """Create a small guidance file in a temporary directory."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_guidance = Path(self.test_dir) / 'guidance.ttl'
+        graph = Graph()
+        graph.add((self.GUIDANCE.Existing, RDF.type, self.GUIDANCE.ValidationRule))
+        graph.serialize(destination=str(self.test_guidance), format='turtle')
+        self.manager = GuidanceManager(str(self.test_guidance))
+        
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+        
+    def test_transaction_isolation(self):
+        """Uncommitted changes are visible only inside the transaction."""
+        tx_id = self.manager.begin_transaction()
+        rule_uri = self.manager.add_validation_rule("tx_rule", {}, "SPARQL")
+        self.manager.remove((self.GUIDANCE.Existing, None, None))
+        triple = (rule_uri, RDF.type, self.GUIDANCE.ValidationRule)
+        self.assertNotIn(triple, self.manager.graph)
+        self.assertIn(triple, list(self.manager.triples((rule_uri, None, None))))
+        self.assertEqual(list(self.manager.triples((self.GUIDANCE.Existing, None, None))), [])
+        
+        self.manager.rollback_transaction(tx_id)
+        self.assertNotIn(triple, self.manager.graph)
+        self.assertIn((self.GUIDANCE.Existing, RDF.type, self.GUIDANCE.ValidationRule), self.manager.graph)
+        self.assertFalse(self.manager.journal_path.exists())
+        
+    def test_snapshot_reads(self):
+        """A transaction does not observe commits made after it began."""
+        outer = self.manager.begin_transaction()
+        inner = self.manager.begin_transaction()
+        rule_uri = self.manager.add_validation_rule("inner_rule", {}, "SPARQL")
+        self.manager.commit_transaction(inner)
+        
+        self.assertIn((rule_uri, RDF.type, self.GUIDANCE.ValidationRule), self.manager.graph)
+        self.assertEqual(list(self.manager.triples((rule_uri, None, None))), [])
+        self.manager.commit_transaction(outer)
+        self.assertTrue(list(self.manager.triples((rule_uri, None, None))))
+        
+    def test_journal_replay(self):
+        """Commits are journaled and replayed without rewriting the source."""
+        source_before = self.test_guidance.read_text()
+        tx_id = self.manager.begin_transaction()
+        rule_uri = self.manager.add_validation_rule("journaled", {"pattern": 'a "quoted"\nvalue'}, "SYNTAX")
+        self.manager.commit_transaction(tx_id)
+        self.manager.save()
+        
+        self.assertEqual(self.test_guidance.read_text(), source_before)
+        reloaded = GuidanceManager(str(self.test_guidance))
+        self.assertIn((rule_uri, self.GUIDANCE.hasPattern, Literal('a "quoted"\nvalue')), reloaded.graph)
+        
+    def test_compaction(self):
+        """Compaction folds the journal into the source and a snapshot."""
+        rule_uri = self.manager.add_validation_rule("compacted", {}, "SPARQL")
+        self.assertTrue(self.manager.journal_path.exists())
+        self.manager.compact()
+        
+        self.assertFalse(self.manager.journal_path.exists())
+        self.assertTrue(self.manager.snapshot_path.read_text().startswith("# source: "))
+        reloaded = GuidanceManager(str(self.test_guidance))
+        self.assertIn((rule_uri, RDF.type, self.GUIDANCE.ValidationRule), reloaded.graph)
+        self.assertEqual(len(reloaded.graph), len(self.manager.graph))
+        
+    def test_failed_compaction_keeps_source_and_journal(self):
+        """A serializer error leaves guidance.ttl whole and the journal in place."""
+        source_before = self.test_guidance.read_text()
+        rule_uri = self.manager.add_validation_rule("pending", {}, "SPARQL")
+        def fail_midway(graph, destination=None, **kwargs):
+            Path(destination).write_text("@prefix broken")
+            raise RuntimeError("disk full")
+        
+        with patch.object(Graph, "serialize", fail_midway):
+            with self.assertRaises(RuntimeError):
+                self.manager.compact()
+        self.assertEqual(self.test_guidance.read_text(), source_before)
+        self.assertTrue(self.manager.journal_path.exists())
+        self.assertFalse(Path(f"{self.test_guidance}.tmp").exists())
+        reloaded = GuidanceManager(str(self.test_guidance))
+        self.assertIn((rule_uri, RDF.type, self.GUIDANCE.ValidationRule), reloaded.graph)
+        
+    def test_direct_graph_edits_saved(self):
+        """Edits made straight on the graph still reach the source on save."""
+        self.manager.graph.add((self.GUIDANCE.Direct, RDF.type, OWL.Class))
+        self.manager.save()
+        reloaded = Graph().parse(str(self.test_guidance), format='turtle')
+        self.assertIn((self.GUIDANCE.Direct, RDF.type, OWL.Class), reloaded)
+        
+    def test_same_size_direct_edit_saved(self):
+        """A direct edit that keeps the triple count still reaches the source."""
+        self.manager.graph.add((self.GUIDANCE.a, self.GUIDANCE.p, Literal(1)))
+        self.manager.save()
+        self.manager.graph.set((self.GUIDANCE.a, self.GUIDANCE.p, Literal(2)))
+        self.manager.save()
+        reloaded = GuidanceManager(str(self.test_guidance))
+        self.assertEqual(reloaded.graph.value(self.GUIDANCE.a, self.GUIDANCE.p), Literal(2))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""Import-time budget for the package and its CLI entry point."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import ontology_framework
+
+SRC = str(Path(__file__).parent.parent / "src")
+
+# Cold-import budget for `import ontology_framework.cli`, in milliseconds
+IMPORT_BUDGET_MS = float(os.environ.get("BEAST_MODE_IMPORT_BUDGET_MS", "150"))
+
+HEAVY_MODULES = ("rdflib", "pyshacl", "requests", "owlready2")
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get("PYTHONPATH")])))
+    return subprocess.run([sys.executable, *options, "-c", code], env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def test_package_import_skips_heavy_dependencies():
+    """Importing the package or its CLI does not load rdflib, pyshacl or requests."""
+    code = (
+        "import sys, ontology_framework, ontology_framework.cli\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert _run(code).stdout.strip() == ""
+
+
+def test_cli_import_within_budget():
+    """Cold import of the CLI stays under the budget reported by -X importtime."""
+    stderr = _run("import ontology_framework.cli", "-X", "importtime").stderr
+    cumulative_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Only top-level entries; nested imports are already in their parent's total
+        if name.startswith(" ontology_framework") and not name.startswith("  "):
+            cumulative_us += int(cumulative)
+    assert 0 < cumulative_us / 1000 < IMPORT_BUDGET_MS
+
+
+def test_lazy_attributes_resolve():
+    """Public names load on first access and match the defining module."""
+    from ontology_framework.exceptions import ValidationError
+    from ontology_framework.modules.error_handling import ErrorSeverity
+
+    assert ontology_framework.ValidationError is ValidationError
+    assert ontology_framework.ErrorSeverity is ErrorSeverity
+    assert "SparqlOperations" in dir(ontology_framework)
+    with pytest.raises(AttributeError):
+        ontology_framework.NoSuchName
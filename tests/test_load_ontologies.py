@@ -0,0 +1,165 @@
+"""Tests for the dependency-ordered parallel module loader in scripts/load_ontologies."""
+
+import base64
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from ontology_framework.graphdb_batch_writer import UpdateBatchWriter
+from ontology_framework.graphdb_client import GraphDBClient
+from tests.utils.graphdb_standin import GraphDBStandIn
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+try:
+    import load_ontologies
+    from load_ontologies import OntologyLoader, format_load_report
+finally:
+    sys.path.pop(0)
+
+BASE = "https://raw.githubusercontent.com/louspringer/ontology-framework/main/"
+
+
+def _module(name, imports=()):
+    lines = [
+        "@prefix owl: <http://www.w3.org/2002/07/owl#> .",
+        "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .",
+        f"<{BASE}modules/{name}#> a owl:Ontology ;",
+    ]
+    lines += [f"    owl:imports {iri} ;" for iri in imports]
+    lines.append(f'    rdfs:label "{name}" .')
+    lines += [f'<{BASE}modules/{name}#C{i}> a owl:Class .' for i in range(20)]
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    monkeypatch.setenv("GRAPHDB_USERNAME", "test")
+    monkeypatch.setenv("GRAPHDB_PASSWORD", "test")
+    with GraphDBStandIn(repository="onto") as server:
+        yield server
+
+
+@pytest.fixture
+def module_dir(tmp_path):
+    modules = tmp_path / "modules"
+    modules.mkdir()
+    files = {
+        # base <- mid <- top, with imports spelled three different ways
+        "base": _module("base"),
+        "mid": _module("mid", [f"<{BASE}modules/base#>"]),
+        "top": _module("top", [f"<{BASE}modules/mid.ttl>", "<http://elsewhere.example.org/base.ttl>"]),
+        # a <-> b cycle and an independent module
+        "a": _module("a", [f"<{BASE}modules/b#>"]),
+        "b": _module("b", [f"<{BASE}modules/a#>"]),
+        "solo": _module("solo", ["<http://www.w3.org/2004/02/skos/core>"]),
+    }
+    for name, text in files.items():
+        (modules / f"{name}.ttl").write_text(text)
+    return tmp_path
+
+
+def _loader(standin, root):
+    writer = UpdateBatchWriter(GraphDBClient(standin.url, "onto"), max_latency=None, flush_at_exit=False)
+    return OntologyLoader(standin.url, "onto", writer=writer, root=str(root))
+
+
+def _uploads(standin):
+    return {r["params"]["context"].strip("<>").rsplit("/", 1)[-1]: r
+            for r in standin.requests_matching("PUT") if "context" in r["params"]}
+
+
+MODULES = [f"modules/{name}.ttl" for name in ["top", "mid", "base", "a", "b", "solo"]]
+
+
+def test_loads_named_graphs_in_import_order(standin, module_dir):
+    """Each module lands in its own graph, after every module it imports."""
+    results = _loader(standin, module_dir).load_modules(MODULES, workers=4)
+    assert [r.module for r in results] == MODULES
+    assert all(r.status == "loaded" for r in results), format_load_report(results)
+    assert set(standin.graphs) == {f"{BASE}{module}" for module in MODULES}
+    assert all(len(standin.graphs[f"{BASE}{r.module}"]) == r.triples for r in results)
+
+    uploads = _uploads(standin)
+    assert uploads["mid.ttl"]["received"] >= uploads["base.ttl"]["finished"]
+    assert uploads["top.ttl"]["received"] >= uploads["mid.ttl"]["finished"]
+    # The cycle is broken at the earliest listed member
+    assert uploads["b.ttl"]["received"] >= uploads["a.ttl"]["finished"]
+    assert results[0].imports == ["modules/base.ttl", "modules/mid.ttl"]
+
+    # Tracking status and hashes go out in one update
+    updates = [r for r in standin.requests_matching("POST") if r["path"].endswith("/statements")]
+    assert len(updates) == 1
+
+
+def test_unchanged_modules_are_skipped(standin, module_dir):
+    """A second load only uploads modules whose content changed."""
+    _loader(standin, module_dir).load_modules(MODULES, workers=2)
+    first_uploads = len(_uploads(standin))
+    (module_dir / "modules" / "solo.ttl").write_text(_module("solo") + '<urn:x> <urn:y> "changed" .\n')
+    standin.requests.clear()
+
+    results = _loader(standin, module_dir).load_modules(MODULES, workers=2)
+    statuses = {r.module.rsplit("/", 1)[-1]: r.status for r in results}
+    assert statuses.pop("solo.ttl") == "loaded"
+    assert set(statuses.values()) == {"skipped"}
+    assert list(_uploads(standin)) == ["solo.ttl"]
+    assert first_uploads == 6
+    # The old hash was replaced, not added to
+    hashes = list(standin.explicit.objects(None, None))
+    assert len([h for h in hashes if len(str(h)) == 64]) == 6
+
+
+def test_independent_uploads_run_concurrently(standin, module_dir):
+    """Total time tracks the longest import chain, not the module count."""
+    standin.upload_delay = 0.3
+    independent = [f"modules/{name}.ttl" for name in ["base", "a", "solo"]]
+    (module_dir / "modules" / "a.ttl").write_text(_module("a"))
+    start = time.perf_counter()
+    results = _loader(standin, module_dir).load_modules(independent, workers=3)
+    elapsed = time.perf_counter() - start
+    assert all(r.status == "loaded" for r in results)
+    assert elapsed < 0.3 * len(independent)
+
+
+def test_failures_block_dependents(standin, module_dir):
+    """A module that fails to parse blocks what imports it; others still load."""
+    (module_dir / "modules" / "base.ttl").write_text("this is not turtle")
+    results = _loader(standin, module_dir).load_modules(MODULES, workers=1)
+    statuses = {r.module.rsplit("/", 1)[-1]: r.status for r in results}
+    assert statuses["base.ttl"] == "failed"
+    assert statuses["mid.ttl"] == "blocked" and statuses["top.ttl"] == "blocked"
+    assert statuses["solo.ttl"] == statuses["a.ttl"] == "loaded"
+    report = format_load_report(results)
+    assert "blocked" in report and "modules/solo.ttl" in report
+
+
+def test_every_request_uses_the_same_optional_auth(standin, module_dir):
+    """Hash reads, uploads and tracking send the environment credentials."""
+    results = OntologyLoader(standin.url, "onto", root=str(module_dir)).load_modules(MODULES, workers=2)
+    assert all(r.status == "loaded" and not r.error for r in results)
+    expected = "Basic " + base64.b64encode(b"test:test").decode()
+    assert {r["authorization"] for r in standin.requests} == {expected}
+
+
+def test_loads_without_credentials(standin, module_dir, monkeypatch):
+    """A server without security needs no GRAPHDB_USERNAME/GRAPHDB_PASSWORD."""
+    monkeypatch.delenv("GRAPHDB_USERNAME")
+    monkeypatch.delenv("GRAPHDB_PASSWORD")
+    results = OntologyLoader(standin.url, "onto", root=str(module_dir)).load_modules(MODULES, workers=2)
+    assert all(r.status == "loaded" and not r.error for r in results), format_load_report(results)
+    assert len(standin.graphs) == len(MODULES)
+    assert {r["authorization"] for r in standin.requests} == {None}
+    hashes = [h for h in standin.explicit.objects(None, None) if len(str(h)) == 64]
+    assert len(hashes) == len(MODULES)
+
+
+def test_tracking_failure_keeps_load_results(standin, module_dir, monkeypatch):
+    """A writer that cannot be created marks tracking as missing instead of raising."""
+    def no_client(*args, **kwargs):
+        raise RuntimeError("no client")
+    monkeypatch.setattr(load_ontologies, "GraphDBClient", no_client)
+    results = OntologyLoader(standin.url, "onto", root=str(module_dir)).load_modules(MODULES, workers=2)
+    assert {(r.status, r.error) for r in results} == {("loaded", "tracking status not stored")}
+    assert len(standin.graphs) == len(MODULES)
@@ -0,0 +1,146 @@
+"""Tests for level-of-detail clustering and layout of large ontology graphs."""
+
+import time
+
+import numpy as np
+import pytest
+from rdflib import Graph, URIRef
+from rdflib.namespace import RDF, RDFS
+
+from ontology_framework.visualization.lod_layout import (
+    cluster_node_id,
+    cluster_nodes,
+    force_layout,
+    multilevel_layout,
+    read_cluster_shard,
+    write_cluster_shards,
+)
+from ontology_framework.visualization.ontology_graph import extract_graph_data
+
+EX = "http://example.org/"
+OTHER = "http://other.example.org/ns#"
+
+
+def _tree(classes, fanout=10):
+    """Graph of classes C0..Cn in one subclass tree, each with one instance"""
+    g = Graph()
+    for i in range(1, classes):
+        g.add((URIRef(f"{EX}C{i}"), RDFS.subClassOf, URIRef(f"{EX}C{(i - 1) // fanout}")))
+    for i in range(classes):
+        g.add((URIRef(f"{EX}i{i}"), RDF.type, URIRef(f"{EX}C{i}")))
+    return g
+
+
+def _all_edges(data):
+    return [edge for edges in data.edges.values() for edge in edges]
+
+
+def test_namespace_and_subtree_clusters():
+    """Clusters partition the nodes; big subtrees split, instances follow their class."""
+    g = _tree(111)
+    g.add((URIRef(f"{OTHER}A"), RDFS.seeAlso, URIRef(f"{EX}C0")))
+    data = extract_graph_data(g)
+    by_namespace = cluster_nodes(data, "namespace")
+    assert sorted(by_namespace) == [EX, OTHER]
+    assert by_namespace[OTHER] == [f"{OTHER}A"]
+
+    whole = cluster_nodes(data, "subtree")
+    assert sorted(whole) == [f"{EX}C0", OTHER]
+    split = cluster_nodes(data, "subtree", max_size=30)
+    assert sorted(sum(split.values(), [])) == sorted(data.degree)
+    assert max(len(members) for members in split.values()) <= 30
+    owner = {node: group for group, members in split.items() for node in members}
+    assert owner[f"{EX}i57"] == owner[f"{EX}C57"]
+
+    with pytest.raises(ValueError):
+        cluster_nodes(data, "bogus")
+
+
+def test_subtree_cycles_terminate():
+    """A subclass cycle is treated as a tree rooted where it closes."""
+    g = Graph()
+    a, b, c = (URIRef(f"{EX}{name}") for name in "ABC")
+    g.add((a, RDFS.subClassOf, b))
+    g.add((b, RDFS.subClassOf, a))
+    g.add((c, RDFS.subClassOf, c))
+    groups = cluster_nodes(extract_graph_data(g), "subtree")
+    assert sorted(sum(groups.values(), [])) == [str(a), str(b), str(c)]
+
+
+@pytest.mark.parametrize("exact_limit", [10000, 50])
+def test_force_layout_pulls_neighbours_together(exact_limit):
+    """Exact and grid-approximated repulsion both give bounded, deterministic layouts."""
+    # Two dense groups of 100 joined by a single edge
+    rng = np.random.default_rng(1)
+    left = rng.integers(0, 100, size=(400, 2))
+    edges = np.vstack([left, left + 100, [[0, 100]]])
+    pos = force_layout(200, edges, exact_limit=exact_limit)
+    assert pos.shape == (200, 2)
+    assert np.isfinite(pos).all() and np.abs(pos).max() <= 1.0 + 1e-9
+    assert np.array_equal(pos, force_layout(200, edges, exact_limit=exact_limit))
+    within = np.linalg.norm(pos[:100].mean(axis=0) - pos[:100], axis=1).mean()
+    between = np.linalg.norm(pos[:100].mean(axis=0) - pos[100:].mean(axis=0))
+    assert between > within
+
+
+def test_crowded_cell_repulsion_is_chunked(monkeypatch):
+    """A cell holding most nodes is summed in row chunks with the same result."""
+    from ontology_framework.visualization import lod_layout
+    rng = np.random.default_rng(3)
+    # One far outlier stretches the grid so nearly every node shares a cell
+    pos = np.vstack([rng.random((300, 2)) * 0.01, [[100.0, 100.0]]])
+    whole = lod_layout._repulsion(pos, 0.01, exact_limit=10)
+    shapes = []
+    pairwise = lod_layout._pairwise
+
+    def recording(x, y, px, py, scale):
+        shapes.append((len(x), len(px)))
+        return pairwise(x, y, px, py, scale)
+
+    monkeypatch.setattr(lod_layout, "_CHUNK", 64)
+    monkeypatch.setattr(lod_layout, "_pairwise", recording)
+    chunked = lod_layout._repulsion(pos, 0.01, exact_limit=10)
+    assert np.allclose(whole, chunked)
+    assert max(rows for rows, _ in shapes) <= 64
+
+
+def test_multilevel_layout_scales():
+    """Fifty thousand nodes lay out in seconds when clustered by subtree."""
+    data = extract_graph_data(_tree(25000))
+    groups = cluster_nodes(data, "subtree", max_size=2000)
+    start = time.perf_counter()
+    positions, centres = multilevel_layout(_all_edges(data), groups)
+    assert time.perf_counter() - start < 60
+    assert len(positions) == 50000
+    assert set(centres) == set(groups)
+
+
+def test_cluster_shards(tmp_path):
+    """Each cluster's shard holds its members and marks edges to and from other clusters."""
+    data = extract_graph_data(_tree(111))
+    groups = cluster_nodes(data, "subtree", max_size=30)
+    positions, _ = multilevel_layout(_all_edges(data), groups)
+    labels = {node: node.rsplit("/", 1)[-1] for node in data.degree}
+    files = write_cluster_shards(tmp_path, data, groups, positions, labels, {"Class": "#55efc4"}, {})
+    assert set(files) == set(groups)
+
+    seen = set()
+    crossing = 0
+    incoming = 0
+    for group, name in files.items():
+        assert (tmp_path / name).read_text().startswith("registerClusterShard(")
+        shard = read_cluster_shard(tmp_path / name)
+        assert shard["cluster"] == cluster_node_id(group)
+        assert {node["id"] for node in shard["nodes"]} == set(groups[group])
+        seen.update(node["id"] for node in shard["nodes"])
+        for edge in shard["edges"]:
+            assert edge["from"] in groups[group]
+            if edge["to"] not in groups[group]:
+                crossing += 1
+                assert edge["toCluster"].startswith("cluster:")
+        for edge in shard["incoming"]:
+            assert edge["to"] in groups[group] and edge["from"] not in groups[group]
+            assert edge["fromCluster"] != shard["cluster"]
+            incoming += 1
+    assert seen == set(data.degree)
+    assert crossing == incoming > 0
@@ -0,0 +1,98 @@
+"""Tests for InferenceManager against a local GraphDB stand-in server."""
+
+import pytest
+from rdflib import Graph, URIRef
+from rdflib.namespace import RDF
+
+from manage_inference import InferenceManager
+from tests.utils.graphdb_standin import GraphDBStandIn
+
+EX = "http://example.org/"
+DATA = f"""
+@prefix ex: <{EX}> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+ex:Dog rdfs:subClassOf ex:Animal .
+ex:Animal rdfs:subClassOf ex:LivingThing .
+ex:rex a ex:Dog ; ex:owner [ ex:name "Alice" ] .
+""" + "".join(f'ex:i{i} a ex:Dog ; rdfs:label "Instance {i}" .\n' for i in range(200))
+# Left over from a ruleset that no longer applies
+STALE = f"<{EX}rex> <{EX}stale> <{EX}inference> ."
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    monkeypatch.setenv("GRAPHDB_USERNAME", "test")
+    monkeypatch.setenv("GRAPHDB_PASSWORD", "test")
+    with GraphDBStandIn(repository="onto") as server:
+        server.load(DATA)
+        server.implicit.parse(data=STALE, format="nt")
+        yield server
+
+
+@pytest.fixture
+def manager(standin):
+    return InferenceManager(standin.url, "onto")
+
+
+def test_counts_come_from_one_query(standin, manager):
+    """Explicit and inferred counts need one query and no ruleset change."""
+    counts = manager.separate_inferred_explicit()
+    assert counts["explicit"] == len(standin.explicit)
+    assert counts["inferred"] == len(standin.implicit)
+    assert counts["total"] == counts["explicit"] + counts["inferred"]
+    assert counts["ruleset"] == "rdfs"
+    queries = [r for r in standin.requests_matching("GET") if "query" in r["params"]]
+    assert len(queries) == 1
+    assert not standin.requests_matching("POST")
+
+
+def test_clear_inferred_reloads_in_one_streamed_add(standin, manager):
+    """Explicit statements go back as one chunked N-Quads ADD inside one transaction."""
+    explicit_before = Graph() + standin.explicit
+    assert manager.clear_inferred_statements()
+
+    adds = standin.requests_matching("PUT", "ADD")
+    assert len(adds) == 1
+    assert adds[0]["content_type"] == "application/n-quads"
+    assert [r["params"]["action"] for r in standin.requests_matching("PUT")][0] == "UPDATE"
+    assert len(standin.requests_matching("PUT", "COMMIT")) == 1
+    # No repository reconfiguration and nothing left open
+    assert all(r["path"].endswith("/transactions") for r in standin.requests_matching("POST"))
+    assert not standin.transactions
+
+    assert len(standin.explicit) == len(explicit_before)
+    names = list(standin.explicit.objects(None, URIRef(f"{EX}name")))
+    assert [str(name) for name in names] == ["Alice"]
+    assert (URIRef(f"{EX}rex"), URIRef(f"{EX}stale"), URIRef(f"{EX}inference")) not in standin.implicit
+    assert (URIRef(f"{EX}rex"), RDF.type, URIRef(f"{EX}LivingThing")) in standin.implicit
+
+
+def test_clear_inferred_keeps_named_graphs(standin, manager):
+    """Statements in named graphs are reloaded into the same graphs."""
+    module = Graph().parse(data=f"<{EX}m> <{EX}p> [ <{EX}q> 1 ] .", format="turtle")
+    standin.graphs[f"{EX}modules/m.ttl"] = module
+    assert manager.clear_inferred_statements()
+    assert set(standin.graphs) == {f"{EX}modules/m.ttl"}
+    assert len(standin.graphs[f"{EX}modules/m.ttl"]) == 2
+    assert (URIRef(f"{EX}m"), URIRef(f"{EX}p"), None) not in standin.explicit
+
+
+def test_clear_inferred_rolls_back_on_failure(standin, manager, monkeypatch):
+    """A rejected batch rolls the transaction back and leaves the data alone."""
+    before = len(standin.explicit)
+    monkeypatch.setattr(manager.client, "add_to_transaction", lambda *args, **kwargs: False)
+    assert not manager.clear_inferred_statements()
+    assert len(standin.requests_matching("DELETE")) == 1
+    assert not standin.transactions
+    assert len(standin.explicit) == before
+
+
+@pytest.mark.parametrize("suffix, fmt", [(".nt", "nt"), (".ttl", "turtle")])
+def test_export_streams_explicit_statements(standin, manager, tmp_path, suffix, fmt):
+    """Exports hold explicit statements only, in the format the suffix names."""
+    output = tmp_path / f"export{suffix}"
+    assert manager.export_without_inference(output)
+    exported = Graph().parse(output, format=fmt)
+    assert len(exported) == len(standin.explicit)
+    assert standin.requests_matching("GET")[-1]["params"]["infer"] == "false"
+    assert not standin.requests_matching("POST")
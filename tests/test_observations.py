@@ -0,0 +1,135 @@
+"""Tests for batched background delivery of module observations."""
+
+import json
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ontology_framework.core import observations
+from ontology_framework.core.observations import (
+    ObservationEmitter, ObservationSink, MemorySink, FileSink, WebSocketSink, get_observation_emitter
+)
+from tests.test_tracing import TracedModule
+
+
+class BlockingSink(ObservationSink):
+    """Sink that holds the worker until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.entered = threading.Event()
+        self.observations = []
+
+    def send_batch(self, batch):
+        self.entered.set()
+        self.release.wait(5)
+        self.observations.extend(batch)
+
+
+class RecordingHandler:
+    """Stand-in for an Observatory WebSocket handler."""
+
+    def __init__(self):
+        self.received = []
+
+    def broadcast_observation(self, observation):
+        self.received.append(observation)
+
+
+def event(message, event_type="info"):
+    return {"module": "m", "event_type": event_type, "message": message}
+
+
+class TestObservationEmitter(unittest.TestCase):
+    """Test cases for ObservationEmitter."""
+
+    def setUp(self):
+        self.emitter = ObservationEmitter(max_queue=3, batch_size=50, flush_interval=0.01)
+
+    def tearDown(self):
+        self.emitter.close()
+
+    def test_batched_delivery(self):
+        """Observations reach their sink in batches after a flush."""
+        sink = MemorySink()
+        self.emitter.max_queue = 1000
+        for i in range(120):
+            self.emitter.emit(sink, event(f"e{i}"))
+        self.assertTrue(self.emitter.flush())
+        self.assertEqual([o["message"] for o in sink.observations], [f"e{i}" for i in range(120)])
+        self.assertLessEqual(max(sink.batch_sizes), 50)
+        self.assertLess(len(sink.batch_sizes), 120)
+
+    def test_overflow_coalesces_then_drops(self):
+        """A full queue coalesces repeats and otherwise drops the oldest event."""
+        blocker = BlockingSink()
+        self.emitter.emit(blocker, event("first"))
+        blocker.entered.wait(5)
+        for message in ["a", "b", "c", "b", "d"]:
+            self.emitter.emit(blocker, event(message))
+        blocker.release.set()
+        self.emitter.flush()
+
+        messages = [o["message"] for o in blocker.observations]
+        self.assertEqual(messages, ["first", "b", "c", "d"])
+        self.assertEqual(blocker.observations[1]["repeat_count"], 2)
+        self.assertEqual(self.emitter.stats()["coalesced"], 1)
+        self.assertEqual(self.emitter.stats()["dropped"], 1)
+
+    def test_failing_sink_is_isolated(self):
+        """A sink raising does not stop delivery to other sinks."""
+        class Broken(ObservationSink):
+            def send_batch(self, batch):
+                raise RuntimeError("down")
+        good = MemorySink()
+        self.emitter.emit(Broken(), event("x"))
+        self.emitter.emit(good, event("y"))
+        self.emitter.flush()
+        self.assertEqual(len(good.observations), 1)
+        self.assertEqual(self.emitter.stats()["failed"], 1)
+
+    def test_file_and_websocket_sinks(self):
+        """File sinks write JSON lines; WebSocket sinks broadcast each event."""
+        handler = RecordingHandler()
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "observations.jsonl"
+            self.emitter.emit(FileSink(str(path)), event("to file"))
+            self.emitter.emit(WebSocketSink(handler), event("to socket"))
+            self.emitter.flush()
+            self.assertEqual(json.loads(path.read_text())["message"], "to file")
+        self.assertEqual(handler.received[0]["message"], "to socket")
+
+
+class TestModuleObservations(unittest.TestCase):
+    """Test cases for ReflectiveModule.emit_observation."""
+
+    def test_emit_observation_enqueues(self):
+        """Module observations are delivered to the configured sink."""
+        module = TracedModule()
+        sink = MemorySink()
+        module.set_observation_sink(sink)
+        module.emit_observation("loaded", event_type="success", context={"n": 1})
+        get_observation_emitter().flush()
+        self.assertEqual(sink.observations[0]["message"], "loaded")
+        self.assertEqual(sink.observations[0]["severity"], "success")
+        self.assertEqual(sink.observations[0]["context"], {"n": 1})
+
+    def test_handler_import_resolved_once(self):
+        """A missing Observatory handler is looked up only once."""
+        observations.resolve_global_handler_getter()
+        self.assertIsNot(observations._global_handler_getter, observations._UNRESOLVED)
+        module = TracedModule()
+        module.emit_observation("no observatory")
+        self.assertTrue(get_observation_emitter().flush())
+
+    def test_sink_must_implement_send_batch(self):
+        """ObservationSink is abstract; a sink without send_batch cannot be created."""
+        with self.assertRaises(TypeError):
+            ObservationSink()
+        with self.assertRaises(TypeError):
+            type("NoSend", (ObservationSink,), {})()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Tests for the shared ontology graph extraction used by the visualizers."""
+
+import time
+
+from rdflib import Graph, URIRef
+from rdflib.namespace import RDF, RDFS
+
+from ontology_framework.visualization.ontology_graph import (
+    compute_node_types,
+    extract_graph_data,
+    extract_relationships,
+)
+
+EX = "http://example.org/"
+TTL = f"""
+@prefix ex: <{EX}> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+ex:onto a owl:Ontology ; owl:imports ex:other .
+ex:Animal a owl:Class ; rdfs:subClassOf owl:Thing .
+ex:Dog a owl:Class ; rdfs:subClassOf ex:Animal , [ a owl:Restriction ] .
+ex:owner rdfs:domain ex:Dog ; rdfs:range ex:Person .
+ex:rex a ex:Dog ; rdfs:seeAlso ex:Animal ; rdfs:label "Rex" .
+"""
+
+
+def _sparql_relationships(g, relation):
+    """The per-relation queries the visualizers used to run"""
+    patterns = {
+        "subClassOf": "?s rdfs:subClassOf ?o . FILTER(isURI(?o)) FILTER(?o != owl:Thing)",
+        "domain": "?s rdfs:domain ?o .",
+        "range": "?s rdfs:range ?o .",
+        "imports": "?s owl:imports ?o .",
+        "type": "?s rdf:type ?o . FILTER(isURI(?o))",
+        "seeAlso": "?s rdfs:seeAlso ?o .",
+    }
+    return sorted((str(s), str(o)) for s, o in g.query(f"SELECT ?s ?o WHERE {{ {patterns[relation]} }}"))
+
+
+def test_matches_sparql_extraction():
+    """Index extraction returns the same edges the SPARQL queries did."""
+    g = Graph().parse(data=TTL, format="turtle")
+    relationships = extract_relationships(g)
+    for relation, edges in relationships.items():
+        assert sorted(edges) == _sparql_relationships(g, relation), relation
+    assert extract_relationships(g, ["range", "bogus"]) == {"range": [(f"{EX}owner", f"{EX}Person")]}
+
+
+def test_node_types_and_degrees():
+    """Types follow Class > Property > Ontology > Instance precedence."""
+    g = Graph().parse(data=TTL, format="turtle")
+    data = extract_graph_data(g)
+    assert data.node_types[f"{EX}Animal"] == "Class"
+    assert data.node_types[f"{EX}owner"] == "Property"
+    assert data.node_types[f"{EX}onto"] == "Ontology"
+    assert data.node_types[f"{EX}rex"] == "Instance"
+    assert data.node_types[f"{EX}Person"] == "Unknown"
+    # Only superclasses count as classes; Dog is merely rdf:type'd
+    assert data.node_types[f"{EX}Dog"] == "Instance"
+    # Animal: Dog (subClassOf), rex (seeAlso), owl:Class (type)
+    assert data.degree[f"{EX}Animal"] == 3
+    assert set(data.nodes) == set(data.node_types)
+
+
+def test_exclusions_drop_edges():
+    """Excluded URIs disappear with every edge touching them."""
+    g = Graph().parse(data=TTL, format="turtle")
+    data = extract_graph_data(g, exclude_classes=[f"{EX}Animal"])
+    assert f"{EX}Animal" not in data.degree
+    assert all(f"{EX}Animal" not in edge for edges in data.edges.values() for edge in edges)
+
+
+def test_scales_linearly():
+    """Fifty thousand edges extract and type in well under the old per-node rescans."""
+    g = Graph()
+    for i in range(25000):
+        cls = URIRef(f"{EX}C{i}")
+        g.add((cls, RDFS.subClassOf, URIRef(f"{EX}C{i // 10}")))
+        g.add((URIRef(f"{EX}i{i}"), RDF.type, cls))
+    start = time.perf_counter()
+    data = extract_graph_data(g)
+    elapsed = time.perf_counter() - start
+    assert data.edge_count == 50000
+    assert len(compute_node_types(data.edges)) == len(data.degree) == 50000
+    assert elapsed < 10
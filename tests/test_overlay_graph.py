@@ -0,0 +1,134 @@
+"""Tests for the copy-on-write overlay graph."""
+
+import pytest
+from pyshacl import validate
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import RDF, RDFS
+
+from ontology_framework.core.overlay_graph import OverlayGraph
+from ontology_framework.exceptions import PatchApplicationError
+from ontology_framework.meta import MetaOntology, PatchStatus
+from ontology_framework.modules.patch_management import PATCH, PatchManager
+
+EX = "http://example.org/"
+A, B, C = (URIRef(f"{EX}{name}") for name in "ABC")
+
+
+@pytest.fixture
+def base():
+    g = Graph()
+    g.bind("ex", EX)
+    g.add((A, RDF.type, RDFS.Class))
+    g.add((B, RDF.type, RDFS.Class))
+    g.add((A, RDFS.label, Literal("A")))
+    return g
+
+
+def test_reads_through_and_keeps_base(base):
+    """Writes land in the overlay; the base is untouched until commit."""
+    overlay = OverlayGraph(base)
+    assert set(overlay) == set(base)
+
+    overlay.add((C, RDF.type, RDFS.Class))
+    overlay.remove((A, RDFS.label, None))
+    assert len(overlay) == 3
+    assert (A, RDFS.label, Literal("A")) not in overlay
+    assert set(overlay.subjects(RDF.type, RDFS.Class)) == {A, B, C}
+    assert len(base) == 3 and (C, RDF.type, RDFS.Class) not in base
+
+    # Re-adding a hidden base triple only un-hides it
+    overlay.add((A, RDFS.label, Literal("A")))
+    assert overlay.removed == set()
+    assert overlay.added == {(C, RDF.type, RDFS.Class)}
+
+
+def test_base_changed_under_overlay(base):
+    """Triples the base gains or loses after an overlay write are counted once."""
+    overlay = OverlayGraph(base)
+    overlay.add((C, RDF.type, RDFS.Class))
+    overlay.remove((A, RDFS.label, None))
+    base.add((C, RDF.type, RDFS.Class))
+    base.remove((A, RDFS.label, None))
+    assert len(overlay) == len(set(overlay)) == 3
+    assert list(overlay.triples((C, None, None))) == [(C, RDF.type, RDFS.Class)]
+
+
+def test_commit_and_discard(base):
+    """commit() applies the delta to the base; discard() drops it."""
+    overlay = OverlayGraph(base)
+    overlay.add((C, RDF.type, RDFS.Class))
+    overlay.remove((B, None, None))
+    overlay.bind("exo", "http://example.org/other/")
+    assert overlay.commit() == (1, 1)
+    assert not overlay.dirty
+    assert (C, RDF.type, RDFS.Class) in base and (B, RDF.type, RDFS.Class) not in base
+    assert dict(base.namespaces())["exo"] == URIRef("http://example.org/other/")
+
+    overlay.remove((C, None, None))
+    overlay.discard()
+    assert set(overlay) == set(base)
+
+
+def test_sparql_update_round_trip(base):
+    """The extracted update turns a fresh overlay into the same graph."""
+    overlay = OverlayGraph(base)
+    overlay.add((C, RDFS.label, Literal("C", lang="en")))
+    overlay.remove((A, RDFS.label, None))
+
+    replay = OverlayGraph(base)
+    replay.update(overlay.to_sparql_update())
+    assert set(replay) == set(overlay)
+
+    assert OverlayGraph(base).to_sparql_update() == ""
+    with_bnode = Graph()
+    with_bnode.add((BNode(), RDF.type, RDFS.Class))
+    overlay = OverlayGraph(with_bnode)
+    overlay.remove((None, RDF.type, None))
+    with pytest.raises(ValueError):
+        overlay.to_sparql_update()
+
+
+def test_shacl_validates_overlay(base):
+    """A pending change can be SHACL-validated before it is committed."""
+    shapes = Graph().parse(format="turtle", data=f"""
+        @prefix sh: <http://www.w3.org/ns/shacl#> .
+        <{EX}ClassShape> a sh:NodeShape ; sh:targetClass <{RDFS.Class}> ;
+            sh:property [ sh:path <{RDFS.label}> ; sh:minCount 1 ] .
+    """)
+    overlay = OverlayGraph(base)
+    overlay.remove((None, RDF.type, RDFS.Class))
+    overlay.add((A, RDF.type, RDFS.Class))
+    assert validate(overlay, shacl_graph=shapes)[0]
+    overlay.add((C, RDF.type, RDFS.Class))
+    assert not validate(overlay, shacl_graph=shapes)[0]
+
+
+def test_patch_dry_run_and_failure_leave_target(base, tmp_path, monkeypatch):
+    """Uncommitted and failed patches never reach the target graph."""
+    monkeypatch.chdir(tmp_path)
+    manager = PatchManager(meta_ontology=MetaOntology())
+    before = set(base)
+
+    manager.create_patch("p1", "Add C", content=f"@prefix ex: <{EX}> .\nex:C a <{RDFS.Class}> .")
+    preview = manager.apply_patch("p1", base, commit=False)
+    assert preview.added == {(C, RDF.type, RDFS.Class)}
+    assert set(base) == before
+
+    manager.create_patch("bad", "Broken", content="this is not turtle")
+    with pytest.raises(PatchApplicationError):
+        manager.apply_patch("bad", base)
+    assert set(base) == before
+    assert manager.graph.value(PATCH.bad, PATCH.status) == Literal(PatchStatus.PENDING.name)
+
+
+def test_sparql_update_patch(base, tmp_path, monkeypatch):
+    """Patch content may be a SPARQL Update, and applies on commit."""
+    monkeypatch.chdir(tmp_path)
+    manager = PatchManager(meta_ontology=MetaOntology())
+    manager.create_patch("p1", "Rename A", content=(
+        f'DELETE DATA {{ <{A}> <{RDFS.label}> "A" }} ;\n'
+        f'INSERT DATA {{ <{A}> <{RDFS.label}> "Alpha" }}'
+    ))
+    manager.apply_patch("p1", base)
+    assert base.value(A, RDFS.label) == Literal("Alpha")
+    assert manager.graph.value(PATCH.p1, PATCH.status) == Literal(PatchStatus.APPLIED.name)
@@ -0,0 +1,106 @@
+"""Tests for the prepared-query registry and its index-lookup planner."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from rdflib import Graph, Literal, Namespace
+from rdflib.namespace import RDF, RDFS
+
+from ontology_framework.modules.validator import RULE_ISSUES_QUERY, MCPValidator
+from ontology_framework.prepared_queries import QueryRegistry
+from ontology_framework.sparql_operations import (
+    CLASSES_QUERY,
+    INDIVIDUALS_QUERY,
+    PROPERTIES_QUERY,
+    SHACL_SHAPES_QUERY,
+    SparqlOperations,
+)
+
+EX = Namespace("http://example.org/")
+
+
+def _sorted(rows):
+    return sorted(tuple(str(value) for value in row) for row in rows)
+
+
+@pytest.fixture
+def graph():
+    g = Graph()
+    g.add((EX.Person, RDF.type, RDFS.Class))
+    g.add((EX.Person, RDFS.label, Literal("Person")))
+    g.add((EX.Person, RDFS.label, Literal("Personne", lang="fr")))
+    g.add((EX.Person, RDFS.comment, Literal("A human")))
+    g.add((EX.Place, RDF.type, RDFS.Class))
+    g.add((EX.name, RDF.type, RDF.Property))
+    g.add((EX.name, RDFS.domain, EX.Person))
+    g.add((EX.alice, RDF.type, EX.Person))
+    g.add((EX.alice, RDFS.label, Literal("Alice")))
+    g.add((EX.paris, RDF.type, EX.Place))
+    return g
+
+
+@pytest.mark.parametrize("prepared,bindings", [
+    (CLASSES_QUERY, {}),
+    (PROPERTIES_QUERY, {}),
+    (INDIVIDUALS_QUERY, {}),
+    (INDIVIDUALS_QUERY, {"class_uri": EX.Person}),
+])
+def test_index_rows_match_sparql(graph, prepared, bindings):
+    """Planned index lookups give the same rows as the SPARQL engine."""
+    assert prepared.plan is not None
+    assert _sorted(prepared.rows(graph, **bindings)) == _sorted(prepared.query(graph, **bindings))
+
+
+def test_optional_values_multiply_rows(graph):
+    """Two labels give two rows, and a missing OPTIONAL gives None."""
+    classes = SparqlOperations.get_classes(graph)
+    person = sorted(c["label"] for c in classes if c["uri"] == str(EX.Person))
+    assert person == ["Person", "Personne"]
+    place = [c for c in classes if c["uri"] == str(EX.Place)]
+    assert place == [{"uri": str(EX.Place), "label": None, "comment": None}]
+    assert [i["uri"] for i in SparqlOperations.get_individuals(graph, str(EX.Person))] == [str(EX.alice)]
+
+
+def test_complex_queries_not_planned():
+    """Nested OPTIONALs and UNIONs stay on the SPARQL engine."""
+    assert SHACL_SHAPES_QUERY.plan is None
+    assert RULE_ISSUES_QUERY.plan is None
+
+
+def test_timings_recorded(graph):
+    """Each execution is counted, separating index lookups from SPARQL runs."""
+    registry = QueryRegistry()
+    prepared = registry.register("test.classes", CLASSES_QUERY.text)
+    prepared.rows(graph)
+    prepared.query(graph)
+    timing = registry.timings()["test.classes"]
+    assert timing["calls"] == 2
+    assert timing["index_calls"] == 1
+    assert timing["max_ms"] >= timing["mean_ms"] > 0
+
+
+def test_timings_count_concurrent_calls(graph):
+    """Calls from many threads are all counted."""
+    prepared = QueryRegistry().register("test.concurrent", CLASSES_QUERY.text)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: prepared.rows(graph), range(400)))
+    assert prepared.timing()["calls"] == prepared.timing()["index_calls"] == 400
+
+
+def test_register_is_idempotent_per_name():
+    """The same name returns the same query, unless the text differs."""
+    registry = QueryRegistry()
+    first = registry.register("q", "SELECT ?s WHERE { ?s ?p ?o }")
+    assert registry.register("q", "SELECT ?s WHERE { ?s ?p ?o }") is first
+    with pytest.raises(ValueError):
+        registry.register("q", "SELECT ?o WHERE { ?s ?p ?o }")
+    registry.compile_all()
+    assert first.plan is None
+
+
+def test_validator_targets_use_prepared_query():
+    """acquire_targets runs the registered query rather than re-parsing its text."""
+    calls = RULE_ISSUES_QUERY.calls
+    targets = MCPValidator().acquire_targets(Graph())
+    assert set(targets) == {"classes", "properties", "shapes", "individuals"}
+    assert RULE_ISSUES_QUERY.calls == calls + 1
@@ -0,0 +1,100 @@
+"""Tests for the parallel, incremental repository scanner."""
+
+import os
+import re
+
+import pytest
+
+from ontology_framework.namespace_recovery.find_example_org import ExampleOrgFinder
+from ontology_framework.namespace_recovery.repo_scanner import RepositoryScanner, compile_ignore_patterns
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a small tree with example.org references."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "ns.py").write_text(
+        'import os\nEX = Namespace("http://example.org/ns#")\n\nURL = "HTTP://EXAMPLE.ORG/x"  # example.org\n'
+    )
+    (tmp_path / "data.ttl").write_text("@prefix ex: <http://example.org/> .\nex:A a ex:B .")
+    (tmp_path / "clean.md").write_text("nothing here\n")
+    (tmp_path / "empty.txt").write_text("")
+    (tmp_path / "blob.bin").write_bytes(b"\0\1example.org\2")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("// example.org\n")
+    (tmp_path / "skip.log").write_text("example.org\n")
+    return tmp_path
+
+
+def test_ignore_patterns_compiled_like_fnmatch():
+    """One regex matches exactly what fnmatch would."""
+    ignore = compile_ignore_patterns(["*.log", "node_modules", "build/*"])
+    assert ignore.match("run.log")
+    assert ignore.match("node_modules")
+    assert ignore.match("build/out.txt")
+    assert not ignore.match("node_modules_backup")
+    assert compile_ignore_patterns([]) is None
+
+
+def test_finder_reports_lines_and_context(repo):
+    """Matches are case-insensitive, one per line, with the file context."""
+    finder = ExampleOrgFinder(["node_modules", "*.log"])
+    references = finder.scan_directory(str(repo))
+    by_file = {}
+    for ref in references:
+        by_file.setdefault(os.path.relpath(ref.file_path, repo), []).append(ref)
+
+    assert set(by_file) == {os.path.join("src", "ns.py"), "data.ttl"}
+    assert [(r.line_number, r.line_content) for r in by_file[os.path.join("src", "ns.py")]] == [
+        (2, 'EX = Namespace("http://example.org/ns#")'),
+        (4, 'URL = "HTTP://EXAMPLE.ORG/x"  # example.org'),
+    ]
+    assert by_file["data.ttl"][0].context == "Turtle RDF"
+    assert finder.scan_file(str(repo / "skip.log")) == []
+
+
+def test_ignored_directories_pruned(repo):
+    """Files under ignored directories are never listed."""
+    scanner = RepositoryScanner(r"example\.org", ["node_modules"])
+    assert not any("node_modules" in path for path in scanner.walk(str(repo)))
+
+
+def test_rescan_only_reads_changed_files(repo):
+    """Unchanged files are served from the (path, mtime, size) cache."""
+    scanner = RepositoryScanner(r"example\.org", ["node_modules"], flags=re.IGNORECASE)
+    first = scanner.scan(str(repo))
+    walked = scanner.files_scanned
+    assert scanner.scan(str(repo)) == first
+    assert scanner.files_scanned == walked
+
+    target = repo / "clean.md"
+    target.write_text("now mentions example.org\n")
+    os.utime(target, ns=(0, 10 ** 9))
+    results = scanner.scan(str(repo))
+    assert scanner.files_scanned == walked + 1
+    assert results[str(target)] == [(1, "now mentions example.org")]
+
+
+def test_cache_persisted_between_runs(repo, tmp_path_factory):
+    """A new scanner with the same cache file does not rescan anything."""
+    cache_path = str(tmp_path_factory.mktemp("cache") / "scan.json")
+    first = RepositoryScanner(r"example\.org", ["node_modules"], cache_path=cache_path).scan(str(repo))
+    second = RepositoryScanner(r"example\.org", ["node_modules"], cache_path=cache_path)
+    assert second.scan(str(repo)) == first
+    assert second.files_scanned == 0
+
+    other_pattern = RepositoryScanner(r"example\.com", cache_path=cache_path)
+    other_pattern.scan(str(repo))
+    assert other_pattern.files_scanned > 0
+
+
+def test_process_pool_matches_serial_scan(tmp_path):
+    """Scanning across worker processes gives the same results in order."""
+    for i in range(40):
+        body = "x\n" * i + ("see example.org\n" if i % 3 == 0 else "none\n")
+        (tmp_path / f"f{i:02d}.txt").write_text(body)
+    serial = RepositoryScanner(r"example\.org", workers=1).scan(str(tmp_path))
+    parallel = RepositoryScanner(r"example\.org", workers=2, parallel_threshold=1, chunk_size=8).scan(str(tmp_path))
+    assert parallel == serial
+    assert list(parallel) == list(serial)
+    assert len(parallel) == 14
@@ -0,0 +1,187 @@
+"""Tests for the append-only session change log and its use in manage_models."""
+
+import time
+
+import pytest
+
+from ontology_framework.core.session_change_log import SessionChangeLog
+
+EX = "http://example.org/"
+
+
+def _record(log, i, change_type="ADD"):
+    return log.record(f"<{EX}s{i % 10}>", f"<{EX}p{i % 3}>", f'"{i}"', change_type=change_type)
+
+
+def test_indexes_and_replay(tmp_path):
+    """Lookups use the indexes, and reopening the file restores them."""
+    path = tmp_path / "session.jsonl"
+    with SessionChangeLog(path) as log:
+        for i in range(30):
+            _record(log, i, "ADD" if i % 2 else "DELETE")
+        grouped = log.record(f"<{EX}x>", f"<{EX}p>", '"a"', change_id="c1")
+        log.record(f"<{EX}x>", f"<{EX}q>", '"b"', change_id=grouped.change_id)
+        assert [c.object for c in log.by_subject(f"<{EX}s3>")] == ['"3"', '"13"', '"23"']
+        assert len(log.by_predicate(f"<{EX}p0>")) == 10
+        assert len(log.by_change_type("DELETE")) == 15
+        assert len(log.by_change_id("c1")) == 2
+
+    reopened = SessionChangeLog(path)
+    assert len(reopened) == 32
+    assert reopened.by_subject(f"<{EX}s3>")[1].object == '"13"'
+    assert list(reopened.grouped())[-1] == "c1"
+
+
+def test_flush_in_batches_and_resume(tmp_path):
+    """Flushing writes pending changes in batches and survives a failed batch."""
+    path = tmp_path / "session.jsonl"
+    log = SessionChangeLog(path)
+    for i in range(25):
+        _record(log, i)
+    batches = []
+    assert log.flush(batches.append, batch_size=10) == 25
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert not log.pending
+
+    for i in range(25, 40):
+        _record(log, i)
+
+    def fail_second(batch):
+        if batches and batches[-1][0].object == '"25"':
+            raise RuntimeError("store unavailable")
+        batches.append(batch)
+
+    with pytest.raises(RuntimeError):
+        log.flush(fail_second, batch_size=10)
+    log.close()
+
+    reopened = SessionChangeLog(path)
+    assert reopened.flushed == 35
+    assert [c.object for c in reopened.pending] == [f'"{i}"' for i in range(35, 40)]
+
+
+def test_incremental_export(tmp_path):
+    """A second export appends only the triples added since the first."""
+    log = SessionChangeLog(tmp_path / "session.jsonl")
+    out = tmp_path / "export.ttl"
+    for i in range(5):
+        _record(log, i)
+    assert log.export_ttl(out) == 5
+    _record(log, 5)
+    log.close()
+
+    reopened = SessionChangeLog(tmp_path / "session.jsonl")
+    assert reopened.export_ttl(out) == 1
+    assert reopened.export_ttl(out) == 0
+    lines = [line for line in out.read_text().splitlines() if line and not line.startswith("@prefix")]
+    assert len(lines) == 6
+
+    from rdflib import Graph
+    assert len(Graph().parse(out, format="turtle")) == 6
+
+
+def test_interrupted_write_is_dropped(tmp_path):
+    """A half-written last line is discarded and later records still replay."""
+    path = tmp_path / "session.jsonl"
+    with SessionChangeLog(path) as log:
+        for i in range(3):
+            _record(log, i)
+    with path.open("a") as f:
+        f.write('{"op": "change", "subj')
+    with SessionChangeLog(path) as log:
+        assert len(log) == 3
+        _record(log, 3)
+    assert len(SessionChangeLog(path)) == 4
+
+
+def test_record_cost_is_flat(tmp_path):
+    """Recording the 10,000th change costs about the same as the first ones."""
+    log = SessionChangeLog(tmp_path / "session.jsonl")
+
+    def timed(start, count):
+        begin = time.perf_counter()
+        for i in range(start, start + count):
+            _record(log, i)
+            log.by_subject(f"<{EX}s{i % 10}>")[-1:]
+        return time.perf_counter() - begin
+
+    first = timed(0, 500)
+    timed(500, 9000)
+    last = timed(9500, 500)
+    assert last < first * 3 + 0.05
+    assert len(log.by_subject(f"<{EX}s0>")) == 1000
+
+
+class FakeCursor:
+    def __init__(self, batches, statements=None):
+        self.batches = batches
+        self.statements = statements if statements is not None else []
+        self.connection = self
+
+    def executemany(self, statement, rows):
+        self.statements.append(statement)
+        self.batches.append(rows)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def cursor(self):
+        return self
+
+    def close(self):
+        pass
+
+
+def test_add_to_session_flushes_in_batches(tmp_path, monkeypatch):
+    """manage_models records locally and inserts full batches with executemany."""
+    pytest.importorskip("oracledb")
+    import manage_models
+
+    batches = []
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(manage_models, "SESSION_LOG_DIR", tmp_path / ".sessions")
+    monkeypatch.setattr(manage_models, "FLUSH_BATCH_SIZE", 100)
+    monkeypatch.setattr(manage_models, "_change_logs", {})
+    monkeypatch.setattr(manage_models, "_session_tables", {})
+    monkeypatch.setattr(manage_models, "get_connection", lambda: FakeCursor(batches))
+    (tmp_path / ".session").write_text("SESSION_X\nSESSION_DATA_X")
+    # A fresh log is seeded from the existing table, which is empty here
+    monkeypatch.setattr(manage_models, "_load_session_rows", lambda *args: None)
+
+    for i in range(250):
+        assert manage_models.add_to_session(f"<{EX}s{i}>", f"<{EX}p>", f'"{i}"', "ADD")
+    assert [len(rows) for rows in batches] == [100, 100]
+    assert manage_models.flush_session() == 50
+    last = batches[-1][-1]
+    assert [last["subject"], last["predicate"], last["object"]] == [f"<{EX}s249>", f"<{EX}p>", '"249"']
+
+    manage_models.export_session_ttl()
+    assert (tmp_path / "session_export_SESSION_X.ttl").exists()
+    manage_models._change_logs["SESSION_X"].close()
+
+
+def test_exit_flush_uses_each_sessions_table(tmp_path, monkeypatch):
+    """Logs left pending at exit go to their own model and table, guarded by change id."""
+    pytest.importorskip("oracledb")
+    import manage_models
+
+    batches, statements = [], []
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(manage_models, "SESSION_LOG_DIR", tmp_path / ".sessions")
+    monkeypatch.setattr(manage_models, "_change_logs", {})
+    monkeypatch.setattr(manage_models, "_session_tables", {})
+    monkeypatch.setattr(manage_models, "get_connection", lambda: FakeCursor(batches, statements))
+    monkeypatch.setattr(manage_models, "_load_session_rows", lambda *args: None)
+
+    for name in ["A", "B"]:
+        (tmp_path / ".session").write_text(f"SESSION_{name}\nSESSION_DATA_{name}")
+        assert manage_models.add_to_session(f"<{EX}{name}>", f"<{EX}p>", '"x"', "ADD")
+    manage_models._flush_at_exit()
+
+    assert [rows[0]["model"] for rows in batches] == ["SESSION_A", "SESSION_B"]
+    assert ["INTO SESSION_DATA_A" in s for s in statements] == [True, False]
+    assert ["INTO SESSION_DATA_B" in s for s in statements] == [False, True]
+    assert all("NOT EXISTS" in s and "s.change_id = :change_id" in s for s in statements)
@@ -0,0 +1,123 @@
+"""Tests for concurrent spore integration."""
+
+import shutil
+import tempfile
+import unittest
+from typing import List
+from rdflib import Literal, Namespace, URIRef
+from rdflib.namespace import RDF, RDFS, OWL
+
+from ontology_framework.spore_integration import SporeIntegrator, GUIDANCE
+from ontology_framework.spore_concurrency import ConcurrentSporeIntegrator
+from ontology_framework.exceptions import ConcurrentModificationError
+
+TEST = Namespace("http://example.org/test#")
+META = Namespace("http://example.org/guidance#")
+
+class TestConcurrentSporeIntegration(unittest.TestCase):
+    """Test cases for ConcurrentSporeIntegrator."""
+
+    def setUp(self) -> None:
+        """Set up an integrator with a target model."""
+        self.test_dir = tempfile.mkdtemp()
+        self.integrator = SporeIntegrator(self.test_dir)
+        self.integrator.graph.bind("test", TEST)
+        self.integrator.graph.bind("meta", META)
+        self.model = TEST.Model
+        self.engine = ConcurrentSporeIntegrator(self.integrator, max_workers=4)
+
+    def tearDown(self) -> None:
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def add_spore(self, name: str, patches: List[str], imports: List[str] = ()) -> URIRef:
+        """Add a valid spore distributing the given patches."""
+        graph = self.integrator.graph
+        spore = TEST[name]
+        graph.add((spore, RDF.type, META.Spore))
+        graph.add((spore, META.targetModel, self.model))
+        graph.add((spore, GUIDANCE.targetModel, self.model))
+        graph.add((spore, OWL.versionInfo, Literal("1.0.0")))
+        graph.add((spore, RDFS.label, Literal(name)))
+        graph.add((spore, RDFS.comment, Literal(f"Spore {name}")))
+        for patch_name in patches:
+            patch = TEST[patch_name]
+            graph.add((spore, META.distributesPatch, patch))
+            graph.add((spore, GUIDANCE.distributesPatch, patch))
+            graph.add((patch, RDF.type, GUIDANCE.ConceptPatch))
+        for dependency_name in imports:
+            dependency = TEST[dependency_name]
+            graph.add((spore, OWL.imports, dependency))
+            graph.add((dependency, RDF.type, GUIDANCE.TransformationPattern))
+        return spore
+
+    def test_partition_separates_conflicts(self) -> None:
+        """Spores reading another spore's patch go into a later group."""
+        a = self.add_spore("A", ["PatchA"])
+        b = self.add_spore("B", ["PatchB"])
+        c = self.add_spore("C", ["PatchC"], imports=["PatchA"])
+        groups = self.engine.partition([self.engine.footprint(s, self.model) for s in (a, b, c)])
+        self.assertEqual([[fp.spore for fp in group] for group in groups], [[a, b], [c]])
+
+    def test_integrate_batch(self) -> None:
+        """All spores are applied and the batch is reported."""
+        spores = [self.add_spore(f"S{i}", [f"P{i}"]) for i in range(8)]
+        self.assertTrue(self.integrator.integrate_concurrent(spores, self.model))
+        report = self.integrator.last_batch_report
+        self.assertEqual(sorted(report.integrated), sorted(spores))
+        self.assertEqual(report.groups, 1)
+        self.assertGreater(report.throughput, 0)
+        self.assertFalse(report.partial)
+
+    def test_invalid_spore_reported(self) -> None:
+        """A failing spore is reported as a partial batch without touching the graph."""
+        good = self.add_spore("Good", ["GoodPatch"])
+        bad = self.add_spore("Bad", ["BadPatch"])
+        self.integrator.graph.remove((bad, GUIDANCE.targetModel, self.model))
+        before = set(self.integrator.graph)
+        self.assertFalse(self.integrator.integrate_concurrent([good, bad], self.model))
+        report = self.integrator.last_batch_report
+        self.assertEqual(report.integrated, [good])
+        self.assertIn(bad, report.failed)
+        self.assertTrue(report.partial)
+        self.assertEqual(set(self.integrator.graph), before)
+
+    def test_unregistered_namespace_fails_only_that_spore(self) -> None:
+        """The batch namespace check fails offending spores and integrates the rest."""
+        good = self.add_spore("Good", ["GoodPatch"])
+        bad = self.add_spore("Bad", ["BadPatch"])
+        self.integrator.graph.add((bad, RDFS.seeAlso, URIRef("http://unregistered.example.net/ns#Thing")))
+        self.assertFalse(self.integrator.integrate_concurrent([good, bad], self.model))
+        report = self.integrator.last_batch_report
+        self.assertEqual(report.integrated, [good])
+        self.assertIn("http://unregistered.example.net/ns#", report.failed[bad])
+        self.assertEqual(report.total, 2)
+        self.assertTrue(report.partial)
+
+    def test_spores_use_serial_path(self) -> None:
+        """Each spore goes through integrate_spore, and its errors are reported."""
+        a = self.add_spore("A", ["PatchA"])
+        b = self.add_spore("B", ["PatchB"])
+        seen = []
+
+        def integrate_spore(spore, target_model):
+            seen.append(spore)
+            if spore == b:
+                raise ValueError("rejected by integrate_spore")
+            return True
+
+        self.integrator.integrate_spore = integrate_spore
+        report = self.engine.integrate([a, b], self.model)
+        self.assertEqual(sorted(seen), sorted([a, b]))
+        self.assertEqual(report.integrated, [a])
+        self.assertEqual(report.failed, {b: "rejected by integrate_spore"})
+
+    def test_duplicate_patches_rejected(self) -> None:
+        """Spores distributing the same patch are still rejected outright."""
+        a = self.add_spore("A", ["Shared"])
+        b = self.add_spore("B", ["Shared"])
+        with self.assertRaises(ConcurrentModificationError):
+            self.integrator.integrate_concurrent([a, b], self.model)
+
+if __name__ == '__main__':
+    unittest.main()
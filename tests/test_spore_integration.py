@@ -8,9 +8,9 @@ from typing import Optional
 from rdflib import Graph, URIRef, Literal, Namespace
 from rdflib.namespace import RDF, RDFS, OWL
 
-from ontology_framework.spore_integration import SporeIntegrator
+from ontology_framework.spore_integration import SporeIntegrator, NamespaceTrie, GUIDANCE
 from ontology_framework.spore_validation import SporeValidator
-from ontology_framework.exceptions import ConcurrentModificationError
+from ontology_framework.exceptions import ConcurrentModificationError, ConformanceError
 
 # Configure logging
 logging.basicConfig(
@@ -183,5 +183,60 @@ class TestSporeIntegration(unittest.TestCase):
             logger.error(f"Cleanup failed: {str(e)}")
             raise
 
+class TestNamespaceIndex(unittest.TestCase):
+    """Test cases for the namespace trie used by conformance checks."""
+    
+    def setUp(self) -> None:
+        """Set up an integrator with hash and slash namespaces registered."""
+        self.test_dir = tempfile.mkdtemp()
+        self.integrator = SporeIntegrator(self.test_dir)
+        graph = self.integrator.validator.graph
+        graph.bind("test", TEST)
+        graph.bind("meta", META)
+        graph.bind("spores", "http://example.org/spores/")
+        self.good_spore = URIRef("http://example.org/spores/good")
+        self.bad_spore = URIRef("http://invalid.org/spores/bad")
+        for spore in (self.good_spore, self.bad_spore):
+            graph.add((spore, RDF.type, META.Spore))
+            graph.add((spore, GUIDANCE.targetModel, TEST.TestModel))
+    
+    def tearDown(self) -> None:
+        """Clean up test environment."""
+        Path(self.test_dir).rmdir()
+    
+    def test_trie_resolution(self) -> None:
+        """IRIs resolve to the longest registered namespace."""
+        trie = NamespaceTrie(["http://example.org/", "http://example.org/test#", "http://example.org/spores/"])
+        self.assertEqual(trie.resolve("http://example.org/test#Thing"), "http://example.org/test#")
+        self.assertEqual(trie.resolve("http://example.org/spores/a"), "http://example.org/spores/")
+        self.assertEqual(trie.resolve("http://example.org/test"), "http://example.org/test#")
+        self.assertEqual(trie.resolve("http://example.org/other"), "http://example.org/")
+        self.assertIsNone(trie.resolve("http://invalid.org/x"))
+    
+    def test_slash_namespace_validation(self) -> None:
+        """Slash namespaces are recognised by prefix and namespace checks."""
+        self.assertTrue(self.integrator.validate_prefixes(self.good_spore))
+        self.assertTrue(self.integrator.validate_namespaces(self.good_spore))
+        with self.assertRaises(ConformanceError):
+            self.integrator.validate_namespaces(self.bad_spore)
+    
+    def test_trie_rebuilt_on_new_binding(self) -> None:
+        """Binding a namespace invalidates the cached trie."""
+        trie = self.integrator.get_namespace_trie()
+        self.assertIs(trie, self.integrator.get_namespace_trie())
+        self.integrator.validator.graph.bind("invalid", "http://invalid.org/spores/")
+        self.assertIsNot(trie, self.integrator.get_namespace_trie())
+        self.assertIn(str(self.bad_spore), self.integrator.get_namespace_trie())
+        # Prefixes declared in parsed data count as bindings too
+        trie = self.integrator.get_namespace_trie()
+        self.integrator.guidance_graph.parse(data="@prefix late: <http://late.example.org/> .", format="turtle")
+        self.assertIsNot(trie, self.integrator.get_namespace_trie())
+        self.assertIn("http://late.example.org/x", self.integrator.get_namespace_trie())
+    
+    def test_model_bulk_validation(self) -> None:
+        """All spores of a model are checked in one pass."""
+        violations = self.integrator.validate_model_namespaces(TEST.TestModel)
+        self.assertEqual(violations, {self.bad_spore: {"http://invalid.org/spores/"}})
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""Tests for sampled operation tracing in ReflectiveModule."""
+
+import json
+import unittest
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ontology_framework.core.unified_reflective_module import (
+    ReflectiveModule, ModuleCapability, ModuleHealth, ModuleStatus, GracefulDegradationResult
+)
+from ontology_framework.core.tracing import LatencyHistogram
+
+
+class TracedModule(ReflectiveModule):
+    """Minimal module used to exercise tracing."""
+
+    def __init__(self):
+        super().__init__()
+        self._enable_prometheus = False
+
+    def get_module_info(self):
+        return {"module_id": "traced"}
+
+    def get_capabilities(self):
+        return [ModuleCapability.MONITORING]
+
+    def get_health_status(self):
+        return ModuleHealth("traced", ModuleStatus.HEALTHY, 1.0, [], datetime.now())
+
+    def graceful_degradation(self):
+        return GracefulDegradationResult(True, [], [])
+
+
+class TestSampledTracing(unittest.TestCase):
+    """Test cases for the tracing subsystem."""
+
+    def setUp(self):
+        self.module = TracedModule()
+
+    def test_full_sampling_records_traces(self):
+        """With every operation sampled, traces carry their output."""
+        with self.module.trace_operation("load", path="a.ttl") as trace:
+            trace.output_result = {"triples": 3}
+        traces = self.module.get_operation_traces()
+        self.assertEqual(len(traces), 1)
+        self.assertEqual(traces[0].output_result, {"triples": 3})
+        self.assertEqual(traces[0].input_parameters, {"path": "a.ttl"})
+        self.assertTrue(traces[0].performance_metrics["success"])
+        self.assertGreater(traces[0].rss_end_bytes, 0)
+        self.assertIn("delta_mb", traces[0].memory_usage)
+
+    def test_unsampled_operations_still_measured(self):
+        """Unsampled operations feed counters and histograms but store no trace."""
+        self.module.configure_tracing(sample_rate=0.0)
+        for _ in range(5):
+            with self.module.trace_operation("query") as trace:
+                trace.output_result = "ignored"
+        self.assertEqual(self.module.get_operation_traces(), [])
+        self.assertEqual(self.module.get_performance_metrics()["operation_count"], 5)
+        self.assertEqual(self.module.get_latency_histograms()["query"]["count"], 5)
+
+    def test_failures_always_traced(self):
+        """Failed operations are kept even when not sampled."""
+        self.module.configure_tracing(sample_rate=0.0)
+        with self.assertRaises(ValueError):
+            with self.module.trace_operation("parse", source="bad"):
+                raise ValueError("broken")
+        trace = self.module.get_operation_traces()[0]
+        self.assertEqual(trace.error_info["error_type"], "ValueError")
+        self.assertEqual(trace.input_parameters, {"source": "bad"})
+        self.assertLessEqual(trace.start_unix_ns, trace.end_unix_ns)
+        self.assertEqual(self.module.get_performance_metrics()["error_count"], 1)
+
+    def test_ring_is_bounded(self):
+        """Only the most recent traces are kept."""
+        self.module._tracer.traces = type(self.module._tracer.traces)(maxlen=3)
+        for i in range(10):
+            with self.module.trace_operation(f"op{i}"):
+                pass
+        self.assertEqual([t.operation_name for t in self.module.get_operation_traces()], ["op7", "op8", "op9"])
+
+    def test_memory_snapshots_can_be_disabled(self):
+        """Without memory tracing, traces carry no RSS snapshots."""
+        self.module.configure_tracing(trace_memory=False)
+        with self.module.trace_operation("alloc"):
+            pass
+        trace = self.module.get_operation_traces()[0]
+        self.assertEqual(trace.rss_start_bytes, 0)
+        self.assertEqual(trace.memory_usage, {})
+
+    def test_histogram_percentiles(self):
+        """Percentiles report bucket upper bounds."""
+        histogram = LatencyHistogram()
+        for duration in [0.05] * 90 + [40.0] * 10:
+            histogram.record(duration)
+        summary = histogram.summary()
+        self.assertEqual(summary["p50_ms"], 0.1)
+        self.assertEqual(summary["p99_ms"], 50)
+        self.assertEqual(summary["max_ms"], 40.0)
+
+    def test_otlp_export(self):
+        """Traces are appended to a local file as OTLP JSON lines."""
+        with self.module.trace_operation("export", count=2):
+            pass
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "traces.jsonl"
+            self.assertEqual(self.module.export_traces(str(path)), 1)
+            request = json.loads(path.read_text().splitlines()[0])
+        span = request["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        self.assertEqual(span["name"], "export")
+        self.assertEqual(len(span["traceId"]), 32)
+        self.assertEqual(len(span["spanId"]), 16)
+        self.assertEqual(span["status"], {"code": 1})
+        self.assertIn({"key": "input.count", "value": {"intValue": "2"}}, span["attributes"])
+
+    def test_repeated_export_writes_each_span_once(self):
+        """Each export only appends traces recorded since the previous one."""
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "traces.jsonl"
+            with self.module.trace_operation("first"):
+                pass
+            self.assertEqual(self.module.export_traces(str(path)), 1)
+            self.assertEqual(self.module.export_traces(str(path)), 0)
+            for name in ("second", "third"):
+                with self.module.trace_operation(name):
+                    pass
+            self.assertEqual(self.module.export_traces(str(path)), 2)
+            names = [
+                span["name"]
+                for line in path.read_text().splitlines()
+                for span in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+            ]
+        self.assertEqual(names, ["first", "second", "third"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Test cases for the WASM engine instance pool, run against a stub engine.
+
+The stub stands in for wasmtime and implements the connector's ABI in
+Python: linear memory is a ctypes buffer, allocate is a bump allocator, and
+each instance keeps the Turtle updates it applied as its "store".
+"""
+import ctypes
+import json
+import types
+
+import pytest
+
+import bfg9k_manager
+from bfg9k_manager import WASMRDFConnector
+
+MEMORY_SIZE = 1 << 16
+
+
+class StubMemory:
+    def __init__(self):
+        self.buffer = ctypes.create_string_buffer(MEMORY_SIZE)
+
+    def data_len(self, store):
+        return MEMORY_SIZE
+
+    def data_ptr(self, store):
+        return ctypes.addressof(self.buffer)
+
+
+class StubInstance:
+    """Engine instance whose updates fail while its number is in `failing`"""
+
+    created = 0
+    failing = set()
+    raising = set()
+
+    def __init__(self, store, module, imports):
+        self.number = StubInstance.created
+        StubInstance.created += 1
+        self.memory = StubMemory()
+        self.applied = []
+        self.lengths = {}
+        self.next_free = 8
+
+    def _allocate(self, store, size):
+        ptr = self.next_free
+        self.next_free += size
+        return ptr
+
+    def _read(self, ptr, length):
+        return self.memory.buffer.raw[ptr:ptr + length].decode("utf-8")
+
+    def _result(self, value):
+        data = json.dumps(value).encode("utf-8")
+        ptr = self._allocate(None, len(data))
+        ctypes.memmove(ctypes.addressof(self.memory.buffer) + ptr, data, len(data))
+        self.lengths[ptr] = len(data)
+        return ptr
+
+    def _update(self, store, ptr, length):
+        if self.number in StubInstance.raising:
+            raise RuntimeError("trap")
+        if self.number in StubInstance.failing:
+            return 0
+        self.applied.append(self._read(ptr, length))
+        return 1
+
+    def _query(self, store, ptr, length):
+        return self._result({"instance": self.number, "applied": self.applied})
+
+    def exports(self, store):
+        return {
+            "memory": self.memory,
+            "allocate": self._allocate,
+            "deallocate": lambda store, ptr: None,
+            "get_result_length": lambda store, ptr: self.lengths[ptr],
+            "execute_query": self._query,
+            "execute_update": self._update,
+        }
+
+
+@pytest.fixture
+def connector(monkeypatch):
+    """Connector over four stub engine instances"""
+    StubInstance.created = 0
+    StubInstance.failing = set()
+    StubInstance.raising = set()
+    stub = types.SimpleNamespace(
+        Engine=lambda: object(),
+        Module=types.SimpleNamespace(from_file=lambda engine, path: object()),
+        Store=lambda engine: object(),
+        Instance=StubInstance,
+    )
+    monkeypatch.setattr(bfg9k_manager, "wasmtime", stub)
+    return WASMRDFConnector("stub.wasm", pool_size=4)
+
+
+def _stores(connector):
+    return [instance.instance.applied for instance in connector.pool.instances]
+
+
+def test_update_reaches_every_instance(connector):
+    """Updates are broadcast, so any instance can serve a query."""
+    assert connector.update("<urn:a> <urn:p> 1 .")
+    assert connector.update_batch(["<urn:b> <urn:p> 2 .", "<urn:c> <urn:p> 3 ."])
+    assert all(len(store) == 3 for store in _stores(connector))
+    assert connector.query("SELECT * WHERE { ?s ?p ?o }")["applied"] == _stores(connector)[0]
+
+
+def test_partial_failure_quarantines_diverged_instances(connector):
+    """Instances that miss an update are taken out of rotation."""
+    StubInstance.failing = {1}
+    StubInstance.raising = {2}
+    assert connector.update("<urn:a> <urn:p> 1 .")
+    assert [i.instance.number for i in connector.pool.quarantined] == [1, 2]
+    assert len(connector.pool.instances) == 2
+    for _ in range(8):
+        assert connector.query("SELECT * WHERE { ?s ?p ?o }")["instance"] in (0, 3)
+
+
+def test_failure_everywhere_keeps_pool(connector):
+    """An update every instance rejects leaves the stores matching."""
+    StubInstance.failing = {0, 1, 2, 3}
+    assert not connector.update("<urn:a> <urn:p> 1 .")
+    StubInstance.failing = set()
+    StubInstance.raising = {0, 1, 2, 3}
+    assert not connector.update("<urn:a> <urn:p> 1 .")
+    assert len(connector.pool.instances) == 4 and not connector.pool.quarantined
@@ -0,0 +1,60 @@
+"""Tests for the warm worker pool used by RealTestExecutor."""
+
+import asyncio
+
+import pytest
+
+from ontology_framework.test_generation.data_models import TestCase, TestStatus
+from ontology_framework.test_generation.real_executor import RealTestExecutor
+from ontology_framework.test_generation.worker_pool import TestWorkerPool
+
+
+def make_case(name: str, code: str, timeout: float = 10.0) -> TestCase:
+    return TestCase(name=name, description=name, test_code=code, timeout=timeout)
+
+
+@pytest.fixture
+def pool():
+    pool = TestWorkerPool(size=1, batch_size=8, max_tests_per_worker=3, timeout_grace=2.0, preload=())
+    yield pool
+    pool.shutdown()
+
+
+def run_all(executor: RealTestExecutor, cases):
+    async def run():
+        return await asyncio.gather(*(executor.execute_real_test(case) for case in cases))
+    return asyncio.run(run())
+
+
+def test_outcomes_from_warm_worker(pool):
+    """Passing, failing and skipped tests are reported from one worker"""
+    executor = RealTestExecutor(pool=pool)
+    results = run_all(executor, [
+        make_case("test_passes", "print('hello')\nassert 1 + 1 == 2"),
+        make_case("test_fails", "assert False, 'expected failure'"),
+        make_case("test_skips", "pytest.skip('not here')"),
+    ])
+    assert [r.status for r in results] == [TestStatus.PASSED, TestStatus.FAILED, TestStatus.SKIPPED]
+    assert "hello" in results[0].output
+    assert "expected failure" in results[1].error_message
+    assert pool.workers_started == 1
+
+
+def test_timeout_and_crash_isolation(pool):
+    """A hung or crashing test does not take the rest of its batch with it"""
+    executor = RealTestExecutor(pool=pool)
+    results = run_all(executor, [
+        make_case("test_hangs", "while True:\n    pass", timeout=0.5),
+        make_case("test_crashes", "import os\nos._exit(3)"),
+        make_case("test_after_crash", "assert True"),
+    ])
+    assert [r.status for r in results] == [TestStatus.TIMEOUT, TestStatus.ERROR, TestStatus.PASSED]
+    assert pool.workers_started == 2
+
+
+def test_workers_recycled(pool):
+    """Workers are replaced after max_tests_per_worker tests"""
+    executor = RealTestExecutor(pool=pool)
+    results = run_all(executor, [make_case(f"test_n{i}", f"assert {i} >= 0") for i in range(7)])
+    assert all(r.status == TestStatus.PASSED for r in results)
+    assert pool.workers_started == 3
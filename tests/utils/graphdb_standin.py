@@ -0,0 +1,335 @@
+"""In-process GraphDB stand-in with explicit/implicit statements and transactions.
+
+Unlike MockGraphDBServer, which returns canned responses, this server keeps
+real rdflib graphs so tests can check what a client leaves in the repository.
+It implements the parts of the RDF4J/GraphDB protocol the inference and
+update tools use:
+
+- GET  /repositories/{repo}?query=...           SELECT, including onto:explicit/onto:implicit counts
+- GET  /repositories/{repo}/statements?infer=   N-Triples, N-Quads or Turtle export
+- POST /repositories/{repo}/statements          SPARQL UPDATE (204)
+- PUT  /repositories/{repo}/statements?context= replace a named graph (204)
+- POST /repositories/{repo}/transactions        start (201 + Location)
+- PUT  /repositories/{repo}/transactions/{id}   action=ADD|UPDATE|COMMIT
+- DELETE /repositories/{repo}/transactions/{id} rollback
+- GET  /rest/repositories/{repo}/info           ruleset
+
+On commit and update, inferred statements are recomputed with rdfs:subClassOf closure
+over rdf:type, which is enough to tell stale and fresh inferences apart.
+Named graphs are explicit only: they are exported as N-Quads, reloaded by
+an N-Quads ADD, and emptied by CLEAR ALL.
+"""
+
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple, Type
+from urllib.parse import parse_qs, urlparse
+
+from rdflib import Dataset, Graph, URIRef
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+from rdflib.namespace import RDF, RDFS
+
+from .mock_graphdb import find_free_port
+
+ONTO_EXPLICIT = "http://www.ontotext.com/explicit"
+ONTO_IMPLICIT = "http://www.ontotext.com/implicit"
+
+FORMATS = {
+    "application/n-triples": "nt",
+    "application/n-quads": "nquads",
+    "text/turtle": "turtle",
+}
+
+
+def rdfs_closure(explicit: Graph) -> Graph:
+    """Types implied by rdfs:subClassOf that are not already explicit"""
+    superclasses: Dict[Any, set] = {}
+    for sub, _, sup in explicit.triples((None, RDFS.subClassOf, None)):
+        superclasses.setdefault(sub, set()).add(sup)
+
+    def ancestors(cls, seen):
+        for sup in superclasses.get(cls, ()):
+            if sup not in seen:
+                seen.add(sup)
+                ancestors(sup, seen)
+        return seen
+
+    implicit = Graph()
+    for s, _, cls in explicit.triples((None, RDF.type, None)):
+        for sup in ancestors(cls, set()):
+            if (s, RDF.type, sup) not in explicit:
+                implicit.add((s, RDF.type, sup))
+    return implicit
+
+
+class GraphDBStandIn:
+    """GraphDB stand-in server backed by rdflib graphs."""
+
+    def __init__(self, repository: str = "test", ruleset: str = "rdfs",
+                 host: str = "localhost", port: Optional[int] = None) -> None:
+        """Initialize the stand-in.
+
+        Args:
+            repository: Repository name served under /repositories/
+            ruleset: Ruleset reported by the info endpoint
+            host: The host to bind to
+            port: Optional port; a free one is picked if None
+        """
+        self.repository = repository
+        self.ruleset = ruleset
+        self.host = host
+        self.port = port if port is not None else find_free_port()
+        self.url = f"http://{host}:{self.port}"
+        self.explicit = Graph()
+        self.implicit = Graph()
+        # Working default graph and named graphs of each open transaction
+        self.transactions: Dict[str, Tuple[Graph, Dict[str, Graph]]] = {}
+        # Named graphs written with PUT /statements?context=, kept apart from the default graph
+        self.graphs: Dict[str, Graph] = {}
+        # Seconds each named graph upload takes, to observe concurrency
+        self.upload_delay = 0.0
+        self.requests: List[Dict[str, Any]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.server_thread: Optional[threading.Thread] = None
+
+    def load(self, data: str, format: str = "turtle", inferred: Optional[str] = None) -> None:
+        """Load explicit data, with inferred data as given or from the RDFS closure"""
+        self.explicit.parse(data=data, format=format)
+        if inferred is None:
+            self.implicit = rdfs_closure(self.explicit)
+        else:
+            self.implicit.parse(data=inferred, format=format)
+
+    def requests_matching(self, method: str, action: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Logged requests with the given method and, optionally, transaction action"""
+        return [r for r in self.requests
+                if r["method"] == method and (action is None or r["params"].get("action") == action)]
+
+    def start(self) -> None:
+        """Start serving on a background thread."""
+        self.server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.server_thread:
+            self.server_thread.join()
+            self.server_thread = None
+
+    def __enter__(self) -> "GraphDBStandIn":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _count_query(self, query: str) -> Optional[Dict[str, Any]]:
+        if ONTO_EXPLICIT not in query and "onto:explicit" not in query:
+            return None
+        return {
+            "head": {"vars": ["explicit", "implicit"]},
+            "results": {"bindings": [{
+                "explicit": {"type": "literal", "value": str(len(self.explicit))},
+                "implicit": {"type": "literal", "value": str(len(self.implicit))},
+            }]},
+        }
+
+    def _handler(self) -> Type[BaseHTTPRequestHandler]:
+        standin = self
+        repo_path = f"/repositories/{self.repository}"
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _record(self) -> Dict[str, Any]:
+                parsed = urlparse(self.path)
+                body = b""
+                length = int(self.headers.get("Content-Length", 0) or 0)
+                if length:
+                    body = self.rfile.read(length)
+                elif self.headers.get("Transfer-Encoding") == "chunked":
+                    body = self._read_chunked()
+                entry = {
+                    "method": self.command,
+                    "path": parsed.path,
+                    "params": {k: v[0] for k, v in parse_qs(parsed.query).items()},
+                    "content_type": self.headers.get("Content-Type", ""),
+                    "authorization": self.headers.get("Authorization"),
+                    "body": body,
+                    "received": time.monotonic(),
+                }
+                standin.requests.append(entry)
+                return entry
+
+            def _read_chunked(self) -> bytes:
+                data = b""
+                while True:
+                    size = int(self.rfile.readline().strip(), 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        return data
+                    data += self.rfile.read(size)
+                    self.rfile.readline()
+
+            def _send(self, status: int, body: bytes = b"", content_type: str = "text/plain",
+                      headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                entry = self._record()
+                path, params = entry["path"], entry["params"]
+                if path == f"/rest/repositories/{standin.repository}/info":
+                    self._send(200, json.dumps({"ruleset": standin.ruleset}).encode(), "application/json")
+                elif path == f"{repo_path}/statements":
+                    accept = self.headers.get("Accept", "application/n-triples")
+                    fmt = FORMATS.get(accept)
+                    if fmt is None:
+                        self._send(406)
+                        return
+                    with standin._lock:
+                        dataset = Dataset()
+                        default = dataset.graph(DATASET_DEFAULT_GRAPH_ID)
+                        default += standin.explicit
+                        if params.get("infer", "true") != "false":
+                            default += standin.implicit
+                        for name, named in standin.graphs.items():
+                            # Triple formats have no graph names; GraphDB merges them
+                            target = dataset.graph(URIRef(name)) if fmt == "nquads" else default
+                            target += named
+                    graph = dataset if fmt == "nquads" else default
+                    self._send(200, graph.serialize(format=fmt, encoding="utf-8"), accept)
+                elif path == repo_path and "query" in params:
+                    with standin._lock:
+                        result = standin._count_query(params["query"])
+                        if result is None:
+                            graph = standin.explicit + standin.implicit
+                            result = json.loads(graph.query(params["query"]).serialize(format="json"))
+                    self._send(200, json.dumps(result).encode(), "application/sparql-results+json")
+                else:
+                    self._send(404)
+
+            def do_POST(self) -> None:
+                entry = self._record()
+                if entry["path"] == f"{repo_path}/transactions":
+                    with standin._lock:
+                        tx_id = f"tx{next(standin._ids)}"
+                        working = Graph()
+                        working += standin.explicit
+                        graphs = {}
+                        for name, named in standin.graphs.items():
+                            graphs[name] = Graph()
+                            graphs[name] += named
+                        standin.transactions[tx_id] = (working, graphs)
+                    self._send(201, headers={"Location": f"{standin.url}{repo_path}/transactions/{tx_id}"})
+                elif (entry["path"] == f"{repo_path}/statements"
+                      and entry["content_type"].startswith("application/sparql-update")):
+                    try:
+                        with standin._lock:
+                            standin.explicit.update(entry["body"].decode("utf-8"))
+                            standin.implicit = rdfs_closure(standin.explicit)
+                    except Exception as e:
+                        self._send(400, str(e).encode())
+                        return
+                    self._send(204)
+                else:
+                    self._send(404)
+
+            def do_PUT(self) -> None:
+                entry = self._record()
+                if entry["path"] == f"{repo_path}/statements" and "context" in entry["params"]:
+                    self._replace_graph(entry)
+                    return
+                prefix = f"{repo_path}/transactions/"
+                tx_id = entry["path"][len(prefix):] if entry["path"].startswith(prefix) else None
+                state = standin.transactions.get(tx_id) if tx_id else None
+                if state is None:
+                    self._send(404)
+                    return
+                working, graphs = state
+                action = entry["params"].get("action")
+                try:
+                    if action == "ADD":
+                        fmt = FORMATS.get(entry["content_type"].split(";")[0].strip())
+                        if fmt is None:
+                            self._send(415)
+                            return
+                        self._add(working, graphs, entry["body"].decode("utf-8"), fmt)
+                    elif action == "UPDATE":
+                        update = entry["body"].decode("utf-8")
+                        # A plain Graph has no dataset for rdflib's CLEAR ALL
+                        if " ".join(update.split()).upper() in ("CLEAR ALL", "CLEAR DEFAULT"):
+                            working.remove((None, None, None))
+                            if "ALL" in update.upper():
+                                graphs.clear()
+                        else:
+                            working.update(update)
+                    elif action == "COMMIT":
+                        with standin._lock:
+                            standin.explicit = working
+                            standin.graphs = graphs
+                            standin.implicit = rdfs_closure(working)
+                            del standin.transactions[tx_id]
+                    else:
+                        self._send(400)
+                        return
+                except Exception as e:
+                    self._send(400, str(e).encode())
+                    return
+                self._send(200)
+
+            def _add(self, working: Graph, graphs: Dict[str, Graph], data: str, fmt: str) -> None:
+                if fmt != "nquads":
+                    working.parse(data=data, format=fmt)
+                    return
+                dataset = Dataset()
+                dataset.parse(data=data, format=fmt)
+                for context in dataset.graphs():
+                    if context.identifier == DATASET_DEFAULT_GRAPH_ID:
+                        working += context
+                    else:
+                        named = graphs.setdefault(str(context.identifier), Graph())
+                        named += context
+
+            def _replace_graph(self, entry: Dict[str, Any]) -> None:
+                fmt = FORMATS.get(entry["content_type"].split(";")[0].strip())
+                if fmt is None:
+                    self._send(415)
+                    return
+                time.sleep(standin.upload_delay)
+                graph = Graph()
+                try:
+                    graph.parse(data=entry["body"].decode("utf-8"), format=fmt)
+                except Exception as e:
+                    self._send(400, str(e).encode())
+                    return
+                with standin._lock:
+                    standin.graphs[entry["params"]["context"].strip("<>")] = graph
+                entry["finished"] = time.monotonic()
+                self._send(204)
+
+            def do_DELETE(self) -> None:
+                entry = self._record()
+                tx_id = entry["path"].rsplit("/", 1)[-1]
+                if standin.transactions.pop(tx_id, None) is None:
+                    self._send(404)
+                else:
+                    self._send(204)
+
+        return Handler
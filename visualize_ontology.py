@@ -3,7 +3,7 @@
 Ontology Visualization Tool
 
 Generates a visualization of ontology dependencies and relationships
-using SPARQL queries rather than direct TTL parsing.
+read from the graph's predicate index rather than direct TTL parsing.
 """
 
 import sys
@@ -17,6 +17,15 @@ import matplotlib.patches as mpatches
 from rdflib import Graph, URIRef, Namespace, Literal
 from rdflib.namespace import RDF, RDFS, OWL
 import collections
+from ontology_framework.visualization.lod_layout import multilevel_layout
+from ontology_framework.visualization.ontology_graph import (
+    extract_graph_data,
+    extract_relationships,
+    shorten_uri,
+)
+
+# networkx force layouts are quadratic; larger graphs use the multilevel layout
+LARGE_GRAPH_NODES = 1000
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -29,7 +38,7 @@ def parse_arguments():
                         help="Types of relationships to include")
     parser.add_argument("--exclude-classes", nargs="+", default=[],
                         help="Class URIs to exclude from visualization")
-    parser.add_argument("--layout", default="fdp", choices=["spring", "circular", "kamada_kawai", "hierarchical", "fdp"],
+    parser.add_argument("--layout", default="fdp", choices=["spring", "circular", "kamada_kawai", "hierarchical", "fdp", "multilevel"],
                         help="Layout algorithm to use")
     return parser.parse_args()
 
@@ -108,141 +117,21 @@ def extract_imports(g):
     return [(str(row.ontology), str(row.imported)) for row in g.query(query)]
 
 def extract_all_relationships(g, relation_types=None, exclude_classes=None):
-    """Extract all specified relationship types using separate SPARQL queries."""
+    """Extract all specified relationship types from the graph's predicate index."""
     if relation_types is None:
         relation_types = ["subClassOf", "imports", "domain", "range"]
-    if exclude_classes is None:
-        exclude_classes = []
-    
-    relationships = {}
-    
-    # Extract subClassOf relationships
-    if "subClassOf" in relation_types:
-        query = """
-        SELECT ?source ?target
-        WHERE {
-            ?source rdfs:subClassOf ?target .
-            FILTER(isURI(?target))
-            FILTER(?target != owl:Thing)
-        }
-        """
-        results = g.query(query)
-        relationships["subClassOf"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    # Extract domain relationships
-    if "domain" in relation_types:
-        query = """
-        SELECT ?property ?domain
-        WHERE {
-            ?property rdfs:domain ?domain .
-        }
-        """
-        results = g.query(query)
-        relationships["domain"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    # Extract range relationships
-    if "range" in relation_types:
-        query = """
-        SELECT ?property ?range
-        WHERE {
-            ?property rdfs:range ?range .
-        }
-        """
-        results = g.query(query)
-        relationships["range"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    # Extract imports relationships
-    if "imports" in relation_types:
-        query = """
-        SELECT ?ontology ?imported
-        WHERE {
-            ?ontology owl:imports ?imported .
-        }
-        """
-        results = g.query(query)
-        relationships["imports"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    # Extract type relationships
-    if "type" in relation_types:
-        query = """
-        SELECT ?instance ?class
-        WHERE {
-            ?instance rdf:type ?class .
-            FILTER(isURI(?class))
-        }
-        """
-        results = g.query(query)
-        relationships["type"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    # Extract seeAlso relationships
-    if "seeAlso" in relation_types:
-        query = """
-        SELECT ?source ?target
-        WHERE {
-            ?source rdfs:seeAlso ?target .
-        }
-        """
-        results = g.query(query)
-        relationships["seeAlso"] = [(str(row[0]), str(row[1])) for row in results]
-    
-    return relationships
+    return extract_relationships(g, relation_types, exclude_classes)
 
-def shorten_uri(uri, namespaces):
-    """Shorten URI using namespace prefixes."""
-    for prefix, namespace in namespaces.items():
-        if uri.startswith(str(namespace)):
-            return f"{prefix}:{uri[len(str(namespace)):]}"
-    return uri.split('#')[-1] if '#' in uri else uri.split('/')[-1]
-
-def get_node_type(node, relationships):
-    """Determine node type based on its relationships."""
-    # Check if it's a class
-    for _, target in relationships.get("subClassOf", []):
-        if node == target:
-            return "Class"
-    
-    # Check if it's a property
-    for source, _ in relationships.get("domain", []) + relationships.get("range", []):
-        if node == source:
-            return "Property"
-    
-    # Check if it's an ontology
-    for source, _ in relationships.get("imports", []):
-        if node == source:
-            return "Ontology"
-    
-    # Default to instance if it has a type relationship
-    for source, _ in relationships.get("type", []):
-        if node == source:
-            return "Instance"
-    
-    return "Unknown"
-
-def assign_node_groups(G, relationships):
-    """Assign nodes to groups based on their connectivity patterns."""
-    node_groups = {}
-    
-    # Create a reverse mapping from nodes to their types
-    node_types = {node: get_node_type(node, relationships) for node in G.nodes()}
-    
-    # Group by namespace prefix
+def assign_node_groups(G):
+    """Group nodes by namespace prefix."""
+    node_groups = collections.defaultdict(list)
     for node in G.nodes():
         prefix = node.split('#')[0] if '#' in node else node.split('/')[-2] if '/' in node else "default"
-        if prefix not in node_groups:
-            node_groups[prefix] = []
         node_groups[prefix].append(node)
-    
-    # Also create clusters based on connectivity
-    connectivity = {}
-    for node in G.nodes():
-        neighbors = set(G.successors(node)) | set(G.predecessors(node))
-        connectivity[node] = len(neighbors)
-    
-    # Return both grouping strategies
-    return node_groups, node_types, connectivity
+    return dict(node_groups)
 
-def create_graph(relationships, namespaces):
-    """Create NetworkX graph from relationships."""
+def create_graph(data, namespaces):
+    """Create NetworkX graph from extracted graph data."""
     G = nx.DiGraph()
     
     # Track edge types for the legend
@@ -259,25 +148,29 @@ def create_graph(relationships, namespaces):
     }
     
     # Add all relationships to the graph
-    for rel_type, edges in relationships.items():
+    for rel_type, edges in data.edges.items():
         if edges:
             edge_types[rel_type] = colors.get(rel_type, "gray")
-            for source, target in edges:
-                G.add_edge(source, target, relationship=rel_type, color=colors.get(rel_type, "gray"))
+            G.add_edges_from(edges, relationship=rel_type, color=edge_types[rel_type])
     
     # Add node labels using shortened URIs
-    node_labels = {}
-    for node in G.nodes():
-        node_labels[node] = shorten_uri(node, namespaces)
+    node_labels = {node: shorten_uri(node, namespaces) for node in G.nodes()}
     
-    # Group nodes by different strategies
-    node_groups, node_types, connectivity = assign_node_groups(G, relationships)
+    # Node types and connectivity come precomputed with the edges
+    node_groups = assign_node_groups(G)
     
-    return G, node_labels, edge_types, node_groups, node_types, connectivity
+    return G, node_labels, edge_types, node_groups, data.node_types, data.degree
 
 def apply_layout(G, layout_type="spring", node_groups=None, node_types=None, connectivity=None):
     """Apply the selected layout algorithm."""
-    if layout_type == "spring":
+    if layout_type in ("spring", "kamada_kawai", "fdp") and G.number_of_nodes() > LARGE_GRAPH_NODES:
+        print(f"{G.number_of_nodes()} nodes: using the multilevel layout instead of {layout_type}")
+        layout_type = "multilevel"
+    
+    if layout_type == "multilevel":
+        # Namespace groups first, then their members around each group
+        pos, _ = multilevel_layout(G.edges(), node_groups or {"default": list(G.nodes())})
+    elif layout_type == "spring":
         # Enhanced spring layout with grouped nodes
         pos = nx.spring_layout(G, k=0.5, iterations=200, seed=42)
     elif layout_type == "circular":
@@ -375,8 +268,12 @@ def visualize_graph(G, node_labels, edge_types, output_file, show_labels=True, l
         node_sizes[node] = size
     
     # Draw nodes by type
+    nodes_by_type = collections.defaultdict(list)
+    for node, ntype in node_types.items():
+        nodes_by_type[ntype].append(node)
+    
     for node_type, color in node_type_colors.items():
-        nodes = [node for node, ntype in node_types.items() if ntype == node_type]
+        nodes = nodes_by_type.get(node_type)
         if nodes:
             sizes = [node_sizes.get(node, 500) for node in nodes]
             nx.draw_networkx_nodes(G, pos, 
@@ -397,8 +294,12 @@ def visualize_graph(G, node_labels, edge_types, output_file, show_labels=True, l
         "seeAlso": "dashed"
     }
     
+    edges_by_type = collections.defaultdict(list)
+    for u, v, rel_type in G.edges(data="relationship"):
+        edges_by_type[rel_type].append((u, v))
+    
     for rel_type, color in edge_types.items():
-        edges = [(u, v) for u, v, d in G.edges(data=True) if d["relationship"] == rel_type]
+        edges = edges_by_type.get(rel_type)
         if edges:
             nx.draw_networkx_edges(G, pos, 
                                   edgelist=edges,
@@ -434,7 +335,7 @@ def visualize_graph(G, node_labels, edge_types, output_file, show_labels=True, l
     # Create legend for node types
     node_patches = [mpatches.Patch(color=color, label=node_type) 
                    for node_type, color in node_type_colors.items() 
-                   if any(ntype == node_type for _, ntype in node_types.items())]
+                   if node_type in nodes_by_type]
     
     # Add both legends
     plt.legend(handles=edge_patches + node_patches, 
@@ -479,14 +380,15 @@ def main():
     
     # Extract relationships 
     global relationships
-    relationships = extract_all_relationships(g, args.relation_types, args.exclude_classes)
+    data = extract_graph_data(g, args.relation_types, args.exclude_classes)
+    relationships = data.edges
     
     if not any(relationships.values()):
         print("No relationships found matching the specified criteria")
         return
     
     # Create graph
-    G, node_labels, edge_types, node_groups, node_types, connectivity = create_graph(relationships, namespaces)
+    G, node_labels, edge_types, node_groups, node_types, connectivity = create_graph(data, namespaces)
     
     # Print summary statistics
     print(f"Graph contains {G.number_of_nodes()} nodes and {G.number_of_edges()} edges")